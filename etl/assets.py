@@ -1,50 +1,350 @@
+import functools
 import json
-from typing import cast
-
-from dagster import AssetsDefinition, asset
+import shutil
+from collections.abc import Iterator
+from itertools import batched, chain
+from pathlib import Path
+from typing import Any, cast
+
+from dagster import (
+    AssetExecutionContext,
+    AssetIn,
+    AssetRecordsFilter,
+    AssetsDefinition,
+    DagsterInvariantViolationError,
+    DataVersion,
+    DataVersionsByPartition,
+    Output,
+    asset,
+    observable_source_asset,
+)
 
+from etl.instrumentation import Instrumentation, instrumented
+from etl.memory import MemoryBudget
 from etl.models import (
+    DEFAULT_DATA_FILE_NAMES,
     AntiRecommendationGraphTuple,
-    DocumentTuple,
+    ArkgStoreDescriptor,
     RecordTuple,
+    VectorStoreDescriptor,
     rdf_serializations,
 )
-from etl.models.types import RdfFileExtension, RdfMimeType, RdfSerializationName
-from etl.pipelines import (
-    AntiRecommendationRetrievalPipeline,
-    OpenaiRecordEnrichmentPipeline,
+from etl.models.types import (
+    AntiRecommendationKey,
+    RdfFileExtension,
+    RdfMimeType,
+    RdfSerializationName,
+    RecordKey,
+)
+from etl.partitions import RecordPartitions, merge_partitions
+from etl.readers import (
+    WikipediaAbstractDumpReader,
+    WikipediaDatasetReader,
+    WikipediaReader,
 )
-from etl.readers import WikipediaReader
 from etl.resources import (
+    CompressionSettings,
     InputConfig,
+    LocalEmbeddingSettings,
+    MemorySettings,
     OpenaiSettings,
     OutputConfig,
     RetrievalAlgorithmParameters,
+    VectorStoreSettings,
+    WikidataSettings,
 )
-from etl.stores import ArkgStore, VectorStore
+from etl.versioning import content_hash, file_content_hash, settings_content_hash
+from etl.writers import JsonlWriter, RdfStreamWriter
+
+ANTI_RECOMMENDATIONS_BATCH_SIZE = 256
+
+# Pipelines, stores and DocumentTuple are imported in the assets that use them, so that loading the code location,
+# and every step of a run, does not import the LangChain, OpenAI, FAISS and requests-cache dependencies of every asset.
+# The assets of Documents are annotated with Any, as Dagster resolves the annotations of assets when they are defined.
+
+# The partitions of the assets from wikipedia_articles_from_storage to wikipedia_anti_recommendations.
+# Fan-in assets downstream of them merge their per-partition outputs.
+record_partitions = RecordPartitions.from_env_vars(
+    data_file_names_default=DEFAULT_DATA_FILE_NAMES
+)
+
+# Assets declare code versions, to be incremented when a change to an asset changes its outputs, and the input
+# data files and the resource settings that change outputs are observable source assets, versioned by content
+# hashes. Dagster reports an asset as unsynced when its code version, or the data version of an input, changed
+# since its last materialization, so that only the stale parts of the graph need to be materialized.
+# Assets whose outputs are records report content hashes as data versions, so that a partition whose records
+# did not change does not make its downstream partitions stale.
+
+
+@observable_source_asset(partitions_def=record_partitions.partitions_def)
+def wikipedia_data_files(
+    input_config: InputConfig,
+) -> DataVersion | DataVersionsByPartition:
+    """
+    Observe the data files of Wikipedia articles, versioned by a hash of their contents and of the filters of Records.
+
+    With partitions, every partition is versioned by the data files it is read from, so that a change to one data
+    file only makes the partitions that read it stale.
+    """
+
+    parsed_input_config = input_config.parse()
+    filters_content_hash = settings_content_hash(
+        input_config,
+        field_names=(
+            "min_record_key",
+            "max_record_key",
+            "namespaces",
+            "modified_since",
+        ),
+    )
+
+    # Under the KEY_HASH scheme, every partition reads every data file, which are hashed once.
+    @functools.cache
+    def data_version(data_file_paths: frozenset[Path]) -> str:
+        return content_hash((file_content_hash(data_file_paths), filters_content_hash))
+
+    if record_partitions.partitions_def is None:
+        return DataVersion(data_version(parsed_input_config.data_file_paths))
+
+    return DataVersionsByPartition(
+        {
+            partition_key: data_version(data_file_paths)
+            for partition_key, data_file_paths in record_partitions.data_file_paths_by_partition(
+                parsed_input_config
+            ).items()
+        }
+    )
+
+
+@observable_source_asset
+def record_enrichment_settings(openai_settings: OpenaiSettings) -> DataVersion:
+    """Observe the settings of the OpenAI model that summarizes Wikipedia articles."""
+
+    return DataVersion(
+        settings_content_hash(
+            openai_settings, field_names=("generative_model_name", "temperature")
+        )
+    )
+
+
+@observable_source_asset
+def embedding_settings(
+    openai_settings: OpenaiSettings,
+    vector_store_settings: VectorStoreSettings,
+    local_embedding_settings: LocalEmbeddingSettings,
+) -> DataVersion:
+    """Observe the settings of the OpenAI or local embedding model and of the vector store layout."""
+
+    return DataVersion(
+        content_hash(
+            (
+                settings_content_hash(
+                    openai_settings, field_names=("embedding_model_name",)
+                ),
+                settings_content_hash(vector_store_settings),
+                settings_content_hash(local_embedding_settings),
+            )
+        )
+    )
+
+
+@observable_source_asset
+def retrieval_settings(
+    retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
+) -> DataVersion:
+    """Observe the parameters of the retrieval of anti-recommendations."""
+
+    return DataVersion(settings_content_hash(retrieval_algorithm_parameters))
+
+
+@observable_source_asset
+def arkg_settings(wikidata_settings: WikidataSettings) -> DataVersion:
+    """Observe the settings of the Wikidata identifier resolution of ARKGs."""
+
+    return DataVersion(settings_content_hash(wikidata_settings))
+
+
+@observable_source_asset
+def serialization_settings(compression_settings: CompressionSettings) -> DataVersion:
+    """Observe the compression settings of ARKG serializations."""
+
+    return DataVersion(settings_content_hash(compression_settings))
+
+
+def remove_superseded_spill_directories(
+    context: AssetExecutionContext, spill_directory_path: Path
+) -> None:
+    """
+    Remove the run subdirectories of spill_directory_path, the spill directory of the asset of context, that no
+    stored output points to any more.
 
+    The segments of the run of context, of the run of the latest materialization of the asset, and of runs that
+    have not finished, are kept.
+    """
+
+    if not spill_directory_path.is_dir():
+        return
+
+    materializations = context.instance.fetch_materializations(
+        AssetRecordsFilter(
+            asset_key=context.asset_key,
+            asset_partitions=(
+                [context.partition_key] if context.has_partition_key else None
+            ),
+        ),
+        limit=1,
+    ).records
+    kept_run_ids = {
+        context.run_id,
+        *(materialization.run_id for materialization in materializations),
+    }
+
+    for run_directory_path in spill_directory_path.iterdir():
+        if run_directory_path.name in kept_run_ids:
+            continue
+        run = context.instance.get_run_by_id(run_directory_path.name)
+        if run is None or run.is_finished:
+            shutil.rmtree(run_directory_path, ignore_errors=True)
+
+
+def memory_budget(memory_settings: MemorySettings, asset_name: str) -> MemoryBudget:
+    """
+    Return the MemoryBudget of the asset called asset_name, which spills to a directory of its name, partition and
+    run.
+
+    Runs spill to their own directories, so that a rematerialization, or a concurrent run, of the asset does not
+    delete the segments that its stored output points to. The directories of superseded runs are removed.
+    """
+
+    try:
+        context: AssetExecutionContext | None = AssetExecutionContext.get()
+    except DagsterInvariantViolationError:
+        context = None
+
+    if context is None:
+        return memory_settings.memory_budget(asset_name)
+
+    spill_directory_name = (
+        f"{asset_name}/{context.partition_key}"
+        if context.has_partition_key
+        else asset_name
+    )
+    if memory_settings.memory_budget_bytes is not None:
+        remove_superseded_spill_directories(
+            context, Path(memory_settings.spill_directory_path) / spill_directory_name
+        )
+
+    return memory_settings.memory_budget(f"{spill_directory_name}/{context.run_id}")
 
-@asset
+
+def record_tuple_data_version(record_tuple: RecordTuple) -> DataVersion:
+    """Return the data version of record_tuple, a hash of its records."""
+
+    return DataVersion(
+        content_hash(record.model_dump_json() for record in record_tuple.records)
+    )
+
+
+@asset(
+    partitions_def=record_partitions.partitions_def,
+    deps=[wikipedia_data_files],
+    code_version="1",
+)
+@instrumented
 def wikipedia_articles_from_storage(
+    context: AssetExecutionContext,
     input_config: InputConfig,
-) -> RecordTuple:
-    """Materialize an asset of Wikipedia articles."""
+    memory_settings: MemorySettings,
+) -> Output[RecordTuple]:
+    """
+    Materialize an asset of Wikipedia articles, of only the partition being materialized if partitioned.
+
+    Data files are read as Wikipedia abstract dumps if their names end in .xml or .xml.gz, as Parquet or Arrow
+    datasets, with the filters of input_config pushed down, if their names end in .parquet, .arrow or .feather, and as
+    JSON Lines otherwise. Records of every data file are filtered by the key range of input_config, and only datasets
+    can be filtered by namespaces and modification times.
+    """
 
-    return RecordTuple(
-        records=tuple(
-            WikipediaReader(data_file_paths=input_config.parse().data_file_paths).read()
+    partition_key = context.partition_key if context.has_partition_key else None
+    parsed_input_config = input_config.parse()
+    data_file_paths = record_partitions.data_file_paths(
+        parsed_input_config, partition_key
+    )
+    abstract_dump_file_paths = frozenset(
+        data_file_path
+        for data_file_path in data_file_paths
+        if WikipediaAbstractDumpReader.is_abstract_dump(data_file_path)
+    )
+    dataset_paths = frozenset(
+        data_file_path
+        for data_file_path in data_file_paths
+        if WikipediaDatasetReader.is_dataset(data_file_path)
+    )
+    if data_file_paths - dataset_paths and (
+        parsed_input_config.namespaces is not None
+        or parsed_input_config.modified_since is not None
+    ):
+        message = "Only Parquet and Arrow datasets can be filtered by namespaces and modification times"
+        raise ValueError(message)
+
+    wikipedia_articles = RecordTuple(
+        records=memory_budget(
+            memory_settings, "wikipedia_articles_from_storage"
+        ).collect(
+            record_partitions.partition_records(
+                chain(
+                    (
+                        article
+                        for article in chain(
+                            WikipediaReader(
+                                data_file_paths=data_file_paths
+                                - abstract_dump_file_paths
+                                - dataset_paths
+                            ).read(),
+                            WikipediaAbstractDumpReader(
+                                data_file_paths=abstract_dump_file_paths
+                            ).read(),
+                        )
+                        if parsed_input_config.contains_record_key(article.key)
+                    ),
+                    WikipediaDatasetReader(
+                        data_file_paths=dataset_paths,
+                        min_record_key=parsed_input_config.min_record_key,
+                        max_record_key=parsed_input_config.max_record_key,
+                        namespaces=parsed_input_config.namespaces,
+                        modified_since=parsed_input_config.modified_since,
+                    ).read(),
+                ),
+                partition_key,
+            )
         )
     )
 
+    return Output(
+        wikipedia_articles,
+        data_version=record_tuple_data_version(wikipedia_articles),
+    )
+
 
-@asset
+@asset(
+    partitions_def=record_partitions.partitions_def,
+    deps=[record_enrichment_settings],
+    code_version="1",
+)
+@instrumented
 def wikipedia_articles_with_summaries(
-    wikipedia_articles_from_storage: RecordTuple, openai_settings: OpenaiSettings
-) -> RecordTuple:
+    wikipedia_articles_from_storage: RecordTuple,
+    openai_settings: OpenaiSettings,
+    memory_settings: MemorySettings,
+) -> Output[RecordTuple]:
     """Materialize an asset of Wikipedia articles with summaries."""
 
-    return RecordTuple(
-        records=tuple(
+    from etl.pipelines import OpenaiRecordEnrichmentPipeline
+
+    wikipedia_articles_with_summaries = RecordTuple(
+        records=memory_budget(
+            memory_settings, "wikipedia_articles_with_summaries"
+        ).collect(
             OpenaiRecordEnrichmentPipeline(openai_settings).enrich_record(
                 wikipedia_article
             )
@@ -52,12 +352,26 @@ def wikipedia_articles_with_summaries(
         )
     )
 
+    return Output(
+        wikipedia_articles_with_summaries,
+        data_version=record_tuple_data_version(wikipedia_articles_with_summaries),
+    )
+
 
-@asset
+@asset(
+    ins={"wikipedia_articles_with_summaries": AssetIn(dagster_type=Any)},
+    code_version="1",
+)
+@instrumented
 def wikipedia_articles_with_summaries_json_file(
-    wikipedia_articles_with_summaries: RecordTuple, output_config: OutputConfig
+    wikipedia_articles_with_summaries: RecordTuple | dict[str, RecordTuple],
+    output_config: OutputConfig,
 ) -> None:
-    """Store the asset of Wikipedia articles with summaries as JSON."""
+    """Store the asset of Wikipedia articles with summaries, of all partitions, as JSON."""
+
+    wikipedia_articles_with_summaries = merge_partitions(
+        wikipedia_articles_with_summaries, merge=RecordTuple.concatenate
+    )
 
     output_config.parse().record_enrichment_directory_path.mkdir(
         parents=True, exist_ok=True
@@ -73,81 +387,303 @@ def wikipedia_articles_with_summaries_json_file(
         )
 
 
-@asset
+@asset(partitions_def=record_partitions.partitions_def, code_version="1")
+@instrumented
 def documents_of_wikipedia_articles_with_summaries(
     wikipedia_articles_with_summaries: RecordTuple,
-) -> DocumentTuple:
-    """Materialize an asset of Documents of Wikipedia articles with summaries."""
+    memory_settings: MemorySettings,
+) -> Any:  # noqa: ANN401
+    """Materialize an asset of Documents of Wikipedia articles with summaries, as a DocumentTuple."""
+
+    from etl.models import DocumentTuple
 
     return DocumentTuple.from_records(
         records=wikipedia_articles_with_summaries.records,
         record_content=lambda record: str(record.model_dump().get("summary")),
+        memory_budget=memory_budget(
+            memory_settings, "documents_of_wikipedia_articles_with_summaries"
+        ),
     )
 
 
-@asset
+@asset(
+    ins={"documents_of_wikipedia_articles_with_summaries": AssetIn(dagster_type=Any)},
+    deps=[embedding_settings],
+    code_version="1",
+)
+@instrumented
 def wikipedia_articles_vector_store(
     output_config: OutputConfig,
     openai_settings: OpenaiSettings,
-    documents_of_wikipedia_articles_with_summaries: DocumentTuple,
-) -> VectorStore.Descriptor:
-    """Materialize an asset of Wikipedia articles embeddings."""
+    # A DocumentTuple, or a dict of the DocumentTuples of all partitions.
+    documents_of_wikipedia_articles_with_summaries: Any,  # noqa: ANN401
+    vector_store_settings: VectorStoreSettings,
+    local_embedding_settings: LocalEmbeddingSettings,
+) -> Output[VectorStoreDescriptor]:
+    """
+    Materialize an asset of the embeddings of the Wikipedia articles of all partitions.
+
+    Articles are embedded by the local embedding model of local_embedding_settings if it has one, otherwise by
+    the OpenAI embedding model. Its data version is the version of the saved index, a hash of the index files.
+    """
+
+    from etl.models import DocumentTuple
+    from etl.stores import VectorStore
+
+    documents = merge_partitions(
+        documents_of_wikipedia_articles_with_summaries,
+        merge=DocumentTuple.concatenate,
+    ).documents
+    instrumentation = Instrumentation.current()
 
     with VectorStore.create(
         openai_settings=openai_settings,
-        documents=documents_of_wikipedia_articles_with_summaries.documents,
+        documents=documents,
         output_config=output_config,
+        vector_store_settings=vector_store_settings,
+        local_embedding_settings=local_embedding_settings,
     ) as vector_store:
-        vector_store.save_local()
+        if local_embedding_settings.local_embedding_model_name is None:
+            embedded_texts = instrumentation.counter("openai_embeddings_texts")
+            instrumentation.record_cache(
+                "openai_embeddings",
+                hits=len(documents) - embedded_texts,
+                misses=embedded_texts,
+            )
+
+        vector_store.save_local(
+            compressed_index_type=vector_store_settings.compressed_index_type
+        )
+
+        descriptor = cast(VectorStoreDescriptor, vector_store.descriptor)
 
-        return cast(VectorStore.Descriptor, vector_store.descriptor)
+        return Output(
+            descriptor,
+            data_version=(
+                DataVersion(descriptor.index_version)
+                if descriptor.index_version is not None
+                else None
+            ),
+        )
 
 
-@asset
+@asset(
+    partitions_def=record_partitions.partitions_def,
+    deps=[retrieval_settings],
+    code_version="1",
+)
+@instrumented
 def wikipedia_anti_recommendations(
+    output_config: OutputConfig,
     wikipedia_articles_from_storage: RecordTuple,
     retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
-    wikipedia_articles_vector_store: VectorStore.Descriptor,
-) -> AntiRecommendationGraphTuple:
-    """Materialize an asset of Wikipedia anti-recommendations."""
-
-    with VectorStore.open(wikipedia_articles_vector_store) as wikipedia_vector_store:
-
-        return AntiRecommendationGraphTuple(
-            anti_recommendation_graphs=tuple(
-                (
-                    record.key,
-                    tuple(
-                        anti_recommendation.key
-                        for anti_recommendation in AntiRecommendationRetrievalPipeline(
-                            vector_store=wikipedia_vector_store,
-                            retrieval_algorithm_parameters=retrieval_algorithm_parameters,
-                        ).retrieve_documents(record_key=record.key, k=7)
-                        if anti_recommendation.key != record.key
-                    ),
+    wikipedia_articles_vector_store: VectorStoreDescriptor,
+    memory_settings: MemorySettings,
+) -> Output[AntiRecommendationGraphTuple]:
+    """
+    Materialize an asset of Wikipedia anti-recommendations.
+
+    Anti-recommendations retrieved by a previous run with the same index and retrieval parameters are reused from a cache,
+    from which those retrieved with another index or other retrieval parameters are removed.
+    Records are retrieved, or read from the cache, in batches that are spilled under the memory budget as they are
+    produced, and the vector store counts against the budget.
+    """
+
+    from etl.pipelines import AntiRecommendationRetrievalPipeline
+    from etl.stores import RetrievalResultCache, VectorStore
+
+    anti_recommendations_memory_budget = memory_budget(
+        memory_settings, "wikipedia_anti_recommendations"
+    )
+    # The vector store is held by this step, in its process or in its shard worker processes, so it is counted
+    # against the memory budget, before it is loaded.
+    vector_store_bytes = wikipedia_articles_vector_store.index_bytes
+    anti_recommendations_memory_budget.reserve(vector_store_bytes)
+    cache_hits = 0
+
+    with VectorStore.open(
+        wikipedia_articles_vector_store
+    ) as wikipedia_vector_store, RetrievalResultCache(
+        file_path=output_config.parse().retrieval_result_cache_file_path
+    ) as retrieval_result_cache:
+        if wikipedia_articles_vector_store.shard_count <= 1:
+            # Once loaded, an unsharded index is part of the RSS of the step.
+            anti_recommendations_memory_budget.release(vector_store_bytes)
+
+        anti_recommendation_retrieval_pipeline = AntiRecommendationRetrievalPipeline(
+            vector_store=wikipedia_vector_store,
+            retrieval_algorithm_parameters=retrieval_algorithm_parameters,
+        )
+        retrieval_fingerprint = (
+            anti_recommendation_retrieval_pipeline.retrieval_fingerprint(k=7)
+        )
+        pruned_cache_results = (
+            retrieval_result_cache.prune(fingerprint=retrieval_fingerprint)
+            if retrieval_fingerprint is not None
+            else 0
+        )
+
+        def retrieve_anti_recommendation_graphs() -> (
+            Iterator[tuple[RecordKey, tuple[AntiRecommendationKey, ...]]]
+        ):
+            """Yield the anti-recommendation graph of each Record, from the cache or retrieved, batch by batch."""
+
+            nonlocal cache_hits
+
+            for record_keys in batched(
+                (record.key for record in wikipedia_articles_from_storage.records),
+                ANTI_RECOMMENDATIONS_BATCH_SIZE,
+            ):
+                anti_recommendation_keys = (
+                    retrieval_result_cache.get(
+                        fingerprint=retrieval_fingerprint, record_keys=record_keys
+                    )
+                    if retrieval_fingerprint is not None
+                    else {}
                 )
-                for record in wikipedia_articles_from_storage.records
-            )
+                cache_hits += sum(
+                    record_key in anti_recommendation_keys for record_key in record_keys
+                )
+
+                uncached_record_keys = tuple(
+                    dict.fromkeys(
+                        record_key
+                        for record_key in record_keys
+                        if record_key not in anti_recommendation_keys
+                    )
+                )
+                if uncached_record_keys:
+                    retrieved_anti_recommendation_graphs = tuple(
+                        (
+                            record_key,
+                            tuple(
+                                anti_recommendation.key
+                                for anti_recommendation in anti_recommendations
+                                if anti_recommendation.key != record_key
+                            ),
+                        )
+                        for record_key, anti_recommendations in zip(
+                            uncached_record_keys,
+                            anti_recommendation_retrieval_pipeline.retrieve_documents_batch(
+                                record_keys=uncached_record_keys, k=7
+                            ),
+                            strict=True,
+                        )
+                    )
+
+                    anti_recommendation_keys.update(
+                        retrieved_anti_recommendation_graphs
+                    )
+                    if retrieval_fingerprint is not None:
+                        retrieval_result_cache.put(
+                            fingerprint=retrieval_fingerprint,
+                            anti_recommendation_graphs=retrieved_anti_recommendation_graphs,
+                        )
+
+                for record_key in record_keys:
+                    yield record_key, anti_recommendation_keys[record_key]
+
+        # Each batch is spilled as it is retrieved, while the vector store is loaded, so that the RSS checks of the
+        # memory budget count the vector store and the batch, and never every anti-recommendation graph.
+        anti_recommendation_graphs = anti_recommendations_memory_budget.collect(
+            retrieve_anti_recommendation_graphs()
         )
 
+    return Output(
+        AntiRecommendationGraphTuple(
+            anti_recommendation_graphs=anti_recommendation_graphs
+        ),
+        data_version=DataVersion(
+            content_hash(
+                json.dumps(anti_recommendation_graph)
+                for anti_recommendation_graph in anti_recommendation_graphs
+            )
+        ),
+        metadata={
+            "retrieval_cache_hits": cache_hits,
+            "retrieval_cache_misses": len(anti_recommendation_graphs) - cache_hits,
+            "retrieval_cache_hit_rate": (
+                cache_hits / len(anti_recommendation_graphs)
+                if anti_recommendation_graphs
+                else 0.0
+            ),
+            "retrieval_cache_pruned_results": pruned_cache_results,
+        },
+    )
+
 
-@asset
+@asset(
+    ins={"wikipedia_anti_recommendations": AssetIn(dagster_type=Any)},
+    code_version="1",
+)
+@instrumented
 def wikipedia_anti_recommendations_json_file(
     output_config: OutputConfig,
-    wikipedia_anti_recommendations: AntiRecommendationGraphTuple,
+    wikipedia_anti_recommendations: (
+        AntiRecommendationGraphTuple | dict[str, AntiRecommendationGraphTuple]
+    ),
 ) -> None:
-    """Store the asset of Wikipedia anti-recommendations as JSON."""
+    """Store the asset of Wikipedia anti-recommendations as JSON Lines, with one anti-recommendation graph per line."""
+
+    with JsonlWriter(
+        file_path=output_config.parse().wikipedia_anti_recommendations_file_path
+    ) as jsonl_writer:
+        jsonl_writer.write(
+            merge_partitions(
+                wikipedia_anti_recommendations,
+                merge=AntiRecommendationGraphTuple.concatenate,
+            ).anti_recommendation_graphs
+        )
+
+
+@asset(
+    ins={"wikipedia_anti_recommendations": AssetIn(dagster_type=Any)},
+    deps=[arkg_settings],
+    code_version="1",
+)
+@instrumented
+def wikipedia_arkg(
+    output_config: OutputConfig,
+    wikipedia_anti_recommendations: (
+        AntiRecommendationGraphTuple | dict[str, AntiRecommendationGraphTuple]
+    ),
+    wikidata_settings: WikidataSettings,
+) -> Output[ArkgStoreDescriptor]:
+    """
+    Materialize a Wikipedia Anti-Recommendation Knowledge Graph asset, of the anti-recommendations of all partitions.
 
-    output_config.parse().anti_recommendations_directory_path.mkdir(
+    The ARKG Store of the previous materialization is updated with only the Quads that changed.
+    """
+
+    from etl.stores import ArkgStore, WikidataIdentifierStore
+
+    parsed_output_config = output_config.parse()
+    parsed_output_config.wikipedia_arkg_store_directory_path.mkdir(
         parents=True, exist_ok=True
     )
 
-    with output_config.parse().wikipedia_anti_recommendations_file_path.open(
-        mode="w"
-    ) as wikipedia_anti_recommendations_file:
-        wikipedia_anti_recommendations_file.writelines(
-            json.dumps(anti_recommendation_graph)
-            for anti_recommendation_graph in wikipedia_anti_recommendations.anti_recommendation_graphs
+    with WikidataIdentifierStore(
+        file_path=parsed_output_config.wikidata_identifiers_file_path
+    ) as wikidata_identifier_store, ArkgStore.open(
+        ArkgStoreDescriptor(parsed_output_config.wikipedia_arkg_store_directory_path)
+    ) as wikipedia_arkg_store:
+        changes = wikipedia_arkg_store.update(
+            requests_cache_directory_path=parsed_output_config.requests_cache_directory_path,
+            anti_recommendation_graphs=merge_partitions(
+                wikipedia_anti_recommendations,
+                merge=AntiRecommendationGraphTuple.concatenate,
+            ),
+            wikidata_identifier_store=wikidata_identifier_store,
+            wikidata_settings=wikidata_settings,
+        )
+
+        return Output(
+            wikipedia_arkg_store.descriptor,
+            metadata={
+                "arkg_added_quads": changes.added_quad_count,
+                "arkg_removed_quads": changes.removed_quad_count,
+                "arkg_changed_subjects": changes.changed_subject_count,
+            },
         )
 
 
@@ -157,40 +693,182 @@ def wikipedia_arkg_asset_factory(
     rdf_file_extension: RdfFileExtension,
 ) -> AssetsDefinition:
     """
-    A factory to build Wikipedia ARKG assets.
+    A factory to build Wikipedia ARKG serialization assets.
 
     Multiple assets are created based on different RDF serialization types.
     Each RDF serialization type is characterized by a (name, mime_type, file_extension) triple.
+    Every asset dumps the ARKG Store of the wikipedia_arkg asset, which it opens read-only,
+    so that the serializations can be written concurrently.
+    Serializations are compressed as they are written, as configured by compression_settings.
     """
 
-    @asset(name=f"wikipedia_arkg_with_{rdf_serialization_name}_serialization")
-    def wikipedia_arkg(
+    @asset(
+        name=f"wikipedia_arkg_with_{rdf_serialization_name}_serialization",
+        deps=[serialization_settings],
+        code_version="1",
+    )
+    @instrumented
+    def wikipedia_arkg_serialization(
         output_config: OutputConfig,
-        wikipedia_anti_recommendations: AntiRecommendationGraphTuple,
-    ) -> ArkgStore.Descriptor:
-        """Materialize a Wikipedia Anti-Recommendation Knowledge Graph asset."""
+        wikipedia_arkg: ArkgStoreDescriptor,
+        compression_settings: CompressionSettings,
+    ) -> Output[None]:
+        """Store the Wikipedia Anti-Recommendation Knowledge Graph in an RDF serialization."""
 
-        parsed_output_config = output_config.parse()
+        from etl.stores import ArkgStore
 
-        with ArkgStore.create(
-            requests_cache_directory_path=parsed_output_config.requests_cache_directory_path,
-            anti_recommendation_graphs=wikipedia_anti_recommendations,
-            directory_path=parsed_output_config.wikipedia_arkg_store_directory_path,
-        ) as wikipedia_arkg_store:
+        file_extension = compression_settings.file_extension(rdf_file_extension)
+        file_path = output_config.parse().wikipedia_arkg_file_path.with_suffix(
+            file_extension
+        )
 
+        with ArkgStore.open(wikipedia_arkg, read_only=True) as wikipedia_arkg_store:
             wikipedia_arkg_store.dump(
-                file_path=parsed_output_config.wikipedia_arkg_file_path.with_suffix(
-                    rdf_file_extension
-                ),
+                file_path=file_path,
                 rdf_mime_type=rdf_mime_type,
+                compression_settings=compression_settings,
             )
 
-            return wikipedia_arkg_store.descriptor
+        return Output(
+            None,
+            metadata={
+                "rdf_serialization": rdf_serialization_name,
+                "file_extension": file_extension,
+                "file_path": str(file_path),
+            },
+        )
 
-    return wikipedia_arkg
+    return wikipedia_arkg_serialization
 
 
 wikipedia_arkg_assets = [
     wikipedia_arkg_asset_factory(*rdf_serialization_tuple)
     for rdf_serialization_tuple in rdf_serializations
 ]
+
+
+@asset(
+    ins={"wikipedia_anti_recommendations": AssetIn(dagster_type=Any)},
+    deps=[arkg_settings],
+    code_version="1",
+)
+@instrumented
+def wikipedia_wikidata_identifiers(
+    output_config: OutputConfig,
+    wikipedia_anti_recommendations: (
+        AntiRecommendationGraphTuple | dict[str, AntiRecommendationGraphTuple]
+    ),
+    wikidata_settings: WikidataSettings,
+) -> Output[dict[str, str]]:
+    """
+    Materialize the Wikidata identifiers of the Record keys of the anti-recommendations of all partitions.
+
+    They are resolved once, so that the ARKG stream assets, which run concurrently, do not each resolve them against
+    the same WikidataIdentifierStore and MediaWiki API.
+    """
+
+    from etl.pipelines import ArkgBuilderPipeline
+    from etl.stores import WikidataIdentifierStore
+
+    parsed_output_config = output_config.parse()
+
+    with WikidataIdentifierStore(
+        file_path=parsed_output_config.wikidata_identifiers_file_path
+    ) as wikidata_identifier_store:
+        wikidata_identifiers = ArkgBuilderPipeline(
+            arkg_store_directory_path=parsed_output_config.wikipedia_arkg_store_directory_path,
+            requests_cache_directory_path=parsed_output_config.requests_cache_directory_path,
+            wikidata_identifier_store=wikidata_identifier_store,
+            mediawiki_api_url=(
+                None
+                if wikidata_settings.offline
+                else wikidata_settings.mediawiki_api_url
+            ),
+        ).resolve_wikidata_identifiers(
+            tuple(
+                record_key
+                for record_key, _ in merge_partitions(
+                    wikipedia_anti_recommendations,
+                    merge=AntiRecommendationGraphTuple.concatenate,
+                ).anti_recommendation_graphs
+            )
+        )
+
+    return Output(
+        wikidata_identifiers,
+        metadata={"wikidata_identifiers": len(wikidata_identifiers)},
+    )
+
+
+def wikipedia_arkg_stream_asset_factory(
+    rdf_serialization_name: RdfSerializationName,
+    rdf_mime_type: RdfMimeType,
+    rdf_file_extension: RdfFileExtension,
+) -> AssetsDefinition:
+    """
+    A factory to build Wikipedia ARKG serialization assets that do not construct an ARKG Store.
+
+    Each asset streams the Quads of wikipedia_anti_recommendations straight into an RDF serialization file, with the
+    Wikidata identifiers of wikipedia_wikidata_identifiers.
+    The serializations are written to their own files, wikipedia_arkg_stream_file_path, so that they do not overwrite
+    those of wikipedia_arkg_asset_factory.
+    Only the RDF serializations supported by RdfStreamWriter can be streamed.
+    """
+
+    @asset(
+        name=f"wikipedia_arkg_stream_with_{rdf_serialization_name}_serialization",
+        ins={"wikipedia_anti_recommendations": AssetIn(dagster_type=Any)},
+        deps=[serialization_settings],
+        code_version="1",
+    )
+    @instrumented
+    def wikipedia_arkg_stream(
+        output_config: OutputConfig,
+        wikipedia_anti_recommendations: (
+            AntiRecommendationGraphTuple | dict[str, AntiRecommendationGraphTuple]
+        ),
+        wikipedia_wikidata_identifiers: dict[str, str],
+        compression_settings: CompressionSettings,
+    ) -> Output[None]:
+        """Stream the Wikipedia Anti-Recommendation Knowledge Graph into an RDF serialization."""
+
+        from etl.pipelines import ArkgBuilderPipeline
+
+        parsed_output_config = output_config.parse()
+        file_extension = compression_settings.file_extension(rdf_file_extension)
+        file_path = parsed_output_config.wikipedia_arkg_stream_file_path.with_suffix(
+            file_extension
+        )
+
+        ArkgBuilderPipeline(
+            arkg_store_directory_path=parsed_output_config.wikipedia_arkg_store_directory_path,
+            requests_cache_directory_path=parsed_output_config.requests_cache_directory_path,
+            mediawiki_api_url=None,
+        ).write_graph(
+            merge_partitions(
+                wikipedia_anti_recommendations,
+                merge=AntiRecommendationGraphTuple.concatenate,
+            ).anti_recommendation_graphs,
+            file_path=file_path,
+            rdf_mime_type=rdf_mime_type,
+            compression_settings=compression_settings,
+            wikidata_identifiers=wikipedia_wikidata_identifiers,
+        )
+
+        return Output(
+            None,
+            metadata={
+                "rdf_serialization": rdf_serialization_name,
+                "file_extension": file_extension,
+                "file_path": str(file_path),
+            },
+        )
+
+    return wikipedia_arkg_stream
+
+
+wikipedia_arkg_stream_assets = [
+    wikipedia_arkg_stream_asset_factory(*rdf_serialization_tuple)
+    for rdf_serialization_tuple in rdf_serializations
+    if rdf_serialization_tuple[1] in RdfStreamWriter.SUPPORTED_RDF_MIME_TYPES
+]
@@ -1,24 +1,55 @@
 from pathlib import Path
 
 from dagster import Definitions, EnvVar, load_assets_from_modules
-from langchain_community.vectorstores.utils import DistanceStrategy
 
+from etl.models import DEFAULT_DATA_FILE_NAMES
 from etl.resources.input_config import InputConfig
 
 from . import assets
-from .jobs import arkg_job, embedding_job, retrieval_job
-from .resources import OpenaiSettings, OutputConfig, RetrievalAlgorithmParameters
+from .jobs import (
+    arkg_job,
+    arkg_stream_job,
+    documents_job,
+    embedding_job,
+    retrieval_job,
+    source_observation_job,
+)
+from .resources import (
+    CompressionSettings,
+    LocalEmbeddingSettings,
+    MemorySettings,
+    OpenaiSettings,
+    OutputConfig,
+    RetrievalAlgorithmParameters,
+    VectorStoreSettings,
+    WikidataSettings,
+)
 
 definitions = Definitions(
     assets=load_assets_from_modules([assets]),
-    jobs=[embedding_job, retrieval_job, arkg_job],
+    jobs=[
+        source_observation_job,
+        documents_job,
+        embedding_job,
+        retrieval_job,
+        arkg_job,
+        arkg_stream_job,
+    ],
     resources={
+        "compression_settings": CompressionSettings.from_env_vars(),
         "input_config": InputConfig.from_env_vars(
             data_directory_path_default=Path(__file__).parent.absolute()
             / "data"
             / "input"
             / "data_files",
-            data_file_names_default=("mini-wikipedia.output.txt",),
+            data_file_names_default=DEFAULT_DATA_FILE_NAMES,
+        ),
+        "local_embedding_settings": LocalEmbeddingSettings.from_env_vars(),
+        "memory_settings": MemorySettings.from_env_vars(
+            spill_directory_path_default=Path(__file__).parent.absolute()
+            / "data"
+            / "output"
+            / "spill"
         ),
         "openai_settings": OpenaiSettings(
             openai_api_key=EnvVar("OPENAI_API_KEY").get_value("")
@@ -28,13 +59,8 @@ definitions = Definitions(
             / "data"
             / "output"
         ),
-        "retrieval_algorithm_parameters": RetrievalAlgorithmParameters(
-            distance_strategy=EnvVar("ETL_DISTANCE_STRATEGY").get_value(
-                default=DistanceStrategy.EUCLIDEAN_DISTANCE
-            ),
-            score_threshold=float(
-                str(EnvVar("ETL_SCORE_THRESHOLD").get_value(default=str(0.5)))
-            ),
-        ),
+        "retrieval_algorithm_parameters": RetrievalAlgorithmParameters.from_env_vars(),
+        "vector_store_settings": VectorStoreSettings.from_env_vars(),
+        "wikidata_settings": WikidataSettings.from_env_vars(),
     },
 )
@@ -0,0 +1,29 @@
+from typing import TYPE_CHECKING
+
+from .span import Span as Span  # isort:skip
+from .tracer import Tracer as Tracer  # isort:skip
+from .instrumentation import Instrumentation as Instrumentation  # isort:skip
+from .instrumented import instrumented as instrumented
+
+if TYPE_CHECKING:
+    from .http_call_recorder import HttpCallRecorder as HttpCallRecorder
+    from .instrumented_embeddings import (
+        InstrumentedEmbeddings as InstrumentedEmbeddings,
+    )
+
+
+def __getattr__(name: str) -> object:
+    # InstrumentedEmbeddings and HttpCallRecorder are imported when they are first accessed, as they import LangChain
+    # and httpx.
+    if name == "InstrumentedEmbeddings":
+        from .instrumented_embeddings import InstrumentedEmbeddings
+
+        return InstrumentedEmbeddings
+
+    if name == "HttpCallRecorder":
+        from .http_call_recorder import HttpCallRecorder
+
+        return HttpCallRecorder
+
+    message = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(message)
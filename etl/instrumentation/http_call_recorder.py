@@ -0,0 +1,114 @@
+from contextvars import ContextVar, Token
+from typing import Self
+
+import httpx
+
+
+class HttpCallRecorder:
+    """
+    Records the HTTP requests of one external call, that are sent with an httpx.Client of http_client().
+
+    Clients such as OpenAI's retry failed requests themselves, so a request that follows one that failed, or got no
+    response, is counted as a retry. The token usage that JSON responses report, as those of the OpenAI embeddings and chat
+    completions endpoints do, is added up.
+    A recorder records the requests that are sent in the context where it is entered, and a request sent while no
+    recorder is entered is not recorded.
+    """
+
+    def __init__(self) -> None:
+        self.__token: Token[HttpCallRecorder | None] | None = None
+        self.__request_count = 0
+        self.__retry_count = 0
+        self.__last_request_succeeded = False
+        self.__input_tokens = 0
+        self.__output_tokens = 0
+
+    def __enter__(self) -> Self:
+        self.__token = _current_http_call_recorder.set(self)
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
+        if self.__token is not None:
+            _current_http_call_recorder.reset(self.__token)
+            self.__token = None
+
+    @staticmethod
+    def http_client(**kwargs: object) -> httpx.Client:
+        """
+        Return an httpx.Client for the OpenAI client, with the OpenAI defaults and kwargs, whose requests and responses
+        are recorded on the HttpCallRecorder entered in their context.
+        """
+
+        from openai import DefaultHttpxClient
+
+        return DefaultHttpxClient(
+            event_hooks={
+                "request": [HttpCallRecorder.__on_request],
+                "response": [HttpCallRecorder.__on_response],
+            },
+            **kwargs,
+        )
+
+    @staticmethod
+    def __on_request(request: httpx.Request) -> None:
+        http_call_recorder = _current_http_call_recorder.get()
+        if http_call_recorder is not None:
+            http_call_recorder.record_request(request)
+
+    @staticmethod
+    def __on_response(response: httpx.Response) -> None:
+        http_call_recorder = _current_http_call_recorder.get()
+        if http_call_recorder is not None:
+            http_call_recorder.record_response(response)
+
+    def record_request(self, _request: httpx.Request) -> None:
+        """Record a request that is about to be sent, as a retry if the previous one did not succeed."""
+
+        if self.__request_count and not self.__last_request_succeeded:
+            self.__retry_count += 1
+        self.__request_count += 1
+        self.__last_request_succeeded = False
+
+    def record_response(self, response: httpx.Response) -> None:
+        """Record the response to the last request, and the token usage that it reports if it is successful JSON."""
+
+        self.__last_request_succeeded = not response.is_error
+        if response.is_error or not response.headers.get("content-type", "").startswith(
+            "application/json"
+        ):
+            return
+
+        response.read()
+        usage = response.json().get("usage") or {}
+        self.__input_tokens += usage.get("prompt_tokens", 0)
+        self.__output_tokens += usage.get("completion_tokens", 0)
+
+    @property
+    def request_count(self) -> int:
+        """The number of requests sent, retries included."""
+
+        return self.__request_count
+
+    @property
+    def retry_count(self) -> int:
+        """The number of requests sent again after a failed one."""
+
+        return self.__retry_count
+
+    @property
+    def input_tokens(self) -> int:
+        """The number of input tokens that the responses report."""
+
+        return self.__input_tokens
+
+    @property
+    def output_tokens(self) -> int:
+        """The number of output tokens that the responses report."""
+
+        return self.__output_tokens
+
+
+_current_http_call_recorder: ContextVar[HttpCallRecorder | None] = ContextVar(
+    "current_http_call_recorder", default=None
+)
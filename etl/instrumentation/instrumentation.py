@@ -0,0 +1,274 @@
+import bisect
+import functools
+import resource
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token, copy_context
+from typing import ParamSpec, Self, TypeVar
+
+from dagster import MetadataValue
+
+from etl.instrumentation.span import AttributeValue, Span
+from etl.instrumentation.tracer import Tracer
+
+ParamsT = ParamSpec("ParamsT")
+ResultT = TypeVar("ResultT")
+
+
+def _max_rss_bytes() -> int:
+    """Return the peak RSS of the process so far, in bytes."""
+
+    # ru_maxrss is in kilobytes on Linux, and in bytes on macOS.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (
+        1 if sys.platform == "darwin" else 1024
+    )
+
+
+class Instrumentation:
+    """
+    Performance measurements of one asset materialization.
+
+    An Instrumentation measures the wall time and CPU time of the code that runs while it is entered, and how much
+    it raised the peak RSS of the process, and collects the item counts, external call latencies and cache hit rates
+    that pipelines and stores record on Instrumentation.current(). metadata() returns them as Dagster materialization
+    metadata. The peak RSS increase is 0 when an earlier step of the same process peaked higher.
+
+    External call latencies are counted in a histogram of LATENCY_BUCKET_BOUNDS_MS buckets, so that memory stays
+    constant however many calls are made, and percentiles are reported as the upper bound of their bucket.
+    With a tracer, every external call is also recorded as a Span, under the Span of the asset.
+    Recording is thread-safe, and does nothing while no Instrumentation is entered.
+    The current Instrumentation is held per context, so that steps that run concurrently in threads record on their
+    own. Threads that a step starts record on it when they run functions wrapped by Instrumentation.propagated().
+    """
+
+    LATENCY_BUCKET_BOUNDS_MS = (
+        0.1,
+        0.2,
+        0.5,
+        1.0,
+        2.0,
+        5.0,
+        10.0,
+        20.0,
+        50.0,
+        100.0,
+        200.0,
+        500.0,
+        1000.0,
+        2000.0,
+        5000.0,
+        10000.0,
+        20000.0,
+        60000.0,
+        float("inf"),
+    )
+
+    def __init__(self, *, tracer: Tracer | None = None) -> None:
+        self.__tracer = tracer
+        self.__lock = threading.Lock()
+        self.__entered = False
+        self.__token: Token[Instrumentation | None] | None = None
+        self.__counts: Counter[str] = Counter()
+        self.__latency_histograms: dict[str, list[int]] = {}
+        self.__latency_sums_ms: Counter[str] = Counter()
+        self.__latency_maxima_ms: dict[str, float] = {}
+        self.__cache_hits: Counter[str] = Counter()
+        self.__cache_misses: Counter[str] = Counter()
+        self.__start_wall_time = 0.0
+        self.__start_cpu_time = 0.0
+        self.__start_max_rss_bytes = 0
+        self.__wall_time_seconds = 0.0
+        self.__cpu_time_seconds = 0.0
+        self.__peak_rss_increase_bytes = 0
+
+    def __enter__(self) -> Self:
+        self.__token = _current_instrumentation.set(self)
+        self.__entered = True
+        self.__start_wall_time = time.perf_counter()
+        self.__start_cpu_time = time.process_time()
+        self.__start_max_rss_bytes = _max_rss_bytes()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
+        self.__wall_time_seconds = time.perf_counter() - self.__start_wall_time
+        self.__cpu_time_seconds = time.process_time() - self.__start_cpu_time
+        self.__peak_rss_increase_bytes = _max_rss_bytes() - self.__start_max_rss_bytes
+        self.__entered = False
+        if self.__token is not None:
+            _current_instrumentation.reset(self.__token)
+            self.__token = None
+
+    @classmethod
+    def current(cls) -> "Instrumentation":
+        """
+        Return the Instrumentation that was entered last in the current context and not exited yet.
+
+        Without one, return an Instrumentation that is never entered, and so records nothing.
+        """
+
+        return _current_instrumentation.get() or _DISABLED_INSTRUMENTATION
+
+    @staticmethod
+    def propagated(
+        function: Callable[ParamsT, ResultT],
+    ) -> Callable[ParamsT, ResultT]:
+        """
+        Return a wrapper of function that runs it in a copy of the current context, e.g. in the workers of a
+        ThreadPoolExecutor, so that it records on the current Instrumentation.
+        """
+
+        context = copy_context()
+
+        @functools.wraps(function)
+        def wrapper(*args: ParamsT.args, **kwargs: ParamsT.kwargs) -> ResultT:
+            # A context can only be entered by one thread at a time.
+            return context.copy().run(function, *args, **kwargs)
+
+        return wrapper
+
+    def count(self, name: str, count: int = 1) -> None:
+        """Add count items to the counter called name."""
+
+        if not self.__entered:
+            return
+
+        with self.__lock:
+            self.__counts[name] += count
+
+    def counter(self, name: str) -> int:
+        """Return the number of items counted by the counter called name."""
+
+        with self.__lock:
+            return self.__counts[name]
+
+    @contextmanager
+    def span(
+        self, name: str, attributes: dict[str, AttributeValue] | None = None
+    ) -> Iterator[Span]:
+        """
+        Open a Span called name with attributes on the tracer for the duration of the with block, and yield it.
+
+        Without a tracer, or while the Instrumentation is not entered, the yielded Span is discarded.
+        """
+
+        if self.__tracer is None or not self.__entered:
+            yield Span(name=name, trace_id="", span_id="", attributes=attributes)
+            return
+
+        with self.__tracer.span(name, attributes) as span:
+            yield span
+
+    @contextmanager
+    def time_call(
+        self, name: str, attributes: dict[str, AttributeValue] | None = None
+    ) -> Iterator[Span]:
+        """
+        Record the latency of the external call called name that runs in the with block.
+
+        The call is traced as a Span with attributes, which is yielded so that the caller can add the attributes
+        of the call's response.
+        """
+
+        if not self.__entered:
+            yield Span(name=name, trace_id="", span_id="", attributes=attributes)
+            return
+
+        start = time.perf_counter()
+        try:
+            with self.span(name, attributes) as span:
+                yield span
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            with self.__lock:
+                histogram = self.__latency_histograms.setdefault(
+                    name, [0] * len(self.LATENCY_BUCKET_BOUNDS_MS)
+                )
+                histogram[
+                    bisect.bisect_left(self.LATENCY_BUCKET_BOUNDS_MS, latency_ms)
+                ] += 1
+                self.__latency_sums_ms[name] += latency_ms
+                self.__latency_maxima_ms[name] = max(
+                    self.__latency_maxima_ms.get(name, 0.0), latency_ms
+                )
+
+    def record_cache(self, name: str, *, hits: int, misses: int) -> None:
+        """Add hits and misses to the cache called name."""
+
+        if not self.__entered:
+            return
+
+        with self.__lock:
+            self.__cache_hits[name] += hits
+            self.__cache_misses[name] += misses
+
+    def __latency_percentile_ms(self, name: str, percentile: float) -> float:
+        """Return the upper bound of the histogram bucket of name that holds percentile, capped at the maximum latency."""
+
+        histogram = self.__latency_histograms[name]
+        rank = percentile / 100 * sum(histogram)
+        cumulative_count = 0
+
+        for bucket_bound_ms, bucket_count in zip(
+            self.LATENCY_BUCKET_BOUNDS_MS, histogram, strict=True
+        ):
+            cumulative_count += bucket_count
+            if cumulative_count >= rank:
+                return min(bucket_bound_ms, self.__latency_maxima_ms[name])
+
+        return self.__latency_maxima_ms[name]
+
+    def metadata(self) -> dict[str, object]:
+        """Return the measurements as Dagster materialization metadata."""
+
+        metadata: dict[str, object] = {
+            "wall_time_seconds": self.__wall_time_seconds,
+            "cpu_time_seconds": self.__cpu_time_seconds,
+            "peak_rss_increase_bytes": self.__peak_rss_increase_bytes,
+        }
+
+        with self.__lock:
+            for name, count in sorted(self.__counts.items()):
+                metadata[f"{name}_count"] = count
+
+            for name, histogram in sorted(self.__latency_histograms.items()):
+                calls = sum(histogram)
+                metadata[f"{name}_calls"] = calls
+                metadata[f"{name}_latency_mean_ms"] = (
+                    self.__latency_sums_ms[name] / calls
+                )
+                for percentile in (50, 90, 99):
+                    metadata[f"{name}_latency_p{percentile}_ms"] = (
+                        self.__latency_percentile_ms(name, percentile)
+                    )
+                metadata[f"{name}_latency_max_ms"] = self.__latency_maxima_ms[name]
+                metadata[f"{name}_latency_histogram"] = MetadataValue.json(
+                    {
+                        "bucket_bounds_ms": [
+                            str(bucket_bound_ms)
+                            for bucket_bound_ms in self.LATENCY_BUCKET_BOUNDS_MS
+                        ],
+                        "counts": histogram,
+                    }
+                )
+
+            for name in sorted(self.__cache_hits.keys() | self.__cache_misses.keys()):
+                lookups = self.__cache_hits[name] + self.__cache_misses[name]
+                metadata[f"{name}_cache_hits"] = self.__cache_hits[name]
+                metadata[f"{name}_cache_misses"] = self.__cache_misses[name]
+                metadata[f"{name}_cache_hit_rate"] = (
+                    self.__cache_hits[name] / lookups if lookups else 0.0
+                )
+
+        return metadata
+
+
+_current_instrumentation: ContextVar[Instrumentation | None] = ContextVar(
+    "current_instrumentation", default=None
+)
+_DISABLED_INSTRUMENTATION = Instrumentation()
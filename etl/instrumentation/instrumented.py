@@ -0,0 +1,62 @@
+from collections.abc import Callable
+from contextlib import nullcontext
+from functools import wraps
+from typing import ParamSpec, TypeVar
+
+from dagster import AssetExecutionContext, DagsterInvariantViolationError
+
+from etl.instrumentation import Instrumentation, Tracer
+
+ParamsT = ParamSpec("ParamsT")
+ResultT = TypeVar("ResultT")
+
+
+def instrumented(
+    asset_function: Callable[ParamsT, ResultT],
+) -> Callable[ParamsT, ResultT]:
+    """
+    Decorate an asset function to run it in an Instrumentation, and attach its measurements to the materialization.
+
+    Apply it below @asset. The measurements are added to the output metadata of the current asset execution context.
+    Outside a Dagster run, e.g. when an asset is invoked directly, the measurements are discarded.
+    When tracing is configured by environment variables, the asset is traced as a Span, under which the Spans of its
+    external calls nest. The Spans of the assets of a Dagster run share the trace of the run.
+    """
+
+    @wraps(asset_function)
+    def instrumented_asset_function(
+        *args: ParamsT.args, **kwargs: ParamsT.kwargs
+    ) -> ResultT:
+        try:
+            context: AssetExecutionContext | None = AssetExecutionContext.get()
+        except DagsterInvariantViolationError:
+            context = None
+        run_id = context.run.run_id if context else None
+
+        tracer = Tracer.from_env_vars(service_name="etl", trace_key=run_id)
+
+        with tracer or nullcontext(), Instrumentation(
+            tracer=tracer
+        ) as instrumentation, instrumentation.span(
+            (
+                context.asset_key.to_user_string()
+                if context
+                else asset_function.__name__
+            ),
+            {
+                "dagster.run_id": run_id or "",
+                "dagster.partition_key": (
+                    context.partition_key
+                    if context and context.has_partition_key
+                    else ""
+                ),
+            },
+        ):
+            result = asset_function(*args, **kwargs)
+
+        if context is not None:
+            context.add_output_metadata(instrumentation.metadata())
+
+        return result
+
+    return instrumented_asset_function
@@ -0,0 +1,72 @@
+from typing import override
+
+from langchain_core.embeddings import Embeddings
+
+from etl.instrumentation import Instrumentation
+from etl.instrumentation.http_call_recorder import HttpCallRecorder
+from etl.instrumentation.span import AttributeValue, Span
+
+
+class InstrumentedEmbeddings(Embeddings):
+    """
+    An Embeddings that wraps another Embeddings and records its calls on Instrumentation.current().
+
+    Every call is recorded as an external call called name, and traced with its model and batch size.
+    Calls that send HTTP requests through an HttpCallRecorder.http_client() are also traced with their number of
+    retries and the input tokens that the responses report.
+    The number of embedded texts is counted as "{name}_texts".
+    """
+
+    def __init__(self, embeddings: Embeddings, *, name: str) -> None:
+        self.__embeddings = embeddings
+        self.__name = name
+
+    def __getattr__(self, attribute_name: str) -> object:
+        return getattr(self.__embeddings, attribute_name)
+
+    def __attributes(self, batch_size: int) -> dict[str, AttributeValue]:
+        """Return the Span attributes of a call that embeds batch_size texts."""
+
+        return {
+            "gen_ai.request.model": str(getattr(self.__embeddings, "model", "")),
+            "gen_ai.request.batch_size": batch_size,
+        }
+
+    @staticmethod
+    def __set_http_call_attributes(
+        span: Span, http_call_recorder: HttpCallRecorder
+    ) -> None:
+        """Set the retries and the token usage of the HTTP requests of a call on its Span, if it sent any."""
+
+        if http_call_recorder.request_count:
+            span.set_attribute(
+                "http.request.resend_count", http_call_recorder.retry_count
+            ).set_attribute(
+                "gen_ai.usage.input_tokens", http_call_recorder.input_tokens
+            )
+
+    @override
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        instrumentation = Instrumentation.current()
+        instrumentation.count(f"{self.__name}_texts", len(texts))
+
+        with instrumentation.time_call(
+            self.__name, self.__attributes(len(texts))
+        ) as span, HttpCallRecorder() as http_call_recorder:
+            try:
+                return self.__embeddings.embed_documents(texts)
+            finally:
+                self.__set_http_call_attributes(span, http_call_recorder)
+
+    @override
+    def embed_query(self, text: str) -> list[float]:
+        instrumentation = Instrumentation.current()
+        instrumentation.count(f"{self.__name}_texts")
+
+        with instrumentation.time_call(
+            self.__name, self.__attributes(1)
+        ) as span, HttpCallRecorder() as http_call_recorder:
+            try:
+                return self.__embeddings.embed_query(text)
+            finally:
+                self.__set_http_call_attributes(span, http_call_recorder)
@@ -0,0 +1,150 @@
+import argparse
+import heapq
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+OTLP_STATUS_CODE_ERROR = 2
+
+
+def _attribute_value(otlp_value: dict[str, object]) -> object:
+    """Return the value of an OTLP AnyValue."""
+
+    if "intValue" in otlp_value:
+        return int(otlp_value["intValue"])  # type: ignore[call-overload]
+
+    return next(iter(otlp_value.values()), None)
+
+
+def read_spans(traces_file_path: Path) -> Iterator[dict[str, object]]:
+    """
+    Yield the spans of an OTLP JSON file, with one ExportTraceServiceRequest per line, as flat dictionaries.
+
+    Every span has its name, duration_ms, trace_id, span_id, parent_span_id, status ("ok" or "error") and
+    attributes.
+    """
+
+    with traces_file_path.open(encoding="utf-8") as traces_file:
+        for line in traces_file:
+            if not line.strip():
+                continue
+
+            for resource_spans in json.loads(line).get("resourceSpans", []):
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    for otlp_span in scope_spans.get("spans", []):
+                        yield {
+                            "name": otlp_span["name"],
+                            "duration_ms": (
+                                int(otlp_span["endTimeUnixNano"])
+                                - int(otlp_span["startTimeUnixNano"])
+                            )
+                            / 1_000_000,
+                            "trace_id": otlp_span["traceId"],
+                            "span_id": otlp_span["spanId"],
+                            "parent_span_id": otlp_span.get("parentSpanId"),
+                            "status": (
+                                "error"
+                                if otlp_span.get("status", {}).get("code")
+                                == OTLP_STATUS_CODE_ERROR
+                                else "ok"
+                            ),
+                            "attributes": {
+                                attribute["key"]: _attribute_value(attribute["value"])
+                                for attribute in otlp_span.get("attributes", [])
+                            },
+                        }
+
+
+def slowest_spans(
+    traces_file_path: Path, *, count: int = 20, include_assets: bool = False
+) -> dict[str, object]:
+    """
+    Return a report of the count slowest spans of an OTLP JSON file, and of the latency percentiles of every span name.
+
+    Every slow span is reported with the name of its parent span, i.e. the asset that made the call.
+    The spans of assets themselves are left out unless include_assets is set.
+    """
+
+    span_names: dict[str, str] = {}
+    durations_ms: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    candidate_spans: list[tuple[float, int, dict[str, object]]] = []
+
+    for span_index, span in enumerate(read_spans(traces_file_path)):
+        span_names[str(span["span_id"])] = str(span["name"])
+        if span["parent_span_id"] is None and not include_assets:
+            continue
+
+        name = str(span["name"])
+        durations_ms.setdefault(name, []).append(float(span["duration_ms"]))  # type: ignore[arg-type]
+        errors[name] = errors.get(name, 0) + (span["status"] == "error")
+
+        item = (float(span["duration_ms"]), span_index, span)  # type: ignore[arg-type]
+        if len(candidate_spans) < count:
+            heapq.heappush(candidate_spans, item)
+        else:
+            heapq.heappushpop(candidate_spans, item)
+
+    def percentile(sorted_durations_ms: list[float], percentile: float) -> float:
+        return sorted_durations_ms[
+            min(
+                len(sorted_durations_ms) - 1,
+                int(percentile / 100 * len(sorted_durations_ms)),
+            )
+        ]
+
+    span_name_statistics = {}
+    for name, name_durations_ms in sorted(durations_ms.items()):
+        name_durations_ms.sort()
+        span_name_statistics[name] = {
+            "calls": len(name_durations_ms),
+            "errors": errors[name],
+            "total_ms": sum(name_durations_ms),
+            **{
+                f"p{percentile_}_ms": percentile(name_durations_ms, percentile_)
+                for percentile_ in (50, 90, 99)
+            },
+            "max_ms": name_durations_ms[-1],
+        }
+
+    return {
+        "span_names": span_name_statistics,
+        "slowest_spans": [
+            {
+                **span,
+                "parent_name": span_names.get(str(span["parent_span_id"])),
+            }
+            for _, _, span in sorted(candidate_spans, reverse=True)
+        ],
+    }
+
+
+def main() -> None:
+    """Report the slowest spans of a traces file that ETL_TRACES_FILE_PATH pointed to, to find tail latencies."""
+
+    argument_parser = argparse.ArgumentParser(description=main.__doc__)
+    argument_parser.add_argument("traces_file_path", type=Path)
+    argument_parser.add_argument(
+        "-n", "--count", type=int, default=20, help="the number of spans to report"
+    )
+    argument_parser.add_argument(
+        "--include-assets",
+        action="store_true",
+        help="report the spans of assets too, not only of their external calls",
+    )
+    arguments = argument_parser.parse_args()
+
+    print(  # noqa: T201
+        json.dumps(
+            slowest_spans(
+                arguments.traces_file_path,
+                count=arguments.count,
+                include_assets=arguments.include_assets,
+            ),
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
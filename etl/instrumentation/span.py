@@ -0,0 +1,102 @@
+import time
+from typing import Self
+
+AttributeValue = str | bool | int | float
+
+
+class Span:
+    """
+    A timed operation of a trace, with attributes, that is exported in the OTLP JSON encoding.
+
+    trace_id is a 32-character and span_id a 16-character hexadecimal identifier. A Span without a
+    parent_span_id is the root of its trace. A Span is ended when end() is called, and its status is
+    "error" if set_error() was called, "ok" otherwise.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        name: str,
+        trace_id: str,
+        span_id: str,
+        parent_span_id: str | None = None,
+        attributes: dict[str, AttributeValue] | None = None,
+    ) -> None:
+        self.__name = name
+        self.__trace_id = trace_id
+        self.__span_id = span_id
+        self.__parent_span_id = parent_span_id
+        self.__attributes = dict(attributes or {})
+        self.__start_time_unix_nano = time.time_ns()
+        self.__end_time_unix_nano: int | None = None
+        self.__error_message: str | None = None
+
+    @staticmethod
+    def __to_otlp_value(value: AttributeValue) -> dict[str, object]:
+        """Return value as an OTLP AnyValue. Integers are strings, as the OTLP JSON encoding requires."""
+
+        match value:
+            case bool():
+                return {"boolValue": value}
+            case int():
+                return {"intValue": str(value)}
+            case float():
+                return {"doubleValue": value}
+            case _:
+                return {"stringValue": str(value)}
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def trace_id(self) -> str:
+        return self.__trace_id
+
+    @property
+    def span_id(self) -> str:
+        return self.__span_id
+
+    def set_attribute(self, key: str, value: AttributeValue) -> Self:
+        """Set the attribute key to value, and return the Span."""
+
+        self.__attributes[key] = value
+        return self
+
+    def set_error(self, message: str) -> Self:
+        """Mark the Span as failed with message, and return it."""
+
+        self.__error_message = message
+        return self
+
+    def end(self) -> None:
+        """End the Span now."""
+
+        self.__end_time_unix_nano = time.time_ns()
+
+    def to_otlp(self) -> dict[str, object]:
+        """Return the Span in the OTLP JSON encoding."""
+
+        otlp_span: dict[str, object] = {
+            "traceId": self.__trace_id,
+            "spanId": self.__span_id,
+            "name": self.__name,
+            # SPAN_KIND_INTERNAL for spans of assets, SPAN_KIND_CLIENT for spans of outbound requests.
+            "kind": 3 if self.__parent_span_id else 1,
+            "startTimeUnixNano": str(self.__start_time_unix_nano),
+            "endTimeUnixNano": str(self.__end_time_unix_nano or time.time_ns()),
+            "attributes": [
+                {"key": key, "value": self.__to_otlp_value(value)}
+                for key, value in self.__attributes.items()
+            ],
+            # STATUS_CODE_ERROR or STATUS_CODE_OK.
+            "status": (
+                {"code": 2, "message": self.__error_message}
+                if self.__error_message is not None
+                else {"code": 1}
+            ),
+        }
+        if self.__parent_span_id:
+            otlp_span["parentSpanId"] = self.__parent_span_id
+
+        return otlp_span
@@ -0,0 +1,192 @@
+import hashlib
+import json
+import logging
+import secrets
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Self
+from urllib.request import Request, urlopen
+
+from dagster import EnvVar
+
+from etl.instrumentation.span import AttributeValue, Span
+
+logger = logging.getLogger(__name__)
+
+
+class Tracer:
+    """
+    A tracer that records Spans and exports them in the OTLP JSON encoding.
+
+    Spans are exported to file_path, with one OTLP ExportTraceServiceRequest per line like the file exporter
+    of the OpenTelemetry Collector writes, and POSTed to the OTLP/HTTP endpoint of a collector, e.g.
+    http://localhost:4318/v1/traces. Ended spans are buffered and exported every max_buffered_spans spans and
+    on close(), by a background thread, so that exports do not delay the code being traced. Failed exports are
+    logged and dropped, so that tracing never fails the code being traced.
+
+    The parent of a new Span is the innermost Span open in the same context. Threads that start without one,
+    like the workers of a ThreadPoolExecutor, nest their Spans under the root Span of the tracer instead.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        service_name: str,
+        file_path: Path | None = None,
+        endpoint: str | None = None,
+        trace_id: str | None = None,
+        max_buffered_spans: int = 512,
+    ) -> None:
+        self.__service_name = service_name
+        self.__file_path = file_path
+        self.__endpoint = endpoint
+        self.__trace_id = trace_id or secrets.token_hex(16)
+        self.__max_buffered_spans = max_buffered_spans
+        self.__buffered_spans: list[Span] = []
+        self.__lock = threading.Lock()
+        # A single worker exports requests one at a time, in order.
+        self.__exporter = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="tracer_exporter"
+        )
+        self.__root_span: Span | None = None
+        self.__current_span: ContextVar[Span | None] = ContextVar(
+            "current_span", default=None
+        )
+
+        if file_path is not None:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
+        self.close()
+
+    @classmethod
+    def from_env_vars(
+        cls, *, service_name: str, trace_key: str | None = None
+    ) -> Self | None:
+        """
+        Return a Tracer that exports to ETL_TRACES_FILE_PATH and ETL_TRACES_ENDPOINT, or None if neither is set.
+
+        Tracers with the same trace_key, e.g. the assets of one Dagster run, record Spans of the same trace.
+        """
+
+        file_path = EnvVar("ETL_TRACES_FILE_PATH").get_value()
+        endpoint = EnvVar("ETL_TRACES_ENDPOINT").get_value()
+        if not file_path and not endpoint:
+            return None
+
+        return cls(
+            service_name=service_name,
+            file_path=Path(file_path) if file_path else None,
+            endpoint=endpoint or None,
+            trace_id=(
+                hashlib.md5(
+                    trace_key.encode("utf-8"), usedforsecurity=False
+                ).hexdigest()
+                if trace_key
+                else None
+            ),
+        )
+
+    def __export(self, spans: list[Span]) -> None:
+        """Export spans as one OTLP ExportTraceServiceRequest."""
+
+        request_json = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": [
+                                {
+                                    "key": "service.name",
+                                    "value": {"stringValue": self.__service_name},
+                                }
+                            ]
+                        },
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": "etl"},
+                                "spans": [span.to_otlp() for span in spans],
+                            }
+                        ],
+                    }
+                ]
+            }
+        )
+
+        try:
+            if self.__file_path is not None:
+                with self.__file_path.open(mode="a", encoding="utf-8") as traces_file:
+                    traces_file.write(request_json + "\n")
+
+            if self.__endpoint is not None:
+                with urlopen(  # noqa: S310
+                    Request(  # noqa: S310
+                        self.__endpoint,
+                        data=request_json.encode("utf-8"),
+                        headers={"Content-Type": "application/json"},
+                    ),
+                    timeout=10,
+                ):
+                    pass
+        except OSError:
+            logger.warning("Failed to export %d spans.", len(spans), exc_info=True)
+
+    @contextmanager
+    def span(
+        self, name: str, attributes: dict[str, AttributeValue] | None = None
+    ) -> Iterator[Span]:
+        """
+        Open a Span called name with attributes for the duration of the with block, and yield it.
+
+        The first Span opened on the tracer is its root Span. An exception raised in the with block marks
+        the Span as failed.
+        """
+
+        parent_span = self.__current_span.get() or self.__root_span
+        span = Span(
+            name=name,
+            trace_id=self.__trace_id,
+            span_id=secrets.token_hex(8),
+            parent_span_id=parent_span.span_id if parent_span is not None else None,
+            attributes=attributes,
+        )
+        if self.__root_span is None:
+            self.__root_span = span
+        token = self.__current_span.set(span)
+
+        try:
+            yield span
+        except BaseException as exception:
+            span.set_error(f"{type(exception).__name__}: {exception}")
+            raise
+        finally:
+            span.end()
+            self.__current_span.reset(token)
+
+            with self.__lock:
+                self.__buffered_spans.append(span)
+                spans = (
+                    self.__buffered_spans
+                    if len(self.__buffered_spans) >= self.__max_buffered_spans
+                    else None
+                )
+                if spans is not None:
+                    self.__buffered_spans = []
+            if spans is not None:
+                self.__exporter.submit(self.__export, spans)
+
+    def close(self) -> None:
+        """Export the buffered Spans, and wait for the exports in progress to end."""
+
+        with self.__lock:
+            spans, self.__buffered_spans = self.__buffered_spans, []
+        if spans:
+            self.__exporter.submit(self.__export, spans)
+        self.__exporter.shutdown(wait=True)
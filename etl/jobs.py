@@ -1,16 +1,76 @@
-from dagster import define_asset_job
+from dagster import AssetSelection, define_asset_job
 
 from .assets import (
+    arkg_settings,
+    documents_of_wikipedia_articles_with_summaries,
+    embedding_settings,
+    record_enrichment_settings,
+    record_partitions,
+    retrieval_settings,
+    serialization_settings,
     wikipedia_anti_recommendations,
+    wikipedia_arkg,
     wikipedia_arkg_assets,
+    wikipedia_arkg_stream_assets,
     wikipedia_articles_vector_store,
+    wikipedia_articles_with_summaries_json_file,
+    wikipedia_data_files,
+    wikipedia_wikidata_identifiers,
 )
 
-embedding_job = define_asset_job(
-    "embedding_job", selection=["*" + wikipedia_articles_vector_store.key.path[0]]
+documents_job = define_asset_job(
+    "documents_job",
+    selection=["*" + documents_of_wikipedia_articles_with_summaries.key.path[0]],
+    partitions_def=record_partitions.partitions_def,
 )
-retrieval_job = define_asset_job(
-    "retrieval_job",
-    selection=["*" + wikipedia_anti_recommendations.key.path[0]],
+
+if record_partitions.partitions_def is None:
+    embedding_job = define_asset_job(
+        "embedding_job", selection=["*" + wikipedia_articles_vector_store.key.path[0]]
+    )
+    retrieval_job = define_asset_job(
+        "retrieval_job",
+        selection=["*" + wikipedia_anti_recommendations.key.path[0]],
+    )
+else:
+    # A run materializes a single partition, so the fan-in assets that merge all partitions
+    # are materialized by their own jobs, once every partition of documents_job has been materialized.
+    embedding_job = define_asset_job(
+        "embedding_job",
+        selection=[
+            wikipedia_articles_with_summaries_json_file,
+            wikipedia_articles_vector_store,
+        ],
+    )
+    retrieval_job = define_asset_job(
+        "retrieval_job",
+        selection=[wikipedia_anti_recommendations],
+        partitions_def=record_partitions.partitions_def,
+    )
+
+arkg_job = define_asset_job(
+    "arkg_job", selection=[wikipedia_arkg, *wikipedia_arkg_assets]
+)
+arkg_stream_job = define_asset_job(
+    "arkg_stream_job",
+    selection=[wikipedia_wikidata_identifiers, *wikipedia_arkg_stream_assets],
+)
+
+# Observes the data files and settings that assets depend on, so that the assets whose inputs changed are
+# reported as unsynced, and only those are materialized by "Materialize unsynced".
+source_observation_job = define_asset_job(
+    "source_observation_job",
+    selection=AssetSelection.assets(
+        *(
+            source_asset.key
+            for source_asset in (
+                wikipedia_data_files,
+                record_enrichment_settings,
+                embedding_settings,
+                retrieval_settings,
+                arkg_settings,
+                serialization_settings,
+            )
+        )
+    ),
 )
-arkg_job = define_asset_job("arkg_job", selection=wikipedia_arkg_assets)
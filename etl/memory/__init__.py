@@ -0,0 +1,5 @@
+from .spilled_sequence import SpilledSequence as SpilledSequence  # isort:skip
+from .memory_budget import MemoryBudget as MemoryBudget
+from .memory_budget import MemoryBudgetExceededError as MemoryBudgetExceededError
+from .memory_budget import concatenate_sequences as concatenate_sequences
+from .memory_budget import resident_set_size as resident_set_size
@@ -0,0 +1,138 @@
+import resource
+import shutil
+import sys
+from collections.abc import Iterable, Sequence
+from itertools import chain
+from pathlib import Path
+from typing import TypeVar
+
+from etl.memory.spilled_sequence import SpilledSequence
+
+ItemT = TypeVar("ItemT")
+
+
+class MemoryBudgetExceededError(MemoryError):
+    """The RSS of the process exceeded its MemoryBudget."""
+
+
+def resident_set_size() -> int:
+    """Return the current RSS of the process in bytes, or its peak RSS where the current RSS is not available."""
+
+    try:
+        with Path("/proc/self/statm").open(encoding="utf-8") as statm_file:
+            return int(statm_file.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        # ru_maxrss is in kilobytes on Linux, and in bytes on macOS.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (
+            1 if sys.platform == "darwin" else 1024
+        )
+
+
+def concatenate_sequences(sequences: Iterable[Sequence[ItemT]]) -> Sequence[ItemT]:
+    """
+    Return the items of sequences, in order.
+
+    SpilledSequences are concatenated without reading their segments, and other sequences into a tuple.
+    """
+
+    sequences = tuple(sequences)
+    if sequences and all(
+        isinstance(sequence, SpilledSequence) for sequence in sequences
+    ):
+        return SpilledSequence.concatenate(sequences)  # type: ignore[arg-type]
+
+    return tuple(chain.from_iterable(sequences))
+
+
+class MemoryBudget:
+    """
+    A budget for the RSS of a process, that a stage keeps by spilling its outputs to disk.
+
+    collect() holds the items of an output in a tuple without a budget, and otherwise spills them to segment
+    files in spill_directory_path, of SEGMENT_BYTES_FRACTION of the budget, as a SpilledSequence that downstream
+    stages process one item at a time. The RSS is checked every CHECK_INTERVAL_ITEMS spilled items, and check()
+    raises a MemoryBudgetExceededError when it exceeds the budget, rather than let the process be killed by the OS.
+    Memory that a stage holds outside of the RSS of its process, e.g. in worker processes, or is about to load, is
+    reserved, and counted against the budget with the RSS.
+    """
+
+    SEGMENT_BYTES_FRACTION = 1 / 64
+    MIN_SEGMENT_BYTES = 1 << 20
+    CHECK_INTERVAL_ITEMS = 1024
+
+    def __init__(self, *, budget_bytes: int | None, spill_directory_path: Path) -> None:
+        self.__budget_bytes = budget_bytes
+        self.__spill_directory_path = spill_directory_path
+        self.__spill_count = 0
+        self.__reserved_bytes = 0
+
+    @property
+    def budget_bytes(self) -> int | None:
+        return self.__budget_bytes
+
+    @property
+    def segment_bytes(self) -> int:
+        """The size in bytes from which segment files are closed."""
+
+        return max(
+            int((self.__budget_bytes or 0) * self.SEGMENT_BYTES_FRACTION),
+            self.MIN_SEGMENT_BYTES,
+        )
+
+    def check(self) -> None:
+        """Raise a MemoryBudgetExceededError if the RSS of the process exceeds the budget."""
+
+        if self.__budget_bytes is None:
+            return
+
+        rss = resident_set_size()
+        if rss + self.__reserved_bytes > self.__budget_bytes:
+            message = (
+                f"the RSS of {rss} bytes and the {self.__reserved_bytes} reserved bytes exceed the memory budget "
+                f"of {self.__budget_bytes} bytes"
+            )
+            raise MemoryBudgetExceededError(message)
+
+    def reserve(self, size_bytes: int) -> None:
+        """
+        Count size_bytes against the budget, until they are released, and raise a MemoryBudgetExceededError if the
+        RSS of the process and the reserved bytes exceed it.
+        """
+
+        self.__reserved_bytes += size_bytes
+        self.check()
+
+    def release(self, size_bytes: int) -> None:
+        """Stop counting size_bytes reserved by reserve() against the budget, e.g. once they are part of the RSS."""
+
+        self.__reserved_bytes = max(self.__reserved_bytes - size_bytes, 0)
+
+    def collect(self, items: Iterable[ItemT]) -> Sequence[ItemT]:
+        """
+        Return the items as a tuple without a budget, and as a SpilledSequence otherwise.
+
+        Every call spills to its own subdirectory of spill_directory_path, which replaces the segments of a previous
+        MemoryBudget of the same spill_directory_path, e.g. of a retried step of the same run.
+        """
+
+        if self.__budget_bytes is None:
+            return tuple(items)
+
+        directory_path = self.__spill_directory_path / str(self.__spill_count)
+        self.__spill_count += 1
+        shutil.rmtree(directory_path, ignore_errors=True)
+
+        def checked_items() -> Iterable[ItemT]:
+            for item_index, item in enumerate(items):
+                if item_index % self.CHECK_INTERVAL_ITEMS == 0:
+                    self.check()
+                yield item
+
+        spilled_sequence: SpilledSequence[ItemT] = SpilledSequence.write(
+            checked_items(),
+            directory_path=directory_path,
+            segment_bytes=self.segment_bytes,
+        )
+        self.check()
+
+        return spilled_sequence
@@ -0,0 +1,158 @@
+import bisect
+import pickle
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import BinaryIO, Generic, Self, TypeVar, overload
+
+ItemT = TypeVar("ItemT")
+
+
+class SpilledSequence(Sequence[ItemT], Generic[ItemT]):
+    """
+    A read-only sequence whose items are spilled to segment files on disk, and read back as they are iterated.
+
+    A segment file holds the pickles of consecutive items, one after the other. Iterating reads one item at a
+    time, and indexing loads the segment of the item, so that only one segment is held in memory.
+    A SpilledSequence pickles as the paths and lengths of its segments, so that it is passed between the steps
+    of a run without its items, and the segment files must outlive the runs that read it.
+    """
+
+    def __init__(
+        self, *, segment_file_paths: Sequence[Path], segment_lengths: Sequence[int]
+    ) -> None:
+        if len(segment_file_paths) != len(segment_lengths):
+            message = "segment_file_paths and segment_lengths must have the same length"
+            raise ValueError(message)
+
+        self.__segment_file_paths = tuple(segment_file_paths)
+        self.__segment_lengths = tuple(segment_lengths)
+        self.__segment_ends = self.__cumulative_lengths(self.__segment_lengths)
+        self.__loaded_segment: tuple[int, list[ItemT]] | None = None
+
+    @staticmethod
+    def __cumulative_lengths(segment_lengths: Iterable[int]) -> tuple[int, ...]:
+        cumulative_lengths = []
+        cumulative_length = 0
+        for segment_length in segment_lengths:
+            cumulative_length += segment_length
+            cumulative_lengths.append(cumulative_length)
+
+        return tuple(cumulative_lengths)
+
+    @classmethod
+    def write(
+        cls, items: Iterable[ItemT], *, directory_path: Path, segment_bytes: int
+    ) -> Self:
+        """
+        Spill items to segment files of about segment_bytes in directory_path, and return their SpilledSequence.
+
+        Items are pickled one at a time, so that they need not fit in memory together.
+        """
+
+        directory_path.mkdir(parents=True, exist_ok=True)
+        segment_file_paths: list[Path] = []
+        segment_lengths: list[int] = []
+        segment_file: BinaryIO | None = None
+        segment_size = 0
+
+        try:
+            for item in items:
+                if segment_file is None:
+                    segment_file_paths.append(
+                        directory_path / f"segment_{len(segment_file_paths):06d}.pickle"
+                    )
+                    segment_lengths.append(0)
+                    segment_file = segment_file_paths[-1].open(mode="wb")
+                    segment_size = 0
+
+                segment_size += segment_file.write(
+                    pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+                )
+                segment_lengths[-1] += 1
+
+                if segment_size >= segment_bytes:
+                    segment_file.close()
+                    segment_file = None
+        finally:
+            if segment_file is not None:
+                segment_file.close()
+
+        return cls(
+            segment_file_paths=segment_file_paths, segment_lengths=segment_lengths
+        )
+
+    @classmethod
+    def concatenate(cls, spilled_sequences: Iterable["SpilledSequence[ItemT]"]) -> Self:
+        """Return a SpilledSequence of the segments of spilled_sequences, in order, without reading them."""
+
+        segment_file_paths: list[Path] = []
+        segment_lengths: list[int] = []
+        for spilled_sequence in spilled_sequences:
+            segment_file_paths.extend(spilled_sequence.segment_file_paths)
+            segment_lengths.extend(spilled_sequence.segment_lengths)
+
+        return cls(
+            segment_file_paths=segment_file_paths, segment_lengths=segment_lengths
+        )
+
+    @property
+    def segment_file_paths(self) -> tuple[Path, ...]:
+        return self.__segment_file_paths
+
+    @property
+    def segment_lengths(self) -> tuple[int, ...]:
+        return self.__segment_lengths
+
+    @staticmethod
+    def __read_segment(segment_file_path: Path) -> Iterator[ItemT]:
+        with segment_file_path.open(mode="rb") as segment_file:
+            while True:
+                try:
+                    yield pickle.load(segment_file)  # noqa: S301
+                except EOFError:
+                    return
+
+    def __iter__(self) -> Iterator[ItemT]:
+        for segment_file_path in self.__segment_file_paths:
+            yield from self.__read_segment(segment_file_path)
+
+    def __len__(self) -> int:
+        return self.__segment_ends[-1] if self.__segment_ends else 0
+
+    @overload
+    def __getitem__(self, index: int) -> ItemT: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[ItemT, ...]: ...
+
+    def __getitem__(self, index: int | slice) -> ItemT | tuple[ItemT, ...]:
+        if isinstance(index, slice):
+            return tuple(
+                self[item_index] for item_index in range(*index.indices(len(self)))
+            )
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            message = "SpilledSequence index out of range"
+            raise IndexError(message)
+
+        segment_index = bisect.bisect_right(self.__segment_ends, index)
+        if self.__loaded_segment is None or self.__loaded_segment[0] != segment_index:
+            self.__loaded_segment = (
+                segment_index,
+                list(self.__read_segment(self.__segment_file_paths[segment_index])),
+            )
+
+        return self.__loaded_segment[1][
+            index - (self.__segment_ends[segment_index - 1] if segment_index else 0)
+        ]
+
+    def __getstate__(self) -> tuple[tuple[Path, ...], tuple[int, ...]]:
+        return self.__segment_file_paths, self.__segment_lengths
+
+    def __setstate__(self, state: tuple[tuple[Path, ...], tuple[int, ...]]) -> None:
+        self.__init__(segment_file_paths=state[0], segment_lengths=state[1])  # type: ignore[misc]
+
+    def __repr__(self) -> str:
+        return f"SpilledSequence(length={len(self)}, segments={len(self.__segment_file_paths)})"
@@ -1,11 +1,36 @@
+from typing import TYPE_CHECKING
+
 from .record import Record as Record  # isort:skip
 from .anti_recommendation import AntiRecommendation as AntiRecommendation
 from .anti_recommendation_graph_tuple import (
     AntiRecommendationGraphTuple as AntiRecommendationGraphTuple,
 )
+from .arkg_store_descriptor import ArkgStoreDescriptor as ArkgStoreDescriptor
+from .compact_anti_recommendation_graphs import (
+    CompactAntiRecommendationGraphs as CompactAntiRecommendationGraphs,
+)
+from .default_data_file_names import (
+    DEFAULT_DATA_FILE_NAMES as DEFAULT_DATA_FILE_NAMES,
+)
+from .rdf_serializations import (
+    compressed_rdf_file_extensions as compressed_rdf_file_extensions,
+)
 from .rdf_serializations import rdf_serializations as rdf_serializations
 from .record_keys import RecordKeys as RecordKeys
 from .record_tuple import RecordTuple as RecordTuple
+from .vector_store_descriptor import VectorStoreDescriptor as VectorStoreDescriptor
 from .wikipedia_base_url import WIKIPEDIA_BASE_URL as WIKIPEDIA_BASE_URL
 
-from .document_tuple import DocumentTuple as DocumentTuple  # isort: skip
+if TYPE_CHECKING:
+    from .document_tuple import DocumentTuple as DocumentTuple
+
+
+def __getattr__(name: str) -> object:
+    # DocumentTuple is imported when it is first accessed, as it imports LangChain.
+    if name != "DocumentTuple":
+        message = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(message)
+
+    from .document_tuple import DocumentTuple
+
+    return DocumentTuple
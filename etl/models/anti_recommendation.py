@@ -1,8 +1,11 @@
-from typing import NamedTuple
+from __future__ import annotations
 
-from langchain.docstore.document import Document
+from typing import TYPE_CHECKING, NamedTuple
 
-from etl.models.types import AntiRecommendationKey
+if TYPE_CHECKING:
+    from langchain.docstore.document import Document
+
+    from etl.models.types import AntiRecommendationKey
 
 
 class AntiRecommendation(NamedTuple):
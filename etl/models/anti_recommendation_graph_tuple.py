@@ -1,21 +1,60 @@
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
+from typing import Self
 
+from etl.memory import SpilledSequence, concatenate_sequences
+from etl.models.compact_anti_recommendation_graphs import (
+    CompactAntiRecommendationGraphs,
+)
 from etl.models.types import AntiRecommendationKey, RecordKey
 
 
 @dataclass(frozen=True)
 class AntiRecommendationGraphTuple:
     """
-    A dataclass that holds a tuple of anti-recommendation graphs.
+    A dataclass that holds a sequence of anti-recommendation graphs.
 
     An anti-recommendation graph is defined by a (subject, objects) tuple structure.
     Subject is a Record key, and objects are keys of subject's anti-recommendations.
+    Instances are pickled in the form of CompactAntiRecommendationGraphs, unless their graphs are a SpilledSequence,
+    which is pickled as is.
     """
 
-    anti_recommendation_graphs: tuple[
+    anti_recommendation_graphs: Sequence[
         tuple[
             RecordKey,
             tuple[AntiRecommendationKey, ...],
-        ],
-        ...,
+        ]
     ]
+
+    @classmethod
+    def concatenate(cls, anti_recommendation_graph_tuples: Iterable[Self]) -> Self:
+        """Return an AntiRecommendationGraphTuple of the graphs of anti_recommendation_graph_tuples, in order."""
+
+        return cls(
+            anti_recommendation_graphs=concatenate_sequences(
+                anti_recommendation_graph_tuple.anti_recommendation_graphs
+                for anti_recommendation_graph_tuple in anti_recommendation_graph_tuples
+            )
+        )
+
+    def __getstate__(self) -> CompactAntiRecommendationGraphs | SpilledSequence:
+        if isinstance(self.anti_recommendation_graphs, SpilledSequence):
+            return self.anti_recommendation_graphs
+
+        return CompactAntiRecommendationGraphs.from_anti_recommendation_graphs(
+            self.anti_recommendation_graphs
+        )
+
+    def __setstate__(
+        self, state: CompactAntiRecommendationGraphs | SpilledSequence
+    ) -> None:
+        object.__setattr__(
+            self,
+            "anti_recommendation_graphs",
+            (
+                state
+                if isinstance(state, SpilledSequence)
+                else state.to_anti_recommendation_graphs()
+            ),
+        )
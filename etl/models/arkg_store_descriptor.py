@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(frozen=True)
+class ArkgStoreDescriptor:
+    """A dataclass that holds the Path of a directory that contains an ARKG."""
+
+    directory_path: Path
+
+    @property
+    def lookup_tables_directory_path(self) -> Path:
+        """The Path of the directory next to the ARKG that contains its ArkgLookupTables."""
+
+        return self.directory_path.with_name(
+            f"{self.directory_path.name}_lookup_tables"
+        )
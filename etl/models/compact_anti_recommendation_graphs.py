@@ -0,0 +1,191 @@
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import pairwise
+from pathlib import Path
+from typing import Self
+
+import numpy as np
+
+from etl.models.types import AntiRecommendationKey, RecordKey
+
+
+@dataclass(frozen=True, eq=False)
+class CompactAntiRecommendationGraphs:
+    """
+    A dataclass that holds anti-recommendation graphs in flat arrays.
+
+    Record keys and anti-recommendation keys are interned once, as UTF-8 bytes in key_data that are delimited by
+    key_offsets. Graph i has the subject record_key_indices[i] and the objects targets[offsets[i]:offsets[i + 1]],
+    all in int32 key indices. scores optionally holds a float32 score for each object.
+    Arrays are saved as .npy files that are memory-mapped on load.
+    The interned keys and the CSR tables of key_csr are shared with ArkgLookupTables.
+    """
+
+    key_data: np.ndarray
+    key_offsets: np.ndarray
+    record_key_indices: np.ndarray
+    offsets: np.ndarray
+    targets: np.ndarray
+    scores: np.ndarray | None = None
+
+    ARRAY_NAMES = (
+        "key_data",
+        "key_offsets",
+        "record_key_indices",
+        "offsets",
+        "targets",
+        "scores",
+    )
+
+    @classmethod
+    def from_anti_recommendation_graphs(
+        cls,
+        anti_recommendation_graphs: Iterable[
+            tuple[RecordKey, tuple[AntiRecommendationKey, ...]]
+        ],
+        *,
+        scores: Iterable[tuple[float, ...]] | None = None,
+    ) -> Self:
+        """
+        Return the compact form of anti_recommendation_graphs.
+
+        scores holds a tuple of scores for each graph, with one score for each of its anti-recommendation keys.
+        """
+
+        key_indices: dict[str, int] = {}
+        record_key_indices: list[int] = []
+        offsets = [0]
+        targets: list[int] = []
+
+        for record_key, anti_recommendation_keys in anti_recommendation_graphs:
+            record_key_indices.append(
+                key_indices.setdefault(record_key, len(key_indices))
+            )
+            targets.extend(
+                key_indices.setdefault(anti_recommendation_key, len(key_indices))
+                for anti_recommendation_key in anti_recommendation_keys
+            )
+            offsets.append(len(targets))
+
+        score_array = None
+        if scores is not None:
+            score_array = np.fromiter(
+                (score for graph_scores in scores for score in graph_scores),
+                dtype=np.float32,
+            )
+            if len(score_array) != len(targets):
+                message = f"expected {len(targets)} scores, got {len(score_array)}"
+                raise ValueError(message)
+
+        key_data, key_offsets = cls.encode_keys(key_indices)
+
+        return cls(
+            key_data=key_data,
+            key_offsets=key_offsets,
+            record_key_indices=np.array(record_key_indices, dtype=np.int32),
+            offsets=np.array(offsets, dtype=np.int32),
+            targets=np.array(targets, dtype=np.int32),
+            scores=score_array,
+        )
+
+    @staticmethod
+    def encode_keys(keys: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Return the key_data and key_offsets arrays of keys, in order."""
+
+        encoded_keys = [key.encode("utf-8") for key in keys]
+        key_offsets = np.zeros(len(encoded_keys) + 1, dtype=np.int64)
+        np.cumsum([len(key) for key in encoded_keys], out=key_offsets[1:])
+
+        return np.frombuffer(b"".join(encoded_keys), dtype=np.uint8), key_offsets
+
+    @staticmethod
+    def decode_keys(key_data: np.ndarray, key_offsets: np.ndarray) -> list[str]:
+        """Return the keys of the key_data and key_offsets arrays, in the order of their key indices."""
+
+        key_bytes = key_data.tobytes()
+
+        return [
+            key_bytes[start:end].decode("utf-8")
+            for start, end in pairwise(key_offsets.tolist())
+        ]
+
+    @classmethod
+    def load(cls, directory_path: Path) -> Self:
+        """Return the compact anti-recommendation graphs saved in directory_path, with their arrays memory-mapped."""
+
+        return cls(
+            **{
+                array_name: np.load(directory_path / f"{array_name}.npy", mmap_mode="r")
+                for array_name in cls.ARRAY_NAMES
+                if (directory_path / f"{array_name}.npy").exists()
+            }
+        )
+
+    def __len__(self) -> int:
+        return len(self.record_key_indices)
+
+    def __iter__(self) -> Iterator[tuple[RecordKey, tuple[AntiRecommendationKey, ...]]]:
+        keys = self.keys()
+        targets = self.targets.tolist()
+        offsets = self.offsets.tolist()
+
+        for graph_index, record_key_index in enumerate(
+            self.record_key_indices.tolist()
+        ):
+            yield keys[record_key_index], tuple(
+                keys[target]
+                for target in targets[offsets[graph_index] : offsets[graph_index + 1]]
+            )
+
+    def keys(self) -> list[str]:
+        """Return the interned keys, in the order of their key indices."""
+
+        return self.decode_keys(self.key_data, self.key_offsets)
+
+    def key_csr(self, *, reverse: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the CSR offsets and targets of the graphs over key indices.
+
+        The neighbors of key index i are targets[offsets[i]:offsets[i + 1]]: the anti-recommendation keys of Record key
+        i, in the order they were retrieved, or with reverse, the Record keys that anti-recommendation key i is an
+        anti-recommendation of.
+        """
+
+        keys_count = len(self.key_offsets) - 1
+        record_key_indices = np.repeat(self.record_key_indices, np.diff(self.offsets))
+        sources, targets = (
+            (self.targets, record_key_indices)
+            if reverse
+            else (record_key_indices, self.targets)
+        )
+
+        offsets = np.zeros(keys_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=keys_count), out=offsets[1:])
+
+        return offsets, targets[np.argsort(sources, kind="stable")]
+
+    def save(self, directory_path: Path) -> None:
+        """
+        Save the arrays to directory_path.
+
+        Every file is written next to its final path and then renamed over it, so that readers never see a partial file.
+        """
+
+        directory_path.mkdir(parents=True, exist_ok=True)
+
+        for array_name in self.ARRAY_NAMES:
+            array = getattr(self, array_name)
+            if array is None:
+                (directory_path / f"{array_name}.npy").unlink(missing_ok=True)
+                continue
+
+            temporary_file_path = directory_path / f"{array_name}.tmp.npy"
+            np.save(temporary_file_path, array)
+            temporary_file_path.replace(directory_path / f"{array_name}.npy")
+
+    def to_anti_recommendation_graphs(
+        self,
+    ) -> tuple[tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...]:
+        """Return the anti-recommendation graphs in their tuple form."""
+
+        return tuple(self)
@@ -0,0 +1,2 @@
+# A constant that holds the names of the data files that are read when ETL_DATA_FILE_NAMES is not set.
+DEFAULT_DATA_FILE_NAMES = ("mini-wikipedia.output.txt",)
@@ -1,38 +1,60 @@
-from __future__ import annotations
-
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import Self
 
 from langchain.docstore.document import Document
 
+from etl.memory import MemoryBudget, concatenate_sequences
 from etl.models import WIKIPEDIA_BASE_URL, Record
 
-if TYPE_CHECKING:
-    from collections.abc import Callable
-
 
 @dataclass(frozen=True)
 class DocumentTuple:
-    """A dataclass that holds a tuple of Documents."""
+    """
+    A dataclass that holds a sequence of Documents.
+
+    The sequence is a tuple, or a SpilledSequence when the Documents are spilled to disk under a memory budget.
+    """
 
-    documents: tuple[Document, ...]
+    documents: Sequence[Document]
 
     @classmethod
     def from_records(
-        cls, *, records: tuple[Record, ...], record_content: Callable[[Record], str]
-    ) -> DocumentTuple:
+        cls,
+        *,
+        records: Sequence[Record],
+        record_content: Callable[[Record], str],
+        memory_budget: MemoryBudget | None = None,
+    ) -> Self:
         """
         Convert Records into Documents and return an instance of DocumentTuple.
 
         Pass a Record into record_content and use the returned value as a Document's page_content.
+        With a memory_budget, the Documents are collected by it, one Record at a time.
         """
 
+        documents = (
+            Document(
+                page_content=record_content(record),
+                metadata={"source": WIKIPEDIA_BASE_URL + record.key},
+            )
+            for record in records
+        )
+
+        return cls(
+            documents=(
+                memory_budget.collect(documents)
+                if memory_budget is not None
+                else tuple(documents)
+            )
+        )
+
+    @classmethod
+    def concatenate(cls, document_tuples: Iterable[Self]) -> Self:
+        """Return a DocumentTuple of the Documents of document_tuples, in order."""
+
         return cls(
-            documents=tuple(
-                Document(
-                    page_content=record_content(record),
-                    metadata={"source": WIKIPEDIA_BASE_URL + record.key},
-                )
-                for record in records
+            documents=concatenate_sequences(
+                document_tuple.documents for document_tuple in document_tuples
             )
         )
@@ -1,4 +1,9 @@
-from etl.models.types import RdfFileExtension, RdfMimeType, RdfSerializationName
+from etl.models.types import (
+    CompressionFormat,
+    RdfFileExtension,
+    RdfMimeType,
+    RdfSerializationName,
+)
 
 """
 A frozenset containing a tuple of RDF serializations.
@@ -19,3 +24,11 @@ rdf_serializations: frozenset[
         ("rdf_xml", RdfMimeType.RDF_XML, ".rdf"),
     ]
 )
+
+"""
+A dict of the extensions that are appended to the file extension of a compressed RDF serialization.
+"""
+compressed_rdf_file_extensions: dict[CompressionFormat, RdfFileExtension] = {
+    CompressionFormat.GZIP: ".gz",
+    CompressionFormat.ZSTD: ".zst",
+}
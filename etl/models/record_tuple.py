@@ -1,10 +1,27 @@
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
+from typing import Self
 
+from etl.memory import concatenate_sequences
 from etl.models import Record
 
 
 @dataclass(frozen=True)
 class RecordTuple:
-    """A dataclass that holds a tuple of Records."""
+    """
+    A dataclass that holds a sequence of Records.
 
-    records: tuple[Record, ...]
+    The sequence is a tuple, or a SpilledSequence when the Records are spilled to disk under a memory budget.
+    """
+
+    records: Sequence[Record]
+
+    @classmethod
+    def concatenate(cls, record_tuples: Iterable[Self]) -> Self:
+        """Return a RecordTuple of the Records of record_tuples, in order."""
+
+        return cls(
+            records=concatenate_sequences(
+                record_tuple.records for record_tuple in record_tuples
+            )
+        )
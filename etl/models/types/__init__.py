@@ -1,7 +1,13 @@
 from .anti_recommendation_key import AntiRecommendationKey as AntiRecommendationKey
 from .api_key import ApiKey as ApiKey
+from .compressed_index_type import CompressedIndexType as CompressedIndexType
+from .compression_format import CompressionFormat as CompressionFormat
 from .data_file_name import DataFileName as DataFileName
+from .distance_strategy import DistanceStrategy as DistanceStrategy
 from .documents_limit import DocumentsLimit as DocumentsLimit
+from .local_embedding_model_name import (
+    LocalEmbeddingModelName as LocalEmbeddingModelName,
+)
 from .model_query import ModelQuery as ModelQuery
 from .model_response import ModelResponse as ModelResponse
 from .open_ai_embedding_model_name import (
@@ -10,6 +16,7 @@ from .open_ai_embedding_model_name import (
 from .open_ai_generative_model_name import (
     OpenAiGenerativeModelName as OpenAiGenerativeModelName,
 )
+from .partitioning_scheme import PartitioningScheme as PartitioningScheme
 from .rdf_file_extension import RdfFileExtension as RdfFileExtension
 from .rdf_mime_type import RdfMimeType as RdfMimeType
 from .rdf_serialization_name import RdfSerializationName as RdfSerializationName
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class CompressedIndexType(str, Enum):
+    """An enum of compressed vector index types that retrieve candidates for exact re-ranking."""
+
+    INT8 = "int8"
+    PQ = "pq"
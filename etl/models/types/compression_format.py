@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class CompressionFormat(str, Enum):
+    """An enum of compression formats for an ARKG serialization."""
+
+    GZIP = "gzip"
+    ZSTD = "zstd"
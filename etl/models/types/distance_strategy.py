@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class DistanceStrategy(str, Enum):
+    """
+    An enum of the distance strategies of a vector store.
+
+    The members have the values of LangChain's DistanceStrategy, and so compare equal to them, without importing
+    LangChain wherever a distance strategy is configured.
+    """
+
+    EUCLIDEAN_DISTANCE = "EUCLIDEAN_DISTANCE"
+    MAX_INNER_PRODUCT = "MAX_INNER_PRODUCT"
+    DOT_PRODUCT = "DOT_PRODUCT"
+    JACCARD = "JACCARD"
+    COSINE = "COSINE"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class LocalEmbeddingModelName(str, Enum):
+    """An enum of the names of embedding models that run locally, without network access."""
+
+    HASHED_TFIDF_SVD: str = "hashed-tfidf-svd"
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class PartitioningScheme(str, Enum):
+    """An enum of the schemes that split Records into static partitions."""
+
+    DATA_FILE = "data_file"
+    KEY_HASH = "key_hash"
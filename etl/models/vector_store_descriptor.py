@@ -0,0 +1,138 @@
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Self
+
+from etl.models.types import LocalEmbeddingModelName, OpenAiEmbeddingModelName
+
+COMPRESSED_INDEX_FILE_NAME = "index.compressed.faiss"
+VECTORS_FILE_NAME = "vectors.npy"
+
+
+@dataclass(frozen=True)
+class VectorStoreDescriptor:
+    """
+    A dataclass that holds data needed to load a vector store from local storage.
+
+    A VectorStoreDescriptor contains:
+        - directory_path: The Path of the directory that holds the vector store.
+        - cache_directory_path: The Path of the directory that holds cached vector embeddings.
+        - embedding_model_name: The name of the embedding model used to create the vector embeddings.
+        - shard_count: The number of shards that are searched in separate processes, or 1 for a single index.
+    """
+
+    directory_path: Path
+    cache_directory_path: Path
+    embedding_model_name: OpenAiEmbeddingModelName | LocalEmbeddingModelName
+    shard_count: int = 1
+
+    @property
+    def shards_directory_path(self) -> Path:
+        """The Path of the directory that holds the shard directories of a sharded vector store."""
+
+        return self.directory_path / "shards"
+
+    @property
+    def shard_directory_paths(self) -> tuple[Path, ...]:
+        """The Paths of the directories that hold the shards of a sharded vector store."""
+
+        return tuple(
+            self.shards_directory_path / str(shard_index)
+            for shard_index in range(self.shard_count)
+        )
+
+    def with_saved_shard_count(self) -> Self:
+        """
+        Return a copy of the descriptor whose shard_count is that of the vector store saved in directory_path:
+        the number of its shard directories, or 1 if it is not sharded.
+        """
+
+        shard_count = 0
+        while (self.shards_directory_path / str(shard_count) / "index.faiss").exists():
+            shard_count += 1
+
+        return replace(self, shard_count=max(shard_count, 1))
+
+    @property
+    def index_directory_paths(self) -> tuple[Path, ...]:
+        """The Paths of the directories that hold an index each: the shard directories, or directory_path."""
+
+        return (
+            self.shard_directory_paths
+            if self.shard_count > 1
+            else (self.directory_path,)
+        )
+
+    @property
+    def index_file_paths(self) -> tuple[Path, ...]:
+        """The Paths of the files that hold the index of the vector store."""
+
+        return tuple(
+            index_directory_path / index_file_name
+            for index_directory_path in self.index_directory_paths
+            for index_file_name in ("index.faiss", "index.pkl")
+        )
+
+    @property
+    def index_bytes(self) -> int:
+        """The size in bytes of the saved files of the index, about the memory that the index takes once loaded."""
+
+        return sum(
+            index_file_path.stat().st_size
+            for index_file_path in self.index_file_paths
+            if index_file_path.exists()
+        )
+
+    @property
+    def compressed_index_file_paths(self) -> tuple[Path, ...]:
+        """The Paths of the files that hold the compressed index of each index directory, for two-stage retrieval."""
+
+        return tuple(
+            index_directory_path / COMPRESSED_INDEX_FILE_NAME
+            for index_directory_path in self.index_directory_paths
+        )
+
+    @property
+    def vectors_file_paths(self) -> tuple[Path, ...]:
+        """The Paths of the NumPy files that hold the full-precision vectors of each index directory, for two-stage retrieval."""
+
+        return tuple(
+            index_directory_path / VECTORS_FILE_NAME
+            for index_directory_path in self.index_directory_paths
+        )
+
+    @property
+    def has_compressed_index(self) -> bool:
+        """Whether a compressed index and full-precision vectors are saved in every index directory."""
+
+        return all(
+            file_path.exists()
+            for file_path in (
+                *self.compressed_index_file_paths,
+                *self.vectors_file_paths,
+            )
+        )
+
+    @property
+    def local_embedding_model_file_path(self) -> Path:
+        """The Path of the NumPy file that holds the local embedding model that the vector embeddings were created with."""
+
+        return self.directory_path / "local_embedding_model.npz"
+
+    @property
+    def index_version_file_path(self) -> Path:
+        """The Path of the file that holds the version of the index saved in directory_path."""
+
+        return self.directory_path / "index.version"
+
+    @property
+    def index_version(self) -> str | None:
+        """
+        The version of the index saved in directory_path.
+
+        The version is a content hash of the index files, and is None if no index has been saved.
+        """
+
+        if not self.index_version_file_path.exists():
+            return None
+
+        return self.index_version_file_path.read_text(encoding="utf-8").strip()
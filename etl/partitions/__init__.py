@@ -0,0 +1,2 @@
+from .merge_partitions import merge_partitions as merge_partitions
+from .record_partitions import RecordPartitions as RecordPartitions
@@ -0,0 +1,23 @@
+from collections.abc import Callable, Iterable, Mapping
+from typing import TypeVar
+
+ValueT = TypeVar("ValueT")
+
+
+def merge_partitions(
+    partitions: ValueT | Mapping[str, ValueT],
+    *,
+    merge: Callable[[Iterable[ValueT]], ValueT],
+) -> ValueT:
+    """
+    Merge the per-partition values of a partitioned upstream asset into one value.
+
+    A fan-in asset receives a mapping from partition keys to values when its upstream asset is partitioned,
+    and the value itself otherwise. Values are merged in the order of their partition keys, so that the merged
+    value does not depend on the order the partitions were materialized in.
+    """
+
+    if not isinstance(partitions, Mapping):
+        return partitions
+
+    return merge(partitions[partition_key] for partition_key in sorted(partitions))
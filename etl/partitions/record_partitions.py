@@ -0,0 +1,143 @@
+import json
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Self
+
+from dagster import EnvVar, StaticPartitionsDefinition
+
+from etl.models import Record
+from etl.models.types import DataFileName, PartitioningScheme, RecordKey
+from etl.resources import InputConfig
+
+
+class RecordPartitions:
+    """
+    Static partitions of the Records that are read from storage.
+
+    With the DATA_FILE scheme, every data file is a partition, keyed by its name.
+    With the KEY_HASH scheme, every data file is read by every partition, and a Record belongs to the shard
+    of the CRC-32 of its key, modulo shard_count. Shards are keyed "shard_000", "shard_001", etc.
+    KEY_HASH balances shards whatever the sizes of the data files, at the cost of reading every data file shard_count
+    times, so DATA_FILE is preferable when the data files are of similar sizes.
+    Without a scheme, Records are not partitioned.
+    """
+
+    SHARD_KEY_PREFIX = "shard_"
+
+    def __init__(
+        self,
+        *,
+        partitioning_scheme: PartitioningScheme | None,
+        data_file_names: tuple[DataFileName, ...],
+        shard_count: int,
+    ) -> None:
+        if shard_count < 1:
+            message = f"shard_count must be positive, got {shard_count}"
+            raise ValueError(message)
+
+        self.__partitioning_scheme = partitioning_scheme
+        self.__data_file_names = data_file_names
+        self.__shard_count = shard_count
+
+    @classmethod
+    def from_env_vars(
+        cls, *, data_file_names_default: tuple[DataFileName, ...]
+    ) -> Self:
+        """
+        Return a RecordPartitions object, with its scheme obtained from environment variables.
+
+        Partitions are defined when assets are loaded, so the data file names are read from ETL_DATA_FILE_NAMES,
+        like the InputConfig resource does.
+        """
+
+        partitioning_scheme = EnvVar("ETL_PARTITIONING_SCHEME").get_value()
+
+        return cls(
+            partitioning_scheme=(
+                PartitioningScheme(partitioning_scheme) if partitioning_scheme else None
+            ),
+            data_file_names=tuple(
+                json.loads(
+                    str(
+                        EnvVar("ETL_DATA_FILE_NAMES").get_value(
+                            json.dumps(list(data_file_names_default))
+                        )
+                    )
+                )
+            ),
+            shard_count=int(str(EnvVar("ETL_SHARD_COUNT").get_value(default="8"))),
+        )
+
+    @property
+    def partitions_def(self) -> StaticPartitionsDefinition | None:
+        """Return the definition of the partitions, or None if Records are not partitioned."""
+
+        match self.__partitioning_scheme:
+            case PartitioningScheme.DATA_FILE:
+                return StaticPartitionsDefinition(list(self.__data_file_names))
+            case PartitioningScheme.KEY_HASH:
+                return StaticPartitionsDefinition(
+                    [
+                        self.__shard_key(shard_index)
+                        for shard_index in range(self.__shard_count)
+                    ]
+                )
+            case _:
+                return None
+
+    def __shard_key(self, shard_index: int) -> str:
+        return f"{self.SHARD_KEY_PREFIX}{shard_index:03d}"
+
+    def shard_key(self, record_key: RecordKey) -> str:
+        """Return the key of the shard that record_key belongs to under the KEY_HASH scheme."""
+
+        return self.__shard_key(
+            zlib.crc32(record_key.encode("utf-8")) % self.__shard_count
+        )
+
+    def data_file_paths(
+        self, parsed_input_config: InputConfig.Parsed, partition_key: str | None
+    ) -> frozenset[Path]:
+        """Return the paths of the data files that the partition with partition_key is read from."""
+
+        if (
+            partition_key is not None
+            and self.__partitioning_scheme == PartitioningScheme.DATA_FILE
+        ):
+            return frozenset([parsed_input_config.data_directory_path / partition_key])
+
+        return parsed_input_config.data_file_paths
+
+    def data_file_paths_by_partition(
+        self, parsed_input_config: InputConfig.Parsed
+    ) -> dict[str, frozenset[Path]]:
+        """
+        Return the paths of the data files that every partition is read from, by partition key.
+
+        Without a scheme, there are no partitions, and the dict is empty.
+        """
+
+        if self.partitions_def is None:
+            return {}
+
+        return {
+            partition_key: self.data_file_paths(parsed_input_config, partition_key)
+            for partition_key in self.partitions_def.get_partition_keys()
+        }
+
+    def partition_records(
+        self, records: Iterable[Record], partition_key: str | None
+    ) -> Iterator[Record]:
+        """Yield the records that belong to the partition with partition_key."""
+
+        if (
+            partition_key is None
+            or self.__partitioning_scheme != PartitioningScheme.KEY_HASH
+        ):
+            yield from records
+            return
+
+        for record in records:
+            if self.shard_key(record.key) == partition_key:
+                yield record
@@ -1,18 +1,48 @@
-from .arkg_builder_pipeline import (
-    ArkgBuilderPipeline as ArkgBuilderPipeline,
-)  # isort:skip
-from .embedding_pipeline import EmbeddingPipeline as EmbeddingPipeline
-from .openai_embedding_pipeline import (
-    OpenaiEmbeddingPipeline as OpenaiEmbeddingPipeline,
-)
-from .record_enrichment_pipeline import (
-    RecordEnrichmentPipeline as RecordEnrichmentPipeline,
-)
-from .retrieval_pipeline import RetrievalPipeline as RetrievalPipeline
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from .anti_recommendation_retrieval_pipeline import (  # isort:skip
-    AntiRecommendationRetrievalPipeline as AntiRecommendationRetrievalPipeline,
-)
-from .openai_record_enrichment_pipeline import (  # isort:skip
-    OpenaiRecordEnrichmentPipeline as OpenaiRecordEnrichmentPipeline,
-)
+if TYPE_CHECKING:
+    from .anti_recommendation_retrieval_pipeline import (
+        AntiRecommendationRetrievalPipeline as AntiRecommendationRetrievalPipeline,
+    )
+    from .arkg_builder_pipeline import ArkgBuilderPipeline as ArkgBuilderPipeline
+    from .embedding_pipeline import EmbeddingPipeline as EmbeddingPipeline
+    from .hashed_tfidf_svd_embeddings import (
+        HashedTfidfSvdEmbeddings as HashedTfidfSvdEmbeddings,
+    )
+    from .local_embedding_pipeline import (
+        LocalEmbeddingPipeline as LocalEmbeddingPipeline,
+    )
+    from .openai_embedding_pipeline import (
+        OpenaiEmbeddingPipeline as OpenaiEmbeddingPipeline,
+    )
+    from .openai_record_enrichment_pipeline import (
+        OpenaiRecordEnrichmentPipeline as OpenaiRecordEnrichmentPipeline,
+    )
+    from .record_enrichment_pipeline import (
+        RecordEnrichmentPipeline as RecordEnrichmentPipeline,
+    )
+    from .retrieval_pipeline import RetrievalPipeline as RetrievalPipeline
+
+# Pipelines are imported when they are first accessed, so that importing one pipeline does not import the
+# dependencies of the others, e.g. LangChain and the OpenAI client for the ARKG assets.
+_PIPELINE_MODULE_NAMES = {
+    "AntiRecommendationRetrievalPipeline": "anti_recommendation_retrieval_pipeline",
+    "ArkgBuilderPipeline": "arkg_builder_pipeline",
+    "EmbeddingPipeline": "embedding_pipeline",
+    "HashedTfidfSvdEmbeddings": "hashed_tfidf_svd_embeddings",
+    "LocalEmbeddingPipeline": "local_embedding_pipeline",
+    "OpenaiEmbeddingPipeline": "openai_embedding_pipeline",
+    "OpenaiRecordEnrichmentPipeline": "openai_record_enrichment_pipeline",
+    "RecordEnrichmentPipeline": "record_enrichment_pipeline",
+    "RetrievalPipeline": "retrieval_pipeline",
+}
+
+
+def __getattr__(name: str) -> object:
+    module_name = _PIPELINE_MODULE_NAMES.get(name)
+    if module_name is None:
+        message = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(message)
+
+    return getattr(import_module(f"{__name__}.{module_name}"), name)
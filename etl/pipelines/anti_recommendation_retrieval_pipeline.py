@@ -1,3 +1,10 @@
+import hashlib
+import json
+from typing import override
+
+from langchain.docstore.document import Document
+
+from etl.instrumentation import Instrumentation
 from etl.models import WIKIPEDIA_BASE_URL, AntiRecommendation, RecordKeys
 from etl.models.types import DocumentsLimit, ModelQuery, RecordKey
 from etl.pipelines import RetrievalPipeline
@@ -12,6 +19,8 @@ class AntiRecommendationRetrievalPipeline(RetrievalPipeline):
     Retrieves anti-recommendations of a Record key using Documents stored in a VectorStore.
     """
 
+    QUERY_TEMPLATE = "What are {k} Wikipedia articles that are dissimilar but surprisingly similar to the Wikipedia article {record}"
+
     def __init__(
         self,
         *,
@@ -29,8 +38,91 @@ class AntiRecommendationRetrievalPipeline(RetrievalPipeline):
     ) -> ModelQuery:
         """Return a query for the retrieval algorithm."""
 
-        return f"What are {k} Wikipedia articles that are dissimilar but surprisingly similar to the Wikipedia article {RecordKeys.to_prompt_friendly(record_key)}"
+        return self.QUERY_TEMPLATE.format(
+            k=k, record=RecordKeys.to_prompt_friendly(record_key)
+        )
+
+    def __to_anti_recommendations(
+        self, documents_and_similarity_scores: tuple[tuple[Document, float], ...]
+    ) -> tuple[AntiRecommendation, ...]:
+        """Return a tuple of AntiRecommendations built from (Document, similarity score) tuples."""
 
+        return tuple(
+            AntiRecommendation(
+                key=document_and_similarity_score_tuple[0].metadata["source"][
+                    len(WIKIPEDIA_BASE_URL) :
+                ],
+                document=document_and_similarity_score_tuple[0],
+                similarity_score=document_and_similarity_score_tuple[1],
+            )
+            for document_and_similarity_score_tuple in documents_and_similarity_scores
+        )
+
+    def __search_batch(
+        self, *, queries: tuple[ModelQuery, ...], k: DocumentsLimit
+    ) -> tuple[tuple[tuple[Document, float], ...], ...]:
+        """
+        Return the (Document, similarity score) tuples of each query in queries.
+
+        When mmr_lambda_mult is set, the Documents are re-ranked for diversity with maximal marginal relevance.
+        """
+
+        parameters = self.__retrieval_algorithm_parameters
+        instrumentation = Instrumentation.current()
+        instrumentation.count("vector_store_queries", len(queries))
+
+        with instrumentation.time_call(
+            "vector_store_search",
+            {
+                "vector_store.queries": len(queries),
+                "vector_store.k": k,
+                "vector_store.mmr": parameters.mmr_lambda_mult is not None,
+            },
+        ):
+            if parameters.mmr_lambda_mult is None:
+                return self.__vector_store.similarity_search_with_score_batch(
+                    queries=queries,
+                    k=k,
+                    score_threshold=parameters.score_threshold,
+                    rerank_oversampling_factor=parameters.rerank_oversampling_factor,
+                )
+
+            return self.__vector_store.max_marginal_relevance_search_with_score_batch(
+                queries=queries,
+                k=k,
+                fetch_k=k * parameters.mmr_fetch_k_factor,
+                lambda_mult=parameters.mmr_lambda_mult,
+                score_threshold=parameters.score_threshold,
+                rerank_oversampling_factor=parameters.rerank_oversampling_factor,
+            )
+
+    def retrieval_fingerprint(self, *, k: DocumentsLimit) -> str | None:
+        """
+        Return a hash of everything that determines the anti-recommendations of a Record key, besides the key itself.
+
+        The fingerprint covers the index version of the VectorStore, the retrieval algorithm parameters, k and the query template.
+        Return None if the VectorStore has no published index version.
+        """
+
+        index_version = self.__vector_store.descriptor.index_version
+        if index_version is None:
+            return None
+
+        return hashlib.sha256(
+            json.dumps(
+                {
+                    "index_version": index_version,
+                    "retrieval_algorithm_parameters": self.__retrieval_algorithm_parameters.model_dump(
+                        mode="json"
+                    ),
+                    "k": k,
+                    "query_template": self.QUERY_TEMPLATE,
+                },
+                sort_keys=True,
+            ).encode("utf-8")
+        ).hexdigest()
+
+    @override
     def retrieve_documents(
         self,
         *,
@@ -42,21 +134,47 @@ class AntiRecommendationRetrievalPipeline(RetrievalPipeline):
 
         k is the number of Documents to retrieve.
         """
-        return tuple(
-            AntiRecommendation(
-                key=document_and_similarity_score_tuple[0].metadata["source"][
-                    len(WIKIPEDIA_BASE_URL) :
-                ],
-                document=document_and_similarity_score_tuple[0],
-                similarity_score=document_and_similarity_score_tuple[1],
+
+        query = self.__create_query(
+            record_key=record_key,
+            k=k,
+        )
+
+        if self.__retrieval_algorithm_parameters.mmr_lambda_mult is not None:
+            return self.__to_anti_recommendations(
+                self.__search_batch(queries=(query,), k=k)[0]
             )
-            for document_and_similarity_score_tuple in self.__vector_store.similarity_search_with_score(
-                query=self.__create_query(
-                    record_key=record_key,
-                    k=k,
-                ),
+
+        return self.__to_anti_recommendations(
+            self.__vector_store.similarity_search_with_score(
+                query=query,
                 k=k,
                 score_threshold=self.__retrieval_algorithm_parameters.score_threshold,
                 distance_strategy=self.__retrieval_algorithm_parameters.distance_strategy,
+                rerank_oversampling_factor=self.__retrieval_algorithm_parameters.rerank_oversampling_factor,
+            )
+        )
+
+    @override
+    def retrieve_documents_batch(
+        self,
+        *,
+        record_keys: tuple[RecordKey, ...],
+        k: DocumentsLimit,
+    ) -> tuple[tuple[AntiRecommendation, ...], ...]:
+        """
+        Return a tuple that contains the anti-recommendations of each key in record_keys.
+
+        The queries of all record_keys are embedded, searched and re-ranked as one batch.
+        k is the number of Documents to retrieve for each key.
+        """
+        return tuple(
+            self.__to_anti_recommendations(documents_and_similarity_scores)
+            for documents_and_similarity_scores in self.__search_batch(
+                queries=tuple(
+                    self.__create_query(record_key=record_key, k=k)
+                    for record_key in record_keys
+                ),
+                k=k,
             )
         )
@@ -1,125 +1,326 @@
+import logging
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched
 from pathlib import Path
+from typing import cast
 
 from pyoxigraph import Literal, NamedNode, Quad, Store
+from requests.adapters import HTTPAdapter, Retry
 from requests_cache import CachedSession
 
-from etl.models.types import AntiRecommendationKey, RecordKey
+from etl.instrumentation import Instrumentation
+from etl.models.types import AntiRecommendationKey, RdfMimeType, RecordKey
 from etl.namespaces import ARKG, RDF, SCHEMA, WD
+from etl.resources import CompressionSettings
+from etl.stores.wikidata_identifier_store import WikidataIdentifierStore
+from etl.writers import RdfStreamWriter
+
+logger = logging.getLogger(__name__)
 
 
 class ArkgBuilderPipeline:
     """
     A pipeline to build Anti-Recommendation Knowledge Graphs.
 
-    Constructs a RDF Store from a tuple of anti-recommendation graphs.
+    Constructs a RDF Store from a tuple of anti-recommendation graphs, or writes them straight to an RDF serialization.
+
+    Wikidata identifiers of Record keys are looked up in wikidata_identifier_store first.
+    The rest are resolved with the MediaWiki API at mediawiki_api_url, with up to max_titles_per_request titles in each
+    request and up to max_concurrent_requests requests in flight, and added to wikidata_identifier_store. Requests that
+    fail to connect or with a 429 or 5xx status are retried up to max_retries times, with exponential backoff.
+    A mediawiki_api_url of None builds the ARKG offline, from wikidata_identifier_store alone.
     """
 
-    def __init__(
-        self, *, arkg_store_directory_path: Path, requests_cache_directory_path: Path
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        arkg_store_directory_path: Path,
+        requests_cache_directory_path: Path,
+        wikidata_identifier_store: WikidataIdentifierStore | None = None,
+        mediawiki_api_url: str | None = "https://en.wikipedia.org/w/api.php",
+        max_titles_per_request: int = 50,
+        max_concurrent_requests: int = 8,
+        max_retries: int = 3,
     ) -> None:
-        arkg_store_directory_path.mkdir(exist_ok=True, parents=True)
         requests_cache_directory_path.mkdir(parents=True, exist_ok=True)
-        self.__arkg_store = Store(arkg_store_directory_path)
+        self.__arkg_store_directory_path = arkg_store_directory_path
+        self.__wikidata_identifier_store = wikidata_identifier_store
+        self.__mediawiki_api_url = mediawiki_api_url
+        self.__max_titles_per_request = max_titles_per_request
+        self.__max_concurrent_requests = max_concurrent_requests
+        # Steps that run concurrently share the cache, so it waits for their locks.
         self.__cached_session = CachedSession(
             cache_name=requests_cache_directory_path / "wikidata_identifiers",
             expire_after=3600,
+            busy_timeout=60_000,
+            wal=True,
+        )
+        # Cached responses carry no retry history, so only requests sent to the MediaWiki API report resends.
+        http_adapter = HTTPAdapter(
+            pool_maxsize=max_concurrent_requests,
+            max_retries=Retry(
+                total=max_retries,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
         )
+        self.__cached_session.mount("http://", http_adapter)
+        self.__cached_session.mount("https://", http_adapter)
 
-    def __add_anti_recommendation_quads_to_store(
-        self,
-        *,
-        anti_recommendation_keys: tuple[AntiRecommendationKey, ...],
-        item_reviewed: NamedNode,
-    ) -> None:
+    def __get_wikidata_identifiers(
+        self, titles: tuple[RecordKey, ...]
+    ) -> dict[RecordKey, str]:
         """
-        Add `anti-recommendation` Quads to the RDF Store.
+        Return the Wikidata identifiers of titles, fetched with one MediaWiki API request.
 
-        `item_reviewed` is the IRI of the item that is being anti-recommended.
-
-        Each anti_recommendation_key has 2 Quad expressions in this method:
-        - a `type` Quad that expresses the type of Review the anti_recommendation_key belongs to.
-        - an `item-reviewed` Quad that relates the anti_recommendation_key to the item that is being anti-recommended.
+        Titles are mapped through the normalizations and redirects reported by the API.
+        Titles of missing pages, or of pages without a `wikibase_item`, are left out.
         """
-        for anti_recommendation_key in anti_recommendation_keys:
 
-            anti_recommendation_iri = ARKG.anti_recommendation_iri(
-                record_key=anti_recommendation_key
-            )
+        instrumentation = Instrumentation.current()
 
-            self.__arkg_store.add(
-                Quad(
-                    anti_recommendation_iri,
-                    RDF.TYPE,
-                    SCHEMA.RECOMMENDATION,
-                )
+        with instrumentation.time_call(
+            "mediawiki_api",
+            {
+                "http.request.method": "GET",
+                "server.address": cast(str, self.__mediawiki_api_url),
+                "mediawiki.titles": len(titles),
+            },
+        ) as span:
+            response = self.__cached_session.get(
+                cast(str, self.__mediawiki_api_url),
+                params={
+                    "action": "query",
+                    "prop": "pageprops",
+                    "ppprop": "wikibase_item",
+                    "redirects": "1",
+                    "titles": "|".join(titles),
+                    "format": "json",
+                    "formatversion": "2",
+                },
             )
-            self.__arkg_store.add(
-                Quad(
-                    anti_recommendation_iri,
-                    SCHEMA.ITEM_REVIEWED,
-                    item_reviewed,
-                )
+            span.set_attribute(
+                "http.response.status_code", response.status_code
+            ).set_attribute(
+                "http.request.resend_count",
+                len(getattr(getattr(response.raw, "retries", None), "history", ())),
+            ).set_attribute(
+                "http.from_cache", response.from_cache
             )
+        instrumentation.record_cache(
+            "mediawiki_api_requests",
+            hits=int(response.from_cache),
+            misses=int(not response.from_cache),
+        )
+        response.raise_for_status()
+        query = response.json().get("query", {})
+
+        normalized_titles = {
+            normalization["from"]: normalization["to"]
+            for normalization in query.get("normalized", ())
+        }
+        redirected_titles = {
+            redirect["from"]: redirect["to"] for redirect in query.get("redirects", ())
+        }
+        wikidata_identifiers = {
+            page["title"]: page["pageprops"]["wikibase_item"]
+            for page in query.get("pages", ())
+            if "wikibase_item" in page.get("pageprops", {})
+        }
+
+        resolved_wikidata_identifiers = {}
+        for title in titles:
+            page_title = normalized_titles.get(title, title)
+            page_title = redirected_titles.get(page_title, page_title)
 
-    def __get_wikidata_iri(self, record_key: RecordKey) -> NamedNode:
-        """Return a RDF node that contains the Wikidata IRI of record_key."""
+            if page_title in wikidata_identifiers:
+                resolved_wikidata_identifiers[title] = wikidata_identifiers[page_title]
 
-        response = self.__cached_session.get(
-            f"https://en.wikipedia.org/w/api.php?action=query&prop=pageprops&titles={record_key}&format=json"
+        return resolved_wikidata_identifiers
+
+    def resolve_wikidata_identifiers(
+        self, record_keys: tuple[RecordKey, ...]
+    ) -> dict[RecordKey, str]:
+        """
+        Return the Wikidata identifiers of record_keys.
+
+        Record keys missing from wikidata_identifier_store are resolved in batches of up to max_titles_per_request titles,
+        with batches fetched concurrently. Record keys without a Wikidata identifier are left out.
+        """
+
+        wikidata_identifiers = (
+            self.__wikidata_identifier_store.get(record_keys)
+            if self.__wikidata_identifier_store is not None
+            else {}
+        )
+        unresolved_record_keys = tuple(
+            record_key
+            for record_key in dict.fromkeys(record_keys)
+            if record_key not in wikidata_identifiers
         )
 
-        wikidata_identifier = next(
-            iter(dict(response.json()["query"]["pages"]).values())
-        )["pageprops"]["wikibase_item"]
+        if self.__wikidata_identifier_store is not None:
+            Instrumentation.current().record_cache(
+                "wikidata_identifier_store",
+                hits=len(wikidata_identifiers),
+                misses=len(unresolved_record_keys),
+            )
 
-        return NamedNode(WD.BASE_IRI.value + wikidata_identifier)
+        if unresolved_record_keys and self.__mediawiki_api_url is not None:
+            with ThreadPoolExecutor(
+                max_workers=self.__max_concurrent_requests
+            ) as executor:
+                fetched_wikidata_identifiers = {
+                    record_key: wikidata_identifier
+                    for batch_wikidata_identifiers in executor.map(
+                        Instrumentation.propagated(self.__get_wikidata_identifiers),
+                        batched(unresolved_record_keys, self.__max_titles_per_request),
+                    )
+                    for record_key, wikidata_identifier in batch_wikidata_identifiers.items()
+                }
 
-    def construct_graph(
+            if self.__wikidata_identifier_store is not None:
+                self.__wikidata_identifier_store.put(fetched_wikidata_identifiers)
+            wikidata_identifiers.update(fetched_wikidata_identifiers)
+
+        return wikidata_identifiers
+
+    def __generate_quads(
         self,
+        *,
         graphs: tuple[tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...],
-    ) -> Store:
+        wikidata_iris: dict[RecordKey, NamedNode],
+    ) -> Iterator[Quad]:
         """
-        Return a RDF Store populated with anti_recommendation_graphs.
+        Yield the Quads of anti_recommendation_graphs.
 
-        Each record_key in the anti_recommendation_graph has 3 Quad expressions in this method:
+        Each record_key in the anti_recommendation_graph has 3 Quad expressions:
         - a `type` Quad that expresses the type of CreativeWork the record_key belongs to.
         - a `title` Quad that expresses the title of the record_key.
         - a `url` Quad that expresses the URL of the record_key.
 
-        All anti-recommendations are related to a record_key via the __add_anti_recommendation_quads_to_store method.
-        """
+        Each of its anti_recommendation_keys has 2 Quad expressions:
+        - a `type` Quad that expresses the type of Review the anti_recommendation_key belongs to.
+        - an `item-reviewed` Quad that relates the anti_recommendation_key to the item that is being anti-recommended.
 
-        for graph in graphs:
-            record_key = graph[0]
-            record_key_wikidata_iri = self.__get_wikidata_iri(record_key)
+        The IRI of each anti_recommendation_key is created once and reused across graphs, and the Quads that
+        describe a node are yielded once, however many graphs it is in, so that streams hold no duplicate triples.
+        Graphs of record_keys that have no Wikidata identifier are skipped.
+        """
 
-            self.__arkg_store.add(
-                Quad(
-                    record_key_wikidata_iri,
-                    RDF.TYPE,
-                    SCHEMA.WEB_PAGE,
-                ),
-            )
+        anti_recommendation_iris: dict[AntiRecommendationKey, NamedNode] = {}
+        described_wikidata_iris: set[NamedNode] = set()
+        described_record_keys: set[RecordKey] = set()
+        reviewed_items: set[tuple[NamedNode, NamedNode]] = set()
 
-            self.__arkg_store.add(
-                Quad(
-                    record_key_wikidata_iri,
-                    SCHEMA.TITLE,
-                    Literal(record_key),
+        for record_key, anti_recommendation_keys in graphs:
+            if record_key not in wikidata_iris:
+                logger.warning(
+                    "Skipping %s, which has no Wikidata identifier.", record_key
                 )
-            )
+                continue
+
+            record_key_wikidata_iri = wikidata_iris[record_key]
 
-            self.__arkg_store.add(
-                Quad(
+            # Redirects resolve different Record keys, with their own titles, to the same Wikidata IRI.
+            if record_key_wikidata_iri not in described_wikidata_iris:
+                described_wikidata_iris.add(record_key_wikidata_iri)
+                yield Quad(record_key_wikidata_iri, RDF.TYPE, SCHEMA.WEB_PAGE)
+                yield Quad(
                     record_key_wikidata_iri,
                     SCHEMA.URL,
                     Literal(record_key_wikidata_iri.value),
                 )
-            )
+            if record_key not in described_record_keys:
+                described_record_keys.add(record_key)
+                yield Quad(record_key_wikidata_iri, SCHEMA.TITLE, Literal(record_key))
+
+            for anti_recommendation_key in anti_recommendation_keys:
+                anti_recommendation_iri = anti_recommendation_iris.get(
+                    anti_recommendation_key
+                )
+                if anti_recommendation_iri is None:
+                    anti_recommendation_iri = anti_recommendation_iris[
+                        anti_recommendation_key
+                    ] = ARKG.anti_recommendation_iri(record_key=anti_recommendation_key)
+                    yield Quad(anti_recommendation_iri, RDF.TYPE, SCHEMA.RECOMMENDATION)
+
+                if (anti_recommendation_iri, record_key_wikidata_iri) in reviewed_items:
+                    continue
+                reviewed_items.add((anti_recommendation_iri, record_key_wikidata_iri))
+                yield Quad(
+                    anti_recommendation_iri,
+                    SCHEMA.ITEM_REVIEWED,
+                    record_key_wikidata_iri,
+                )
 
-            self.__add_anti_recommendation_quads_to_store(
-                anti_recommendation_keys=graph[1],
-                item_reviewed=record_key_wikidata_iri,
+    def generate_quads(
+        self,
+        graphs: tuple[tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...],
+        *,
+        wikidata_identifiers: Mapping[RecordKey, str] | None = None,
+    ) -> Iterator[Quad]:
+        """
+        Yield the Quads of anti_recommendation_graphs, once the Wikidata identifiers of their Record keys are resolved.
+
+        With wikidata_identifiers, e.g. those returned by resolve_wikidata_identifiers, the Record keys are not
+        resolved again.
+        """
+
+        if wikidata_identifiers is None:
+            wikidata_identifiers = self.resolve_wikidata_identifiers(
+                tuple(graph[0] for graph in graphs)
             )
 
-        return self.__arkg_store
+        return self.__generate_quads(
+            graphs=graphs,
+            wikidata_iris={
+                record_key: NamedNode(WD.BASE_IRI.value + wikidata_identifier)
+                for record_key, wikidata_identifier in wikidata_identifiers.items()
+            },
+        )
+
+    def construct_graph(
+        self,
+        graphs: tuple[tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...],
+    ) -> Store:
+        """
+        Return a RDF Store populated with anti_recommendation_graphs.
+
+        The Quads of all graphs are streamed into the Store's bulk loader, instead of being added one transaction at a time.
+        The Store is created in arkg_store_directory_path.
+        """
+
+        self.__arkg_store_directory_path.mkdir(exist_ok=True, parents=True)
+        arkg_store = Store(self.__arkg_store_directory_path)
+
+        arkg_store.bulk_extend(self.generate_quads(graphs))
+
+        return arkg_store
+
+    def write_graph(  # noqa: PLR0913
+        self,
+        graphs: tuple[tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...],
+        *,
+        file_path: Path,
+        rdf_mime_type: RdfMimeType,
+        compression_settings: CompressionSettings | None = None,
+        wikidata_identifiers: Mapping[RecordKey, str] | None = None,
+    ) -> None:
+        """
+        Write anti_recommendation_graphs to file_path in an RDF serialization, without constructing a RDF Store.
+
+        rdf_mime_type must be one of RdfStreamWriter.SUPPORTED_RDF_MIME_TYPES.
+        The serialization is compressed as it is written, as configured by compression_settings.
+        With wikidata_identifiers, the Record keys are not resolved again.
+        """
+
+        with RdfStreamWriter(
+            file_path=file_path,
+            rdf_mime_type=rdf_mime_type,
+            compression_settings=compression_settings,
+        ) as rdf_stream_writer:
+            rdf_stream_writer.write(
+                self.generate_quads(graphs, wikidata_identifiers=wikidata_identifiers)
+            )
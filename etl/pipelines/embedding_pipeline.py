@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from itertools import batched
 from typing import final
 
 from langchain.docstore.document import Document
@@ -9,19 +11,47 @@ from langchain_core.embeddings import Embeddings
 class EmbeddingPipeline(ABC):
     """An interface to build embedding pipelines that transform Records into embeddings."""
 
+    EMBEDDING_BATCH_SIZE = 16_384
+
     @abstractmethod
     def _create_embedding_model(self) -> Embeddings:
         """Return an embedding model that will be used to create an embedding store."""
 
+    @final
+    @property
+    def embedding_model(self) -> Embeddings:
+        """The embedding model that transforms Documents and queries into embeddings."""
+
+        return self._create_embedding_model()
+
+    def fit(self, *, documents: Sequence[Document]) -> None:  # noqa: B027
+        """
+        Fit the embedding model to the Documents of a corpus, before any of them is embedded.
+
+        Pretrained embedding models, like OpenAI's, are not fitted, and ignore it.
+        """
+
     @final
     def create_vector_store(
         self,
         *,
-        documents: tuple[Document, ...],
+        documents: Sequence[Document],
     ) -> VectorStore:
-        """Return a vector store that contains Document embeddings."""
+        """
+        Return a vector store that contains Document embeddings.
+
+        Documents are embedded EMBEDDING_BATCH_SIZE at a time, so that only one batch of embeddings is held
+        as Python lists while the index grows.
+        """
 
-        return FAISS.from_documents(
-            documents=list(documents),
-            embedding=self._create_embedding_model(),
+        embedding_model = self._create_embedding_model()
+        document_batches = batched(documents, self.EMBEDDING_BATCH_SIZE)
+
+        vector_store = FAISS.from_documents(
+            documents=list(next(document_batches, ())),
+            embedding=embedding_model,
         )
+        for document_batch in document_batches:
+            vector_store.add_documents(list(document_batch))
+
+        return vector_store
@@ -0,0 +1,285 @@
+import re
+import zlib
+from collections.abc import Iterator, Sequence
+from itertools import chain, pairwise
+from pathlib import Path
+from typing import Self, override
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from etl.models.types import LocalEmbeddingModelName
+
+SparseBatch = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _add_sparse_dot(
+    product: np.ndarray,
+    *,
+    rows: np.ndarray,
+    columns: np.ndarray,
+    weights: np.ndarray,
+    dense: np.ndarray,
+) -> None:
+    """
+    Add the product of a sparse matrix and dense to product.
+
+    The sparse matrix holds weights at (rows, columns), sorted by row, with at most one weight per cell.
+    """
+
+    if not len(rows):
+        return
+
+    row_starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    product[rows[row_starts]] += np.add.reduceat(
+        dense[columns] * weights[:, np.newaxis], row_starts
+    )
+
+
+class HashedTfidfSvdEmbeddings(Embeddings):
+    """
+    An embedding model that runs on the CPU, without network access, whose embeddings are the latent semantic
+    analysis of hashed TF-IDF vectors.
+
+    Texts are split into lowercase words, and their words and word bigrams are hashed into hash_features buckets
+    by CRC-32, so that no vocabulary is held in memory. Term counts are weighted by sublinear TF-IDF, normalized,
+    and projected onto the top dimensions right singular vectors of the TF-IDF matrix of the texts that the model
+    was fitted to, which are computed by randomized SVD. Embeddings are normalized, so that their inner products
+    are cosine similarities.
+    Texts are hashed and projected batch_size at a time, with sparse products, so that memory does not grow with
+    the number of texts. The model must be fitted, or loaded, before it embeds texts.
+    """
+
+    TOKEN_PATTERN = re.compile(r"\w+")
+    OVERSAMPLES = 10
+    POWER_ITERATIONS = 2
+
+    def __init__(
+        self,
+        *,
+        dimensions: int = 256,
+        hash_features: int = 1 << 16,
+        batch_size: int = 256,
+        seed: int = 0,
+    ) -> None:
+        self.model = LocalEmbeddingModelName.HASHED_TFIDF_SVD.value
+        self.__dimensions = dimensions
+        self.__hash_features = hash_features
+        self.__batch_size = batch_size
+        self.__seed = seed
+        self.__inverse_document_frequencies: np.ndarray | None = None
+        self.__projection: np.ndarray | None = None
+
+    @classmethod
+    def load(cls, file_path: Path, *, batch_size: int = 256) -> Self:
+        """Return a fitted HashedTfidfSvdEmbeddings loaded from the NumPy file at file_path."""
+
+        with np.load(file_path) as model_file:
+            inverse_document_frequencies = model_file["inverse_document_frequencies"]
+            projection = model_file["projection"]
+
+        embeddings = cls(
+            dimensions=projection.shape[1],
+            hash_features=projection.shape[0],
+            batch_size=batch_size,
+        )
+        embeddings.__inverse_document_frequencies = (  # noqa: SLF001
+            inverse_document_frequencies
+        )
+        embeddings.__projection = projection  # noqa: SLF001
+
+        return embeddings
+
+    def save(self, file_path: Path) -> None:
+        """Save the fitted model to a NumPy file at file_path."""
+
+        inverse_document_frequencies, projection = self.__fitted_model()
+
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with file_path.open(mode="wb") as model_file:
+            np.savez(
+                model_file,
+                inverse_document_frequencies=inverse_document_frequencies,
+                projection=projection,
+            )
+
+    def __fitted_model(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the inverse document frequencies and the projection of the fitted model."""
+
+        if self.__inverse_document_frequencies is None or self.__projection is None:
+            message = "HashedTfidfSvdEmbeddings must be fitted before it embeds texts"
+            raise ValueError(message)
+
+        return self.__inverse_document_frequencies, self.__projection
+
+    def __terms(self, text: str) -> Iterator[str]:
+        """Return an iterator of the lowercase words and word bigrams of text."""
+
+        words = self.TOKEN_PATTERN.findall(text.lower())
+
+        return chain(words, map(" ".join, pairwise(words)))
+
+    def __hash_terms(self, texts: Sequence[str]) -> SparseBatch:
+        """Return the rows, the buckets and the counts of the hashed terms of texts, sorted by row."""
+
+        keys = np.fromiter(
+            (
+                row * self.__hash_features
+                + zlib.crc32(term.encode("utf-8")) % self.__hash_features
+                for row, text in enumerate(texts)
+                for term in self.__terms(text)
+            ),
+            dtype=np.int64,
+        )
+        keys, counts = np.unique(keys, return_counts=True)
+
+        return (
+            keys // self.__hash_features,
+            keys % self.__hash_features,
+            counts.astype(np.float32),
+        )
+
+    @staticmethod
+    def __tfidf(
+        hashed_terms: SparseBatch,
+        *,
+        texts_count: int,
+        inverse_document_frequencies: np.ndarray,
+    ) -> SparseBatch:
+        """Return the rows, the buckets and the normalized TF-IDF weights of hashed_terms."""
+
+        rows, buckets, counts = hashed_terms
+
+        weights = (1.0 + np.log(counts)) * inverse_document_frequencies[buckets]
+        norms = np.sqrt(np.bincount(rows, weights=weights**2, minlength=texts_count))
+
+        return rows, buckets, (weights / norms[rows]).astype(np.float32)
+
+    def fit(self, texts: Sequence[str]) -> Self:
+        """
+        Fit the inverse document frequencies and the projection of the model to texts.
+
+        The TF-IDF matrix of texts is held sparse, and multiplied batch by batch, so texts should be a sample
+        of the corpus rather than the corpus itself.
+        """
+
+        if not texts:
+            message = "HashedTfidfSvdEmbeddings must be fitted to at least one text"
+            raise ValueError(message)
+
+        batches = tuple(
+            (
+                self.__hash_terms(texts[batch_start : batch_start + self.__batch_size]),
+                len(texts[batch_start : batch_start + self.__batch_size]),
+            )
+            for batch_start in range(0, len(texts), self.__batch_size)
+        )
+
+        document_frequencies = np.zeros(self.__hash_features, dtype=np.int64)
+        for (_, buckets, _), _ in batches:
+            document_frequencies += np.bincount(buckets, minlength=self.__hash_features)
+        inverse_document_frequencies = (
+            np.log((1.0 + len(texts)) / (1.0 + document_frequencies)) + 1.0
+        ).astype(np.float32)
+
+        tfidf_batches = tuple(
+            self.__tfidf(
+                hashed_terms,
+                texts_count=texts_count,
+                inverse_document_frequencies=inverse_document_frequencies,
+            )
+            for hashed_terms, texts_count in batches
+        )
+        batch_starts = np.cumsum([0, *(texts_count for _, texts_count in batches)])
+
+        def dot(dense: np.ndarray) -> np.ndarray:
+            product = np.zeros((len(texts), dense.shape[1]), dtype=np.float32)
+            for (rows, buckets, weights), batch_start in zip(
+                tfidf_batches, batch_starts, strict=False
+            ):
+                _add_sparse_dot(
+                    product[batch_start:],
+                    rows=rows,
+                    columns=buckets,
+                    weights=weights,
+                    dense=dense,
+                )
+
+            return product
+
+        def transpose_dot(dense: np.ndarray) -> np.ndarray:
+            product = np.zeros((self.__hash_features, dense.shape[1]), dtype=np.float32)
+            for (rows, buckets, weights), batch_start in zip(
+                tfidf_batches, batch_starts, strict=False
+            ):
+                order = np.argsort(buckets, kind="stable")
+                _add_sparse_dot(
+                    product,
+                    rows=buckets[order],
+                    columns=rows[order],
+                    weights=weights[order],
+                    dense=dense[batch_start:],
+                )
+
+            return product
+
+        # Randomized SVD with power iterations, after Halko, Martinsson and Tropp (2011).
+        rank = min(
+            self.__dimensions + self.OVERSAMPLES, len(texts), self.__hash_features
+        )
+        range_basis = dot(
+            np.random.default_rng(self.__seed)
+            .standard_normal((self.__hash_features, rank))
+            .astype(np.float32)
+        )
+        for _ in range(self.POWER_ITERATIONS):
+            range_basis = dot(
+                np.linalg.qr(transpose_dot(np.linalg.qr(range_basis)[0]))[0]
+            )
+        right_singular_vectors = np.linalg.svd(
+            transpose_dot(np.linalg.qr(range_basis)[0]), full_matrices=False
+        )[0][:, : self.__dimensions]
+
+        self.__inverse_document_frequencies = inverse_document_frequencies
+        # With fewer texts than dimensions, the missing dimensions are zero.
+        self.__projection = np.pad(
+            right_singular_vectors,
+            ((0, 0), (0, self.__dimensions - right_singular_vectors.shape[1])),
+        ).astype(np.float32)
+
+        return self
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """Return the embeddings of texts, as the rows of a float32 array."""
+
+        inverse_document_frequencies, projection = self.__fitted_model()
+        embeddings = np.zeros((len(texts), self.__dimensions), dtype=np.float32)
+
+        for batch_start in range(0, len(texts), self.__batch_size):
+            batch_texts = texts[batch_start : batch_start + self.__batch_size]
+            rows, buckets, weights = self.__tfidf(
+                self.__hash_terms(batch_texts),
+                texts_count=len(batch_texts),
+                inverse_document_frequencies=inverse_document_frequencies,
+            )
+            _add_sparse_dot(
+                embeddings[batch_start:],
+                rows=rows,
+                columns=buckets,
+                weights=weights,
+                dense=projection,
+            )
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+        return np.divide(
+            embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0
+        )
+
+    @override
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.transform(texts).tolist()
+
+    @override
+    def embed_query(self, text: str) -> list[float]:
+        return self.transform([text])[0].tolist()
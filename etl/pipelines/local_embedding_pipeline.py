@@ -0,0 +1,70 @@
+import math
+from collections.abc import Sequence
+from pathlib import Path
+from typing import override
+
+from langchain.docstore.document import Document
+from langchain_core.embeddings import Embeddings
+
+from etl.instrumentation import InstrumentedEmbeddings
+from etl.pipelines import EmbeddingPipeline
+from etl.pipelines.hashed_tfidf_svd_embeddings import HashedTfidfSvdEmbeddings
+from etl.resources import LocalEmbeddingSettings
+
+
+class LocalEmbeddingPipeline(EmbeddingPipeline):
+    """
+    A concrete implementation of EmbeddingPipeline.
+
+    Uses a HashedTfidfSvdEmbeddings model, which runs on the CPU without network access, to transform Records
+    into embeddings. The model is fitted to up to local_embedding_settings.fit_sample_size Documents, evenly spaced over
+    the corpus, and saved to local_embedding_model_file_path, so that queries are embedded by the same model once
+    the vector store is loaded.
+    """
+
+    def __init__(
+        self,
+        *,
+        local_embedding_settings: LocalEmbeddingSettings,
+        local_embedding_model_file_path: Path,
+    ) -> None:
+        self.__local_embedding_settings = local_embedding_settings
+        self.__local_embedding_model_file_path = local_embedding_model_file_path
+        self.__embedding_model = HashedTfidfSvdEmbeddings(
+            dimensions=local_embedding_settings.dimensions,
+            hash_features=local_embedding_settings.hash_features,
+            batch_size=local_embedding_settings.batch_size,
+        )
+
+    @override
+    def fit(self, *, documents: Sequence[Document]) -> None:
+        """Fit the local embedding model to a sample of documents, and save it."""
+
+        sample_step = max(
+            math.ceil(len(documents) / self.__local_embedding_settings.fit_sample_size),
+            1,
+        )
+
+        self.__embedding_model.fit(
+            [document.page_content for document in documents[::sample_step]]
+        )
+        self.__embedding_model.save(self.__local_embedding_model_file_path)
+
+    @override
+    def _create_embedding_model(self) -> Embeddings:
+        """Return the local embedding model, which is shared by the shards of a vector store."""
+
+        return InstrumentedEmbeddings(self.__embedding_model, name="local_embeddings")
+
+    @staticmethod
+    def load_embedding_model(*, local_embedding_model_file_path: Path) -> Embeddings:
+        """
+        Load and return a local embedding model saved by LocalEmbeddingPipeline.fit.
+
+        Texts embedded by the model are recorded as "local_embeddings" calls.
+        """
+
+        return InstrumentedEmbeddings(
+            HashedTfidfSvdEmbeddings.load(local_embedding_model_file_path),
+            name="local_embeddings",
+        )
@@ -6,6 +6,7 @@ from langchain.storage import LocalFileStore
 from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
 
+from etl.instrumentation import HttpCallRecorder, InstrumentedEmbeddings
 from etl.models.types.open_ai_embedding_model_name import OpenAiEmbeddingModelName
 from etl.pipelines import EmbeddingPipeline
 from etl.resources import OpenaiSettings
@@ -44,16 +45,22 @@ class OpenaiEmbeddingPipeline(EmbeddingPipeline):
         openai_embeddings_cache_directory_path: Path,
         openai_embedding_model_name: OpenAiEmbeddingModelName,
     ) -> Embeddings:
-        """Create and return an OpenAI embedding model."""
+        """
+        Create and return an OpenAI embedding model.
+
+        Requests to OpenAI, which are only made for texts missing from the cache, are recorded as "openai_embeddings" calls,
+        with their retries and token usage.
+        """
 
         openai_embeddings_cache_directory_path.mkdir(parents=True, exist_ok=True)
 
         openai_embeddings_model = OpenAIEmbeddings(
-            model=str(openai_embedding_model_name.value)
+            model=str(openai_embedding_model_name.value),
+            http_client=HttpCallRecorder.http_client(),
         )
 
         return CacheBackedEmbeddings.from_bytes_store(
-            openai_embeddings_model,
+            InstrumentedEmbeddings(openai_embeddings_model, name="openai_embeddings"),
             LocalFileStore(openai_embeddings_cache_directory_path),
             namespace=openai_embeddings_model.model,
         )
@@ -3,8 +3,10 @@ from typing import override
 from langchain.prompts import PromptTemplate
 from langchain.schema import StrOutputParser
 from langchain.schema.runnable import RunnablePassthrough, RunnableSerializable
+from langchain_community.callbacks import get_openai_callback
 from langchain_openai import ChatOpenAI
 
+from etl.instrumentation import HttpCallRecorder, Instrumentation
 from etl.models import Record, RecordKeys, wikipedia
 from etl.models.types import ModelQuery, ModelResponse, RecordKey
 from etl.pipelines import RecordEnrichmentPipeline
@@ -20,6 +22,7 @@ class OpenaiRecordEnrichmentPipeline(RecordEnrichmentPipeline):
 
     def __init__(self, openai_settings: OpenaiSettings) -> None:
         self.__openai_settings = openai_settings
+        self.__max_retries = 2
         self.__template = """\
                 Keep the answer as concise as possible.
                 Question: {question}
@@ -36,6 +39,8 @@ class OpenaiRecordEnrichmentPipeline(RecordEnrichmentPipeline):
         return ChatOpenAI(
             name=str(self.__openai_settings.generative_model_name.value),
             temperature=self.__openai_settings.temperature,
+            max_retries=self.__max_retries,
+            http_client=HttpCallRecorder.http_client(),
         )
 
     def __build_chain(self, model: ChatOpenAI) -> RunnableSerializable:
@@ -48,9 +53,34 @@ class OpenaiRecordEnrichmentPipeline(RecordEnrichmentPipeline):
     def __generate_response(
         self, *, question: ModelQuery, chain: RunnableSerializable
     ) -> ModelResponse:
-        """Invoke the OpenAI large language model and generate a response."""
+        """
+        Invoke the OpenAI large language model and generate a response.
+
+        The call is traced with its token usage and the number of requests that the OpenAI client retried.
+        """
 
-        return str(chain.invoke(question))
+        with Instrumentation.current().time_call(
+            "openai_chat",
+            {
+                "gen_ai.system": "openai",
+                "gen_ai.request.model": str(
+                    self.__openai_settings.generative_model_name.value
+                ),
+            },
+        ) as span, get_openai_callback() as openai_callback, HttpCallRecorder() as http_call_recorder:
+            try:
+                response = str(chain.invoke(question))
+            finally:
+                span.set_attribute(
+                    "http.request.resend_count", http_call_recorder.retry_count
+                )
+            span.set_attribute(
+                "gen_ai.usage.input_tokens", openai_callback.prompt_tokens
+            ).set_attribute(
+                "gen_ai.usage.output_tokens", openai_callback.completion_tokens
+            )
+
+            return response
 
     @override
     def enrich_record(self, record: Record) -> Record:
@@ -19,3 +19,16 @@ class RetrievalPipeline(ABC):
 
         k is the number of Documents to retrieve.
         """
+
+    @abstractmethod
+    def retrieve_documents_batch(
+        self,
+        *,
+        record_keys: tuple[RecordKey, ...],
+        k: DocumentsLimit,
+    ) -> tuple[tuple[AntiRecommendation, ...], ...]:
+        """
+        Return a tuple that contains the AntiRecommendations of each key in record_keys, in the order of record_keys.
+
+        k is the number of Documents to retrieve for each key.
+        """
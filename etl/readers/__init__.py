@@ -1,2 +1,8 @@
-from .reader import Reader as Reader
+from .reader import Reader as Reader  # isort:skip
+from .wikipedia_abstract_dump_reader import (
+    WikipediaAbstractDumpReader as WikipediaAbstractDumpReader,
+)
+from .wikipedia_dataset_reader import (
+    WikipediaDatasetReader as WikipediaDatasetReader,
+)
 from .wikipedia_reader import WikipediaReader as WikipediaReader
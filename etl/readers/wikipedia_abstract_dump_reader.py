@@ -0,0 +1,72 @@
+import gzip
+from collections.abc import Iterable
+from pathlib import Path
+from typing import override
+from xml.etree.ElementTree import iterparse
+
+from unidecode import unidecode
+
+from etl.instrumentation import Instrumentation
+from etl.models import wikipedia
+from etl.readers import Reader
+
+
+class WikipediaAbstractDumpReader(Reader):
+    """
+    A concrete implementation of Reader.
+
+    Read in the abstract dumps of Wikipedia, e.g. enwiki-20240601-abstract.xml.gz, and yield them as wikipedia.Articles.
+    A dump is a <feed> of <doc> elements, each with the <title>, <url>, <abstract> and <links> of an article.
+    Dumps are parsed incrementally, and every <doc> is cleared once read, so that memory does not grow with the size
+    of a dump. Titles lose the "Wikipedia: " prefix of dumps, and texts are transliterated to ASCII like
+    WikipediaReader does.
+    """
+
+    ABSTRACT_DUMP_FILE_SUFFIXES = (".xml", ".xml.gz")
+    TITLE_PREFIX = "Wikipedia: "
+
+    def __init__(self, data_file_paths: frozenset[Path]) -> None:
+        self.abstract_dump_file_paths = data_file_paths
+
+    @classmethod
+    def is_abstract_dump(cls, data_file_path: Path) -> bool:
+        """Return whether data_file_path is the path of an abstract dump, by its suffix."""
+
+        return data_file_path.name.endswith(cls.ABSTRACT_DUMP_FILE_SUFFIXES)
+
+    @override
+    def read(self) -> Iterable[wikipedia.Article]:
+        """Read in Wikipedia abstract dumps and yield them as wikipedia.Articles."""
+
+        instrumentation = Instrumentation.current()
+
+        for abstract_dump_file_path in self.abstract_dump_file_paths:
+            with (
+                gzip.open(abstract_dump_file_path, mode="rb")
+                if abstract_dump_file_path.suffix == ".gz"
+                else abstract_dump_file_path.open(mode="rb")
+            ) as abstract_dump_file:
+                root = None
+
+                # Abstract dumps are published by Wikimedia, and the expat parser bounds entity expansion.
+                for event, element in iterparse(  # noqa: S314
+                    abstract_dump_file, events=("start", "end")
+                ):
+                    if root is None:
+                        root = element
+                    if event != "end" or element.tag != "doc":
+                        continue
+
+                    instrumentation.count("wikipedia_articles_read")
+                    yield wikipedia.Article(
+                        title=unidecode(
+                            (element.findtext("title") or "").removeprefix(
+                                self.TITLE_PREFIX
+                            )
+                        ),
+                        url=unidecode(element.findtext("url") or ""),
+                        abstract=unidecode(element.findtext("abstract") or ""),
+                    )
+
+                    # The root holds every <doc> parsed so far, so clearing it releases them.
+                    root.clear()
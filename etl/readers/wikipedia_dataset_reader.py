@@ -0,0 +1,177 @@
+import functools
+import operator
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+from typing import Any, override
+
+from unidecode import unidecode
+
+from etl.instrumentation import Instrumentation
+from etl.models import wikipedia
+from etl.models.types import RecordKey
+from etl.readers import Reader
+
+
+class WikipediaDatasetReader(Reader):
+    """
+    A concrete implementation of Reader.
+
+    Read in Wikipedia articles from Parquet or Arrow IPC datasets, e.g. the snapshots of a data lake, and yield them
+    as wikipedia.Articles, in batches of up to batch_size.
+    Only the columns that wikipedia.Article holds are read, and the filters are pushed down into the scan, so that
+    row groups whose statistics rule them out are skipped:
+    - Articles whose keys are from min_record_key, inclusive, to max_record_key, exclusive, by the title column,
+    - Articles in one of namespaces, by the namespace column,
+    - Articles modified at or after modified_since, by the modified column.
+    Datasets without the namespace or modified column cannot be filtered by them, and raise a ValueError.
+    Datasets are files or directories of files, read as Parquet unless their names end in .arrow or .feather.
+    Requires the optional pyarrow package.
+    """
+
+    DATASET_FILE_SUFFIXES = (".parquet", ".arrow", ".feather")
+    COLUMNS = ("title", "url", "abstract")
+    TITLE_COLUMN = "title"
+    NAMESPACE_COLUMN = "namespace"
+    MODIFIED_COLUMN = "modified"
+
+    def __init__(  # noqa: PLR0913
+        self,
+        data_file_paths: frozenset[Path],
+        *,
+        min_record_key: RecordKey | None = None,
+        max_record_key: RecordKey | None = None,
+        namespaces: frozenset[int] | None = None,
+        modified_since: datetime | None = None,
+        batch_size: int = 65_536,
+    ) -> None:
+        self.dataset_paths = data_file_paths
+        self.__min_record_key = min_record_key
+        self.__max_record_key = max_record_key
+        self.__namespaces = namespaces
+        self.__modified_since = modified_since
+        self.__batch_size = batch_size
+
+    @classmethod
+    def is_dataset(cls, data_file_path: Path) -> bool:
+        """Return whether data_file_path is the path of a Parquet or Arrow IPC dataset, by its suffix."""
+
+        return data_file_path.name.endswith(cls.DATASET_FILE_SUFFIXES)
+
+    def __contains_record_key(self, record_key: RecordKey) -> bool:
+        """Return whether record_key is in the key range of the reader."""
+
+        return (
+            self.__min_record_key is None or record_key >= self.__min_record_key
+        ) and (self.__max_record_key is None or record_key < self.__max_record_key)
+
+    def __filter(self, schema: Any, dataset_path: Path) -> Any:  # noqa: ANN401
+        """
+        Return the pyarrow.dataset expression of the filters of a dataset with schema, or None without filters.
+
+        Raise a ValueError if the dataset lacks the column of a filter.
+        """
+
+        import pyarrow.compute
+        import pyarrow.dataset
+
+        for column, filter_value in (
+            (self.NAMESPACE_COLUMN, self.__namespaces),
+            (self.MODIFIED_COLUMN, self.__modified_since),
+        ):
+            if filter_value is not None and column not in schema.names:
+                message = f"{dataset_path} has no {column} column to filter by"
+                raise ValueError(message)
+
+        expressions = []
+        # Record keys are titles with underscores for spaces, transliterated to ASCII once read.
+        # Titles that are not ASCII are let through, and filtered by their Record keys once read.
+        title = pyarrow.dataset.field(self.TITLE_COLUMN)
+        record_key = pyarrow.compute.replace_substring(
+            title, pattern=" ", replacement="_"
+        )
+        key_range_expressions = []
+        if self.__min_record_key is not None:
+            key_range_expressions.append(record_key >= self.__min_record_key)
+        if self.__max_record_key is not None:
+            key_range_expressions.append(record_key < self.__max_record_key)
+        if key_range_expressions:
+            expressions.append(
+                functools.reduce(operator.and_, key_range_expressions)
+                | ~pyarrow.compute.string_is_ascii(title)
+            )
+        if self.__namespaces is not None:
+            expressions.append(
+                pyarrow.dataset.field(self.NAMESPACE_COLUMN).isin(
+                    sorted(self.__namespaces)
+                )
+            )
+        if self.__modified_since is not None:
+            expressions.append(
+                pyarrow.dataset.field(self.MODIFIED_COLUMN) >= self.__modified_since
+            )
+
+        return functools.reduce(operator.and_, expressions) if expressions else None
+
+    def read_batches(self) -> Iterator[tuple[wikipedia.Article, ...]]:
+        """Read in Wikipedia datasets and yield them as batches of wikipedia.Articles."""
+
+        # Without datasets, pyarrow is not needed.
+        if not self.dataset_paths:
+            return
+
+        try:
+            import pyarrow.dataset
+        except ImportError as import_error:
+            message = "Parquet and Arrow datasets require the pyarrow package"
+            raise ValueError(message) from import_error
+
+        instrumentation = Instrumentation.current()
+
+        for dataset_path in sorted(self.dataset_paths):
+            dataset = pyarrow.dataset.dataset(
+                dataset_path,
+                format=(
+                    "ipc"
+                    if dataset_path.name.endswith((".arrow", ".feather"))
+                    else "parquet"
+                ),
+            )
+
+            filter_ = self.__filter(dataset.schema, dataset_path)
+
+            for record_batch in dataset.to_batches(
+                columns=[
+                    column for column in self.COLUMNS if column in dataset.schema.names
+                ],
+                filter=filter_,
+                batch_size=self.__batch_size,
+            ):
+                columns = record_batch.to_pydict()
+                articles = tuple(
+                    wikipedia.Article(
+                        **{
+                            column: unidecode(value)
+                            for column, value in zip(columns, row, strict=True)
+                            if value is not None
+                        }
+                    )
+                    for row in zip(*columns.values(), strict=True)
+                )
+                articles = tuple(
+                    article
+                    for article in articles
+                    if self.__contains_record_key(article.key)
+                )
+                if not articles:
+                    continue
+
+                instrumentation.count("wikipedia_articles_read", len(articles))
+                yield articles
+
+    @override
+    def read(self) -> Iterable[wikipedia.Article]:
+        """Read in Wikipedia datasets and yield them as wikipedia.Articles."""
+
+        return chain.from_iterable(self.read_batches())
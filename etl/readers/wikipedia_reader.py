@@ -5,6 +5,7 @@ from typing import override
 
 from unidecode import unidecode
 
+from etl.instrumentation import Instrumentation
 from etl.models import wikipedia
 from etl.readers import Reader
 
@@ -23,6 +24,8 @@ class WikipediaReader(Reader):
     def read(self) -> Iterable[wikipedia.Article]:
         """Read in Wikipedia data and yield them as wikipedia.Articles."""
 
+        instrumentation = Instrumentation.current()
+
         for wikipedia_jsonl_file_path in self.wikipedia_jsonl_file_paths:
             if wikipedia_jsonl_file_path:
                 with wikipedia_jsonl_file_path.open(encoding="utf-8") as json_file:
@@ -39,4 +42,5 @@ class WikipediaReader(Reader):
                             )
                         )
 
+                        instrumentation.count("wikipedia_articles_read")
                         yield wikipedia.Article(**(json_obj["abstract_info"]))
@@ -1,6 +1,13 @@
+from .compression_settings import CompressionSettings as CompressionSettings
 from .input_config import InputConfig as InputConfig
+from .local_embedding_settings import (
+    LocalEmbeddingSettings as LocalEmbeddingSettings,
+)
+from .memory_settings import MemorySettings as MemorySettings
 from .openai_settings import OpenaiSettings as OpenaiSettings
 from .output_config import OutputConfig as OutputConfig
 from .retrieval_algorithm_parameters import (
     RetrievalAlgorithmParameters as RetrievalAlgorithmParameters,
 )
+from .vector_store_settings import VectorStoreSettings as VectorStoreSettings
+from .wikidata_settings import WikidataSettings as WikidataSettings
@@ -0,0 +1,51 @@
+from typing import Self
+
+from dagster import ConfigurableResource, EnvVar
+from pydantic import Field
+
+from etl.models import compressed_rdf_file_extensions
+from etl.models.types import CompressionFormat, RdfFileExtension
+
+
+class CompressionSettings(ConfigurableResource):  # type: ignore[misc]
+    """
+    A ConfigurableResource that holds the settings of compressed ARKG serializations.
+
+    Properties include:
+    - compression_format: The format that serializations are compressed with while they are written.
+      None means serializations are not compressed.
+    - compression_level: The compression level. None means the default level of compression_format.
+    - compression_threads: The number of threads that compress zstd serializations, in addition to the writing thread.
+      0 means serializations are compressed by the writing thread. gzip serializations are always compressed by the writing thread.
+    """
+
+    compression_format: CompressionFormat | None = Field(default=None)
+    compression_level: int | None = Field(default=None)
+    compression_threads: int = Field(default=0, ge=0)
+
+    @classmethod
+    def from_env_vars(cls) -> Self:
+        """Return a CompressionSettings object, with settings obtained from environment variables."""
+
+        compression_format = EnvVar("ETL_COMPRESSION_FORMAT").get_value()
+        compression_level = EnvVar("ETL_COMPRESSION_LEVEL").get_value()
+
+        return cls(
+            compression_format=(
+                CompressionFormat(compression_format) if compression_format else None
+            ),
+            compression_level=int(compression_level) if compression_level else None,
+            compression_threads=int(
+                str(EnvVar("ETL_COMPRESSION_THREADS").get_value(default="0"))
+            ),
+        )
+
+    def file_extension(self, rdf_file_extension: RdfFileExtension) -> RdfFileExtension:
+        """Return the extension of files that contain a serialization with rdf_file_extension, compressed with these settings."""
+
+        if self.compression_format is None:
+            return rdf_file_extension
+
+        return (
+            rdf_file_extension + compressed_rdf_file_extensions[self.compression_format]
+        )
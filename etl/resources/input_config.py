@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from dagster import ConfigurableResource, EnvVar
+from pydantic import Field
 
 if TYPE_CHECKING:
     from etl.models.types import DataFileName
@@ -18,6 +20,12 @@ class InputConfig(ConfigurableResource):  # type: ignore[misc]
     Properties include:
     - data_directory_path: The directory path of input data,
     - data_file_names: A list of data file names,
+    - min_record_key and max_record_key: The range of the keys of the Records to read, from min_record_key,
+      inclusive, to max_record_key, exclusive. None means the range is unbounded.
+    - namespaces: The namespaces of the Records to read. None means every namespace.
+    - modified_since: An ISO 8601 date and time, from which modified Records are read. None means every Record.
+    The filters are pushed down into the scans of Parquet and Arrow datasets. The key range also filters the Records
+    of other data files, which have no namespaces or modification times to filter by.
     """
 
     @dataclass(frozen=True)
@@ -28,9 +36,24 @@ class InputConfig(ConfigurableResource):  # type: ignore[misc]
 
         data_directory_path: Path
         data_file_paths: frozenset[Path]
+        min_record_key: str | None = None
+        max_record_key: str | None = None
+        namespaces: frozenset[int] | None = None
+        modified_since: datetime | None = None
+
+        def contains_record_key(self, record_key: str) -> bool:
+            """Return whether record_key is in the key range, from min_record_key, inclusive, to max_record_key, exclusive."""
+
+            return (
+                self.min_record_key is None or record_key >= self.min_record_key
+            ) and (self.max_record_key is None or record_key < self.max_record_key)
 
     data_directory_path: str
     data_file_names: list[str]
+    min_record_key: str | None = Field(default=None)
+    max_record_key: str | None = Field(default=None)
+    namespaces: list[int] | None = Field(default=None)
+    modified_since: str | None = Field(default=None)
 
     @classmethod
     def default(
@@ -55,6 +78,8 @@ class InputConfig(ConfigurableResource):  # type: ignore[misc]
     ) -> InputConfig:
         """Return an InputConfig object, with parameter values obtained from environment variables."""
 
+        namespaces = EnvVar("ETL_NAMESPACES").get_value()
+
         return cls(
             data_directory_path=EnvVar("ETL_DATA_DIRECTORY_PATH").get_value(
                 str(data_directory_path_default)
@@ -66,6 +91,10 @@ class InputConfig(ConfigurableResource):  # type: ignore[misc]
                     )
                 )
             ),
+            min_record_key=EnvVar("ETL_MIN_RECORD_KEY").get_value() or None,
+            max_record_key=EnvVar("ETL_MAX_RECORD_KEY").get_value() or None,
+            namespaces=json.loads(namespaces) if namespaces else None,
+            modified_since=EnvVar("ETL_MODIFIED_SINCE").get_value() or None,
         )
 
     def parse(self) -> Parsed:
@@ -81,4 +110,14 @@ class InputConfig(ConfigurableResource):  # type: ignore[misc]
                     for data_file_name in self.data_file_names
                 ]
             ),
+            min_record_key=self.min_record_key,
+            max_record_key=self.max_record_key,
+            namespaces=(
+                frozenset(self.namespaces) if self.namespaces is not None else None
+            ),
+            modified_since=(
+                datetime.fromisoformat(self.modified_since)
+                if self.modified_since is not None
+                else None
+            ),
         )
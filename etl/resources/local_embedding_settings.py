@@ -0,0 +1,62 @@
+from typing import Self
+
+from dagster import ConfigurableResource, EnvVar
+from pydantic import Field
+
+from etl.models.types import LocalEmbeddingModelName
+
+
+class LocalEmbeddingSettings(ConfigurableResource):  # type: ignore[misc]
+    """
+    A ConfigurableResource that holds the settings of the local embedding model, which replaces OpenAI embeddings.
+
+    Properties include:
+    - local_embedding_model_name: The local embedding model that embeds Documents on the CPU, without network access.
+      None means Documents are embedded with the OpenAI embedding model of OpenaiSettings.
+    - dimensions: The number of dimensions of local embeddings.
+    - hash_features: The number of buckets that words and word bigrams are hashed into.
+    - fit_sample_size: The number of Documents, evenly spaced over the corpus, that the local model is fitted to.
+    - batch_size: The number of texts that are embedded at a time.
+    """
+
+    local_embedding_model_name: LocalEmbeddingModelName | None = Field(default=None)
+    dimensions: int = Field(default=256, ge=1)
+    hash_features: int = Field(default=1 << 16, ge=1)
+    fit_sample_size: int = Field(default=20_000, ge=1)
+    batch_size: int = Field(default=256, ge=1)
+
+    @classmethod
+    def from_env_vars(cls) -> Self:
+        """Return a LocalEmbeddingSettings object, with settings obtained from environment variables."""
+
+        local_embedding_model_name = EnvVar(
+            "ETL_LOCAL_EMBEDDING_MODEL_NAME"
+        ).get_value()
+
+        return cls(
+            local_embedding_model_name=(
+                LocalEmbeddingModelName(local_embedding_model_name)
+                if local_embedding_model_name
+                else None
+            ),
+            dimensions=int(
+                str(EnvVar("ETL_LOCAL_EMBEDDING_DIMENSIONS").get_value(default="256"))
+            ),
+            hash_features=int(
+                str(
+                    EnvVar("ETL_LOCAL_EMBEDDING_HASH_FEATURES").get_value(
+                        default=str(1 << 16)
+                    )
+                )
+            ),
+            fit_sample_size=int(
+                str(
+                    EnvVar("ETL_LOCAL_EMBEDDING_FIT_SAMPLE_SIZE").get_value(
+                        default="20000"
+                    )
+                )
+            ),
+            batch_size=int(
+                str(EnvVar("ETL_LOCAL_EMBEDDING_BATCH_SIZE").get_value(default="256"))
+            ),
+        )
@@ -0,0 +1,49 @@
+import tempfile
+from pathlib import Path
+from typing import Self
+
+from dagster import ConfigurableResource, EnvVar
+from pydantic import Field
+
+from etl.memory import MemoryBudget
+
+
+class MemorySettings(ConfigurableResource):  # type: ignore[misc]
+    """
+    A ConfigurableResource that holds the memory budget of the steps of the ETL.
+
+    Properties include:
+    - memory_budget_bytes: The RSS that a step may reach. Stages spill their outputs to segment files on disk, and
+      process their inputs one item at a time, so that their memory does not grow with the number of Records.
+      None means outputs are held in memory.
+    - spill_directory_path: The path of the directory of the spilled segment files. Spilled outputs are read from
+      their segment files by downstream steps, so the directory must be shared by the steps of a run.
+    """
+
+    memory_budget_bytes: int | None = Field(default=None, ge=0)
+    spill_directory_path: str = Field(
+        default=str(Path(tempfile.gettempdir()) / "etl_spill")
+    )
+
+    @classmethod
+    def from_env_vars(cls, *, spill_directory_path_default: Path) -> Self:
+        """Return a MemorySettings object, with settings obtained from environment variables."""
+
+        memory_budget_bytes = EnvVar("ETL_MEMORY_BUDGET_BYTES").get_value()
+
+        return cls(
+            memory_budget_bytes=(
+                int(memory_budget_bytes) if memory_budget_bytes else None
+            ),
+            spill_directory_path=EnvVar("ETL_SPILL_DIRECTORY_PATH").get_value(
+                str(spill_directory_path_default)
+            ),
+        )
+
+    def memory_budget(self, spill_directory_name: str) -> MemoryBudget:
+        """Return a MemoryBudget that spills to the subdirectory spill_directory_name of spill_directory_path."""
+
+        return MemoryBudget(
+            budget_bytes=self.memory_budget_bytes,
+            spill_directory_path=Path(self.spill_directory_path) / spill_directory_name,
+        )
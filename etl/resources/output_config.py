@@ -31,6 +31,12 @@ class OutputConfig(ConfigurableResource):  # type: ignore[misc]
 
             return self.openai_embeddings_directory_path / "openai_embeddings_cache"
 
+        @property
+        def local_embeddings_directory_path(self) -> Path:
+            """The Path of the directory that contains local embeddings data."""
+
+            return self.output_directory_path / "local_embeddings"
+
         @property
         def record_enrichment_directory_path(self) -> Path:
             """The Path of the directory that contains data on enriched records."""
@@ -58,6 +64,12 @@ class OutputConfig(ConfigurableResource):  # type: ignore[misc]
                 / "wikipedia_articles_with_summaries.jsonl"
             )
 
+        @property
+        def wikidata_identifiers_file_path(self) -> Path:
+            """The Path of the file that maps Record keys to Wikidata identifiers."""
+
+            return self.output_directory_path / "wikidata_identifiers.sqlite"
+
         @property
         def wikipedia_anti_recommendations_file_path(self) -> Path:
             """The Path of the file that contains anti-recommendations of Wikipedia articles."""
@@ -67,12 +79,27 @@ class OutputConfig(ConfigurableResource):  # type: ignore[misc]
                 / "wikipedia_anti_recommendations.jsonl"
             )
 
+        @property
+        def retrieval_result_cache_file_path(self) -> Path:
+            """The Path of the file that caches the anti-recommendations retrieved for each Record key."""
+
+            return (
+                self.anti_recommendations_directory_path
+                / "retrieval_result_cache.sqlite"
+            )
+
         @property
         def wikipedia_arkg_file_path(self) -> Path:
             """The Path of the file that contains a Wikipedia ARKG."""
 
             return self.anti_recommendations_directory_path / "wikipedia_arkg"
 
+        @property
+        def wikipedia_arkg_stream_file_path(self) -> Path:
+            """The Path of the file that contains a Wikipedia ARKG streamed from anti-recommendations."""
+
+            return self.anti_recommendations_directory_path / "wikipedia_arkg_stream"
+
         @property
         def wikipedia_arkg_store_directory_path(self) -> Path:
             """The Path of the directory that contains a Wikipedia ARKG Store."""
@@ -1,11 +1,58 @@
-from dagster import ConfigurableResource
-from langchain_community.vectorstores.utils import DistanceStrategy
+from typing import Self
 
-from etl.models.types import ScoreThreshold
+from dagster import ConfigurableResource, EnvVar
+from pydantic import Field
+
+from etl.models.types import DistanceStrategy, ScoreThreshold
 
 
 class RetrievalAlgorithmParameters(ConfigurableResource):  # type: ignore[misc]
-    """A ConfigurableResource that holds the parameters of retrieval algorithms."""
+    """
+    A ConfigurableResource that holds the parameters of retrieval algorithms.
+
+    When rerank_oversampling_factor is set, k * rerank_oversampling_factor candidates are retrieved
+    from a compressed index and re-ranked exactly with full-precision vectors. Vector stores saved without a
+    compressed index are searched exactly instead.
+    When mmr_lambda_mult is set, k * mmr_fetch_k_factor candidates are retrieved
+    and re-ranked for diversity with maximal marginal relevance.
+    """
 
     distance_strategy: DistanceStrategy
     score_threshold: ScoreThreshold
+    rerank_oversampling_factor: int | None = Field(default=None, ge=1)
+    mmr_lambda_mult: float | None = Field(default=None, ge=0, le=1)
+    mmr_fetch_k_factor: int = Field(default=4, ge=1)
+
+    @classmethod
+    def from_env_vars(
+        cls,
+        *,
+        distance_strategy_default: DistanceStrategy = DistanceStrategy.EUCLIDEAN_DISTANCE,
+        score_threshold_default: ScoreThreshold = 0.5,
+    ) -> Self:
+        """Return a RetrievalAlgorithmParameters object, with parameter values obtained from environment variables."""
+
+        rerank_oversampling_factor = EnvVar(
+            "ETL_RERANK_OVERSAMPLING_FACTOR"
+        ).get_value()
+        mmr_lambda_mult = EnvVar("ETL_MMR_LAMBDA_MULT").get_value()
+
+        return cls(
+            distance_strategy=EnvVar("ETL_DISTANCE_STRATEGY").get_value(
+                default=distance_strategy_default
+            ),
+            score_threshold=float(
+                str(
+                    EnvVar("ETL_SCORE_THRESHOLD").get_value(
+                        default=str(score_threshold_default)
+                    )
+                )
+            ),
+            rerank_oversampling_factor=(
+                int(rerank_oversampling_factor) if rerank_oversampling_factor else None
+            ),
+            mmr_lambda_mult=float(mmr_lambda_mult) if mmr_lambda_mult else None,
+            mmr_fetch_k_factor=int(
+                str(EnvVar("ETL_MMR_FETCH_K_FACTOR").get_value(default="4"))
+            ),
+        )
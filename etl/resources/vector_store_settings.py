@@ -0,0 +1,50 @@
+from typing import Self
+
+from dagster import ConfigurableResource, EnvVar
+from pydantic import Field
+
+from etl.models.types import CompressedIndexType
+
+
+class VectorStoreSettings(ConfigurableResource):  # type: ignore[misc]
+    """
+    A ConfigurableResource that holds the settings of a vector store's layout.
+
+    Properties include:
+    - shard_count: The number of shards that are built in parallel.
+    - memory_budget_bytes: The size up to which shards are merged into one in-memory index.
+      Larger vector stores are searched across shard worker processes. None means shards are always merged.
+      Defaults to the memory budget of the steps of the ETL, ETL_MEMORY_BUDGET_BYTES, which counts the vector store.
+    - compressed_index_type: The type of compressed index that is saved next to the index for two-stage retrieval.
+      None means no compressed index is saved.
+    """
+
+    shard_count: int = Field(default=1, ge=1)
+    memory_budget_bytes: int | None = Field(default=None, ge=0)
+    compressed_index_type: CompressedIndexType | None = Field(default=None)
+
+    @classmethod
+    def from_env_vars(cls) -> Self:
+        """Return a VectorStoreSettings object, with settings obtained from environment variables."""
+
+        memory_budget_bytes = (
+            EnvVar("ETL_VECTOR_STORE_MEMORY_BUDGET_BYTES").get_value()
+            or EnvVar("ETL_MEMORY_BUDGET_BYTES").get_value()
+        )
+        compressed_index_type = EnvVar(
+            "ETL_VECTOR_STORE_COMPRESSED_INDEX_TYPE"
+        ).get_value()
+
+        return cls(
+            shard_count=int(
+                str(EnvVar("ETL_VECTOR_STORE_SHARD_COUNT").get_value(default="1"))
+            ),
+            memory_budget_bytes=(
+                int(memory_budget_bytes) if memory_budget_bytes else None
+            ),
+            compressed_index_type=(
+                CompressedIndexType(compressed_index_type)
+                if compressed_index_type
+                else None
+            ),
+        )
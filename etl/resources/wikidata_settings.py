@@ -0,0 +1,30 @@
+from typing import Self
+
+from dagster import ConfigurableResource, EnvVar
+
+
+class WikidataSettings(ConfigurableResource):  # type: ignore[misc]
+    """
+    A ConfigurableResource that holds the settings of Wikidata identifier resolution.
+
+    Properties include:
+    - mediawiki_api_url: The URL of the MediaWiki API that resolves titles that are not in the Wikidata identifier store.
+    - offline: Whether ARKGs are built from the Wikidata identifier store alone, without MediaWiki API requests.
+    """
+
+    mediawiki_api_url: str = "https://en.wikipedia.org/w/api.php"
+    offline: bool = False
+
+    @classmethod
+    def from_env_vars(cls) -> Self:
+        """Return a WikidataSettings object, with settings obtained from environment variables."""
+
+        return cls(
+            mediawiki_api_url=EnvVar("ETL_MEDIAWIKI_API_URL").get_value(
+                default=cls.model_fields["mediawiki_api_url"].default
+            ),
+            offline=str(EnvVar("ETL_WIKIDATA_OFFLINE").get_value(default="false"))
+            .strip()
+            .lower()
+            in ("1", "true", "yes"),
+        )
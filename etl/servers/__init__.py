@@ -0,0 +1,5 @@
+from .micro_batcher import MicroBatcher as MicroBatcher  # isort:skip
+from .anti_recommendation_server import (
+    AntiRecommendationServer as AntiRecommendationServer,
+)
+from .sparql_server import SparqlServer as SparqlServer
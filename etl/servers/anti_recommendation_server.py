@@ -0,0 +1,363 @@
+import argparse
+import json
+import logging
+import threading
+from collections.abc import Callable
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Self
+from urllib.parse import parse_qs, urlsplit
+
+from dagster import EnvVar
+
+from etl.models import AntiRecommendation
+from etl.models.types import DocumentsLimit, RecordKey
+from etl.pipelines import AntiRecommendationRetrievalPipeline
+from etl.resources import (
+    LocalEmbeddingSettings,
+    OpenaiSettings,
+    OutputConfig,
+    RetrievalAlgorithmParameters,
+)
+from etl.servers.micro_batcher import MicroBatcher
+from etl.stores import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class AntiRecommendationServer:
+    """
+    An HTTP server that answers anti-recommendation lookups from a memory-resident VectorStore.
+
+    Endpoints:
+    - GET /anti-recommendations?record_key=<key>&k=<k>: the anti-recommendations of a Record key.
+    - GET /health: the version of the index that is being served.
+
+    Concurrent lookups are grouped by a MicroBatcher and retrieved from the VectorStore as one batch.
+    The VectorStore is reopened whenever a new index version is published to the directory of vector_store_descriptor,
+    sharded or not as it was saved.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        vector_store_descriptor: VectorStore.Descriptor,
+        retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        max_batch_size: int = 64,
+        max_batch_wait_seconds: float = 0.002,
+        reload_interval_seconds: float = 5.0,
+        open_vector_store: Callable[
+            [VectorStore.Descriptor], VectorStore
+        ] = VectorStore.open,
+    ) -> None:
+        self.__vector_store_descriptor = vector_store_descriptor
+        self.__retrieval_algorithm_parameters = retrieval_algorithm_parameters
+        self.__open_vector_store = open_vector_store
+        self.__reload_interval_seconds = reload_interval_seconds
+        self.__reload_lock = threading.Lock()
+        self.__retrieval_lock = threading.Lock()
+        self.__closed = threading.Event()
+
+        self.__index_version = vector_store_descriptor.index_version
+        self.__vector_store = open_vector_store(
+            vector_store_descriptor.with_saved_shard_count()
+        )
+        self.__retrieval_pipeline = self.__create_retrieval_pipeline(
+            self.__vector_store
+        )
+
+        self.__micro_batcher: MicroBatcher[
+            tuple[RecordKey, DocumentsLimit], tuple[AntiRecommendation, ...]
+        ] = MicroBatcher(
+            process_batch=self.__retrieve_anti_recommendations,
+            max_batch_size=max_batch_size,
+            max_batch_wait_seconds=max_batch_wait_seconds,
+        )
+        self.__http_server = ThreadingHTTPServer(
+            (host, port), self.__create_request_handler_class()
+        )
+        self.__http_server.daemon_threads = True
+        self.__serve_thread = threading.Thread(
+            target=self.__http_server.serve_forever, daemon=True
+        )
+        self.__reload_thread = threading.Thread(
+            target=self.__watch_index_version, daemon=True
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
+        self.close()
+
+    def __create_retrieval_pipeline(
+        self, vector_store: VectorStore
+    ) -> AntiRecommendationRetrievalPipeline:
+        """Return an AntiRecommendationRetrievalPipeline that retrieves Documents from vector_store."""
+
+        return AntiRecommendationRetrievalPipeline(
+            vector_store=vector_store,
+            retrieval_algorithm_parameters=self.__retrieval_algorithm_parameters,
+        )
+
+    def __retrieve_anti_recommendations(
+        self, lookups: tuple[tuple[RecordKey, DocumentsLimit], ...]
+    ) -> tuple[tuple[AntiRecommendation, ...], ...]:
+        """
+        Return the anti-recommendations of a batch of (record_key, k) lookups, in the order of lookups.
+
+        Lookups that share the same k are retrieved together, and a Record is never its own anti-recommendation.
+        """
+
+        anti_recommendations: dict[int, tuple[AntiRecommendation, ...]] = {}
+
+        with self.__retrieval_lock:
+            for k in {k for _, k in lookups}:
+                lookup_indices = tuple(
+                    lookup_index
+                    for lookup_index, (_, lookup_k) in enumerate(lookups)
+                    if lookup_k == k
+                )
+
+                for lookup_index, retrieved_anti_recommendations in zip(
+                    lookup_indices,
+                    self.__retrieval_pipeline.retrieve_documents_batch(
+                        record_keys=tuple(
+                            lookups[lookup_index][0] for lookup_index in lookup_indices
+                        ),
+                        k=k,
+                    ),
+                    strict=True,
+                ):
+                    anti_recommendations[lookup_index] = tuple(
+                        anti_recommendation
+                        for anti_recommendation in retrieved_anti_recommendations
+                        if anti_recommendation.key != lookups[lookup_index][0]
+                    )
+
+        return tuple(
+            anti_recommendations[lookup_index] for lookup_index in range(len(lookups))
+        )
+
+    def __watch_index_version(self) -> None:
+        """Reload the VectorStore every reload_interval_seconds until the server is closed."""
+
+        while not self.__closed.wait(self.__reload_interval_seconds):
+            try:
+                self.reload()
+            except Exception:
+                logger.exception("Failed to reload the vector store.")
+
+    def __respond(
+        self,
+        request_handler: BaseHTTPRequestHandler,
+        status: HTTPStatus,
+        body: dict,
+    ) -> None:
+        """Write a JSON response to request_handler."""
+
+        encoded_body = json.dumps(body).encode("utf-8")
+
+        request_handler.send_response(status)
+        request_handler.send_header("Content-Type", "application/json")
+        request_handler.send_header("Content-Length", str(len(encoded_body)))
+        request_handler.end_headers()
+        request_handler.wfile.write(encoded_body)
+
+    def __handle_get(self, request_handler: BaseHTTPRequestHandler) -> None:
+        """Route a GET request to its endpoint."""
+
+        url = urlsplit(request_handler.path)
+        parameters = parse_qs(url.query)
+
+        if url.path == "/health":
+            self.__respond(
+                request_handler, HTTPStatus.OK, {"index_version": self.index_version}
+            )
+            return
+
+        if url.path != "/anti-recommendations":
+            self.__respond(
+                request_handler, HTTPStatus.NOT_FOUND, {"error": "unknown endpoint"}
+            )
+            return
+
+        if not parameters.get("record_key"):
+            self.__respond(
+                request_handler,
+                HTTPStatus.BAD_REQUEST,
+                {"error": "missing record_key parameter"},
+            )
+            return
+
+        record_key = parameters["record_key"][0]
+
+        try:
+            k = int(parameters.get("k", ["7"])[0])
+        except ValueError:
+            k = 0
+        if k < 1:
+            self.__respond(
+                request_handler,
+                HTTPStatus.BAD_REQUEST,
+                {"error": "k must be a positive integer"},
+            )
+            return
+
+        try:
+            anti_recommendations = self.__micro_batcher.submit((record_key, k)).result()
+        except Exception:
+            logger.exception("Failed to retrieve anti-recommendations.")
+            self.__respond(
+                request_handler,
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                {"error": "retrieval failed"},
+            )
+            return
+
+        self.__respond(
+            request_handler,
+            HTTPStatus.OK,
+            {
+                "record_key": record_key,
+                "anti_recommendations": [
+                    {
+                        "key": anti_recommendation.key,
+                        "similarity_score": anti_recommendation.similarity_score,
+                    }
+                    for anti_recommendation in anti_recommendations
+                ],
+            },
+        )
+
+    def __create_request_handler_class(self) -> type[BaseHTTPRequestHandler]:
+        """Return a BaseHTTPRequestHandler class that forwards requests to this server."""
+
+        handle_get = self.__handle_get
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                handle_get(self)
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                logger.debug(format, *args)
+
+        return RequestHandler
+
+    @property
+    def index_version(self) -> str | None:
+        """The version of the index that is being served."""
+
+        return self.__index_version
+
+    @property
+    def server_address(self) -> tuple[str, int]:
+        """The (host, port) tuple the server is bound to."""
+
+        host, port = self.__http_server.server_address[:2]
+        return str(host), int(port)
+
+    def reload(self) -> bool:
+        """
+        Reopen the VectorStore if a new index version has been published.
+
+        Return True if the VectorStore was reopened.
+        An index that is republished while it is being opened is left for the next reload.
+        """
+
+        with self.__reload_lock:
+            index_version = self.__vector_store_descriptor.index_version
+            if index_version is None or index_version == self.__index_version:
+                return False
+
+            vector_store = self.__open_vector_store(
+                self.__vector_store_descriptor.with_saved_shard_count()
+            )
+
+            if self.__vector_store_descriptor.index_version != index_version:
+                vector_store.close()
+                return False
+
+            with self.__retrieval_lock:
+                previous_vector_store = self.__vector_store
+                self.__vector_store = vector_store
+                self.__retrieval_pipeline = self.__create_retrieval_pipeline(
+                    vector_store
+                )
+                self.__index_version = index_version
+            previous_vector_store.close()
+
+            logger.info("Reloaded vector store at index version %s.", index_version)
+            return True
+
+    def start(self) -> None:
+        """Start serving requests and watching for new index versions in background threads."""
+
+        self.__serve_thread.start()
+        self.__reload_thread.start()
+
+    def serve_forever(self) -> None:
+        """Start the server and block until it is interrupted."""
+
+        self.start()
+        try:
+            self.__closed.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop serving requests and release the server's resources."""
+
+        self.__closed.set()
+        if self.__serve_thread.is_alive():
+            self.__http_server.shutdown()
+        self.__http_server.server_close()
+        self.__micro_batcher.close()
+        self.__vector_store.close()
+
+
+def main() -> None:
+    """Run an AntiRecommendationServer over the vector store of the ETL's output directory."""
+
+    argument_parser = argparse.ArgumentParser(description=main.__doc__)
+    argument_parser.add_argument("--host", default="127.0.0.1")
+    argument_parser.add_argument("--port", type=int, default=8000)
+    argument_parser.add_argument("--max-batch-size", type=int, default=64)
+    argument_parser.add_argument("--max-batch-wait-seconds", type=float, default=0.002)
+    argument_parser.add_argument("--reload-interval-seconds", type=float, default=5.0)
+    arguments = argument_parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    output_config = OutputConfig.from_env_vars(
+        output_directory_path_default=Path(__file__).parent.parent.absolute()
+        / "data"
+        / "output"
+    )
+
+    AntiRecommendationServer(
+        vector_store_descriptor=VectorStore.create_descriptor(
+            openai_settings=OpenaiSettings(
+                openai_api_key=EnvVar("OPENAI_API_KEY").get_value("")
+            ),
+            output_config=output_config,
+            local_embedding_settings=LocalEmbeddingSettings.from_env_vars(),
+        ),
+        retrieval_algorithm_parameters=RetrievalAlgorithmParameters.from_env_vars(),
+        host=arguments.host,
+        port=arguments.port,
+        max_batch_size=arguments.max_batch_size,
+        max_batch_wait_seconds=arguments.max_batch_wait_seconds,
+        reload_interval_seconds=arguments.reload_interval_seconds,
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
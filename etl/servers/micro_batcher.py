@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Generic, Self, TypeVar
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+
+class MicroBatcher(Generic[ItemT, ResultT]):
+    """
+    A batcher that groups items submitted by concurrent callers into batches.
+
+    A batch is processed once it holds max_batch_size items, or max_batch_wait_seconds after its first item arrived.
+    process_batch receives a tuple of items and must return a tuple of results in the same order. If it raises, or
+    returns a different number of results, the exception is set on the Futures of every item of the batch, and later
+    batches are still processed. Items cannot be submitted once the batcher is closed.
+    """
+
+    def __init__(
+        self,
+        *,
+        process_batch: Callable[[tuple[ItemT, ...]], tuple[ResultT, ...]],
+        max_batch_size: int,
+        max_batch_wait_seconds: float,
+    ) -> None:
+        self.__process_batch = process_batch
+        self.__max_batch_size = max_batch_size
+        self.__max_batch_wait_seconds = max_batch_wait_seconds
+        self.__closed = False
+        self.__closed_lock = threading.Lock()
+        self.__pending: queue.SimpleQueue[tuple[ItemT, Future[ResultT]] | None] = (
+            queue.SimpleQueue()
+        )
+        self.__worker = threading.Thread(target=self.__run, daemon=True)
+        self.__worker.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
+        self.close()
+
+    def __next_batch(
+        self,
+    ) -> tuple[list[tuple[ItemT, Future[ResultT]]], bool]:
+        """
+        Block until a batch is ready and return it.
+
+        The returned bool is True if the batcher was closed while the batch was collected.
+        """
+
+        first_pending = self.__pending.get()
+        if first_pending is None:
+            return [], True
+
+        batch = [first_pending]
+        deadline = time.monotonic() + self.__max_batch_wait_seconds
+
+        while len(batch) < self.__max_batch_size:
+            remaining_seconds = deadline - time.monotonic()
+            if remaining_seconds <= 0:
+                break
+            try:
+                pending = self.__pending.get(timeout=remaining_seconds)
+            except queue.Empty:
+                break
+            if pending is None:
+                return batch, True
+            batch.append(pending)
+
+        return batch, False
+
+    def __run(self) -> None:
+        """Process batches until the batcher is closed."""
+
+        closed = False
+        while not closed:
+            batch, closed = self.__next_batch()
+            # Futures that were cancelled before their batch is processed are left out of it.
+            batch = [
+                (item, future)
+                for item, future in batch
+                if future.set_running_or_notify_cancel()
+            ]
+            if batch:
+                self.__resolve(batch)
+
+    @staticmethod
+    def __fail(
+        batch: list[tuple[ItemT, Future[ResultT]]], exception: BaseException
+    ) -> None:
+        """Set exception on the Futures of every item of batch."""
+
+        for _, future in batch:
+            future.set_exception(exception)
+
+    def __resolve(self, batch: list[tuple[ItemT, Future[ResultT]]]) -> None:
+        """Process batch and set the result, or the exception, of each of its Futures."""
+
+        try:
+            results = tuple(self.__process_batch(tuple(item for item, _ in batch)))
+        except Exception as exception:  # noqa: BLE001
+            self.__fail(batch, exception)
+            return
+
+        if len(results) != len(batch):
+            message = (
+                f"process_batch returned {len(results)} results for {len(batch)} items"
+            )
+            self.__fail(batch, ValueError(message))
+            return
+
+        for (_, future), result in zip(batch, results, strict=True):
+            future.set_result(result)
+
+    def submit(self, item: ItemT) -> Future[ResultT]:
+        """
+        Add item to the next batch and return a Future of its result.
+
+        Raise a RuntimeError if the batcher is closed.
+        """
+
+        future: Future[ResultT] = Future()
+        with self.__closed_lock:
+            if self.__closed:
+                message = "cannot submit items to a closed MicroBatcher"
+                raise RuntimeError(message)
+            self.__pending.put((item, future))
+
+        return future
+
+    def close(self) -> None:
+        """Process the items that are already pending and stop the batcher."""
+
+        with self.__closed_lock:
+            if not self.__closed:
+                self.__closed = True
+                self.__pending.put(None)
+
+        self.__worker.join()
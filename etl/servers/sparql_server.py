@@ -0,0 +1,465 @@
+import argparse
+import contextlib
+import json
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Self
+from urllib.parse import parse_qs, urlsplit
+
+import pyoxigraph as ox
+
+from etl.models.types import SparqlQuery
+from etl.resources import OutputConfig
+from etl.stores import ArkgStore
+
+logger = logging.getLogger(__name__)
+
+SPARQL_RESULTS_JSON_MIME_TYPE = "application/sparql-results+json"
+N_TRIPLES_MIME_TYPE = "application/n-triples"
+XSD_STRING = ox.NamedNode("http://www.w3.org/2001/XMLSchema#string")
+RDF_LANG_STRING = ox.NamedNode("http://www.w3.org/1999/02/22-rdf-syntax-ns#langString")
+
+
+class SparqlServer:
+    """
+    An HTTP server that answers SPARQL 1.1 queries over an ARKG Store, which it opens read-only.
+
+    Endpoints:
+    - GET /sparql?query=<query> and POST /sparql, with an `application/sparql-query` or form-encoded body: the results of
+      a query, as SPARQL 1.1 Query Results JSON for SELECT and ASK queries, and as N-Triples for CONSTRUCT and DESCRIBE
+      queries.
+    - GET /health: whether the server is up.
+
+    Up to max_concurrent_queries queries are evaluated at once on a thread pool. Results are streamed to the client in
+    chunked responses of at least chunk_size bytes while they are evaluated. A query that has not been fully answered
+    after query_timeout_seconds is abandoned: before its first chunk, with a 504 response, and after it,
+    by closing the connection.
+    pyoxigraph cannot cancel the evaluation of a query, so the deadline is checked between its results, and an
+    abandoned query keeps its thread until it yields its next result or ends. A query that computes for long before
+    its first result, e.g. to sort or aggregate, holds its thread for as long, and max_concurrent_queries such
+    queries make every other query wait for a thread, and time out, until they are done.
+    Results of up to max_cached_result_bytes are kept in an LRU cache of cache_size queries.
+    The ARKG Store is never written to, so cached results stay valid for the life of the server.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        arkg_store_descriptor: ArkgStore.Descriptor,
+        host: str = "127.0.0.1",
+        port: int = 7878,
+        max_concurrent_queries: int = 8,
+        query_timeout_seconds: float = 30.0,
+        cache_size: int = 256,
+        max_cached_result_bytes: int = 1 << 20,
+        chunk_size: int = 1 << 16,
+    ) -> None:
+        self.__arkg_store = ArkgStore.open(arkg_store_descriptor, read_only=True)
+        self.__query_timeout_seconds = query_timeout_seconds
+        self.__cache_size = cache_size
+        self.__max_cached_result_bytes = max_cached_result_bytes
+        self.__chunk_size = chunk_size
+        self.__cached_results: OrderedDict[SparqlQuery, tuple[str, bytes]] = (
+            OrderedDict()
+        )
+        self.__cache_lock = threading.Lock()
+        self.__cache_hit_count = 0
+        self.__closed = threading.Event()
+
+        self.__query_executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_queries, thread_name_prefix="sparql-query"
+        )
+        self.__http_server = ThreadingHTTPServer(
+            (host, port), self.__create_request_handler_class()
+        )
+        self.__http_server.daemon_threads = True
+        self.__serve_thread = threading.Thread(
+            target=self.__http_server.serve_forever, daemon=True
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
+        self.close()
+
+    @staticmethod
+    def __serialize_term(term: ox.NamedNode | ox.BlankNode | ox.Literal) -> dict:
+        """Return term as an RDF term of the SPARQL 1.1 Query Results JSON format."""
+
+        if isinstance(term, ox.NamedNode):
+            return {"type": "uri", "value": term.value}
+
+        if isinstance(term, ox.BlankNode):
+            return {"type": "bnode", "value": term.value}
+
+        if isinstance(term, ox.Literal):
+            if term.language is not None:
+                return {
+                    "type": "literal",
+                    "value": term.value,
+                    "xml:lang": term.language,
+                }
+            if term.datatype not in (XSD_STRING, RDF_LANG_STRING):
+                return {
+                    "type": "literal",
+                    "value": term.value,
+                    "datatype": term.datatype.value,
+                }
+            return {"type": "literal", "value": term.value}
+
+        return {"type": "triple", "value": str(term)}
+
+    @classmethod
+    def __serialize_results(
+        cls, results: ox.QuerySolutions | ox.QueryTriples | bool
+    ) -> tuple[str, Iterator[str]]:
+        """Return the MIME type of results, and an iterator over their serialization that evaluates them lazily."""
+
+        if isinstance(results, bool):
+            return SPARQL_RESULTS_JSON_MIME_TYPE, iter(
+                (json.dumps({"head": {}, "boolean": results}),)
+            )
+
+        if isinstance(results, ox.QueryTriples):
+            return N_TRIPLES_MIME_TYPE, (f"{triple} .\n" for triple in results)
+
+        def serialize_solutions() -> Iterator[str]:
+            variables = [variable.value for variable in results.variables]
+            yield json.dumps({"head": {"vars": variables}})[:-1]
+            yield ', "results": {"bindings": ['
+
+            separator = ""
+            for solution in results:
+                yield separator + json.dumps(
+                    {
+                        variable: cls.__serialize_term(solution[variable])
+                        for variable in variables
+                        if solution[variable] is not None
+                    }
+                )
+                separator = ", "
+
+            yield "]}}"
+
+        return SPARQL_RESULTS_JSON_MIME_TYPE, serialize_solutions()
+
+    def __evaluate(
+        self, query: SparqlQuery, chunks: queue.Queue, deadline: float
+    ) -> None:
+        """
+        Evaluate query on the thread pool, and put its MIME type, then its serialized chunks, then None into chunks.
+
+        An exception is put into chunks instead if query fails, or if it is still waiting for a thread or running at deadline.
+        Results are cached once they are complete, if they are small enough.
+        """
+
+        try:
+            if time.monotonic() > deadline:
+                message = "query timed out while it waited for a thread"
+                raise TimeoutError(message)  # noqa: TRY301
+
+            content_type, serialized_results = self.__serialize_results(
+                self.__arkg_store.query(query)
+            )
+            chunks.put(content_type, timeout=max(deadline - time.monotonic(), 0))
+
+            cached_chunks: list[bytes] | None = []
+            cached_size = 0
+
+            for chunk in self.__chunk(serialized_results, deadline):
+                chunks.put(chunk, timeout=max(deadline - time.monotonic(), 0))
+
+                if cached_chunks is not None:
+                    cached_chunks.append(chunk)
+                    cached_size += len(chunk)
+                    if cached_size > self.__max_cached_result_bytes:
+                        cached_chunks = None
+
+            if cached_chunks is not None:
+                self.__cache(query, content_type, b"".join(cached_chunks))
+
+            chunks.put(None, timeout=max(deadline - time.monotonic(), 0))
+        except queue.Full:
+            pass
+        except Exception as exception:  # noqa: BLE001
+            with contextlib.suppress(queue.Full):
+                chunks.put_nowait(exception)
+
+    def __chunk(self, texts: Iterator[str], deadline: float) -> Iterator[bytes]:
+        """
+        Yield texts encoded in chunks of at least chunk_size bytes, except for the last chunk.
+
+        Raise TimeoutError once deadline has passed.
+        """
+
+        pending_texts: list[str] = []
+        pending_size = 0
+
+        for text in texts:
+            if time.monotonic() > deadline:
+                message = "query timed out"
+                raise TimeoutError(message)
+
+            pending_texts.append(text)
+            pending_size += len(text)
+
+            if pending_size >= self.__chunk_size:
+                yield "".join(pending_texts).encode("utf-8")
+                pending_texts.clear()
+                pending_size = 0
+
+        if pending_texts:
+            yield "".join(pending_texts).encode("utf-8")
+
+    def __cache(self, query: SparqlQuery, content_type: str, body: bytes) -> None:
+        """Cache the results of query, and evict the least recently used results beyond cache_size."""
+
+        with self.__cache_lock:
+            self.__cached_results[query] = (content_type, body)
+            self.__cached_results.move_to_end(query)
+            while len(self.__cached_results) > self.__cache_size:
+                self.__cached_results.popitem(last=False)
+
+    def __get_cached(self, query: SparqlQuery) -> tuple[str, bytes] | None:
+        """Return the cached MIME type and body of query's results, if they are cached."""
+
+        with self.__cache_lock:
+            cached_result = self.__cached_results.get(query)
+            if cached_result is not None:
+                self.__cached_results.move_to_end(query)
+                self.__cache_hit_count += 1
+            return cached_result
+
+    def __respond(
+        self,
+        request_handler: BaseHTTPRequestHandler,
+        status: HTTPStatus,
+        body: bytes,
+        content_type: str = "application/json",
+    ) -> None:
+        """Write a complete response to request_handler."""
+
+        request_handler.send_response(status)
+        request_handler.send_header("Content-Type", content_type)
+        request_handler.send_header("Content-Length", str(len(body)))
+        request_handler.end_headers()
+        request_handler.wfile.write(body)
+
+    def __respond_error(
+        self, request_handler: BaseHTTPRequestHandler, status: HTTPStatus, error: str
+    ) -> None:
+        """Write a JSON error response to request_handler."""
+
+        self.__respond(
+            request_handler, status, json.dumps({"error": error}).encode("utf-8")
+        )
+
+    def __read_query(self, request_handler: BaseHTTPRequestHandler) -> str | None:
+        """Return the query of a SPARQL protocol request, or None if it has none."""
+
+        url = urlsplit(request_handler.path)
+
+        if request_handler.command == "GET":
+            return parse_qs(url.query).get("query", [None])[0]
+
+        body = request_handler.rfile.read(
+            int(request_handler.headers.get("Content-Length", 0))
+        ).decode("utf-8")
+        content_type = (
+            request_handler.headers.get("Content-Type", "").split(";")[0].strip()
+        )
+
+        if content_type == "application/sparql-query":
+            return body
+
+        return parse_qs(body).get("query", [None])[0]
+
+    def __handle_query(self, request_handler: BaseHTTPRequestHandler) -> None:
+        """Answer a SPARQL protocol request, from the cache or by streaming the results of its query."""
+
+        url = urlsplit(request_handler.path)
+
+        if request_handler.command == "GET" and url.path == "/health":
+            self.__respond(request_handler, HTTPStatus.OK, b'{"status": "ok"}')
+            return
+
+        if url.path != "/sparql":
+            self.__respond_error(
+                request_handler, HTTPStatus.NOT_FOUND, "unknown endpoint"
+            )
+            return
+
+        query = self.__read_query(request_handler)
+        if not query:
+            self.__respond_error(
+                request_handler, HTTPStatus.BAD_REQUEST, "missing query parameter"
+            )
+            return
+
+        cached_result = self.__get_cached(query)
+        if cached_result is not None:
+            content_type, body = cached_result
+            self.__respond(request_handler, HTTPStatus.OK, body, content_type)
+            return
+
+        self.__answer_query(request_handler, query)
+
+    @staticmethod
+    def __next_chunk(chunks: queue.Queue, deadline: float) -> object:
+        """Return the next item that the evaluation of a query put into chunks, or a TimeoutError at deadline."""
+
+        try:
+            return chunks.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            return TimeoutError()
+
+    def __answer_query(
+        self, request_handler: BaseHTTPRequestHandler, query: SparqlQuery
+    ) -> None:
+        """Evaluate query on the thread pool, and stream its results to request_handler as a chunked response."""
+
+        deadline = time.monotonic() + self.__query_timeout_seconds
+        chunks: queue.Queue = queue.Queue(maxsize=16)
+        self.__query_executor.submit(self.__evaluate, query, chunks, deadline)
+
+        content_type = self.__next_chunk(chunks, deadline)
+
+        if isinstance(content_type, SyntaxError):
+            self.__respond_error(
+                request_handler, HTTPStatus.BAD_REQUEST, str(content_type)
+            )
+            return
+        if isinstance(content_type, TimeoutError):
+            self.__respond_error(
+                request_handler, HTTPStatus.GATEWAY_TIMEOUT, "query timed out"
+            )
+            return
+        if isinstance(content_type, Exception):
+            logger.error("Failed to evaluate a query.", exc_info=content_type)
+            self.__respond_error(
+                request_handler, HTTPStatus.INTERNAL_SERVER_ERROR, "query failed"
+            )
+            return
+
+        request_handler.send_response(HTTPStatus.OK)
+        request_handler.send_header("Content-Type", str(content_type))
+        request_handler.send_header("Transfer-Encoding", "chunked")
+        request_handler.end_headers()
+
+        while (chunk := self.__next_chunk(chunks, deadline)) is not None:
+            if isinstance(chunk, Exception):
+                logger.warning("Abandoned a streamed query: %s", chunk)
+                request_handler.close_connection = True
+                return
+
+            request_handler.wfile.write(
+                b"%x\r\n%s\r\n" % (len(chunk), chunk)  # type: ignore[arg-type]
+            )
+
+        request_handler.wfile.write(b"0\r\n\r\n")
+
+    def __create_request_handler_class(self) -> type[BaseHTTPRequestHandler]:
+        """Return a BaseHTTPRequestHandler class that forwards requests to this server."""
+
+        handle_query = self.__handle_query
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and chunks are separate writes, which Nagle's algorithm would hold back for a delayed ACK.
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:  # noqa: N802
+                handle_query(self)
+
+            def do_POST(self) -> None:  # noqa: N802
+                handle_query(self)
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                logger.debug(format, *args)
+
+        return RequestHandler
+
+    @property
+    def cache_hit_count(self) -> int:
+        """The number of queries that were answered from the cache so far."""
+
+        return self.__cache_hit_count
+
+    @property
+    def server_address(self) -> tuple[str, int]:
+        """The (host, port) tuple the server is bound to."""
+
+        host, port = self.__http_server.server_address[:2]
+        return str(host), int(port)
+
+    def start(self) -> None:
+        """Start serving requests in a background thread."""
+
+        self.__serve_thread.start()
+
+    def serve_forever(self) -> None:
+        """Start the server and block until it is interrupted."""
+
+        self.start()
+        try:
+            self.__closed.wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop serving requests and release the server's resources."""
+
+        self.__closed.set()
+        if self.__serve_thread.is_alive():
+            self.__http_server.shutdown()
+        self.__http_server.server_close()
+        self.__query_executor.shutdown(wait=True, cancel_futures=True)
+        self.__arkg_store.close()
+
+
+def main() -> None:
+    """Run a SparqlServer over the ARKG Store of the ETL's output directory."""
+
+    argument_parser = argparse.ArgumentParser(description=main.__doc__)
+    argument_parser.add_argument("--host", default="127.0.0.1")
+    argument_parser.add_argument("--port", type=int, default=7878)
+    argument_parser.add_argument("--max-concurrent-queries", type=int, default=8)
+    argument_parser.add_argument("--query-timeout-seconds", type=float, default=30.0)
+    argument_parser.add_argument("--cache-size", type=int, default=256)
+    argument_parser.add_argument("--max-cached-result-bytes", type=int, default=1 << 20)
+    arguments = argument_parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    SparqlServer(
+        arkg_store_descriptor=ArkgStore.Descriptor(
+            OutputConfig.from_env_vars(
+                output_directory_path_default=Path(__file__).parent.parent.absolute()
+                / "data"
+                / "output"
+            )
+            .parse()
+            .wikipedia_arkg_store_directory_path
+        ),
+        host=arguments.host,
+        port=arguments.port,
+        max_concurrent_queries=arguments.max_concurrent_queries,
+        query_timeout_seconds=arguments.query_timeout_seconds,
+        cache_size=arguments.cache_size,
+        max_cached_result_bytes=arguments.max_cached_result_bytes,
+    ).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,34 @@
-from .arkg_store import ArkgStore as ArkgStore
-from .vector_store import VectorStore as VectorStore
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .arkg_lookup_tables import ArkgLookupTables as ArkgLookupTables
+    from .arkg_store import ArkgStore as ArkgStore
+    from .retrieval_result_cache import RetrievalResultCache as RetrievalResultCache
+    from .vector_store import VectorStore as VectorStore
+    from .vector_store_shard_pool import (
+        VectorStoreShardPool as VectorStoreShardPool,
+    )
+    from .wikidata_identifier_store import (
+        WikidataIdentifierStore as WikidataIdentifierStore,
+    )
+
+# Stores are imported when they are first accessed, so that importing one store does not import the
+# dependencies of the others, e.g. FAISS and LangChain for the ARKG assets.
+_STORE_MODULE_NAMES = {
+    "ArkgLookupTables": "arkg_lookup_tables",
+    "ArkgStore": "arkg_store",
+    "RetrievalResultCache": "retrieval_result_cache",
+    "VectorStore": "vector_store",
+    "VectorStoreShardPool": "vector_store_shard_pool",
+    "WikidataIdentifierStore": "wikidata_identifier_store",
+}
+
+
+def __getattr__(name: str) -> object:
+    module_name = _STORE_MODULE_NAMES.get(name)
+    if module_name is None:
+        message = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(message)
+
+    return getattr(import_module(f"{__name__}.{module_name}"), name)
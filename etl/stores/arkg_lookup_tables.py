@@ -0,0 +1,188 @@
+import secrets
+import shutil
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Self
+
+import numpy as np
+
+from etl.models.compact_anti_recommendation_graphs import (
+    CompactAntiRecommendationGraphs,
+)
+from etl.models.types import AntiRecommendationKey, RecordKey
+
+
+class ArkgLookupTables:
+    """
+    Precomputed adjacency tables of an ARKG, that answer anti-recommendation lookups without SPARQL.
+
+    Record keys and anti-recommendation keys are interned in one key dictionary, by CompactAntiRecommendationGraphs,
+    and saved in its key_data and key_offsets format. The forward table maps each key to the anti-recommendation keys
+    of its Record, and the reverse table maps each key to the Record keys it is an anti-recommendation of. Both tables
+    are the CSR arrays of CompactAntiRecommendationGraphs.key_csr: the neighbors of key index i are
+    targets[offsets[i]:offsets[i + 1]], in int32 key indices.
+    Tables are saved as .npy files that are memory-mapped on load, and swapped in whole.
+    """
+
+    ARRAY_NAMES = (
+        "key_data",
+        "key_offsets",
+        "forward_offsets",
+        "forward_targets",
+        "reverse_offsets",
+        "reverse_targets",
+    )
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        key_data: np.ndarray,
+        key_offsets: np.ndarray,
+        forward_offsets: np.ndarray,
+        forward_targets: np.ndarray,
+        reverse_offsets: np.ndarray,
+        reverse_targets: np.ndarray,
+    ) -> None:
+        self.__key_data = key_data
+        self.__key_offsets = key_offsets
+        self.__keys = CompactAntiRecommendationGraphs.decode_keys(key_data, key_offsets)
+        self.__key_indices = {
+            key: key_index for key_index, key in enumerate(self.__keys)
+        }
+        self.__forward_offsets = forward_offsets
+        self.__forward_targets = forward_targets
+        self.__reverse_offsets = reverse_offsets
+        self.__reverse_targets = reverse_targets
+
+    @classmethod
+    def from_anti_recommendation_graphs(
+        cls,
+        anti_recommendation_graphs: Iterable[
+            tuple[RecordKey, tuple[AntiRecommendationKey, ...]]
+        ],
+    ) -> Self:
+        """Return the lookup tables of anti_recommendation_graphs."""
+
+        compact_anti_recommendation_graphs = (
+            CompactAntiRecommendationGraphs.from_anti_recommendation_graphs(
+                anti_recommendation_graphs
+            )
+        )
+        forward_offsets, forward_targets = compact_anti_recommendation_graphs.key_csr()
+        reverse_offsets, reverse_targets = compact_anti_recommendation_graphs.key_csr(
+            reverse=True
+        )
+
+        return cls(
+            key_data=compact_anti_recommendation_graphs.key_data,
+            key_offsets=compact_anti_recommendation_graphs.key_offsets,
+            forward_offsets=forward_offsets,
+            forward_targets=forward_targets,
+            reverse_offsets=reverse_offsets,
+            reverse_targets=reverse_targets,
+        )
+
+    @classmethod
+    def is_saved(cls, directory_path: Path) -> bool:
+        """Whether lookup tables, in the current format, are saved in directory_path."""
+
+        return all(
+            (directory_path / f"{array_name}.npy").exists()
+            for array_name in cls.ARRAY_NAMES
+        )
+
+    @classmethod
+    def load(cls, directory_path: Path) -> Self:
+        """Return the lookup tables saved in directory_path, with their arrays memory-mapped."""
+
+        # directory_path is resolved once, so that every file is read from the same save.
+        directory_path = directory_path.resolve()
+
+        return cls(
+            **{
+                array_name: np.load(directory_path / f"{array_name}.npy", mmap_mode="r")
+                for array_name in cls.ARRAY_NAMES
+            },
+        )
+
+    def save(self, directory_path: Path) -> None:
+        """
+        Save the lookup tables to directory_path.
+
+        The files are written to a new directory next to directory_path, and directory_path is then replaced with a
+        symbolic link to it by a single rename, so that readers see either the previous tables or the new ones, never
+        a mix of both. The directory of the previous tables is kept for the readers that are still loading it, and
+        older ones are removed.
+        """
+
+        directory_path.parent.mkdir(parents=True, exist_ok=True)
+        save_directory_path = directory_path.with_name(
+            f"{directory_path.name}.{secrets.token_hex(8)}"
+        )
+        save_directory_path.mkdir()
+
+        arrays = {
+            "key_data": self.__key_data,
+            "key_offsets": self.__key_offsets,
+            "forward_offsets": self.__forward_offsets,
+            "forward_targets": self.__forward_targets,
+            "reverse_offsets": self.__reverse_offsets,
+            "reverse_targets": self.__reverse_targets,
+        }
+        for array_name, array in arrays.items():
+            np.save(save_directory_path / f"{array_name}.npy", array)
+
+        previous_directory_path = (
+            directory_path.resolve() if directory_path.is_symlink() else None
+        )
+        # Tables saved before saves were swapped in are a directory, which a rename cannot replace.
+        if directory_path.is_dir() and not directory_path.is_symlink():
+            shutil.rmtree(directory_path)
+
+        link_path = save_directory_path.with_name(f"{save_directory_path.name}.link")
+        link_path.symlink_to(save_directory_path.name, target_is_directory=True)
+        link_path.replace(directory_path)
+
+        kept_directory_paths = (save_directory_path.resolve(), previous_directory_path)
+        for stale_path in directory_path.parent.glob(f"{directory_path.name}.*"):
+            if (
+                not stale_path.is_symlink()
+                and stale_path.resolve() not in kept_directory_paths
+            ):
+                shutil.rmtree(stale_path, ignore_errors=True)
+
+    def anti_recommendations(
+        self, record_key: RecordKey
+    ) -> tuple[AntiRecommendationKey, ...]:
+        """Return the anti-recommendation keys of record_key, in the order they were retrieved."""
+
+        key_index = self.__key_indices.get(record_key)
+        if key_index is None:
+            return ()
+
+        return tuple(
+            self.__keys[target]
+            for target in self.__forward_targets[
+                self.__forward_offsets[key_index] : self.__forward_offsets[
+                    key_index + 1
+                ]
+            ].tolist()
+        )
+
+    def anti_recommended_by(
+        self, anti_recommendation_key: AntiRecommendationKey
+    ) -> tuple[RecordKey, ...]:
+        """Return the Record keys that have anti_recommendation_key as an anti-recommendation."""
+
+        key_index = self.__key_indices.get(anti_recommendation_key)
+        if key_index is None:
+            return ()
+
+        return tuple(
+            self.__keys[target]
+            for target in self.__reverse_targets[
+                self.__reverse_offsets[key_index] : self.__reverse_offsets[
+                    key_index + 1
+                ]
+            ].tolist()
+        )
@@ -1,59 +1,121 @@
+import logging
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
+from itertools import groupby
 from pathlib import Path
-from typing import Self
+from typing import Self, cast
 
 import pyoxigraph as ox
 
-from etl.models import AntiRecommendationGraphTuple
-from etl.models.types import RdfMimeType, SparqlQuery
+from etl.models import AntiRecommendationGraphTuple, ArkgStoreDescriptor
+from etl.models.types import (
+    AntiRecommendationKey,
+    RdfMimeType,
+    RecordKey,
+    SparqlQuery,
+)
+from etl.namespaces import ARKG, SCHEMA
 from etl.pipelines.arkg_builder_pipeline import ArkgBuilderPipeline
+from etl.resources import CompressionSettings, WikidataSettings
+from etl.stores.arkg_lookup_tables import ArkgLookupTables
+from etl.stores.wikidata_identifier_store import WikidataIdentifierStore
+from etl.writers import open_compressed_file
+
+logger = logging.getLogger(__name__)
 
 
 class ArkgStore:
     """A store for an Anti-Recommendation Knowledge Graph."""
 
+    Descriptor = ArkgStoreDescriptor
+
     @dataclass(frozen=True)
-    class Descriptor:
-        """A dataclass that holds the Path of a directory that contains an ARKG."""
+    class Changes:
+        """A dataclass that holds the counts of the changes an update applied to an ARKG."""
 
-        directory_path: Path
+        added_quad_count: int
+        removed_quad_count: int
+        changed_subject_count: int
 
     def __init__(self, *, store: ox.Store, directory_path: Path) -> None:
         self.__store = store
         self.__directory_path = directory_path
+        self.__lookup_tables: ArkgLookupTables | None = None
+        self.__closed = False
 
     def __enter__(self) -> Self:
         return self
 
     def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
-        del self.__store
+        self.close()
+
+    @staticmethod
+    def __create_arkg_builder_pipeline(
+        *,
+        directory_path: Path,
+        requests_cache_directory_path: Path,
+        wikidata_identifier_store: WikidataIdentifierStore | None,
+        wikidata_settings: WikidataSettings | None,
+    ) -> ArkgBuilderPipeline:
+        """Return an ArkgBuilderPipeline that resolves Wikidata identifiers as configured by wikidata_settings."""
+
+        if wikidata_settings is None:
+            wikidata_settings = WikidataSettings()
+
+        return ArkgBuilderPipeline(
+            arkg_store_directory_path=directory_path,
+            requests_cache_directory_path=requests_cache_directory_path,
+            wikidata_identifier_store=wikidata_identifier_store,
+            mediawiki_api_url=(
+                None
+                if wikidata_settings.offline
+                else wikidata_settings.mediawiki_api_url
+            ),
+        )
 
     @classmethod
-    def create(
+    def create(  # noqa: PLR0913
         cls,
         *,
         directory_path: Path,
         requests_cache_directory_path: Path,
         anti_recommendation_graphs: AntiRecommendationGraphTuple,
+        wikidata_identifier_store: WikidataIdentifierStore | None = None,
+        wikidata_settings: WikidataSettings | None = None,
     ) -> Self:
         """
         Return an ArkgStore that contains an ARKG Store constructed with an ArkgBuilderPipeline.
+
+        Wikidata identifiers are looked up in wikidata_identifier_store before they are requested from the MediaWiki API.
+        The ArkgLookupTables of anti_recommendation_graphs are saved next to the ARKG Store.
         """
 
-        return cls(
-            store=ArkgBuilderPipeline(
-                arkg_store_directory_path=directory_path,
-                requests_cache_directory_path=requests_cache_directory_path,
-            ).construct_graph(anti_recommendation_graphs.anti_recommendation_graphs),
+        store = cls.__create_arkg_builder_pipeline(
             directory_path=directory_path,
-        )
+            requests_cache_directory_path=requests_cache_directory_path,
+            wikidata_identifier_store=wikidata_identifier_store,
+            wikidata_settings=wikidata_settings,
+        ).construct_graph(anti_recommendation_graphs.anti_recommendation_graphs)
+        ArkgLookupTables.from_anti_recommendation_graphs(
+            anti_recommendation_graphs.anti_recommendation_graphs
+        ).save(cls.Descriptor(directory_path).lookup_tables_directory_path)
+
+        return cls(store=store, directory_path=directory_path)
 
     @classmethod
-    def open(cls, descriptor: Descriptor) -> Self:
-        """Return an ArkgStore that contains a RDF Store initialized with descriptor.directory_path."""
+    def open(cls, descriptor: Descriptor, *, read_only: bool = False) -> Self:
+        """
+        Return an ArkgStore that contains a RDF Store initialized with descriptor.directory_path.
+
+        Any number of processes can open the same ARKG Store with read_only, as long as no process has it open for writing.
+        """
 
         return cls(
-            store=ox.Store(path=descriptor.directory_path),
+            store=(
+                ox.Store.read_only(str(descriptor.directory_path))
+                if read_only
+                else ox.Store(path=descriptor.directory_path)
+            ),
             directory_path=descriptor.directory_path,
         )
 
@@ -63,16 +125,211 @@ class ArkgStore:
 
         return ArkgStore.Descriptor(self.__directory_path)
 
-    def dump(self, file_path: Path, rdf_mime_type: RdfMimeType) -> None:
+    def update(
+        self,
+        *,
+        requests_cache_directory_path: Path,
+        anti_recommendation_graphs: AntiRecommendationGraphTuple,
+        wikidata_identifier_store: WikidataIdentifierStore | None = None,
+        wikidata_settings: WikidataSettings | None = None,
+    ) -> Changes:
+        """
+        Update the ARKG Store to the ARKG of anti_recommendation_graphs, and return the counts of the applied changes.
+
+        The Quads of anti_recommendation_graphs are grouped by subject, and compared with the Quads of the same subject
+        in the Store. Subjects that are only in the Store lose all of their Quads.
+        The removed and added Quads are applied in one SPARQL update, which pyoxigraph runs as one transaction, so that
+        a failed update leaves the Store unchanged. The Quads of the ARKG are held in memory, grouped by subject, and
+        the update holds the changed Quads. An empty Store is bulk loaded instead, without a transaction.
+        The ArkgLookupTables next to the ARKG Store are rebuilt from anti_recommendation_graphs once the Store is
+        updated, so that a failed update leaves the tables of the previous ARKG.
+        """
+
+        quads_by_subject: dict[ox.NamedNode | ox.BlankNode, set[ox.Quad]] = {}
+        for quad in self.__create_arkg_builder_pipeline(
+            directory_path=self.__directory_path,
+            requests_cache_directory_path=requests_cache_directory_path,
+            wikidata_identifier_store=wikidata_identifier_store,
+            wikidata_settings=wikidata_settings,
+        ).generate_quads(anti_recommendation_graphs.anti_recommendation_graphs):
+            quads_by_subject.setdefault(quad.subject, set()).add(quad)
+
+        if not len(self.__store):
+            self.__store.bulk_extend(
+                quad for quads in quads_by_subject.values() for quad in quads
+            )
+            self.__save_lookup_tables(anti_recommendation_graphs)
+            return ArkgStore.Changes(
+                added_quad_count=len(self.__store),
+                removed_quad_count=0,
+                changed_subject_count=len(quads_by_subject),
+            )
+
+        removed_quads = [
+            quad for quad in self.__store if quad.subject not in quads_by_subject
+        ]
+        changed_subjects = {quad.subject for quad in removed_quads}
+        added_quads: list[ox.Quad] = []
+
+        for subject, quads in quads_by_subject.items():
+            stored_quads = set(self.__store.quads_for_pattern(subject, None, None))
+            if stored_quads == quads:
+                continue
+
+            changed_subjects.add(subject)
+            removed_quads.extend(stored_quads - quads)
+            added_quads.extend(quads - stored_quads)
+
+        if changed_subjects:
+            self.__store.update(
+                f"DELETE DATA {{ {self.__to_sparql_data(removed_quads)} }} ;\n"
+                f"INSERT DATA {{ {self.__to_sparql_data(added_quads)} }}"
+            )
+
+        self.__save_lookup_tables(anti_recommendation_graphs)
+
+        return ArkgStore.Changes(
+            added_quad_count=len(added_quads),
+            removed_quad_count=len(removed_quads),
+            changed_subject_count=len(changed_subjects),
+        )
+
+    @staticmethod
+    def __to_sparql_data(quads: Iterable[ox.Quad]) -> str:
+        """Return quads as the data block of a SPARQL `INSERT DATA` or `DELETE DATA` operation."""
+
+        return "\n".join(
+            (
+                f"{quad.triple} ."
+                if quad.graph_name == ox.DefaultGraph()
+                else f"GRAPH {quad.graph_name} {{ {quad.triple} . }}"
+            )
+            for quad in quads
+        )
+
+    def __save_lookup_tables(
+        self, anti_recommendation_graphs: AntiRecommendationGraphTuple
+    ) -> None:
+        """Save the ArkgLookupTables of anti_recommendation_graphs next to the ARKG Store."""
+
+        self.__lookup_tables = ArkgLookupTables.from_anti_recommendation_graphs(
+            anti_recommendation_graphs.anti_recommendation_graphs
+        )
+        self.__lookup_tables.save(self.descriptor.lookup_tables_directory_path)
+
+    def __anti_recommendation_graphs(
+        self,
+    ) -> Iterator[tuple[RecordKey, tuple[AntiRecommendationKey, ...]]]:
+        """
+        Yield the anti-recommendation graphs of the ARKG Store.
+
+        The Store does not hold the order anti-recommendations were retrieved in, so the anti-recommendation keys
+        of every Record key are sorted.
+        """
+
+        solutions = cast(
+            ox.QuerySolutions,
+            self.__store.query(
+                f"""
+                SELECT ?title ?anti_recommendation WHERE {{
+                    ?item {SCHEMA.TITLE} ?title .
+                    OPTIONAL {{ ?anti_recommendation {SCHEMA.ITEM_REVIEWED} ?item }}
+                }}
+                ORDER BY ?title ?anti_recommendation
+                """
+            ),
+        )
+
+        for title, title_solutions in groupby(
+            solutions, key=lambda solution: cast(ox.Literal, solution["title"]).value
+        ):
+            yield (
+                RecordKey(title),
+                tuple(
+                    AntiRecommendationKey(
+                        solution["anti_recommendation"].value.removeprefix(
+                            ARKG.BASE_IRI.value
+                        )
+                    )
+                    for solution in title_solutions
+                    if solution["anti_recommendation"] is not None
+                ),
+            )
+
+    @property
+    def __loaded_lookup_tables(self) -> ArkgLookupTables:
+        """
+        The ArkgLookupTables next to the ARKG Store, which are loaded on first use.
+
+        ARKG Stores built without lookup tables, or with lookup tables in a previous format, get them rebuilt from the
+        Store.
+        """
+
+        if self.__lookup_tables is None:
+            lookup_tables_directory_path = self.descriptor.lookup_tables_directory_path
+
+            if ArkgLookupTables.is_saved(lookup_tables_directory_path):
+                self.__lookup_tables = ArkgLookupTables.load(
+                    lookup_tables_directory_path
+                )
+            else:
+                logger.warning(
+                    "Rebuilding the missing or outdated lookup tables of %s.",
+                    self.__directory_path,
+                )
+                self.__lookup_tables = ArkgLookupTables.from_anti_recommendation_graphs(
+                    self.__anti_recommendation_graphs()
+                )
+                self.__lookup_tables.save(lookup_tables_directory_path)
+
+        return self.__lookup_tables
+
+    def anti_recommendations(
+        self, record_key: RecordKey
+    ) -> tuple[AntiRecommendationKey, ...]:
+        """Return the anti-recommendation keys of record_key from the ArkgLookupTables, without a SPARQL query."""
+
+        return self.__loaded_lookup_tables.anti_recommendations(record_key)
+
+    def anti_recommended_by(
+        self, anti_recommendation_key: AntiRecommendationKey
+    ) -> tuple[RecordKey, ...]:
+        """Return the Record keys that anti-recommend anti_recommendation_key from the ArkgLookupTables, without a SPARQL query."""
+
+        return self.__loaded_lookup_tables.anti_recommended_by(anti_recommendation_key)
+
+    def close(self) -> None:
+        """
+        Release the ARKG Store, so that it can be opened for writing by another ArkgStore.
+
+        Closing a closed ArkgStore does nothing.
+        """
+
+        if self.__closed:
+            return
+
+        self.__closed = True
+        del self.__store
+
+    def dump(
+        self,
+        file_path: Path,
+        rdf_mime_type: RdfMimeType,
+        compression_settings: CompressionSettings | None = None,
+    ) -> None:
         """
         Dump the ARKG Store into a file.
 
         The RDF serialization is determined by arkg_mime_type.
+        It is compressed as it is written, as configured by compression_settings.
         """
-        self.__store.dump(
-            output=file_path,
-            mime_type=rdf_mime_type,
-        )
+        with open_compressed_file(
+            file_path, compression_settings=compression_settings
+        ) as file:
+            self.__store.dump(
+                output=file,
+                mime_type=rdf_mime_type,
+            )
 
     def load(self, file_path: Path, rdf_mime_type: RdfMimeType) -> None:
         """
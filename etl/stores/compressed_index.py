@@ -0,0 +1,109 @@
+import math
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from etl.models.types import CompressedIndexType, DocumentsLimit
+
+# A PQ index with 1 bit per sub-quantizer trains 2 centroids.
+MIN_PQ_TRAINING_VECTORS = 2
+
+
+def save_compressed_index(
+    index: faiss.Index,
+    compressed_index_type: CompressedIndexType,
+    *,
+    compressed_index_file_path: Path,
+    vectors_file_path: Path,
+) -> None:
+    """
+    Save the full-precision vectors of index as a NumPy file, and a compressed index built from them.
+
+    INT8 indexes quantize each dimension to 8 bits. PQ indexes encode groups of about 8 dimensions
+    with up to 8 bits each, using fewer bits when there are too few vectors to train 256 centroids, and
+    fall back to INT8 when there are too few vectors to train two.
+    """
+
+    vectors = index.reconstruct_n(0, index.ntotal)
+
+    if (
+        compressed_index_type == CompressedIndexType.PQ
+        and index.ntotal >= MIN_PQ_TRAINING_VECTORS
+    ):
+        sub_quantizers_count = next(
+            sub_quantizers_count
+            for sub_quantizers_count in range(max(index.d // 8, 1), 0, -1)
+            if index.d % sub_quantizers_count == 0
+        )
+        compressed_index = faiss.IndexPQ(
+            index.d,
+            sub_quantizers_count,
+            min(8, max(int(math.log2(max(index.ntotal, 2))), 1)),
+            index.metric_type,
+        )
+    else:
+        compressed_index = faiss.IndexScalarQuantizer(
+            index.d, faiss.ScalarQuantizer.QT_8bit, index.metric_type
+        )
+
+    compressed_index.train(vectors)
+    compressed_index.add(vectors)
+
+    np.save(vectors_file_path, vectors)
+    faiss.write_index(compressed_index, str(compressed_index_file_path))
+
+
+def load_compressed_index(
+    *, compressed_index_file_path: Path, vectors_file_path: Path
+) -> tuple[faiss.Index, np.ndarray]:
+    """Return the compressed index, and the memory-mapped full-precision vectors, saved by save_compressed_index."""
+
+    return (
+        faiss.read_index(str(compressed_index_file_path)),
+        np.load(vectors_file_path, mmap_mode="r"),
+    )
+
+
+def search_compressed_index(
+    *,
+    compressed_index: faiss.Index,
+    vectors: np.ndarray,
+    query_vectors: np.ndarray,
+    k: DocumentsLimit,
+    rerank_oversampling_factor: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return the (distances, indices) arrays of the k closest vectors to each query vector.
+
+    k * rerank_oversampling_factor candidates are retrieved from compressed_index,
+    and re-ranked with exact distances to the full-precision vectors.
+    """
+
+    _, candidate_indices = compressed_index.search(
+        query_vectors, k * rerank_oversampling_factor
+    )
+    is_candidate = candidate_indices != -1
+    candidate_vectors = vectors[np.where(is_candidate, candidate_indices, 0)]
+
+    if compressed_index.metric_type == faiss.METRIC_INNER_PRODUCT:
+        candidate_distances = np.einsum("qcd,qd->qc", candidate_vectors, query_vectors)
+        candidate_distances[~is_candidate] = -np.inf
+        candidate_order = np.argsort(-candidate_distances, axis=1, kind="stable")
+    else:
+        candidate_distances = np.square(
+            candidate_vectors - query_vectors[:, np.newaxis, :]
+        ).sum(axis=2)
+        candidate_distances[~is_candidate] = np.inf
+        candidate_order = np.argsort(candidate_distances, axis=1, kind="stable")
+
+    candidate_order = candidate_order[:, :k]
+
+    return (
+        np.take_along_axis(candidate_distances, candidate_order, axis=1),
+        np.where(
+            np.take_along_axis(is_candidate, candidate_order, axis=1),
+            np.take_along_axis(candidate_indices, candidate_order, axis=1),
+            -1,
+        ),
+    )
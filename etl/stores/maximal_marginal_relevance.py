@@ -0,0 +1,69 @@
+import numpy as np
+
+
+def maximal_marginal_relevance_batch(
+    *,
+    query_vectors: np.ndarray,
+    candidate_vectors: np.ndarray,
+    is_candidate: np.ndarray,
+    k: int,
+    lambda_mult: float,
+) -> np.ndarray:
+    """
+    Select k diverse candidates for each query with maximal marginal relevance, for a batch of queries at once.
+
+    query_vectors has shape (queries, dimensions), and candidate_vectors has shape (queries, candidates, dimensions).
+    is_candidate is a (queries, candidates) mask of the candidates that can be selected.
+    lambda_mult weighs the cosine similarity to the query against the cosine similarity to already selected candidates,
+    as in LangChain's maximal_marginal_relevance.
+
+    Return a (queries, k) array of candidate positions in selection order, padded with -1.
+    """
+
+    candidate_similarities = np.matmul(
+        candidate_vectors, candidate_vectors.transpose(0, 2, 1)
+    )
+    candidate_norms = np.maximum(
+        np.sqrt(np.diagonal(candidate_similarities, axis1=1, axis2=2)),
+        np.finfo(np.float32).tiny,
+    )
+    query_norms = np.maximum(
+        np.linalg.norm(query_vectors, axis=1), np.finfo(np.float32).tiny
+    )
+
+    # Cosine similarities are computed from the raw vectors and rescaled by their norms,
+    # instead of normalizing a copy of every candidate vector.
+    candidate_similarities /= (
+        candidate_norms[:, :, np.newaxis] * candidate_norms[:, np.newaxis, :]
+    )
+    query_similarities = np.matmul(candidate_vectors, query_vectors[:, :, np.newaxis])[
+        :, :, 0
+    ] / (candidate_norms * query_norms[:, np.newaxis])
+
+    queries = np.arange(len(query_vectors))
+    is_available = is_candidate.copy()
+    redundancies = np.zeros_like(query_similarities)
+    selected_candidates = np.full((len(query_vectors), k), -1)
+
+    for selection in range(min(k, candidate_vectors.shape[1])):
+        scores = np.where(
+            is_available,
+            lambda_mult * query_similarities - (1 - lambda_mult) * redundancies,
+            -np.inf,
+        )
+        selected_candidate = np.argmax(scores, axis=1)
+        is_selected = is_available[queries, selected_candidate]
+
+        selected_candidates[:, selection] = np.where(
+            is_selected, selected_candidate, -1
+        )
+        is_available[queries, selected_candidate] = False
+        redundancies = (
+            np.maximum(
+                redundancies, candidate_similarities[queries, selected_candidate]
+            )
+            if selection
+            else candidate_similarities[queries, selected_candidate]
+        )
+
+    return selected_candidates
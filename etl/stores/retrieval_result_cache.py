@@ -0,0 +1,112 @@
+import json
+import sqlite3
+from collections.abc import Iterable
+from itertools import batched
+from pathlib import Path
+from typing import Self
+
+from etl.models.types import AntiRecommendationKey, RecordKey
+
+
+class RetrievalResultCache:
+    """
+    A persistent SQLite cache of the anti-recommendation keys retrieved for each Record key.
+
+    Results are stored under a retrieval fingerprint, which identifies the index and the retrieval parameters they were
+    computed with. Results of other fingerprints are never returned, so a changed index or parameter is a cache miss,
+    and prune removes them.
+    Partitions that run concurrently share the cache: it is written ahead of a log, so that readers do not block the
+    writer, and a connection waits up to busy_timeout_seconds for the lock of another.
+    """
+
+    GET_BATCH_SIZE = 500
+
+    def __init__(self, *, file_path: Path, busy_timeout_seconds: float = 60.0) -> None:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.__connection = sqlite3.connect(file_path, timeout=busy_timeout_seconds)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS retrieval_results (
+                fingerprint TEXT NOT NULL,
+                record_key TEXT NOT NULL,
+                anti_recommendation_keys TEXT NOT NULL,
+                PRIMARY KEY (fingerprint, record_key)
+            )
+            """
+        )
+        self.__connection.commit()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection to the cache database."""
+
+        self.__connection.close()
+
+    def get(
+        self, *, fingerprint: str, record_keys: Iterable[RecordKey]
+    ) -> dict[RecordKey, tuple[AntiRecommendationKey, ...]]:
+        """
+        Return the cached anti-recommendation keys of the record_keys that were retrieved under fingerprint.
+
+        Record keys are looked up in batches of GET_BATCH_SIZE, so that only the results of record_keys are read.
+        """
+
+        record_keys = tuple(dict.fromkeys(record_keys))
+        cached_anti_recommendation_keys: dict[
+            RecordKey, tuple[AntiRecommendationKey, ...]
+        ] = {}
+
+        for batch_record_keys in batched(record_keys, self.GET_BATCH_SIZE):
+            for record_key, anti_recommendation_keys in self.__connection.execute(
+                "SELECT record_key, anti_recommendation_keys FROM retrieval_results "  # noqa: S608
+                "WHERE fingerprint = ? AND record_key IN ("
+                + ",".join("?" * len(batch_record_keys))
+                + ")",
+                (fingerprint, *batch_record_keys),
+            ):
+                cached_anti_recommendation_keys[record_key] = tuple(
+                    json.loads(anti_recommendation_keys)
+                )
+
+        return {
+            record_key: cached_anti_recommendation_keys[record_key]
+            for record_key in record_keys
+            if record_key in cached_anti_recommendation_keys
+        }
+
+    def prune(self, *, fingerprint: str) -> int:
+        """
+        Remove the results of every fingerprint other than fingerprint, which can never be returned again once the
+        index or the parameters they were retrieved with changed, and return the number of removed results.
+        """
+
+        with self.__connection:
+            return self.__connection.execute(
+                "DELETE FROM retrieval_results WHERE fingerprint != ?", (fingerprint,)
+            ).rowcount
+
+    def put(
+        self,
+        *,
+        fingerprint: str,
+        anti_recommendation_graphs: Iterable[
+            tuple[RecordKey, tuple[AntiRecommendationKey, ...]]
+        ],
+    ) -> None:
+        """Store the anti-recommendation keys of each Record key under fingerprint, in one transaction."""
+
+        with self.__connection:
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO retrieval_results VALUES (?, ?, ?)",
+                (
+                    (fingerprint, record_key, json.dumps(anti_recommendation_keys))
+                    for record_key, anti_recommendation_keys in anti_recommendation_graphs
+                ),
+            )
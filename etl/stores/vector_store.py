@@ -1,92 +1,279 @@
-from dataclasses import dataclass
+import hashlib
+import logging
+import math
+import operator
+import shutil
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Self, cast
+from typing import Any, Self, cast
 
+import faiss
 import langchain_community.vectorstores as langchain
+import numpy as np
 from langchain.docstore.document import Document
+from langchain.embeddings import CacheBackedEmbeddings
 from langchain_community.vectorstores import FAISS
-from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.embeddings import Embeddings
 
+from etl.instrumentation import Instrumentation
+from etl.models.vector_store_descriptor import (
+    COMPRESSED_INDEX_FILE_NAME,
+    VECTORS_FILE_NAME,
+    VectorStoreDescriptor,
+)
+from etl.models.types.compressed_index_type import CompressedIndexType
+from etl.models.types.distance_strategy import DistanceStrategy
 from etl.models.types.documents_limit import DocumentsLimit
+from etl.models.types.local_embedding_model_name import LocalEmbeddingModelName
 from etl.models.types.model_query import ModelQuery
 from etl.models.types.open_ai_embedding_model_name import OpenAiEmbeddingModelName
 from etl.models.types.score_threshold import ScoreThreshold
-from etl.pipelines import OpenaiEmbeddingPipeline
-from etl.resources import OpenaiSettings
+from etl.pipelines import (
+    EmbeddingPipeline,
+    LocalEmbeddingPipeline,
+    OpenaiEmbeddingPipeline,
+)
+from etl.resources import LocalEmbeddingSettings, OpenaiSettings, VectorStoreSettings
 from etl.resources.output_config import OutputConfig
+from etl.stores.compressed_index import (
+    load_compressed_index,
+    save_compressed_index,
+    search_compressed_index,
+)
+from etl.stores.maximal_marginal_relevance import maximal_marginal_relevance_batch
+from etl.stores.vector_store_shard_pool import VectorStoreShardPool
+
+logger = logging.getLogger(__name__)
 
 
 class VectorStore:
     """A store that contains vector embeddings."""
 
-    @dataclass(frozen=True)
-    class Descriptor:
-        """
-        A dataclass that holds data needed to load a vector store from local storage.
-
-        A Descriptor contains:
-            - directory_path: The Path of the directory that holds the vector store.
-            - cache_directory_path: The Path of the directory that holds cached vector embeddings.
-            - embedding_model_name: The name of the embedding model used to create the vector embeddings.
-        """
-
-        directory_path: Path
-        cache_directory_path: Path
-        embedding_model_name: OpenAiEmbeddingModelName
+    Descriptor = VectorStoreDescriptor
 
     def __init__(
         self,
         *,
         directory_path: Path,
         cache_directory_path: Path,
-        store: langchain.VectorStore,
-        embedding_model_name: OpenAiEmbeddingModelName,
+        store: langchain.VectorStore | VectorStoreShardPool,
+        embedding_model_name: OpenAiEmbeddingModelName | LocalEmbeddingModelName,
     ) -> None:
         self.__store = store
         self.__directory_path = directory_path
         self.__cache_directory_path = cache_directory_path
         self.__embedding_model_name = embedding_model_name
+        self.__compressed_index_and_vectors: tuple[faiss.Index, np.ndarray] | None = (
+            None
+        )
+        self.__warned_of_missing_compressed_index = False
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):  # noqa: ANN001
-        del self.__store
+        self.close()
 
-    @classmethod
-    def create(
-        cls,
+    @staticmethod
+    def create_descriptor(
         *,
-        documents: tuple[Document, ...],
         openai_settings: OpenaiSettings,
         output_config: OutputConfig,
-    ) -> Self:
-        """Return a VectorStore that contains a vector store created from an OpenaiEmbeddingPipeline."""
+        local_embedding_settings: LocalEmbeddingSettings | None = None,
+    ) -> Descriptor:
+        """
+        Return the descriptor of the vector store of the ETL.
+
+        Its embedding model is the local embedding model of local_embedding_settings if it has one, otherwise the
+        OpenAI embedding model of openai_settings.
+        """
 
         parsed_output_config = output_config.parse()
 
-        return cls(
-            store=OpenaiEmbeddingPipeline(
-                openai_settings=openai_settings,
-                openai_embeddings_cache_directory_path=parsed_output_config.openai_embeddings_cache_directory_path,
-            ).create_vector_store(documents=documents),
-            embedding_model_name=openai_settings.embedding_model_name,
+        if (
+            local_embedding_settings is not None
+            and local_embedding_settings.local_embedding_model_name is not None
+        ):
+            return VectorStore.Descriptor(
+                directory_path=parsed_output_config.local_embeddings_directory_path,
+                cache_directory_path=parsed_output_config.local_embeddings_directory_path,
+                embedding_model_name=local_embedding_settings.local_embedding_model_name,
+            )
+
+        return VectorStore.Descriptor(
             directory_path=parsed_output_config.openai_embeddings_directory_path,
             cache_directory_path=parsed_output_config.openai_embeddings_cache_directory_path,
+            embedding_model_name=openai_settings.embedding_model_name,
         )
 
     @classmethod
-    def open(cls, descriptor: Descriptor) -> Self:
-        """Return a VectorStore that contains a vector store loaded from local storage."""
+    def create(  # noqa: PLR0913
+        cls,
+        *,
+        documents: Sequence[Document],
+        openai_settings: OpenaiSettings,
+        output_config: OutputConfig,
+        vector_store_settings: VectorStoreSettings | None = None,
+        local_embedding_settings: LocalEmbeddingSettings | None = None,
+    ) -> Self:
+        """
+        Return a VectorStore that contains a vector store created from a LocalEmbeddingPipeline, if
+        local_embedding_settings has a local embedding model, otherwise from an OpenaiEmbeddingPipeline.
+        """
+
+        descriptor = cls.create_descriptor(
+            openai_settings=openai_settings,
+            output_config=output_config,
+            local_embedding_settings=local_embedding_settings,
+        )
+
+        return cls.create_from_embedding_pipeline(
+            documents=documents,
+            embedding_pipeline=(
+                LocalEmbeddingPipeline(
+                    local_embedding_settings=local_embedding_settings,
+                    local_embedding_model_file_path=descriptor.local_embedding_model_file_path,
+                )
+                if local_embedding_settings is not None
+                and isinstance(descriptor.embedding_model_name, LocalEmbeddingModelName)
+                else OpenaiEmbeddingPipeline(
+                    openai_settings=openai_settings,
+                    openai_embeddings_cache_directory_path=descriptor.cache_directory_path,
+                )
+            ),
+            descriptor=descriptor,
+            vector_store_settings=vector_store_settings or VectorStoreSettings(),
+        )
+
+    @classmethod
+    def create_from_embedding_pipeline(
+        cls,
+        *,
+        documents: Sequence[Document],
+        embedding_pipeline: EmbeddingPipeline,
+        descriptor: Descriptor,
+        vector_store_settings: VectorStoreSettings,
+    ) -> Self:
+        """
+        Return a VectorStore that contains a vector store created from embedding_pipeline.
+
+        With more than one shard, the shards are built in parallel and saved to descriptor.shard_directory_paths.
+        Shards that fit in vector_store_settings.memory_budget_bytes are merged into a single in-memory index,
+        otherwise the VectorStore searches them across shard worker processes.
+        The embedding model is fitted to documents once, before the shards are built, so that they share it.
+        """
+
+        embedding_pipeline.fit(documents=documents)
+        shard_count = min(vector_store_settings.shard_count, len(documents))
+
+        if shard_count <= 1:
+            return cls(
+                store=embedding_pipeline.create_vector_store(documents=documents),
+                embedding_model_name=descriptor.embedding_model_name,
+                directory_path=descriptor.directory_path,
+                cache_directory_path=descriptor.cache_directory_path,
+            )
+
+        sharded_descriptor = VectorStore.Descriptor(
+            directory_path=descriptor.directory_path,
+            cache_directory_path=descriptor.cache_directory_path,
+            embedding_model_name=descriptor.embedding_model_name,
+            shard_count=shard_count,
+        )
+        shard_size = math.ceil(len(documents) / shard_count)
+        # Shards of a previous vector store with more shards would be read as shards of this one.
+        shutil.rmtree(sharded_descriptor.shards_directory_path, ignore_errors=True)
+
+        def save_shard(shard_index: int) -> None:
+            cast(
+                FAISS,
+                embedding_pipeline.create_vector_store(
+                    documents=documents[
+                        shard_index * shard_size : (shard_index + 1) * shard_size
+                    ]
+                ),
+            ).save_local(str(sharded_descriptor.shard_directory_paths[shard_index]))
+
+        with ThreadPoolExecutor(max_workers=shard_count) as executor:
+            tuple(
+                executor.map(Instrumentation.propagated(save_shard), range(shard_count))
+            )
+
+        if (
+            vector_store_settings.memory_budget_bytes is not None
+            and sharded_descriptor.index_bytes
+            > vector_store_settings.memory_budget_bytes
+        ):
+            return cls.open(
+                sharded_descriptor, embeddings=embedding_pipeline.embedding_model
+            )
+
+        merged_store, *shard_stores = (
+            FAISS.load_local(
+                folder_path=str(shard_directory_path),
+                embeddings=embedding_pipeline.embedding_model,
+                allow_dangerous_deserialization=True,
+            )
+            for shard_directory_path in sharded_descriptor.shard_directory_paths
+        )
+        for shard_store in shard_stores:
+            merged_store.merge_from(shard_store)
 
         return cls(
-            store=FAISS.load_local(
-                folder_path=str(descriptor.directory_path),
-                embeddings=OpenaiEmbeddingPipeline.create_embedding_model(
+            store=merged_store,
+            embedding_model_name=descriptor.embedding_model_name,
+            directory_path=descriptor.directory_path,
+            cache_directory_path=descriptor.cache_directory_path,
+        )
+
+    @classmethod
+    def open(
+        cls,
+        descriptor: Descriptor,
+        embeddings: Embeddings | None = None,
+        *,
+        normalize_L2: bool = False,  # noqa: N803
+    ) -> Self:
+        """
+        Return a VectorStore that contains a vector store loaded from local storage.
+
+        Queries are embedded with embeddings, which defaults to the embedding model of descriptor: the local
+        embedding model saved next to the vector store, or an OpenAI embedding model.
+        Query vectors are normalized to unit length if normalize_L2 is True, whether the vector store is sharded
+        or not.
+        """
+
+        if embeddings is None:
+            embeddings = (
+                LocalEmbeddingPipeline.load_embedding_model(
+                    local_embedding_model_file_path=descriptor.local_embedding_model_file_path
+                )
+                if isinstance(descriptor.embedding_model_name, LocalEmbeddingModelName)
+                else OpenaiEmbeddingPipeline.create_embedding_model(
                     openai_embedding_model_name=descriptor.embedding_model_name,
                     openai_embeddings_cache_directory_path=descriptor.cache_directory_path,
+                )
+            )
+
+        if descriptor.shard_count > 1:
+            return cls(
+                store=VectorStoreShardPool(
+                    shard_directory_paths=descriptor.shard_directory_paths,
+                    embeddings=embeddings,
+                    normalize_L2=normalize_L2,
                 ),
+                directory_path=descriptor.directory_path,
+                cache_directory_path=descriptor.cache_directory_path,
+                embedding_model_name=descriptor.embedding_model_name,
+            )
+
+        return cls(
+            store=FAISS.load_local(
+                folder_path=str(descriptor.directory_path),
+                embeddings=embeddings,
                 allow_dangerous_deserialization=True,
+                normalize_L2=normalize_L2,
             ),
             directory_path=descriptor.directory_path,
             cache_directory_path=descriptor.cache_directory_path,
@@ -101,28 +288,115 @@ class VectorStore:
             directory_path=self.__directory_path,
             cache_directory_path=self.__cache_directory_path,
             embedding_model_name=self.__embedding_model_name,
+            shard_count=(
+                len(self.__store.shard_directory_paths)
+                if isinstance(self.__store, VectorStoreShardPool)
+                else 1
+            ),
         )
 
-    def save_local(self) -> None:
-        """Save the vector store to local storage."""
+    def close(self) -> None:
+        """Release the vector store, and stop its shard worker processes if it is sharded."""
+
+        if isinstance(self.__store, VectorStoreShardPool):
+            self.__store.close()
+
+        del self.__store
+
+    def save_local(
+        self, *, compressed_index_type: CompressedIndexType | None = None
+    ) -> None:
+        """
+        Save the vector store to local storage.
+
+        With a compressed_index_type, a compressed index and the full-precision vectors are saved next to the index
+        of every shard, or of the vector store, for two-stage retrieval. Without one, those of a previous save are
+        removed, so that they are not used against a different index.
+        Sharded vector stores are already saved when they are created, and saving them removes the index of an
+        unsharded vector store from the directory, and vice versa, so that with_saved_shard_count of the
+        descriptor tells the saved layout.
+        The index version file is written last, so that a reader watching it only sees fully written indexes.
+        """
+
+        descriptor = self.descriptor
+
+        # The index of the other layout is removed, so that the saved layout tells whether the store is sharded.
+        if not isinstance(self.__store, VectorStoreShardPool):
+            cast(FAISS, self.__store).save_local(str(self.__directory_path))
+            shutil.rmtree(descriptor.shards_directory_path, ignore_errors=True)
+        else:
+            for file_name in (
+                "index.faiss",
+                "index.pkl",
+                COMPRESSED_INDEX_FILE_NAME,
+                VECTORS_FILE_NAME,
+            ):
+                (self.__directory_path / file_name).unlink(missing_ok=True)
 
-        cast(FAISS, self.__store).save_local(str(self.__directory_path))
+        for index_directory_path, compressed_index_file_path, vectors_file_path in zip(
+            descriptor.index_directory_paths,
+            descriptor.compressed_index_file_paths,
+            descriptor.vectors_file_paths,
+            strict=True,
+        ):
+            if compressed_index_type is None:
+                compressed_index_file_path.unlink(missing_ok=True)
+                vectors_file_path.unlink(missing_ok=True)
+                continue
+
+            save_compressed_index(
+                (
+                    faiss.read_index(str(index_directory_path / "index.faiss"))
+                    if isinstance(self.__store, VectorStoreShardPool)
+                    else cast(FAISS, self.__store).index
+                ),
+                compressed_index_type,
+                compressed_index_file_path=compressed_index_file_path,
+                vectors_file_path=vectors_file_path,
+            )
+        self.__compressed_index_and_vectors = None
+
+        index_hash = hashlib.sha256()
+        for index_file_path in descriptor.index_file_paths:
+            with index_file_path.open("rb") as index_file:
+                while chunk := index_file.read(1 << 20):
+                    index_hash.update(chunk)
+        if compressed_index_type is not None:
+            index_hash.update(compressed_index_type.value.encode("utf-8"))
+
+        descriptor.index_version_file_path.write_text(
+            index_hash.hexdigest(), encoding="utf-8"
+        )
 
-    def similarity_search_with_score(
+    def similarity_search_with_score(  # noqa: PLR0913
         self,
         *,
         query: ModelQuery,
         k: DocumentsLimit,
         score_threshold: ScoreThreshold,
         distance_strategy: DistanceStrategy,
+        rerank_oversampling_factor: int | None = None,
     ) -> tuple[tuple[Document, float], ...]:
         """
         Run a similarity search on vector_store.
 
         Return a tuple of (Document, float) tuples that consist of
         Documents that are most similar to query, and their similarity scores in float.
+        Like LangChain, score_threshold is compared with the distances under the distance strategy of the vector
+        store, which need not be distance_strategy.
         """
 
+        if (
+            isinstance(self.__store, VectorStoreShardPool)
+            or rerank_oversampling_factor is not None
+        ):
+            return self.similarity_search_with_score_batch(
+                queries=(query,),
+                k=k,
+                score_threshold=score_threshold,
+                rerank_oversampling_factor=rerank_oversampling_factor,
+            )[0]
+
         return tuple(
             self.__store.similarity_search_with_score(
                 k=k,
@@ -131,3 +405,263 @@ class VectorStore:
                 score_threshold=score_threshold,
             )
         )
+
+    def __search_compressed_index(
+        self,
+        *,
+        query_vectors: np.ndarray,
+        k: DocumentsLimit,
+        rerank_oversampling_factor: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the (distances, indices) arrays of the k closest vectors of an unsharded vector store to each query
+        vector, re-ranked from the candidates of its compressed index.
+        """
+
+        if self.__compressed_index_and_vectors is None:
+            self.__compressed_index_and_vectors = load_compressed_index(
+                compressed_index_file_path=self.descriptor.compressed_index_file_paths[
+                    0
+                ],
+                vectors_file_path=self.descriptor.vectors_file_paths[0],
+            )
+        compressed_index, vectors = self.__compressed_index_and_vectors
+
+        return search_compressed_index(
+            compressed_index=compressed_index,
+            vectors=vectors,
+            query_vectors=query_vectors,
+            k=k,
+            rerank_oversampling_factor=rerank_oversampling_factor,
+        )
+
+    def __saved_rerank_oversampling_factor(
+        self, rerank_oversampling_factor: int | None
+    ) -> int | None:
+        """
+        Return rerank_oversampling_factor if a compressed index has been saved for two-stage retrieval, and None
+        otherwise, so that the index is searched exactly rather than fail.
+        """
+
+        if rerank_oversampling_factor is None or self.descriptor.has_compressed_index:
+            return rerank_oversampling_factor
+
+        if not self.__warned_of_missing_compressed_index:
+            logger.warning(
+                "No compressed index is saved in %s, so the index is searched without two-stage retrieval.",
+                self.__directory_path,
+            )
+            self.__warned_of_missing_compressed_index = True
+
+        return None
+
+    def __search_index(
+        self,
+        *,
+        query_vectors: np.ndarray,
+        k: DocumentsLimit,
+        rerank_oversampling_factor: int | None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Return the (distances, indices) arrays of the k closest vectors of an unsharded vector store to each query vector."""
+
+        rerank_oversampling_factor = self.__saved_rerank_oversampling_factor(
+            rerank_oversampling_factor
+        )
+
+        return (
+            cast(FAISS, self.__store).index.search(query_vectors, k)
+            if rerank_oversampling_factor is None
+            else self.__search_compressed_index(
+                query_vectors=query_vectors,
+                k=k,
+                rerank_oversampling_factor=rerank_oversampling_factor,
+            )
+        )
+
+    def __to_documents_and_distances(
+        self, *, distances: np.ndarray, indices: np.ndarray
+    ) -> tuple[tuple[tuple[Document, float], ...], ...]:
+        """Return the (Document, distance) tuples of each row of a search result, skipping -1 indices."""
+
+        faiss_store = cast(FAISS, self.__store)
+
+        return tuple(
+            tuple(
+                (
+                    cast(
+                        Document,
+                        faiss_store.docstore.search(
+                            faiss_store.index_to_docstore_id[index]
+                        ),
+                    ),
+                    float(distance),
+                )
+                for distance, index in zip(query_distances, query_indices, strict=True)
+                if index != -1
+            )
+            for query_distances, query_indices in zip(distances, indices, strict=True)
+        )
+
+    def __search_by_vectors(
+        self,
+        *,
+        query_vectors: np.ndarray,
+        k: DocumentsLimit,
+        rerank_oversampling_factor: int | None,
+    ) -> tuple[tuple[tuple[Document, float], ...], ...]:
+        """Return the k closest (Document, distance) tuples of each query vector."""
+
+        if isinstance(self.__store, VectorStoreShardPool):
+            return self.__store.search(
+                query_vectors=query_vectors,
+                k=k,
+                rerank_oversampling_factor=self.__saved_rerank_oversampling_factor(
+                    rerank_oversampling_factor
+                ),
+            )
+
+        distances, indices = self.__search_index(
+            query_vectors=query_vectors,
+            k=k,
+            rerank_oversampling_factor=rerank_oversampling_factor,
+        )
+
+        return self.__to_documents_and_distances(distances=distances, indices=indices)
+
+    def __embed_queries(self, queries: tuple[ModelQuery, ...]) -> np.ndarray:
+        """
+        Return the query vectors of queries, embedded with one call to the embedding model.
+
+        Queries are embedded without the embedding cache, so that the queries of clients do not grow it.
+        Query vectors are normalized to unit length if the vector store normalizes them, as FAISS does.
+        """
+
+        embeddings = cast(Embeddings, self.__store.embeddings)
+        if isinstance(embeddings, CacheBackedEmbeddings):
+            embeddings = embeddings.underlying_embeddings
+
+        query_vectors = np.array(
+            embeddings.embed_documents(list(queries)), dtype=np.float32
+        )
+
+        if (
+            self.__store.normalize_L2
+            if isinstance(self.__store, VectorStoreShardPool)
+            else cast(FAISS, self.__store)._normalize_L2  # noqa: SLF001
+        ):
+            faiss.normalize_L2(query_vectors)
+
+        return query_vectors
+
+    def __within_score_threshold(self) -> Callable[[Any, ScoreThreshold], Any]:
+        """
+        Return the comparison of a distance with a score threshold under the distance strategy of the vector store,
+        as LangChain compares them in a single-query similarity search.
+        """
+
+        return (
+            operator.ge
+            if self.__store.distance_strategy
+            in (DistanceStrategy.MAX_INNER_PRODUCT, DistanceStrategy.JACCARD)
+            else operator.le
+        )
+
+    def similarity_search_with_score_batch(
+        self,
+        *,
+        queries: tuple[ModelQuery, ...],
+        k: DocumentsLimit,
+        score_threshold: ScoreThreshold,
+        rerank_oversampling_factor: int | None = None,
+    ) -> tuple[tuple[tuple[Document, float], ...], ...]:
+        """
+        Run a similarity search on vector_store for a batch of queries.
+
+        All queries are embedded with one call to the embedding model and searched with one call to the index.
+        With a rerank_oversampling_factor, candidates from the compressed index saved by save_local are re-ranked
+        with exact distances before score_threshold is applied.
+        score_threshold is compared with the distances under the distance strategy of the vector store, so that the
+        results are those of similarity_search_with_score.
+        Return a tuple that holds the (Document, float) tuples of each query, in the order of queries.
+        """
+
+        if not queries:
+            return ()
+
+        within_score_threshold = self.__within_score_threshold()
+
+        return tuple(
+            tuple(
+                (document, distance)
+                for document, distance in documents_and_distances
+                if within_score_threshold(distance, score_threshold)
+            )
+            for documents_and_distances in self.__search_by_vectors(
+                query_vectors=self.__embed_queries(queries),
+                k=k,
+                rerank_oversampling_factor=rerank_oversampling_factor,
+            )
+        )
+
+    def max_marginal_relevance_search_with_score_batch(  # noqa: PLR0913
+        self,
+        *,
+        queries: tuple[ModelQuery, ...],
+        k: DocumentsLimit,
+        fetch_k: DocumentsLimit,
+        lambda_mult: float,
+        score_threshold: ScoreThreshold,
+        rerank_oversampling_factor: int | None = None,
+    ) -> tuple[tuple[tuple[Document, float], ...], ...]:
+        """
+        Run a maximal marginal relevance search on vector_store for a batch of queries.
+
+        The fetch_k closest Documents of each query that are within score_threshold, under the distance strategy of
+        the vector store, are re-ranked for diversity,
+        with the vectors of the candidates of all queries processed together in NumPy.
+        lambda_mult is 1 for pure relevance and 0 for maximum diversity.
+        Return a tuple that holds the k selected (Document, float) tuples of each query, in the order of queries,
+        where each float is the distance of the Document to the query.
+        """
+
+        if not queries:
+            return ()
+
+        if isinstance(self.__store, VectorStoreShardPool):
+            message = "maximal marginal relevance search is not supported by sharded vector stores"
+            raise ValueError(message)  # noqa: TRY004
+
+        query_vectors = self.__embed_queries(queries)
+        distances, indices = self.__search_index(
+            query_vectors=query_vectors,
+            k=fetch_k,
+            rerank_oversampling_factor=rerank_oversampling_factor,
+        )
+
+        is_candidate = (indices != -1) & self.__within_score_threshold()(
+            distances, score_threshold
+        )
+        candidate_vectors = (
+            cast(FAISS, self.__store)
+            .index.reconstruct_batch(np.where(is_candidate, indices, 0).ravel())
+            .reshape(*indices.shape, -1)
+        )
+
+        selected_candidates = maximal_marginal_relevance_batch(
+            query_vectors=query_vectors,
+            candidate_vectors=candidate_vectors,
+            is_candidate=is_candidate,
+            k=k,
+            lambda_mult=lambda_mult,
+        )
+        is_selected = selected_candidates != -1
+        selected_candidates = np.where(is_selected, selected_candidates, 0)
+
+        return self.__to_documents_and_distances(
+            distances=np.take_along_axis(distances, selected_candidates, axis=1),
+            indices=np.where(
+                is_selected,
+                np.take_along_axis(indices, selected_candidates, axis=1),
+                -1,
+            ),
+        )
@@ -0,0 +1,200 @@
+import heapq
+import multiprocessing
+import pickle
+import threading
+from itertools import islice
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Self
+
+import faiss
+import numpy as np
+from langchain.docstore.document import Document
+from langchain_core.embeddings import Embeddings
+
+from etl.models.types import DistanceStrategy, DocumentsLimit
+from etl.models.vector_store_descriptor import (
+    COMPRESSED_INDEX_FILE_NAME,
+    VECTORS_FILE_NAME,
+)
+from etl.stores.compressed_index import load_compressed_index, search_compressed_index
+
+
+def _serve_shard(shard_directory_path: Path, connection: Connection) -> None:
+    """
+    Load a vector store shard saved in shard_directory_path and answer searches sent over connection.
+
+    Each search is a (query_vectors, k, rerank_oversampling_factor) tuple, and is answered with the (Document, distance)
+    tuples of every query vector. With a rerank_oversampling_factor, candidates from the compressed index of the shard
+    are re-ranked with exact distances, and the compressed index is loaded on the first such search.
+    The shard stops when it receives None.
+    """
+
+    index = faiss.read_index(str(shard_directory_path / "index.faiss"))
+    with (shard_directory_path / "index.pkl").open("rb") as docstore_file:
+        docstore, index_to_docstore_id = pickle.load(docstore_file)  # noqa: S301
+    compressed_index_and_vectors: tuple[faiss.Index, np.ndarray] | None = None
+
+    connection.send(index.metric_type)
+
+    while (search := connection.recv()) is not None:
+        query_vectors, k, rerank_oversampling_factor = search
+
+        if rerank_oversampling_factor is None:
+            distances, indices = index.search(query_vectors, k)
+        else:
+            if compressed_index_and_vectors is None:
+                compressed_index_and_vectors = load_compressed_index(
+                    compressed_index_file_path=shard_directory_path
+                    / COMPRESSED_INDEX_FILE_NAME,
+                    vectors_file_path=shard_directory_path / VECTORS_FILE_NAME,
+                )
+            compressed_index, vectors = compressed_index_and_vectors
+            distances, indices = search_compressed_index(
+                compressed_index=compressed_index,
+                vectors=vectors,
+                query_vectors=query_vectors,
+                k=k,
+                rerank_oversampling_factor=rerank_oversampling_factor,
+            )
+
+        connection.send(
+            [
+                [
+                    (docstore.search(index_to_docstore_id[index]), float(distance))
+                    for distance, index in zip(
+                        query_distances, query_indices, strict=True
+                    )
+                    if index != -1
+                ]
+                for query_distances, query_indices in zip(
+                    distances, indices, strict=True
+                )
+            ]
+        )
+
+    connection.close()
+
+
+class VectorStoreShardPool:
+    """
+    A pool of worker processes that each hold one shard of a vector store in memory.
+
+    Searches are scattered to every shard, and the sorted top-k results of the shards are merged with a heap.
+    Shards are directories written by FAISS.save_local. normalize_L2 tells, like the attribute of FAISS, whether
+    query vectors must be normalized to unit length before they are searched.
+    """
+
+    def __init__(
+        self,
+        *,
+        shard_directory_paths: tuple[Path, ...],
+        embeddings: Embeddings,
+        normalize_L2: bool = False,  # noqa: N803
+    ) -> None:
+        self.__shard_directory_paths = shard_directory_paths
+        self.__embeddings = embeddings
+        self.__normalize_L2 = normalize_L2
+        self.__lock = threading.Lock()
+        self.__connections: list[Connection] = []
+        self.__processes: list[multiprocessing.process.BaseProcess] = []
+
+        context = multiprocessing.get_context("spawn")
+        for shard_directory_path in shard_directory_paths:
+            connection, shard_connection = context.Pipe()
+            process = context.Process(
+                target=_serve_shard,
+                args=(shard_directory_path, shard_connection),
+                daemon=True,
+            )
+            process.start()
+            shard_connection.close()
+
+            self.__connections.append(connection)
+            self.__processes.append(process)
+
+        self.__larger_distance_is_closer = {
+            connection.recv() for connection in self.__connections
+        } == {faiss.METRIC_INNER_PRODUCT}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
+        self.close()
+
+    @property
+    def shard_directory_paths(self) -> tuple[Path, ...]:
+        """The Paths of the directories that hold the shards of the pool."""
+
+        return self.__shard_directory_paths
+
+    @property
+    def embeddings(self) -> Embeddings:
+        """The embedding model that transforms queries into query vectors."""
+
+        return self.__embeddings
+
+    @property
+    def distance_strategy(self) -> DistanceStrategy:
+        """The distance strategy of the shards: MAX_INNER_PRODUCT for inner product indexes, and EUCLIDEAN_DISTANCE otherwise."""
+
+        return (
+            DistanceStrategy.MAX_INNER_PRODUCT
+            if self.__larger_distance_is_closer
+            else DistanceStrategy.EUCLIDEAN_DISTANCE
+        )
+
+    @property
+    def normalize_L2(self) -> bool:  # noqa: N802
+        """Whether query vectors must be normalized to unit length before they are searched."""
+
+        return self.__normalize_L2
+
+    def search(
+        self,
+        *,
+        query_vectors: np.ndarray,
+        k: DocumentsLimit,
+        rerank_oversampling_factor: int | None = None,
+    ) -> tuple[tuple[tuple[Document, float], ...], ...]:
+        """
+        Return the k closest (Document, distance) tuples across all shards for each query vector.
+
+        With a rerank_oversampling_factor, each shard re-ranks the candidates of its compressed index.
+        Each tuple is sorted from the closest Document to the furthest.
+        """
+
+        with self.__lock:
+            for connection in self.__connections:
+                connection.send((query_vectors, k, rerank_oversampling_factor))
+
+            shard_results = [connection.recv() for connection in self.__connections]
+
+        return tuple(
+            tuple(
+                islice(
+                    heapq.merge(
+                        *(shard_result[query_index] for shard_result in shard_results),
+                        key=lambda document_and_distance: document_and_distance[1],
+                        reverse=self.__larger_distance_is_closer,
+                    ),
+                    k,
+                )
+            )
+            for query_index in range(len(query_vectors))
+        )
+
+    def close(self) -> None:
+        """Stop the shard worker processes."""
+
+        with self.__lock:
+            for connection in self.__connections:
+                connection.send(None)
+                connection.close()
+
+            for process in self.__processes:
+                process.join()
+
+            self.__connections.clear()
+            self.__processes.clear()
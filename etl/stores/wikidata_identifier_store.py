@@ -0,0 +1,297 @@
+import argparse
+import gzip
+import logging
+import re
+import sqlite3
+from collections.abc import Iterable, Iterator
+from itertools import batched
+from pathlib import Path
+from typing import Self
+
+from etl.models.types import RecordKey
+from etl.resources import OutputConfig
+
+logger = logging.getLogger(__name__)
+
+SQL_DUMP_ROW_PATTERN = re.compile(r"\(((?:'(?:[^'\\]|\\.)*'|[^'()])*)\)")
+SQL_DUMP_VALUE_PATTERN = re.compile(r"'((?:[^'\\]|\\.)*)'|([^,]+)")
+SQL_DUMP_ESCAPE_PATTERN = re.compile(r"\\(.)")
+SQL_DUMP_ESCAPES = {"0": "\0", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a"}
+
+
+class WikidataIdentifierStore:
+    """
+    A persistent SQLite store that maps Record keys to Wikidata identifiers.
+
+    Mappings never expire, and are only removed with invalidate.
+    Record keys are stored as MediaWiki titles with spaces instead of underscores,
+    so that `Alan_Turing` and `Alan Turing` share a mapping.
+    Steps that run concurrently share the store: it is written ahead of a log, so that readers do not block the
+    writer, and a connection waits up to busy_timeout_seconds for the lock of another.
+    """
+
+    def __init__(self, *, file_path: Path, busy_timeout_seconds: float = 60.0) -> None:
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.__connection = sqlite3.connect(file_path, timeout=busy_timeout_seconds)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS wikidata_identifiers (
+                title TEXT PRIMARY KEY,
+                wikidata_identifier TEXT NOT NULL
+            )
+            """
+        )
+        self.__connection.commit()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
+        self.close()
+
+    @staticmethod
+    def __to_title(record_key: RecordKey) -> str:
+        """Return record_key as a MediaWiki title with spaces instead of underscores."""
+
+        return record_key.replace("_", " ")
+
+    @staticmethod
+    def __read_sql_dump_rows(
+        sql_dump_file_path: Path, table_name: str
+    ) -> Iterator[tuple[str, ...]]:
+        """
+        Yield the rows inserted into table_name by a MediaWiki SQL dump, with every value as a string.
+
+        sql_dump_file_path may be gzip-compressed.
+        """
+
+        insert_prefix = f"INSERT INTO `{table_name}` VALUES "  # noqa: S608
+
+        with (
+            gzip.open(sql_dump_file_path, mode="rt", encoding="utf-8", errors="replace")
+            if sql_dump_file_path.suffix == ".gz"
+            else sql_dump_file_path.open(encoding="utf-8", errors="replace")
+        ) as sql_dump_file:
+            for line in sql_dump_file:
+                if not line.startswith(insert_prefix):
+                    continue
+
+                for row in SQL_DUMP_ROW_PATTERN.finditer(line, len(insert_prefix)):
+                    yield tuple(
+                        other_value
+                        or SQL_DUMP_ESCAPE_PATTERN.sub(
+                            lambda escape: SQL_DUMP_ESCAPES.get(escape[1], escape[1]),
+                            string_value,
+                        )
+                        for string_value, other_value in SQL_DUMP_VALUE_PATTERN.findall(
+                            row[1]
+                        )
+                    )
+
+    def __import_redirects(self, redirect_sql_dump_file_path: Path) -> int:
+        """
+        Map the titles of the redirects of the `redirect` SQL dump to the Wikidata identifiers of their targets, and
+        return the number of imported mappings.
+
+        Requires the page_titles and page_wikidata_identifiers temporary tables of import_sql_dumps.
+        """
+
+        self.__connection.execute(
+            "CREATE TEMPORARY TABLE redirect_targets (page_id INTEGER PRIMARY KEY, target_title TEXT NOT NULL)"
+        )
+        self.__connection.execute(
+            "CREATE INDEX temp.page_titles_title ON page_titles (title)"
+        )
+
+        # Redirects to other namespaces or to other wikis are left out.
+        self.__connection.executemany(
+            "INSERT OR REPLACE INTO redirect_targets VALUES (?, ?)",
+            (
+                (int(row[0]), row[2].replace("_", " "))
+                for row in self.__read_sql_dump_rows(
+                    redirect_sql_dump_file_path, "redirect"
+                )
+                if row[1] == "0" and row[3] in ("", "NULL")
+            ),
+        )
+
+        imported_count = self.__connection.execute(
+            """
+            INSERT OR REPLACE INTO wikidata_identifiers
+            SELECT redirect_titles.title, page_wikidata_identifiers.wikidata_identifier
+            FROM redirect_targets
+            JOIN page_titles AS redirect_titles USING (page_id)
+            JOIN page_titles AS target_titles ON target_titles.title = redirect_targets.target_title
+            JOIN page_wikidata_identifiers ON page_wikidata_identifiers.page_id = target_titles.page_id
+            WHERE redirect_targets.page_id NOT IN (SELECT page_id FROM page_wikidata_identifiers)
+            """
+        ).rowcount
+
+        self.__connection.execute("DROP TABLE redirect_targets")
+
+        return imported_count
+
+    def close(self) -> None:
+        """Close the connection to the store's database."""
+
+        self.__connection.close()
+
+    def get(self, record_keys: Iterable[RecordKey]) -> dict[RecordKey, str]:
+        """Return the Wikidata identifiers of the record_keys that have a mapping."""
+
+        record_keys = tuple(dict.fromkeys(record_keys))
+        wikidata_identifiers: dict[RecordKey, str] = {}
+
+        for batch_record_keys in batched(record_keys, 500):
+            titles = {
+                self.__to_title(record_key): record_key
+                for record_key in batch_record_keys
+            }
+            for title, wikidata_identifier in self.__connection.execute(
+                "SELECT title, wikidata_identifier FROM wikidata_identifiers WHERE title IN ("  # noqa: S608
+                + ",".join("?" * len(titles))
+                + ")",
+                tuple(titles),
+            ):
+                wikidata_identifiers[titles[title]] = wikidata_identifier
+
+        return {
+            record_key: wikidata_identifiers[record_key]
+            for record_key in record_keys
+            if record_key in wikidata_identifiers
+        }
+
+    def put(self, wikidata_identifiers: dict[RecordKey, str]) -> None:
+        """Store the Wikidata identifier of each Record key, in one transaction."""
+
+        with self.__connection:
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO wikidata_identifiers VALUES (?, ?)",
+                (
+                    (self.__to_title(record_key), wikidata_identifier)
+                    for record_key, wikidata_identifier in wikidata_identifiers.items()
+                ),
+            )
+
+    def invalidate(self, record_keys: Iterable[RecordKey] | None = None) -> None:
+        """Remove the mappings of record_keys, or every mapping if record_keys is None."""
+
+        with self.__connection:
+            if record_keys is None:
+                self.__connection.execute("DELETE FROM wikidata_identifiers")
+                return
+
+            self.__connection.executemany(
+                "DELETE FROM wikidata_identifiers WHERE title = ?",
+                ((self.__to_title(record_key),) for record_key in record_keys),
+            )
+
+    def import_sql_dumps(
+        self,
+        *,
+        page_sql_dump_file_path: Path,
+        page_props_sql_dump_file_path: Path,
+        redirect_sql_dump_file_path: Path | None = None,
+    ) -> int:
+        """
+        Import the mappings of all articles from the `page` and `page_props` SQL dumps of a Wikipedia.
+
+        With the `redirect` SQL dump, the titles of redirects to articles are mapped to the Wikidata identifiers
+        of their targets too, unless they have their own, like the MediaWiki API resolves them.
+        The dumps are joined on page ID in temporary tables, so that they never have to fit in memory.
+        Return the number of imported mappings.
+        """
+
+        with self.__connection:
+            self.__connection.execute(
+                "CREATE TEMPORARY TABLE page_wikidata_identifiers (page_id INTEGER PRIMARY KEY, wikidata_identifier TEXT NOT NULL)"
+            )
+            self.__connection.execute(
+                "CREATE TEMPORARY TABLE page_titles (page_id INTEGER PRIMARY KEY, title TEXT NOT NULL)"
+            )
+
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO page_wikidata_identifiers VALUES (?, ?)",
+                (
+                    (int(row[0]), row[2])
+                    for row in self.__read_sql_dump_rows(
+                        page_props_sql_dump_file_path, "page_props"
+                    )
+                    if row[1] == "wikibase_item"
+                ),
+            )
+            self.__connection.executemany(
+                "INSERT OR REPLACE INTO page_titles VALUES (?, ?)",
+                (
+                    (int(row[0]), row[2].replace("_", " "))
+                    for row in self.__read_sql_dump_rows(
+                        page_sql_dump_file_path, "page"
+                    )
+                    if row[1] == "0"
+                ),
+            )
+
+            imported_count = self.__connection.execute(
+                """
+                INSERT OR REPLACE INTO wikidata_identifiers
+                SELECT title, wikidata_identifier
+                FROM page_titles JOIN page_wikidata_identifiers USING (page_id)
+                """
+            ).rowcount
+
+            if redirect_sql_dump_file_path is not None:
+                imported_count += self.__import_redirects(redirect_sql_dump_file_path)
+
+            self.__connection.execute("DROP TABLE page_wikidata_identifiers")
+            self.__connection.execute("DROP TABLE page_titles")
+
+        return imported_count
+
+
+def main() -> None:
+    """Import Wikidata identifiers from the `page`, `page_props` and `redirect` SQL dumps of a Wikipedia, for offline ARKG builds."""
+
+    argument_parser = argparse.ArgumentParser(description=main.__doc__)
+    argument_parser.add_argument("page_sql_dump_file_path", type=Path)
+    argument_parser.add_argument("page_props_sql_dump_file_path", type=Path)
+    argument_parser.add_argument(
+        "redirect_sql_dump_file_path",
+        type=Path,
+        nargs="?",
+        help="the redirect dump, to map the titles of redirects to the identifiers of their targets",
+    )
+    argument_parser.add_argument(
+        "--invalidate",
+        action="store_true",
+        help="remove every existing mapping before the import",
+    )
+    arguments = argument_parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    with WikidataIdentifierStore(
+        file_path=OutputConfig.from_env_vars(
+            output_directory_path_default=Path(__file__).parent.parent.absolute()
+            / "data"
+            / "output"
+        )
+        .parse()
+        .wikidata_identifiers_file_path
+    ) as wikidata_identifier_store:
+        if arguments.invalidate:
+            wikidata_identifier_store.invalidate()
+
+        logger.info(
+            "Imported %d Wikidata identifiers.",
+            wikidata_identifier_store.import_sql_dumps(
+                page_sql_dump_file_path=arguments.page_sql_dump_file_path,
+                page_props_sql_dump_file_path=arguments.page_props_sql_dump_file_path,
+                redirect_sql_dump_file_path=arguments.redirect_sql_dump_file_path,
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+from .content_hash import content_hash as content_hash  # isort:skip
+from .file_content_hash import file_content_hash as file_content_hash
+from .settings_content_hash import settings_content_hash as settings_content_hash
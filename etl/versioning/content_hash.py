@@ -0,0 +1,19 @@
+import hashlib
+from collections.abc import Iterable
+
+
+def content_hash(parts: Iterable[str | bytes]) -> str:
+    """
+    Return the hexadecimal SHA-256 hash of a sequence of parts.
+
+    Every part is hashed with its length, so that different splits of the same bytes have different hashes.
+    """
+
+    hash_ = hashlib.sha256()
+
+    for part in parts:
+        part_bytes = part.encode("utf-8") if isinstance(part, str) else part
+        hash_.update(len(part_bytes).to_bytes(8, "little"))
+        hash_.update(part_bytes)
+
+    return hash_.hexdigest()
@@ -0,0 +1,38 @@
+import hashlib
+from collections.abc import Iterable
+from pathlib import Path
+
+from etl.versioning.content_hash import content_hash
+
+
+def file_content_hash(file_paths: Iterable[Path]) -> str:
+    """
+    Return a hash of the names and contents of file_paths, whatever their order.
+
+    Files are read in chunks, so that large data files are hashed in constant memory. A missing file is hashed
+    as such, so that the hash changes when it is created. A directory, e.g. a Parquet dataset, is hashed as the
+    files it contains.
+    """
+
+    def file_hash(file_path: Path) -> str:
+        if file_path.is_dir():
+            return content_hash(
+                part
+                for directory_file_path in sorted(file_path.rglob("*"))
+                if directory_file_path.is_file()
+                for part in (
+                    str(directory_file_path.relative_to(file_path)),
+                    file_hash(directory_file_path),
+                )
+            )
+        if not file_path.is_file():
+            return ""
+
+        with file_path.open(mode="rb") as file:
+            return hashlib.file_digest(file, "sha256").hexdigest()
+
+    return content_hash(
+        part
+        for file_path in sorted(file_paths)
+        for part in (file_path.name, file_hash(file_path))
+    )
@@ -0,0 +1,22 @@
+import json
+from collections.abc import Iterable
+
+from dagster import ConfigurableResource
+
+from etl.versioning.content_hash import content_hash
+
+
+def settings_content_hash(
+    settings: ConfigurableResource, *, field_names: Iterable[str] | None = None
+) -> str:
+    """
+    Return a hash of the values of the field_names fields of settings, or of all its fields if field_names is None.
+
+    Pass field_names to leave out fields that do not change outputs, like API keys.
+    """
+
+    values = settings.model_dump(mode="json")
+    if field_names is not None:
+        values = {field_name: values[field_name] for field_name in field_names}
+
+    return content_hash((type(settings).__name__, json.dumps(values, sort_keys=True)))
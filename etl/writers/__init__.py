@@ -0,0 +1,3 @@
+from .jsonl_writer import JsonlWriter as JsonlWriter
+from .open_compressed_file import open_compressed_file as open_compressed_file
+from .rdf_stream_writer import RdfStreamWriter as RdfStreamWriter
@@ -0,0 +1,65 @@
+import io
+import json
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Self
+
+from etl.resources import CompressionSettings
+from etl.writers.open_compressed_file import open_compressed_file
+
+
+class JsonlWriter:
+    """
+    A writer that streams JSON values into a JSON Lines file, one value per line.
+
+    Serialized values are collected in memory and written in chunks of at least chunk_size characters,
+    which are compressed as they are written if compression_settings has a compression format.
+    """
+
+    def __init__(
+        self,
+        *,
+        file_path: Path,
+        chunk_size: int = 1 << 22,
+        compression_settings: CompressionSettings | None = None,
+    ) -> None:
+        self.__chunk_size = chunk_size
+        self.__chunk: list[str] = []
+        self.__chunk_length = 0
+        self.__json_encoder = json.JSONEncoder(ensure_ascii=False)
+
+        self.__file = io.TextIOWrapper(
+            open_compressed_file(file_path, compression_settings=compression_settings),
+            encoding="utf-8",
+            newline="\n",
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
+        self.close()
+
+    def __flush_chunk(self) -> None:
+        """Write the current chunk to the file."""
+
+        self.__file.write("".join(self.__chunk))
+        self.__chunk.clear()
+        self.__chunk_length = 0
+
+    def write(self, values: Iterable[object]) -> None:
+        """Write each of values to the file as a line of JSON."""
+
+        for value in values:
+            line = self.__json_encoder.encode(value) + "\n"
+            self.__chunk.append(line)
+            self.__chunk_length += len(line)
+
+            if self.__chunk_length >= self.__chunk_size:
+                self.__flush_chunk()
+
+    def close(self) -> None:
+        """Write the remaining chunk and close the file."""
+
+        self.__flush_chunk()
+        self.__file.close()
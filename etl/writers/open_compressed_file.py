@@ -0,0 +1,53 @@
+import gzip
+from pathlib import Path
+from typing import BinaryIO, cast
+
+from etl.models.types import CompressionFormat
+from etl.resources import CompressionSettings
+
+
+def open_compressed_file(
+    file_path: Path, *, compression_settings: CompressionSettings | None = None
+) -> BinaryIO:
+    """
+    Open file_path for binary writing, with bytes compressed as they are written, as configured by compression_settings.
+
+    zstd compression requires the optional zstandard package.
+    """
+
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if compression_settings is None or compression_settings.compression_format is None:
+        return file_path.open(mode="wb")
+
+    if compression_settings.compression_format == CompressionFormat.GZIP:
+        return cast(
+            BinaryIO,
+            gzip.open(
+                file_path,
+                mode="wb",
+                compresslevel=(
+                    6
+                    if compression_settings.compression_level is None
+                    else compression_settings.compression_level
+                ),
+            ),
+        )
+
+    try:
+        import zstandard
+    except ImportError as import_error:
+        message = "zstd compression requires the zstandard package"
+        raise ValueError(message) from import_error
+
+    return cast(
+        BinaryIO,
+        zstandard.ZstdCompressor(
+            level=(
+                3
+                if compression_settings.compression_level is None
+                else compression_settings.compression_level
+            ),
+            threads=compression_settings.compression_threads,
+        ).stream_writer(file_path.open(mode="wb"), closefd=True),
+    )
@@ -0,0 +1,141 @@
+import io
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Self
+
+from pyoxigraph import DefaultGraph, Quad
+
+from etl.models.types import RdfMimeType
+from etl.namespaces import RDF
+from etl.resources import CompressionSettings
+from etl.writers.open_compressed_file import open_compressed_file
+
+DEFAULT_GRAPH_NAME = str(DefaultGraph())
+
+
+class RdfStreamWriter:
+    """
+    A writer that streams Quads into an RDF serialization file without an RDF Store.
+
+    N-Triples and N-Quads are written one line per Quad. Turtle and TriG are written with consecutive Quads
+    of the same subject grouped into one statement. N-Triples and Turtle cannot express graphs,
+    so only the triple of each Quad is written.
+    Serialized Quads are collected in memory and written in chunks of at least chunk_size characters,
+    which are compressed as they are written if compression_settings has a compression format.
+    """
+
+    SUPPORTED_RDF_MIME_TYPES = frozenset(
+        (
+            RdfMimeType.N_TRIPLES,
+            RdfMimeType.N_QUADS,
+            RdfMimeType.TURTLE,
+            RdfMimeType.APPLICATION_TURTLE,
+            RdfMimeType.TRIG,
+        )
+    )
+
+    def __init__(
+        self,
+        *,
+        file_path: Path,
+        rdf_mime_type: RdfMimeType,
+        chunk_size: int = 1 << 22,
+        compression_settings: CompressionSettings | None = None,
+    ) -> None:
+        if rdf_mime_type not in self.SUPPORTED_RDF_MIME_TYPES:
+            message = f"{rdf_mime_type.value} cannot be written as a stream"
+            raise ValueError(message)
+
+        self.__is_line_based = rdf_mime_type in (
+            RdfMimeType.N_TRIPLES,
+            RdfMimeType.N_QUADS,
+        )
+        self.__has_graphs = rdf_mime_type in (RdfMimeType.N_QUADS, RdfMimeType.TRIG)
+        self.__chunk_size = chunk_size
+        self.__chunk: list[str] = []
+        self.__chunk_length = 0
+        self.__graph_name = DEFAULT_GRAPH_NAME
+        self.__subject: str | None = None
+
+        self.__file = io.TextIOWrapper(
+            open_compressed_file(file_path, compression_settings=compression_settings),
+            encoding="utf-8",
+            newline="\n",
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
+        self.close()
+
+    def __append(self, text: str) -> None:
+        """Append text to the current chunk, and write the chunk once it reaches chunk_size."""
+
+        self.__chunk.append(text)
+        self.__chunk_length += len(text)
+
+        if self.__chunk_length >= self.__chunk_size:
+            self.__flush_chunk()
+
+    def __flush_chunk(self) -> None:
+        """Write the current chunk to the file."""
+
+        self.__file.write("".join(self.__chunk))
+        self.__chunk.clear()
+        self.__chunk_length = 0
+
+    def __end_statement(self) -> None:
+        """End the statement of the current subject, if there is one."""
+
+        if self.__subject is not None:
+            self.__append(" .\n")
+            self.__subject = None
+
+    def __end_graph(self) -> None:
+        """End the block of the current named graph, if there is one."""
+
+        self.__end_statement()
+
+        if self.__graph_name != DEFAULT_GRAPH_NAME:
+            self.__append("}\n")
+            self.__graph_name = DEFAULT_GRAPH_NAME
+
+    def __write_grouped(self, quad: Quad) -> None:
+        """Write quad into the statement of its subject, starting a new statement or graph block when they change."""
+
+        graph_name = str(quad.graph_name) if self.__has_graphs else DEFAULT_GRAPH_NAME
+        if graph_name != self.__graph_name:
+            self.__end_graph()
+            if graph_name != DEFAULT_GRAPH_NAME:
+                self.__append(f"{graph_name} {{\n")
+            self.__graph_name = graph_name
+
+        indentation = "" if self.__graph_name == DEFAULT_GRAPH_NAME else "\t"
+        predicate = "a" if quad.predicate == RDF.TYPE else str(quad.predicate)
+        subject = str(quad.subject)
+
+        if subject == self.__subject:
+            self.__append(f" ;\n{indentation}\t{predicate} {quad.object}")
+        else:
+            self.__end_statement()
+            self.__append(f"{indentation}{subject} {predicate} {quad.object}")
+            self.__subject = subject
+
+    def write(self, quads: Iterable[Quad]) -> None:
+        """Write quads to the file."""
+
+        if self.__is_line_based:
+            for quad in quads:
+                self.__append(f"{quad if self.__has_graphs else quad.triple} .\n")
+            return
+
+        for quad in quads:
+            self.__write_grouped(quad)
+
+    def close(self) -> None:
+        """End the last statement, write the remaining chunk and close the file."""
+
+        self.__end_graph()
+        self.__flush_chunk()
+        self.__file.close()
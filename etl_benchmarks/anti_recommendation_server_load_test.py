@@ -0,0 +1,171 @@
+"""
+Load test an AntiRecommendationServer over a synthetic index.
+
+Run with `python -m etl_benchmarks.anti_recommendation_server_load_test --help`.
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from etl.models import WIKIPEDIA_BASE_URL
+from etl.models.types import OpenAiEmbeddingModelName
+from etl.resources import RetrievalAlgorithmParameters
+from etl.servers import AntiRecommendationServer
+from etl.stores import VectorStore
+
+
+def create_synthetic_vector_store(
+    *, directory_path: Path, documents_count: int, dimensions: int
+) -> VectorStore:
+    """Save a VectorStore of documents_count random vectors to directory_path and return it."""
+
+    vector_store = VectorStore(
+        store=FAISS.from_embeddings(
+            text_embeddings=zip(
+                (f"Synthetic article {index}" for index in range(documents_count)),
+                np.random.default_rng(0)
+                .standard_normal((documents_count, dimensions), dtype=np.float32)
+                .tolist(),
+                strict=True,
+            ),
+            embedding=DeterministicFakeEmbedding(size=dimensions),
+            metadatas=[
+                {"source": f"{WIKIPEDIA_BASE_URL}Synthetic_article_{index}"}
+                for index in range(documents_count)
+            ],
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+        ),
+        directory_path=directory_path,
+        cache_directory_path=directory_path / "cache",
+        embedding_model_name=OpenAiEmbeddingModelName.TEXT_EMBEDDING_3_LARGE,
+    )
+    vector_store.save_local()
+
+    return vector_store
+
+
+def run_client(
+    *,
+    server_address: tuple[str, int],
+    record_keys: list[str],
+    latencies: list[float],
+) -> None:
+    """Look up record_keys one after another over a keep-alive connection and record each latency."""
+
+    connection = http.client.HTTPConnection(*server_address)
+
+    for record_key in record_keys:
+        start = time.perf_counter()
+        connection.request("GET", f"/anti-recommendations?record_key={record_key}&k=7")
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+
+        if response.status != http.client.OK:
+            raise RuntimeError(f"lookup of {record_key} failed with {response.status}")
+
+    connection.close()
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--documents", type=int, default=100_000)
+    argument_parser.add_argument("--dimensions", type=int, default=256)
+    argument_parser.add_argument("--concurrency", type=int, default=32)
+    argument_parser.add_argument("--requests-per-client", type=int, default=200)
+    argument_parser.add_argument("--max-batch-size", type=int, default=64)
+    argument_parser.add_argument("--max-batch-wait-seconds", type=float, default=0.002)
+    arguments = argument_parser.parse_args()
+
+    embedding = DeterministicFakeEmbedding(size=arguments.dimensions)
+
+    def open_vector_store(descriptor: VectorStore.Descriptor) -> VectorStore:
+        return VectorStore(
+            store=FAISS.load_local(
+                folder_path=str(descriptor.directory_path),
+                embeddings=embedding,
+                allow_dangerous_deserialization=True,
+                distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+            ),
+            directory_path=descriptor.directory_path,
+            cache_directory_path=descriptor.cache_directory_path,
+            embedding_model_name=descriptor.embedding_model_name,
+        )
+
+    with tempfile.TemporaryDirectory() as directory_name:
+        vector_store = create_synthetic_vector_store(
+            directory_path=Path(directory_name),
+            documents_count=arguments.documents,
+            dimensions=arguments.dimensions,
+        )
+
+        with AntiRecommendationServer(
+            vector_store_descriptor=vector_store.descriptor,
+            retrieval_algorithm_parameters=RetrievalAlgorithmParameters(
+                distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+                score_threshold=0,
+            ),
+            port=0,
+            max_batch_size=arguments.max_batch_size,
+            max_batch_wait_seconds=arguments.max_batch_wait_seconds,
+            open_vector_store=open_vector_store,
+        ) as anti_recommendation_server:
+            anti_recommendation_server.start()
+
+            rng = np.random.default_rng(1)
+            latencies: list[float] = []
+            clients = [
+                threading.Thread(
+                    target=run_client,
+                    kwargs={
+                        "server_address": anti_recommendation_server.server_address,
+                        "record_keys": [
+                            f"Synthetic_article_{index}"
+                            for index in rng.integers(
+                                arguments.documents, size=arguments.requests_per_client
+                            )
+                        ],
+                        "latencies": latencies,
+                    },
+                )
+                for _ in range(arguments.concurrency)
+            ]
+
+            start = time.perf_counter()
+            for client in clients:
+                client.start()
+            for client in clients:
+                client.join()
+            elapsed_seconds = time.perf_counter() - start
+
+    latency_percentiles = statistics.quantiles(latencies, n=100)
+
+    print(  # noqa: T201
+        json.dumps(
+            {
+                "documents": arguments.documents,
+                "dimensions": arguments.dimensions,
+                "concurrency": arguments.concurrency,
+                "requests": len(latencies),
+                "qps": len(latencies) / elapsed_seconds,
+                "p50_latency_ms": latency_percentiles[49] * 1000,
+                "p99_latency_ms": latency_percentiles[98] * 1000,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
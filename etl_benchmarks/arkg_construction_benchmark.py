@@ -0,0 +1,128 @@
+"""
+Benchmark loading ARKG quads one transaction at a time against ArkgBuilderPipeline's bulk loading.
+
+Run with `python -m etl_benchmarks.arkg_construction_benchmark --help`.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from pyoxigraph import Literal, NamedNode, Quad, Store
+
+from etl.models.types import AntiRecommendationKey, RecordKey
+from etl.namespaces import ARKG, RDF, SCHEMA, WD
+from etl.pipelines import ArkgBuilderPipeline
+from etl.stores import WikidataIdentifierStore
+
+
+def create_synthetic_graphs(
+    *, records_count: int, k: int
+) -> tuple[tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...]:
+    """Return the anti-recommendation graphs of records_count synthetic records, with k anti-recommendations each."""
+
+    record_keys = tuple(f"Synthetic_article_{index}" for index in range(records_count))
+    anti_recommendation_indices = np.random.default_rng(0).integers(
+        records_count, size=(records_count, k)
+    )
+
+    return tuple(
+        (
+            record_key,
+            tuple(record_keys[index] for index in record_anti_recommendation_indices),
+        )
+        for record_key, record_anti_recommendation_indices in zip(
+            record_keys, anti_recommendation_indices.tolist(), strict=True
+        )
+    )
+
+
+def add_quads(
+    *,
+    store: Store,
+    graphs: tuple[tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...],
+    wikidata_identifiers: dict[RecordKey, str],
+) -> None:
+    """Add the quads of graphs to store one Store.add call at a time, like ArkgBuilderPipeline did before bulk loading."""
+
+    for record_key, anti_recommendation_keys in graphs:
+        record_key_wikidata_iri = NamedNode(
+            WD.BASE_IRI.value + wikidata_identifiers[record_key]
+        )
+
+        store.add(Quad(record_key_wikidata_iri, RDF.TYPE, SCHEMA.WEB_PAGE))
+        store.add(Quad(record_key_wikidata_iri, SCHEMA.TITLE, Literal(record_key)))
+        store.add(
+            Quad(
+                record_key_wikidata_iri,
+                SCHEMA.URL,
+                Literal(record_key_wikidata_iri.value),
+            )
+        )
+
+        for anti_recommendation_key in anti_recommendation_keys:
+            anti_recommendation_iri = ARKG.anti_recommendation_iri(
+                record_key=anti_recommendation_key
+            )
+            store.add(Quad(anti_recommendation_iri, RDF.TYPE, SCHEMA.RECOMMENDATION))
+            store.add(
+                Quad(
+                    anti_recommendation_iri,
+                    SCHEMA.ITEM_REVIEWED,
+                    record_key_wikidata_iri,
+                )
+            )
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--quads", type=int, default=10_000_000)
+    argument_parser.add_argument("--k", type=int, default=7)
+    arguments = argument_parser.parse_args()
+
+    records_count = arguments.quads // (3 + 2 * arguments.k)
+    graphs = create_synthetic_graphs(records_count=records_count, k=arguments.k)
+    wikidata_identifiers = {
+        record_key: f"Q{index}" for index, (record_key, _) in enumerate(graphs)
+    }
+    quads_count = records_count * (3 + 2 * arguments.k)
+
+    report: dict[str, float] = {"records": records_count, "quads": quads_count}
+
+    with tempfile.TemporaryDirectory() as directory_name:
+        directory_path = Path(directory_name)
+
+        start = time.perf_counter()
+        add_quads(
+            store=Store(directory_path / "add"),
+            graphs=graphs,
+            wikidata_identifiers=wikidata_identifiers,
+        )
+        report["add_quads_per_second"] = quads_count / (time.perf_counter() - start)
+
+        with WikidataIdentifierStore(
+            file_path=directory_path / "wikidata_identifiers.sqlite"
+        ) as wikidata_identifier_store:
+            wikidata_identifier_store.put(wikidata_identifiers)
+
+            arkg_builder_pipeline = ArkgBuilderPipeline(
+                arkg_store_directory_path=directory_path / "bulk_extend",
+                requests_cache_directory_path=directory_path / "requests_cache",
+                wikidata_identifier_store=wikidata_identifier_store,
+                mediawiki_api_url=None,
+            )
+
+            start = time.perf_counter()
+            arkg_builder_pipeline.construct_graph(graphs)
+            report["bulk_extend_quads_per_second"] = quads_count / (
+                time.perf_counter() - start
+            )
+
+    print(json.dumps(report, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
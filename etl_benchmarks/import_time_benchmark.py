@@ -0,0 +1,166 @@
+"""
+Benchmark the time to import etl.definitions, which the Dagster webserver, daemon and every step process pay
+to load the etl code location, and fail if it exceeds its budget.
+
+Every import is timed in a fresh interpreter. The budget is relative to the time to import dagster in the same
+environment, so that it holds on slower machines, and no module of DEFERRED_MODULES may be imported, as those
+are only imported by the assets that use them.
+
+Run with `python -m etl_benchmarks.import_time_benchmark --help`.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+DEFERRED_MODULES = (
+    "faiss",
+    "langchain",
+    "langchain_community",
+    "langchain_core",
+    "langchain_openai",
+    "openai",
+    "requests_cache",
+)
+
+TIMED_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module_name}
+print(json.dumps({{"seconds": time.perf_counter() - start, "modules": sorted(sys.modules)}}))
+"""
+
+
+def time_import(module_name: str) -> dict[str, object]:
+    """Import module_name in a fresh interpreter, and return the seconds it took and the modules it imported."""
+
+    completed_process = subprocess.run(
+        [  # noqa: S603
+            sys.executable,
+            "-c",
+            TIMED_IMPORT_SCRIPT.format(module_name=module_name),
+        ],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+        text=True,
+    )
+
+    return json.loads(completed_process.stdout.splitlines()[-1])
+
+
+def slowest_imports(module_name: str, *, count: int) -> list[dict[str, object]]:
+    """Return the count top-level packages that take the longest to import with module_name, by -X importtime."""
+
+    completed_process = subprocess.run(
+        [  # noqa: S603
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import {module_name}",
+        ],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+        text=True,
+    )
+    cumulative_microseconds: dict[str, int] = {}
+
+    # Lines are "import time: <self us> | <cumulative us> | <indentation><module name>".
+    for line in completed_process.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():  # noqa: PLR2004
+            continue
+        imported_module_name = fields[2].strip()
+        if "." not in imported_module_name:
+            cumulative_microseconds[imported_module_name] = max(
+                cumulative_microseconds.get(imported_module_name, 0),
+                int(fields[1]),
+            )
+
+    return [
+        {"module": imported_module_name, "seconds": microseconds / 1_000_000}
+        for imported_module_name, microseconds in sorted(
+            cumulative_microseconds.items(), key=lambda item: item[1], reverse=True
+        )[:count]
+    ]
+
+
+def run_benchmark(
+    *, module_name: str, baseline_module_name: str, repeat: int
+) -> dict[str, object]:
+    """Time the imports of module_name and baseline_module_name repeat times, and return their median times."""
+
+    timed_imports = [time_import(module_name) for _ in range(repeat)]
+    baseline_seconds = statistics.median(
+        float(time_import(baseline_module_name)["seconds"])  # type: ignore[arg-type]
+        for _ in range(repeat)
+    )
+    seconds = statistics.median(
+        float(timed_import["seconds"]) for timed_import in timed_imports  # type: ignore[arg-type]
+    )
+
+    return {
+        "module": module_name,
+        "seconds": seconds,
+        "baseline_module": baseline_module_name,
+        "baseline_seconds": baseline_seconds,
+        "ratio": seconds / baseline_seconds,
+        "deferred_modules_imported": [
+            deferred_module_name
+            for deferred_module_name in DEFERRED_MODULES
+            if deferred_module_name in timed_imports[0]["modules"]  # type: ignore[operator]
+        ],
+        "slowest_imports": slowest_imports(module_name, count=10),
+    }
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--module", default="etl.definitions")
+    argument_parser.add_argument("--baseline-module", default="dagster")
+    argument_parser.add_argument("--repeat", type=int, default=5)
+    argument_parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=1.5,
+        help="the budget, as the largest ratio of the import time of --module to that of --baseline-module",
+    )
+    argument_parser.add_argument(
+        "--max-seconds",
+        type=float,
+        help="an absolute budget for the import time of --module, in seconds",
+    )
+    arguments = argument_parser.parse_args()
+
+    report = run_benchmark(
+        module_name=arguments.module,
+        baseline_module_name=arguments.baseline_module,
+        repeat=arguments.repeat,
+    )
+    budget_violations = [
+        f"{arguments.module} imports {deferred_module_name}"
+        for deferred_module_name in report["deferred_modules_imported"]  # type: ignore[attr-defined]
+    ]
+    if report["ratio"] > arguments.max_ratio:  # type: ignore[operator]
+        budget_violations.append(
+            f"{arguments.module} imports {report['ratio']:.2f}x slower than {arguments.baseline_module}"
+        )
+    if arguments.max_seconds is not None and report["seconds"] > arguments.max_seconds:  # type: ignore[operator]
+        budget_violations.append(
+            f"{arguments.module} imports in {report['seconds']:.2f}s"
+        )
+    report["budget_violations"] = budget_violations
+
+    print(json.dumps(report, indent=2))  # noqa: T201
+
+    if budget_violations:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
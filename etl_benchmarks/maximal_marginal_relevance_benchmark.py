@@ -0,0 +1,77 @@
+"""
+Benchmark batched maximal marginal relevance against LangChain's per-query maximal_marginal_relevance.
+
+Run with `python -m etl_benchmarks.maximal_marginal_relevance_benchmark --help`.
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+from langchain_community.vectorstores.utils import maximal_marginal_relevance
+
+from etl.stores.maximal_marginal_relevance import maximal_marginal_relevance_batch
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--records", type=int, default=4096)
+    argument_parser.add_argument("--batch-size", type=int, default=256)
+    argument_parser.add_argument("--dimensions", type=int, default=3072)
+    argument_parser.add_argument("--k", type=int, default=7)
+    argument_parser.add_argument("--fetch-k", type=int, default=28)
+    argument_parser.add_argument("--lambda-mult", type=float, default=0.5)
+    arguments = argument_parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    query_vectors = rng.standard_normal(
+        (arguments.records, arguments.dimensions), dtype=np.float32
+    )
+    candidate_vectors = rng.standard_normal(
+        (arguments.records, arguments.fetch_k, arguments.dimensions),
+        dtype=np.float32,
+    )
+    is_candidate = np.ones((arguments.records, arguments.fetch_k), dtype=bool)
+
+    start = time.perf_counter()
+    for batch_start in range(0, arguments.records, arguments.batch_size):
+        batch = slice(batch_start, batch_start + arguments.batch_size)
+        maximal_marginal_relevance_batch(
+            query_vectors=query_vectors[batch],
+            candidate_vectors=candidate_vectors[batch],
+            is_candidate=is_candidate[batch],
+            k=arguments.k,
+            lambda_mult=arguments.lambda_mult,
+        )
+    batched_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query_vector, query_candidate_vectors in zip(
+        query_vectors, candidate_vectors, strict=True
+    ):
+        maximal_marginal_relevance(
+            query_vector,
+            list(query_candidate_vectors),
+            lambda_mult=arguments.lambda_mult,
+            k=arguments.k,
+        )
+    per_query_seconds = time.perf_counter() - start
+
+    print(  # noqa: T201
+        json.dumps(
+            {
+                "records": arguments.records,
+                "dimensions": arguments.dimensions,
+                "fetch_k": arguments.fetch_k,
+                "k": arguments.k,
+                "batched_us_per_record": batched_seconds / arguments.records * 1e6,
+                "per_query_us_per_record": per_query_seconds / arguments.records * 1e6,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Benchmark every asset from wikipedia_articles_from_storage to the ARKG serializations over a synthetic corpus.
+
+OpenAI models and the MediaWiki API are replaced by deterministic local stand-ins. Every asset is materialized
+in a fresh process, and the report records its duration, throughput, peak RSS and disk usage as JSON,
+which can be compared to the report of another commit with --baseline.
+
+Run with `python -m etl_benchmarks.pipeline_benchmark --help`.
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import UTC, datetime
+from multiprocessing import get_context
+from pathlib import Path
+
+from etl.models import rdf_serializations
+from etl.models.types import DataFileName
+from etl_tests.synthetic_wikipedia_corpus import write_synthetic_corpus
+
+STAGES = (
+    "wikipedia_articles_from_storage",
+    "wikipedia_articles_with_summaries",
+    "wikipedia_articles_with_summaries_json_file",
+    "documents_of_wikipedia_articles_with_summaries",
+    "wikipedia_articles_vector_store",
+    "wikipedia_anti_recommendations",
+    "wikipedia_anti_recommendations_json_file",
+    "wikipedia_arkg",
+    *(
+        f"wikipedia_arkg_with_{rdf_serialization_name}_serialization"
+        for rdf_serialization_name, _, _ in rdf_serializations
+    ),
+)
+
+
+def directory_size(directory_path: Path) -> int:
+    """Return the total size in bytes of the files in directory_path."""
+
+    return sum(
+        file_path.stat().st_size
+        for file_path in directory_path.rglob("*")
+        if file_path.is_file()
+    )
+
+
+def materialize_stage(  # noqa: PLR0913
+    *,
+    asset_name: str,
+    instance_directory_path: Path,
+    input_directory_path: Path,
+    data_file_names: tuple[DataFileName, ...],
+    output_directory_path: Path,
+    articles_count: int,
+    embedding_dimensions: int,
+    mediawiki_api_latency_seconds: float,
+) -> dict[str, float]:
+    """
+    Materialize the asset named asset_name, with the outputs of its upstream assets loaded from the Dagster instance
+    in instance_directory_path, and return its duration and the peak RSS of this process.
+
+    Runs in a fresh process, so that imports are excluded from the duration and the peak RSS is the stage's own.
+    """
+
+    from dagster import DagsterInstance, load_assets_from_modules, materialize
+    from dagster._core.instance.ref import InstanceRef
+
+    from etl import assets
+    from etl.resources import (
+        CompressionSettings,
+        InputConfig,
+        LocalEmbeddingSettings,
+        MemorySettings,
+        OpenaiSettings,
+        OutputConfig,
+        RetrievalAlgorithmParameters,
+        VectorStoreSettings,
+        WikidataSettings,
+    )
+    from etl_tests.mediawiki_api_stand_in import MediaWikiApiStandIn
+    from etl_tests.openai_stand_ins import openai_stand_ins
+    from etl_tests.synthetic_wikipedia_corpus import (
+        SyntheticWikidataIdentifiers,
+    )
+
+    with openai_stand_ins(
+        embedding_dimensions=embedding_dimensions
+    ), MediaWikiApiStandIn(
+        wikidata_identifiers=SyntheticWikidataIdentifiers(
+            articles_count=articles_count
+        ),
+        latency_seconds=mediawiki_api_latency_seconds,
+    ) as mediawiki_api_stand_in, DagsterInstance.from_ref(
+        InstanceRef.from_dir(str(instance_directory_path))
+    ) as instance:
+        start = time.perf_counter()
+        result = materialize(
+            load_assets_from_modules([assets]),
+            selection=[asset_name],
+            instance=instance,
+            resources={
+                "compression_settings": CompressionSettings.from_env_vars(),
+                "input_config": InputConfig.default(
+                    data_directory_path_default=input_directory_path,
+                    data_file_names_default=data_file_names,
+                ),
+                "local_embedding_settings": LocalEmbeddingSettings.from_env_vars(),
+                "memory_settings": MemorySettings.from_env_vars(
+                    spill_directory_path_default=output_directory_path / "spill"
+                ),
+                "openai_settings": OpenaiSettings(openai_api_key="stand-in"),
+                "output_config": OutputConfig.default(
+                    output_directory_path_default=output_directory_path
+                ),
+                "retrieval_algorithm_parameters": RetrievalAlgorithmParameters.from_env_vars(),
+                "vector_store_settings": VectorStoreSettings.from_env_vars(),
+                "wikidata_settings": WikidataSettings(
+                    mediawiki_api_url=mediawiki_api_stand_in.url
+                ),
+            },
+        )
+        elapsed_seconds = time.perf_counter() - start
+
+    if not result.success:
+        raise RuntimeError(f"materializing {asset_name} failed")
+
+    return {
+        "seconds": elapsed_seconds,
+        # ru_maxrss is in kilobytes on Linux, and in bytes on macOS.
+        "peak_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        * (1 if sys.platform == "darwin" else 1024),
+    }
+
+
+def run_benchmark(  # noqa: PLR0913
+    *,
+    directory_path: Path,
+    articles_count: int,
+    data_files_count: int,
+    stages: tuple[str, ...],
+    embedding_dimensions: int,
+    mediawiki_api_latency_seconds: float,
+) -> list[dict[str, object]]:
+    """Materialize stages in order over a synthetic corpus of articles_count articles, and return their statistics."""
+
+    input_directory_path = directory_path / "input"
+    output_directory_path = directory_path / "output"
+    instance_directory_path = directory_path / "dagster"
+    instance_directory_path.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    data_file_names = write_synthetic_corpus(
+        directory_path=input_directory_path,
+        articles_count=articles_count,
+        data_files_count=data_files_count,
+    )
+    elapsed_seconds = time.perf_counter() - start
+    stage_reports: list[dict[str, object]] = [
+        {
+            "stage": "synthetic_wikipedia_corpus",
+            "seconds": elapsed_seconds,
+            "records_per_second": articles_count / elapsed_seconds,
+            "disk_bytes": directory_size(input_directory_path),
+        }
+    ]
+
+    for stage in stages:
+        disk_bytes = directory_size(output_directory_path) + directory_size(
+            instance_directory_path
+        )
+
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=get_context("spawn")
+        ) as executor:
+            stage_statistics = executor.submit(
+                materialize_stage,
+                asset_name=stage,
+                instance_directory_path=instance_directory_path,
+                input_directory_path=input_directory_path,
+                data_file_names=data_file_names,
+                output_directory_path=output_directory_path,
+                articles_count=articles_count,
+                embedding_dimensions=embedding_dimensions,
+                mediawiki_api_latency_seconds=mediawiki_api_latency_seconds,
+            ).result()
+
+        # Disk usage includes the outputs that the Dagster instance stores for downstream stages.
+        stage_disk_bytes = directory_size(output_directory_path) + directory_size(
+            instance_directory_path
+        )
+        stage_reports.append(
+            {
+                "stage": stage,
+                **stage_statistics,
+                "records_per_second": articles_count / stage_statistics["seconds"],
+                "disk_bytes": stage_disk_bytes,
+                "disk_delta_bytes": stage_disk_bytes - disk_bytes,
+            }
+        )
+
+    return stage_reports
+
+
+def compare(
+    report: dict[str, object], baseline_report: dict[str, object]
+) -> dict[str, dict[str, float]]:
+    """Return the ratios of the seconds and peak RSS of every stage of report to those of baseline_report."""
+
+    baseline_stage_reports = {
+        stage_report["stage"]: stage_report
+        for stage_report in baseline_report["stages"]  # type: ignore[attr-defined]
+    }
+    comparison = {}
+
+    for stage_report in report["stages"]:  # type: ignore[attr-defined]
+        baseline_stage_report = baseline_stage_reports.get(stage_report["stage"])
+        if baseline_stage_report is None:
+            continue
+
+        comparison[stage_report["stage"]] = {
+            metric: stage_report[metric] / baseline_stage_report[metric]
+            for metric in ("seconds", "peak_rss_bytes", "disk_bytes")
+            if stage_report.get(metric) and baseline_stage_report.get(metric)
+        }
+
+    return comparison
+
+
+def git_commit() -> str | None:
+    """Return the commit that is checked out, or None outside a git repository."""
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],  # noqa: S603, S607
+            capture_output=True,
+            check=True,
+            cwd=Path(__file__).parent,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--articles", type=int, default=10_000)
+    argument_parser.add_argument("--data-files", type=int, default=1)
+    argument_parser.add_argument(
+        "--stages",
+        nargs="+",
+        default=list(STAGES),
+        choices=STAGES,
+        help="the assets to materialize, in order; each needs the outputs of the stages before it",
+    )
+    argument_parser.add_argument("--embedding-dimensions", type=int, default=256)
+    argument_parser.add_argument(
+        "--mediawiki-api-latency-seconds", type=float, default=0.0
+    )
+    argument_parser.add_argument(
+        "--directory",
+        type=Path,
+        help="the directory to write the corpus and outputs to, a temporary directory by default",
+    )
+    argument_parser.add_argument(
+        "--output", type=Path, help="the file to write the report to"
+    )
+    argument_parser.add_argument(
+        "--baseline", type=Path, help="a report to compare this report to"
+    )
+    arguments = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory_name:
+        stage_reports = run_benchmark(
+            directory_path=arguments.directory or Path(directory_name),
+            articles_count=arguments.articles,
+            data_files_count=arguments.data_files,
+            stages=tuple(arguments.stages),
+            embedding_dimensions=arguments.embedding_dimensions,
+            mediawiki_api_latency_seconds=arguments.mediawiki_api_latency_seconds,
+        )
+
+    report: dict[str, object] = {
+        "commit": git_commit(),
+        "created_at": datetime.now(tz=UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "articles": arguments.articles,
+        "data_files": arguments.data_files,
+        "embedding_dimensions": arguments.embedding_dimensions,
+        "stages": stage_reports,
+    }
+    if arguments.baseline:
+        report["baseline_ratios"] = compare(
+            report, json.loads(arguments.baseline.read_text(encoding="utf-8"))
+        )
+
+    report_json = json.dumps(report, indent=2)
+    if arguments.output:
+        arguments.output.write_text(report_json + "\n", encoding="utf-8")
+    print(report_json)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Benchmark a SparqlServer over a synthetic ARKG with representative anti-recommendation queries at increasing concurrency.
+
+Run with `python -m etl_benchmarks.sparql_server_benchmark --help`.
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+
+from etl.models import AntiRecommendationGraphTuple
+from etl.namespaces import ARKG, SCHEMA, WD
+from etl.resources import WikidataSettings
+from etl.servers import SparqlServer
+from etl.stores import ArkgStore, WikidataIdentifierStore
+from etl_benchmarks.arkg_construction_benchmark import create_synthetic_graphs
+
+
+def create_queries(*, records_count: int, queries_count: int) -> list[str]:
+    """
+    Return queries_count representative queries about Zipf-distributed synthetic records.
+
+    The queries cycle through the anti-recommendations of a record, the record of a title,
+    and the records that an anti-recommendation reviews.
+    """
+
+    record_indices = (
+        np.random.default_rng(1).zipf(1.2, size=queries_count) - 1
+    ) % records_count
+    queries = []
+
+    for query_index, record_index in enumerate(record_indices.tolist()):
+        match query_index % 3:
+            case 0:
+                query = f"SELECT ?anti_recommendation WHERE {{ ?anti_recommendation {SCHEMA.ITEM_REVIEWED} <{WD.BASE_IRI.value}Q{record_index}> }}"
+            case 1:
+                query = f'SELECT ?item WHERE {{ ?item {SCHEMA.TITLE} "Synthetic_article_{record_index}" }}'
+            case _:
+                query = f"SELECT ?item ?title WHERE {{ {ARKG.anti_recommendation_iri(f'Synthetic_article_{record_index}')} {SCHEMA.ITEM_REVIEWED} ?item . ?item {SCHEMA.TITLE} ?title }}"
+
+        queries.append(f"/sparql?query={quote(query)}")
+
+    return queries
+
+
+def run_client(
+    *,
+    server_address: tuple[str, int],
+    paths: list[str],
+    latencies: list[float],
+) -> None:
+    """Request paths one after another over a keep-alive connection and record each latency."""
+
+    connection = http.client.HTTPConnection(*server_address)
+
+    for path in paths:
+        start = time.perf_counter()
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+
+        if response.status != http.client.OK:
+            raise RuntimeError(f"query {path} failed with {response.status}")
+
+    connection.close()
+
+
+def run_level(
+    *,
+    sparql_server: SparqlServer,
+    queries: list[str],
+    concurrency: int,
+    requests_per_client: int,
+) -> dict[str, float]:
+    """Run concurrency clients of requests_per_client queries each against sparql_server, and return their statistics."""
+
+    latencies: list[float] = []
+    cache_hit_count = sparql_server.cache_hit_count
+    clients = [
+        threading.Thread(
+            target=run_client,
+            kwargs={
+                "server_address": sparql_server.server_address,
+                "paths": [
+                    queries[
+                        (client_index * requests_per_client + request_index)
+                        % len(queries)
+                    ]
+                    for request_index in range(requests_per_client)
+                ],
+                "latencies": latencies,
+            },
+        )
+        for client_index in range(concurrency)
+    ]
+
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed_seconds = time.perf_counter() - start
+
+    latency_percentiles = statistics.quantiles(latencies, n=100)
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "qps": len(latencies) / elapsed_seconds,
+        "p50_latency_ms": latency_percentiles[49] * 1000,
+        "p99_latency_ms": latency_percentiles[98] * 1000,
+        "cache_hits": sparql_server.cache_hit_count - cache_hit_count,
+    }
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--records", type=int, default=100_000)
+    argument_parser.add_argument("--k", type=int, default=7)
+    argument_parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32]
+    )
+    argument_parser.add_argument("--requests-per-client", type=int, default=200)
+    argument_parser.add_argument("--max-concurrent-queries", type=int, default=8)
+    argument_parser.add_argument(
+        "--cache-size",
+        type=int,
+        nargs="+",
+        default=[0, 4096],
+        help="the cache sizes to benchmark, 0 disables the cache",
+    )
+    arguments = argument_parser.parse_args()
+
+    graphs = create_synthetic_graphs(records_count=arguments.records, k=arguments.k)
+    report: dict[str, object] = {"records": arguments.records, "k": arguments.k}
+
+    with tempfile.TemporaryDirectory() as directory_name:
+        directory_path = Path(directory_name)
+
+        with WikidataIdentifierStore(
+            file_path=directory_path / "wikidata_identifiers.sqlite"
+        ) as wikidata_identifier_store:
+            wikidata_identifier_store.put(
+                {
+                    record_key: f"Q{index}"
+                    for index, (record_key, _) in enumerate(graphs)
+                }
+            )
+
+            with ArkgStore.create(
+                directory_path=directory_path / "arkg_store",
+                requests_cache_directory_path=directory_path / "requests_cache",
+                anti_recommendation_graphs=AntiRecommendationGraphTuple(
+                    anti_recommendation_graphs=graphs
+                ),
+                wikidata_identifier_store=wikidata_identifier_store,
+                wikidata_settings=WikidataSettings(offline=True),
+            ) as arkg_store:
+                arkg_store_descriptor = arkg_store.descriptor
+
+        for cache_size in arguments.cache_size:
+            with SparqlServer(
+                arkg_store_descriptor=arkg_store_descriptor,
+                port=0,
+                max_concurrent_queries=arguments.max_concurrent_queries,
+                cache_size=cache_size,
+            ) as sparql_server:
+                sparql_server.start()
+
+                report[f"cache_size_{cache_size}"] = [
+                    run_level(
+                        sparql_server=sparql_server,
+                        queries=create_queries(
+                            records_count=arguments.records,
+                            queries_count=concurrency * arguments.requests_per_client,
+                        ),
+                        concurrency=concurrency,
+                        requests_per_client=arguments.requests_per_client,
+                    )
+                    for concurrency in arguments.concurrency
+                ]
+
+    print(json.dumps(report, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark Wikidata identifier resolution in ArkgBuilderPipeline against a local stand-in of the MediaWiki API.
+
+Run with `python -m etl_benchmarks.wikidata_identifier_resolution_benchmark --help`.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from etl.pipelines import ArkgBuilderPipeline
+from etl_tests.mediawiki_api_stand_in import MediaWikiApiStandIn
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("--records", type=int, default=1000)
+    argument_parser.add_argument("--latency-seconds", type=float, default=0.02)
+    argument_parser.add_argument("--max-titles-per-request", type=int, default=50)
+    argument_parser.add_argument("--max-concurrent-requests", type=int, default=8)
+    arguments = argument_parser.parse_args()
+
+    record_keys = tuple(
+        f"Synthetic_article_{index}" for index in range(arguments.records)
+    )
+    graphs = tuple((record_key, ()) for record_key in record_keys)
+
+    report = {
+        "records": arguments.records,
+        "latency_seconds": arguments.latency_seconds,
+    }
+
+    for name, max_titles_per_request, max_concurrent_requests in (
+        ("per_title", 1, 1),
+        (
+            "batched",
+            arguments.max_titles_per_request,
+            arguments.max_concurrent_requests,
+        ),
+    ):
+        with MediaWikiApiStandIn(
+            wikidata_identifiers={
+                record_key.replace("_", " "): f"Q{index}"
+                for index, record_key in enumerate(record_keys)
+            },
+            latency_seconds=arguments.latency_seconds,
+        ) as mediawiki_api_stand_in, tempfile.TemporaryDirectory() as directory_name:
+            arkg_builder_pipeline = ArkgBuilderPipeline(
+                arkg_store_directory_path=Path(directory_name) / "arkg_store",
+                requests_cache_directory_path=Path(directory_name) / "requests_cache",
+                mediawiki_api_url=mediawiki_api_stand_in.url,
+                max_titles_per_request=max_titles_per_request,
+                max_concurrent_requests=max_concurrent_requests,
+            )
+
+            start = time.perf_counter()
+            arkg_builder_pipeline.construct_graph(graphs)
+            report[f"{name}_seconds"] = time.perf_counter() - start
+            report[f"{name}_requests"] = mediawiki_api_stand_in.request_count
+
+    print(json.dumps(report, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
+import hashlib
+import math
 import os
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import override
 
 import pytest
 from faiss import IndexFlatL2
@@ -7,7 +11,7 @@ from langchain.docstore.document import Document
 from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 from langchain_community.vectorstores.utils import DistanceStrategy
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
 
 from etl.models import (
     WIKIPEDIA_BASE_URL,
@@ -19,6 +23,7 @@ from etl.models.types import (
     AntiRecommendationKey,
     DataFileName,
     ModelResponse,
+    OpenAiEmbeddingModelName,
     RdfFileExtension,
     RdfMimeType,
     RdfSerializationName,
@@ -28,18 +33,21 @@ from etl.models.types import (
 from etl.pipelines import (
     AntiRecommendationRetrievalPipeline,
     ArkgBuilderPipeline,
+    EmbeddingPipeline,
     OpenaiEmbeddingPipeline,
     OpenaiRecordEnrichmentPipeline,
 )
 from etl.readers import WikipediaReader
 from etl.resources import (
     InputConfig,
+    MemorySettings,
     OpenaiSettings,
     OutputConfig,
     RetrievalAlgorithmParameters,
 )
 from etl.stores.arkg_store import ArkgStore
 from etl.stores.vector_store import VectorStore
+from etl_tests.openai_stand_ins import openai_stand_ins
 
 
 @pytest.fixture(scope="session")
@@ -100,16 +108,26 @@ def wikipedia_reader(input_config: InputConfig) -> WikipediaReader:
 
 
 @pytest.fixture(scope="session")
-def openai_settings() -> OpenaiSettings:
+def memory_settings() -> MemorySettings:
+    """Return a MemorySettings object without a memory budget."""
+
+    return MemorySettings()
+
+
+@pytest.fixture(scope="session")
+def openai_settings() -> Iterator[OpenaiSettings]:
     """
     Return an OpenaiSettings object.
-    Skip all tests that use this fixture if OPENAI_API_KEY is not present in the environment variables.
+    If OPENAI_API_KEY is not present in the environment variables, the OpenAI chat and embedding models of the
+    pipelines are replaced by their deterministic local stand-ins for the rest of the session.
     """
 
     if "OPENAI_API_KEY" in os.environ:
-        return OpenaiSettings(openai_api_key=os.environ.get("OPENAI_API_KEY"))
+        yield OpenaiSettings(openai_api_key=os.environ.get("OPENAI_API_KEY"))
+        return
 
-    pytest.skip(reason="don't have OpenAI key.")
+    with openai_stand_ins():
+        yield OpenaiSettings(openai_api_key="stand-in")
 
 
 @pytest.fixture(scope="session")
@@ -209,29 +227,140 @@ def tuple_of_articles_with_summaries(
 def vector_store(
     openai_embedding_pipeline: OpenaiEmbeddingPipeline,
     document_of_article_with_summary: Document,
+    document_of_anti_recommendation_article: Document,
     output_config: OutputConfig,
     openai_settings: OpenaiSettings,
 ) -> VectorStore:
-    """Return a VectorStore."""
+    """Return a VectorStore, saved to the output directory."""
 
     parsed_output_config = output_config.parse()
 
-    return VectorStore(
+    vector_store = VectorStore(
         store=openai_embedding_pipeline.create_vector_store(
-            documents=(document_of_article_with_summary,)
+            documents=(
+                document_of_article_with_summary,
+                document_of_anti_recommendation_article,
+            )
         ),
         cache_directory_path=parsed_output_config.openai_embeddings_cache_directory_path,
         directory_path=parsed_output_config.openai_embeddings_directory_path,
         embedding_model_name=openai_settings.embedding_model_name,
     )
+    vector_store.save_local()
+
+    return vector_store
+
+
+class BagOfWordsEmbedding(Embeddings):
+    """A deterministic embedding model that hashes the words of a text into a normalized vector of word counts."""
+
+    def __init__(self, size: int) -> None:
+        self.__size = size
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        vector = [0.0] * self.__size
+
+        for word in text.lower().split():
+            vector[
+                int(hashlib.sha256(word.encode()).hexdigest(), 16) % self.__size
+            ] += 1
+
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+
+class FakeEmbeddingPipeline(EmbeddingPipeline):
+    """An EmbeddingPipeline that embeds Documents with a BagOfWordsEmbedding."""
+
+    @override
+    def _create_embedding_model(self) -> Embeddings:
+        return BagOfWordsEmbedding(size=42)
+
+
+@pytest.fixture(scope="session")
+def fake_embedding() -> Embeddings:
+    """Return a deterministic embedding model that does not need an OpenAI key."""
+
+    return BagOfWordsEmbedding(size=42)
+
+
+@pytest.fixture(scope="session")
+def fake_embedding_pipeline() -> EmbeddingPipeline:
+    """Return an EmbeddingPipeline that does not need an OpenAI key."""
+
+    return FakeEmbeddingPipeline()
+
+
+@pytest.fixture(scope="session")
+def fake_retrieval_algorithm_parameters() -> RetrievalAlgorithmParameters:
+    """Return a RetrievalAlgorithmParameters object that matches the index of fake_vector_store."""
+
+    return RetrievalAlgorithmParameters(
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+        score_threshold=0,
+    )
+
+
+@pytest.fixture(scope="session")
+def open_fake_vector_store(
+    fake_embedding: Embeddings,
+) -> Callable[[VectorStore.Descriptor], VectorStore]:
+    """Return a function that loads a VectorStore saved by fake_vector_store."""
+
+    def open_vector_store(descriptor: VectorStore.Descriptor) -> VectorStore:
+        return VectorStore(
+            store=FAISS.load_local(
+                folder_path=str(descriptor.directory_path),
+                embeddings=fake_embedding,
+                allow_dangerous_deserialization=True,
+                distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+            ),
+            directory_path=descriptor.directory_path,
+            cache_directory_path=descriptor.cache_directory_path,
+            embedding_model_name=descriptor.embedding_model_name,
+        )
+
+    return open_vector_store
+
+
+@pytest.fixture(scope="session")
+def fake_vector_store(
+    tmp_path_factory: pytest.TempPathFactory,
+    fake_embedding: Embeddings,
+    document_of_article_with_summary: Document,
+    document_of_anti_recommendation_article: Document,
+) -> VectorStore:
+    """Return a VectorStore with embeddings from fake_embedding, saved to a temporary directory."""
+
+    directory_path = tmp_path_factory.mktemp("fake_vector_store")
+
+    vector_store = VectorStore(
+        store=FAISS.from_documents(
+            documents=[
+                document_of_article_with_summary,
+                document_of_anti_recommendation_article,
+            ],
+            embedding=fake_embedding,
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT,
+        ),
+        directory_path=directory_path,
+        cache_directory_path=directory_path / "cache",
+        embedding_model_name=OpenAiEmbeddingModelName.TEXT_EMBEDDING_3_LARGE,
+    )
+    vector_store.save_local()
+
+    return vector_store
 
 
 @pytest.fixture(scope="session")
-def faiss(openai_settings: OpenaiSettings) -> FAISS:  # noqa: ARG001
+def faiss(fake_embedding: Embeddings) -> FAISS:
     """Return a FAISS object."""
 
     return FAISS(
-        embedding_function=OpenAIEmbeddings(),
+        embedding_function=fake_embedding,
         docstore=InMemoryDocstore(),
         index=IndexFlatL2(42),
         index_to_docstore_id={},
@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import httpx
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+from etl.instrumentation import (
+    HttpCallRecorder,
+    Instrumentation,
+    InstrumentedEmbeddings,
+    Tracer,
+)
+from etl.instrumentation.slowest_spans import read_spans
+
+
+def openai_transport(body: dict) -> httpx.MockTransport:
+    """Return a stand-in of the OpenAI API that rate-limits the first request, and answers the next ones with body."""
+
+    request_count = 0
+
+    def handle(_request: httpx.Request) -> httpx.Response:
+        nonlocal request_count
+        request_count += 1
+        if request_count == 1:
+            return httpx.Response(429, headers={"retry-after-ms": "1"}, json={})
+
+        return httpx.Response(200, json=body)
+
+    return httpx.MockTransport(handle)
+
+
+def test_instrumented_embeddings_with_http_call_recorder(tmp_path: Path) -> None:
+    """Test that InstrumentedEmbeddings trace the retries and the token usage of OpenAI embeddings requests."""
+
+    traces_file_path = tmp_path / "traces.jsonl"
+    embeddings = InstrumentedEmbeddings(
+        OpenAIEmbeddings(
+            model="text-embedding-3-small",
+            api_key="stand-in",  # type: ignore[arg-type]
+            check_embedding_ctx_length=False,
+            http_async_client=httpx.AsyncClient(),
+            http_client=HttpCallRecorder.http_client(
+                transport=openai_transport(
+                    {
+                        "object": "list",
+                        "data": [
+                            {"object": "embedding", "index": 0, "embedding": [1.0]}
+                        ],
+                        "model": "text-embedding-3-small",
+                        "usage": {"prompt_tokens": 7, "total_tokens": 7},
+                    }
+                )
+            ),
+        ),
+        name="openai_embeddings",
+    )
+
+    with Tracer(service_name="etl", file_path=traces_file_path) as tracer:
+        with Instrumentation(tracer=tracer):
+            assert embeddings.embed_documents(["a", "b"]) == [[1.0], [1.0]]
+
+    (span,) = read_spans(traces_file_path)
+    assert span["attributes"]["http.request.resend_count"] == 1
+    # Without a check of their context length, texts are embedded in a request each.
+    assert span["attributes"]["gen_ai.usage.input_tokens"] == 14
+
+
+def test_http_call_recorder_with_chat_model() -> None:
+    """Test that an HttpCallRecorder counts the retries and the token usage of OpenAI chat completions requests."""
+
+    chat_model = ChatOpenAI(
+        api_key="stand-in",  # type: ignore[arg-type]
+        max_retries=2,
+        http_async_client=httpx.AsyncClient(),
+        http_client=HttpCallRecorder.http_client(
+            transport=openai_transport(
+                {
+                    "id": "chatcmpl-1",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": "gpt-3.5-turbo",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": "Summary"},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": 5,
+                        "completion_tokens": 3,
+                        "total_tokens": 8,
+                    },
+                }
+            )
+        ),
+    )
+
+    with HttpCallRecorder() as http_call_recorder:
+        assert chat_model.invoke("Question").content == "Summary"
+
+    assert http_call_recorder.request_count == 2
+    assert http_call_recorder.retry_count == 1
+    assert http_call_recorder.input_tokens == 5
+    assert http_call_recorder.output_tokens == 3
+
+    # Requests sent while no HttpCallRecorder is entered are not recorded.
+    chat_model.invoke("Question")
+    assert http_call_recorder.request_count == 2
@@ -0,0 +1,93 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dagster import Output, asset, materialize
+
+from etl.instrumentation import Instrumentation, instrumented
+
+
+def test_instrumentation() -> None:
+    """Test that an Instrumentation collects counts, call latencies and cache hit rates while it is entered."""
+
+    Instrumentation.current().count("items", 5)
+
+    with Instrumentation() as instrumentation:
+        assert Instrumentation.current() is instrumentation
+
+        Instrumentation.current().count("items", 2)
+        Instrumentation.current().count("items")
+        for _ in range(3):
+            with Instrumentation.current().time_call("remote"):
+                time.sleep(0.002)
+        Instrumentation.current().record_cache("lookups", hits=3, misses=1)
+
+    assert Instrumentation.current() is not instrumentation
+
+    metadata = instrumentation.metadata()
+
+    assert metadata["wall_time_seconds"] >= 0.006  # type: ignore[operator]
+    assert metadata["items_count"] == 3
+    assert metadata["remote_calls"] == 3
+    assert 2 <= metadata["remote_latency_p50_ms"] <= metadata["remote_latency_max_ms"]  # type: ignore[operator]
+    assert metadata["lookups_cache_hit_rate"] == 0.75
+    assert instrumentation.counter("items") == 3
+    assert metadata["peak_rss_increase_bytes"] >= 0  # type: ignore[operator]
+
+
+def test_instrumentation_in_threads() -> None:
+    """
+    Test that Instrumentations entered concurrently in threads record on their own, and that propagated functions
+    record on the Instrumentation of the thread that started them.
+    """
+
+    both_entered = threading.Barrier(2)
+
+    def count_items(count: int) -> int:
+        with Instrumentation() as instrumentation:
+            both_entered.wait()
+            Instrumentation.current().count("items", count)
+            both_entered.wait()
+
+        return instrumentation.counter("items")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert list(executor.map(count_items, (1, 2))) == [1, 2]
+
+    with Instrumentation() as instrumentation, ThreadPoolExecutor(
+        max_workers=2
+    ) as executor:
+        tuple(
+            executor.map(
+                Instrumentation.propagated(Instrumentation.current().count),
+                ("items",) * 4,
+            )
+        )
+        tuple(
+            executor.map(
+                Instrumentation.propagated(
+                    lambda count: Instrumentation.current().count("items", count)
+                ),
+                (1, 2),
+            )
+        )
+
+    assert instrumentation.counter("items") == 7
+
+
+def test_instrumented() -> None:
+    """Test that @instrumented attaches the measurements of an asset to its materialization, next to its own metadata."""
+
+    @asset
+    @instrumented
+    def counted() -> Output[int]:
+        Instrumentation.current().count("items", 7)
+        return Output(7, metadata={"value": 7})
+
+    result = materialize([counted])
+    metadata = result.asset_materializations_for_node("counted")[0].metadata
+
+    assert metadata["value"].value == 7
+    assert metadata["items_count"].value == 7
+    assert "cpu_time_seconds" in metadata
+    assert counted().value == 7
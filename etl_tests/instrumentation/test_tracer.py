@@ -0,0 +1,95 @@
+import json
+from pathlib import Path
+
+import pytest
+from dagster import asset, materialize
+
+from etl.instrumentation import Instrumentation, Tracer, instrumented
+from etl.instrumentation.slowest_spans import read_spans, slowest_spans
+
+
+def test_tracer(tmp_path: Path) -> None:
+    """Test that a Tracer nests Spans under their parent, marks failed Spans, and exports them as OTLP JSON."""
+
+    traces_file_path = tmp_path / "traces.jsonl"
+
+    with Tracer(
+        service_name="etl", file_path=traces_file_path, max_buffered_spans=2
+    ) as tracer:
+        with tracer.span("asset") as asset_span:
+            with tracer.span("call", {"batch_size": 3}) as call_span:
+                call_span.set_attribute("tokens", 10)
+            with pytest.raises(ValueError, match="failed"), tracer.span("call"):
+                raise ValueError("failed")
+
+    export_requests = [
+        json.loads(line)
+        for line in traces_file_path.read_text(encoding="utf-8").splitlines()
+    ]
+    assert len(export_requests) == 2
+    assert export_requests[0]["resourceSpans"][0]["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "etl"}}
+    ]
+
+    spans = {span["span_id"]: span for span in read_spans(traces_file_path)}
+    assert len(spans) == 3
+    assert spans[asset_span.span_id]["parent_span_id"] is None
+    assert spans[call_span.span_id]["parent_span_id"] == asset_span.span_id
+    assert spans[call_span.span_id]["attributes"] == {"batch_size": 3, "tokens": 10}
+    assert [span["status"] for span in spans.values()] == ["ok", "error", "ok"]
+
+
+def test_instrumented_tracing(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that @instrumented traces an asset, with its external calls nested under it, in the trace of the run."""
+
+    traces_file_path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("ETL_TRACES_FILE_PATH", str(traces_file_path))
+
+    @asset
+    @instrumented
+    def traced() -> int:
+        for latency_ms in range(5):
+            with Instrumentation.current().time_call(
+                "remote", {"latency_ms": latency_ms}
+            ):
+                pass
+        return 5
+
+    result = materialize([traced])
+
+    spans = list(read_spans(traces_file_path))
+    (asset_span,) = (span for span in spans if span["name"] == "traced")
+    call_spans = [span for span in spans if span["name"] == "remote"]
+
+    assert asset_span["attributes"]["dagster.run_id"] == result.run_id  # type: ignore[index]
+    assert len(call_spans) == 5
+    assert all(
+        call_span["parent_span_id"] == asset_span["span_id"]
+        and call_span["trace_id"] == asset_span["trace_id"]
+        for call_span in call_spans
+    )
+
+    report = slowest_spans(traces_file_path, count=2)
+    assert [span["name"] for span in report["slowest_spans"]] == ["remote", "remote"]  # type: ignore[attr-defined]
+    assert report["slowest_spans"][0]["parent_name"] == "traced"  # type: ignore[index]
+    assert report["span_names"]["remote"]["calls"] == 5  # type: ignore[index]
+    assert "traced" not in report["span_names"]  # type: ignore[operator]
+
+
+def test_instrumented_tracing_with_unreachable_endpoint(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that an asset succeeds, and its spans are still written to a file, when the traces endpoint is unreachable."""
+
+    traces_file_path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("ETL_TRACES_FILE_PATH", str(traces_file_path))
+    # Nothing listens on the discard port.
+    monkeypatch.setenv("ETL_TRACES_ENDPOINT", "http://127.0.0.1:9/v1/traces")
+
+    @asset
+    @instrumented
+    def traced() -> int:
+        return 1
+
+    assert materialize([traced]).success
+    assert [span["name"] for span in read_spans(traces_file_path)] == ["traced"]
@@ -0,0 +1,153 @@
+import json
+import threading
+import time
+from collections.abc import Mapping
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Self
+from urllib.parse import parse_qs, urlsplit
+
+
+class MediaWikiApiStandIn:
+    """
+    A local stand-in of the MediaWiki API that answers `action=query&prop=pageprops` requests with `formatversion=2`.
+
+    Titles are normalized like MediaWiki does for English Wikipedia (underscores become spaces, and the first letter
+    is capitalized), then mapped through redirects, then looked up in wikidata_identifiers.
+    Every request is answered after latency_seconds, to stand in for the round-trip to Wikipedia, and the first
+    failing_request_count requests are answered with a 503 status.
+    """
+
+    def __init__(
+        self,
+        *,
+        wikidata_identifiers: Mapping[str, str],
+        redirects: dict[str, str] | None = None,
+        latency_seconds: float = 0.0,
+        failing_request_count: int = 0,
+    ) -> None:
+        self.__wikidata_identifiers = wikidata_identifiers
+        self.__redirects = redirects or {}
+        self.__latency_seconds = latency_seconds
+        self.__failing_request_count = failing_request_count
+        self.__request_count = 0
+        self.__request_count_lock = threading.Lock()
+
+        self.__http_server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), self.__create_request_handler_class()
+        )
+        self.__http_server.daemon_threads = True
+        self.__serve_thread = threading.Thread(
+            target=self.__http_server.serve_forever, daemon=True
+        )
+        self.__serve_thread.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:  # noqa: ANN001
+        self.close()
+
+    @staticmethod
+    def __normalize(title: str) -> str:
+        """Return title normalized like a MediaWiki page title."""
+
+        title = title.replace("_", " ").strip()
+        return title[:1].upper() + title[1:]
+
+    def __query(self, titles: list[str]) -> dict:
+        """Return the `query` object of a pageprops response for titles."""
+
+        normalized = []
+        redirects = []
+        pages = {}
+
+        for title in titles:
+            normalized_title = self.__normalize(title)
+            if normalized_title != title:
+                normalized.append({"from": title, "to": normalized_title})
+
+            page_title = self.__redirects.get(normalized_title, normalized_title)
+            if page_title != normalized_title:
+                redirects.append({"from": normalized_title, "to": page_title})
+
+            pages[page_title] = (
+                {
+                    "title": page_title,
+                    "pageprops": {
+                        "wikibase_item": self.__wikidata_identifiers[page_title]
+                    },
+                }
+                if page_title in self.__wikidata_identifiers
+                else {"title": page_title, "missing": True}
+            )
+
+        return {
+            "normalized": normalized,
+            "redirects": redirects,
+            "pages": list(pages.values()),
+        }
+
+    def __handle_get(self, request_handler: BaseHTTPRequestHandler) -> None:
+        """Answer a pageprops request after latency_seconds."""
+
+        with self.__request_count_lock:
+            self.__request_count += 1
+            failing = self.__request_count <= self.__failing_request_count
+        time.sleep(self.__latency_seconds)
+
+        if failing:
+            request_handler.send_response(HTTPStatus.SERVICE_UNAVAILABLE)
+            request_handler.send_header("Content-Length", "0")
+            request_handler.end_headers()
+            return
+
+        titles = parse_qs(urlsplit(request_handler.path).query).get("titles", [""])[0]
+        body = json.dumps({"query": self.__query(titles.split("|"))}).encode("utf-8")
+
+        request_handler.send_response(HTTPStatus.OK)
+        request_handler.send_header("Content-Type", "application/json")
+        request_handler.send_header("Content-Length", str(len(body)))
+        request_handler.end_headers()
+        request_handler.wfile.write(body)
+
+    def __create_request_handler_class(self) -> type[BaseHTTPRequestHandler]:
+        """Return a BaseHTTPRequestHandler class that forwards requests to this stand-in."""
+
+        handle_get = self.__handle_get
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                handle_get(self)
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                pass
+
+        return RequestHandler
+
+    @property
+    def latency_seconds(self) -> float:
+        """The delay before each request is answered."""
+
+        return self.__latency_seconds
+
+    @property
+    def request_count(self) -> int:
+        """The number of requests answered so far."""
+
+        return self.__request_count
+
+    @property
+    def url(self) -> str:
+        """The URL of the stand-in's api.php endpoint."""
+
+        host, port = self.__http_server.server_address[:2]
+        return f"http://{host!s}:{port}/w/api.php"
+
+    def close(self) -> None:
+        """Stop the stand-in."""
+
+        self.__http_server.shutdown()
+        self.__http_server.server_close()
@@ -0,0 +1,229 @@
+import os
+import pickle
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import pytest
+
+from etl.memory import (
+    MemoryBudget,
+    MemoryBudgetExceededError,
+    SpilledSequence,
+    concatenate_sequences,
+    resident_set_size,
+)
+from etl.models import RecordTuple
+from etl_tests.synthetic_wikipedia_corpus import write_synthetic_corpus
+
+MEMORY_HEADROOM_BYTES = 128 << 20
+# The out-of-core test materializes a corpus whose Records and Documents are larger than the headroom of its
+# memory budget above the RSS after imports. Set ETL_MEMORY_BUDGET_TEST_MILLION_ARTICLES to also run it over a
+# million articles, which takes minutes.
+OUT_OF_CORE_ARTICLES_COUNT = 100_000
+OUT_OF_CORE_MEMORY_HEADROOM_BYTES = 64 << 20
+MILLION_ARTICLES_COUNT = 1_000_000
+
+
+def test_spilled_sequence(tmp_path: Path) -> None:
+    """Test that a SpilledSequence reads back, indexes and concatenates the items spilled to its segments."""
+
+    items = [(str(item), item) for item in range(1000)]
+    spilled_sequence = SpilledSequence.write(
+        items, directory_path=tmp_path / "spill", segment_bytes=256
+    )
+
+    assert len(spilled_sequence.segment_file_paths) > 1
+    assert list(spilled_sequence) == items
+    assert len(spilled_sequence) == len(items)
+    assert spilled_sequence[0] == items[0]
+    assert spilled_sequence[-1] == items[-1]
+    assert spilled_sequence[500] == items[500]
+    assert spilled_sequence[10:20] == tuple(items[10:20])
+    with pytest.raises(IndexError):
+        spilled_sequence[len(items)]
+
+    unpickled_sequence = pickle.loads(pickle.dumps(spilled_sequence))  # noqa: S301
+    assert list(concatenate_sequences((unpickled_sequence, spilled_sequence))) == [
+        *items,
+        *items,
+    ]
+    assert concatenate_sequences(((1, 2), [3])) == (1, 2, 3)
+
+
+def test_memory_budget(tmp_path: Path) -> None:
+    """Test that a MemoryBudget spills only with a budget, and raises once the RSS and reserved bytes exceed it."""
+
+    assert MemoryBudget(budget_bytes=None, spill_directory_path=tmp_path).collect(
+        iter(range(3))
+    ) == (0, 1, 2)
+
+    spilled_sequence = MemoryBudget(
+        budget_bytes=resident_set_size() + MEMORY_HEADROOM_BYTES,
+        spill_directory_path=tmp_path,
+    ).collect(iter(range(3)))
+    assert isinstance(spilled_sequence, SpilledSequence)
+    assert list(spilled_sequence) == [0, 1, 2]
+
+    with pytest.raises(MemoryBudgetExceededError):
+        MemoryBudget(budget_bytes=0, spill_directory_path=tmp_path).collect(range(3))
+
+    memory_budget = MemoryBudget(
+        budget_bytes=resident_set_size() + MEMORY_HEADROOM_BYTES,
+        spill_directory_path=tmp_path,
+    )
+    with pytest.raises(MemoryBudgetExceededError):
+        memory_budget.reserve(2 * MEMORY_HEADROOM_BYTES)
+    memory_budget.release(2 * MEMORY_HEADROOM_BYTES)
+    memory_budget.check()
+
+
+def peak_resident_set_size() -> int:
+    """
+    Return the peak RSS of the process in bytes.
+
+    The peak is read from VmHWM where /proc is available, because the ru_maxrss of a spawned process keeps the peak
+    of the process that forked it.
+    """
+
+    try:
+        with Path("/proc/self/status").open(encoding="utf-8") as status_file:
+            for line in status_file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    # ru_maxrss is in kilobytes on Linux, and in bytes on macOS.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (
+        1 if sys.platform == "darwin" else 1024
+    )
+
+
+def materialize_records_out_of_core(
+    directory_path: Path, memory_headroom_bytes: int
+) -> dict[str, int]:
+    """
+    Materialize the Records and Documents of the synthetic corpus in directory_path under a memory budget of the
+    RSS after imports plus memory_headroom_bytes, and return the budget, its headroom, the peak RSS, the Document
+    count and the size of the spilled Records and Documents.
+
+    Runs in a fresh process, so that the peak RSS is the materialization's own.
+    """
+
+    from dagster import build_asset_context
+
+    from etl.assets import (
+        documents_of_wikipedia_articles_with_summaries,
+        wikipedia_articles_from_storage,
+    )
+    from etl.models import DocumentTuple
+    from etl.resources import InputConfig, MemorySettings
+
+    memory_settings = MemorySettings(
+        memory_budget_bytes=resident_set_size() + memory_headroom_bytes,
+        spill_directory_path=str(directory_path / "spill"),
+    )
+    wikipedia_articles = wikipedia_articles_from_storage(  # type: ignore[attr-defined]
+        build_asset_context(),
+        InputConfig.default(
+            data_directory_path_default=directory_path / "input",
+            data_file_names_default=tuple(
+                file_path.name
+                for file_path in sorted((directory_path / "input").iterdir())
+            ),
+        ),
+        memory_settings,
+    ).value
+    # Outputs are passed between steps pickled, and fanned in by concatenation.
+    wikipedia_articles = RecordTuple.concatenate(
+        (pickle.loads(pickle.dumps(wikipedia_articles)),)  # noqa: S301
+    )
+    documents: DocumentTuple = documents_of_wikipedia_articles_with_summaries(  # type: ignore[attr-defined]
+        wikipedia_articles, memory_settings
+    )
+
+    return {
+        "memory_budget_bytes": int(memory_settings.memory_budget_bytes or 0),
+        "peak_rss_bytes": peak_resident_set_size(),
+        "documents_count": sum(1 for _ in documents.documents),
+        "spilled_bytes": sum(
+            segment_file_path.stat().st_size
+            for spilled_sequence in (wikipedia_articles.records, documents.documents)
+            if isinstance(spilled_sequence, SpilledSequence)
+            for segment_file_path in spilled_sequence.segment_file_paths
+        ),
+    }
+
+
+@pytest.mark.parametrize(
+    ("articles_count", "memory_headroom_bytes"),
+    [
+        (OUT_OF_CORE_ARTICLES_COUNT, OUT_OF_CORE_MEMORY_HEADROOM_BYTES),
+        pytest.param(
+            MILLION_ARTICLES_COUNT,
+            MEMORY_HEADROOM_BYTES,
+            marks=pytest.mark.skipif(
+                "ETL_MEMORY_BUDGET_TEST_MILLION_ARTICLES" not in os.environ,
+                reason="materializing a million articles takes minutes.",
+            ),
+        ),
+    ],
+)
+def test_out_of_core_materialization(
+    tmp_path: Path, articles_count: int, memory_headroom_bytes: int
+) -> None:
+    """
+    Test that Records and Documents larger than the headroom of a memory budget are spilled, and materialized
+    within the budget.
+    """
+
+    write_synthetic_corpus(
+        directory_path=tmp_path / "input",
+        articles_count=articles_count,
+        data_files_count=4,
+    )
+
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=get_context("spawn")
+    ) as executor:
+        report = executor.submit(
+            materialize_records_out_of_core, tmp_path, memory_headroom_bytes
+        ).result()
+
+    assert report["documents_count"] == articles_count
+    assert report["spilled_bytes"] > memory_headroom_bytes
+    assert report["peak_rss_bytes"] <= report["memory_budget_bytes"]
+
+
+def test_memory_budget_of_rematerialized_asset(tmp_path: Path) -> None:
+    """
+    Test that every run of an asset spills to its own directory, and that the directories of superseded runs are
+    removed once the asset is rematerialized, while the output of its latest materialization stays readable.
+    """
+
+    from dagster import DagsterInstance, asset, materialize
+
+    from etl.assets import memory_budget
+    from etl.resources import MemorySettings
+
+    memory_settings = MemorySettings(
+        memory_budget_bytes=resident_set_size() + MEMORY_HEADROOM_BYTES,
+        spill_directory_path=str(tmp_path / "spill"),
+    )
+
+    @asset
+    def spilled_items() -> object:
+        return memory_budget(memory_settings, "spilled_items").collect(iter(range(3)))
+
+    instance = DagsterInstance.ephemeral()
+    results = [materialize([spilled_items], instance=instance) for _ in range(3)]
+    run_ids = [result.run_id for result in results]
+
+    assert sorted(
+        directory_path.name
+        for directory_path in (tmp_path / "spill" / "spilled_items").iterdir()
+    ) == sorted(run_ids[1:])
+    assert list(results[-1].output_for_node("spilled_items")) == [0, 1, 2]
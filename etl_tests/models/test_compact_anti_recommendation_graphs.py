@@ -0,0 +1,59 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from etl.models import AntiRecommendationGraphTuple, CompactAntiRecommendationGraphs
+from etl.models.types import AntiRecommendationKey, RecordKey
+
+ANTI_RECOMMENDATION_GRAPHS = (
+    (
+        RecordKey("Mouseion"),
+        (AntiRecommendationKey("Café"), AntiRecommendationKey("B")),
+    ),
+    (RecordKey("B"), ()),
+    (RecordKey("Café"), (AntiRecommendationKey("Mouseion"),)),
+)
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    """Test that CompactAntiRecommendationGraphs round-trip to the tuple form after a save and a memory-mapped load."""
+
+    CompactAntiRecommendationGraphs.from_anti_recommendation_graphs(
+        ANTI_RECOMMENDATION_GRAPHS, scores=((0.5, 0.25), (), (1.0,))
+    ).save(tmp_path)
+
+    compact_anti_recommendation_graphs = CompactAntiRecommendationGraphs.load(tmp_path)
+
+    assert isinstance(compact_anti_recommendation_graphs.targets, np.memmap)
+    assert compact_anti_recommendation_graphs.keys() == ["Mouseion", "Café", "B"]
+    assert compact_anti_recommendation_graphs.targets.dtype == np.int32
+    assert compact_anti_recommendation_graphs.scores is not None
+    assert compact_anti_recommendation_graphs.scores.tolist() == [0.5, 0.25, 1.0]
+    assert (
+        compact_anti_recommendation_graphs.to_anti_recommendation_graphs()
+        == ANTI_RECOMMENDATION_GRAPHS
+    )
+
+
+def test_from_anti_recommendation_graphs_with_mismatched_scores() -> None:
+    """Test that CompactAntiRecommendationGraphs.from_anti_recommendation_graphs rejects a score count that does not match the keys."""
+
+    with pytest.raises(ValueError, match="expected 3 scores"):
+        CompactAntiRecommendationGraphs.from_anti_recommendation_graphs(
+            ANTI_RECOMMENDATION_GRAPHS, scores=((0.5,),)
+        )
+
+
+def test_pickle_anti_recommendation_graph_tuple() -> None:
+    """Test that an AntiRecommendationGraphTuple is pickled in its compact form and unpickled into an equal instance."""
+
+    anti_recommendation_graph_tuple = AntiRecommendationGraphTuple(
+        anti_recommendation_graphs=ANTI_RECOMMENDATION_GRAPHS
+    )
+
+    assert (
+        pickle.loads(pickle.dumps(anti_recommendation_graph_tuple))  # noqa: S301
+        == anti_recommendation_graph_tuple
+    )
@@ -0,0 +1,120 @@
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, override
+from unittest import mock
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from etl_tests.synthetic_wikipedia_corpus import VOCABULARY
+
+STAND_IN_QUESTION_WORDS = frozenset(
+    "in 5 sentences, give a summary of wikipedia entry. keep the answer as concise as possible. question:".split()
+)
+
+
+class StandInChatModel(BaseChatModel):
+    """
+    A local stand-in of ChatOpenAI that answers every question with a deterministic 5-sentence summary.
+
+    The summary is seeded by the CRC-32 of the question, and every sentence repeats a word of the question
+    that is not part of the enrichment prompt, so that summaries of related titles embed close together.
+    """
+
+    temperature: float = 0
+
+    @property
+    @override
+    def _llm_type(self) -> str:
+        return "stand-in"
+
+    @override
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        question = str(messages[-1].content)
+        rng = np.random.default_rng(zlib.crc32(question.encode("utf-8")))
+        subject_words = [
+            word.removesuffix("'s")
+            for word in question.lower().split()
+            if word not in STAND_IN_QUESTION_WORDS
+        ] or ["summary"]
+
+        sentences = []
+        for sentence_length in rng.integers(8, 20, size=5).tolist():
+            words = [
+                VOCABULARY[word_index]
+                for word_index in rng.integers(len(VOCABULARY), size=sentence_length)
+            ]
+            words[int(rng.integers(sentence_length))] = subject_words[
+                int(rng.integers(len(subject_words)))
+            ]
+            sentences.append(" ".join(words).capitalize() + ".")
+
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=" ".join(sentences)))]
+        )
+
+
+class StandInEmbeddings(Embeddings):
+    """
+    A local stand-in of OpenAIEmbeddings that embeds texts deterministically, by feature hashing.
+
+    Every lowercase word of a text adds a signed 1 to the dimension of the CRC-32 of the word,
+    and embeddings are normalized to unit length, so that texts that share words embed close together.
+    """
+
+    def __init__(
+        self, *, model: str, dimensions: int = 256, http_client: object = None
+    ) -> None:
+        # The http_client of OpenAIEmbeddings is accepted, and unused.
+        del http_client
+        # The model names the namespace of the embedding cache, which must not mix with that of the OpenAI model.
+        self.model = f"stand-in-{model}"
+        self.__dimensions = dimensions
+
+    def __embed(self, text: str) -> list[float]:
+        hashes = np.fromiter(
+            (zlib.crc32(word.encode("utf-8")) for word in text.lower().split()),
+            dtype=np.int64,
+        )
+        embedding = np.zeros(self.__dimensions, dtype=np.float32)
+        np.add.at(
+            embedding,
+            hashes % self.__dimensions,
+            np.where(hashes & (1 << 31), -1.0, 1.0).astype(np.float32),
+        )
+        norm = float(np.linalg.norm(embedding))
+
+        return (embedding / norm if norm else embedding).tolist()
+
+    @override
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.__embed(text) for text in texts]
+
+    @override
+    def embed_query(self, text: str) -> list[float]:
+        return self.__embed(text)
+
+
+@contextmanager
+def openai_stand_ins(*, embedding_dimensions: int = 256) -> Iterator[None]:
+    """Replace the OpenAI chat and embedding models of the ETL's pipelines with their local stand-ins."""
+
+    with mock.patch(
+        "etl.pipelines.openai_record_enrichment_pipeline.ChatOpenAI", StandInChatModel
+    ), mock.patch(
+        "etl.pipelines.openai_embedding_pipeline.OpenAIEmbeddings",
+        partial(StandInEmbeddings, dimensions=embedding_dimensions),
+    ):
+        yield
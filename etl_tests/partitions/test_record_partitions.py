@@ -0,0 +1,219 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from dagster import AssetExecutionContext, AssetIn, DagsterInstance, asset, materialize
+
+from etl.models import RecordTuple, wikipedia
+from etl.models.types import DataFileName, PartitioningScheme
+from etl.partitions import RecordPartitions, merge_partitions
+from etl.readers import WikipediaReader
+from etl.resources import InputConfig
+
+RECORD_KEYS_OF_DATA_FILES = {
+    "first.output.txt": ("Mouseion", "Library_of_Alexandria", "Pharos"),
+    "second.output.txt": ("Serapeum", "Ptolemy_I_Soter"),
+}
+
+
+@pytest.fixture()
+def partitioned_input_config(tmp_path: Path) -> InputConfig:
+    """Return an InputConfig of two data files of Wikipedia articles."""
+
+    for data_file_name, record_keys in RECORD_KEYS_OF_DATA_FILES.items():
+        with (tmp_path / data_file_name).open(mode="w", encoding="utf-8") as data_file:
+            data_file.writelines(
+                json.dumps(
+                    {
+                        "type": "RECORD",
+                        "record": {
+                            "abstract_info": {
+                                "title": record_key,
+                                "url": f"https://en.wikipedia.org/wiki/{record_key}",
+                            }
+                        },
+                    }
+                )
+                + "\n"
+                for record_key in record_keys
+            )
+
+    return InputConfig.default(
+        data_directory_path_default=tmp_path,
+        data_file_names_default=tuple(RECORD_KEYS_OF_DATA_FILES),
+    )
+
+
+def read_partition(
+    record_partitions: RecordPartitions,
+    input_config: InputConfig,
+    partition_key: str | None,
+) -> tuple[str, ...]:
+    """Return the Record keys of the partition with partition_key."""
+
+    return tuple(
+        record.key
+        for record in record_partitions.partition_records(
+            WikipediaReader(
+                data_file_paths=record_partitions.data_file_paths(
+                    input_config.parse(), partition_key
+                )
+            ).read(),
+            partition_key,
+        )
+    )
+
+
+def test_data_file_partitions(partitioned_input_config: InputConfig) -> None:
+    """Test that the DATA_FILE scheme has a partition of the Records of each data file."""
+
+    record_partitions = RecordPartitions(
+        partitioning_scheme=PartitioningScheme.DATA_FILE,
+        data_file_names=tuple(RECORD_KEYS_OF_DATA_FILES),
+        shard_count=8,
+    )
+
+    assert record_partitions.partitions_def is not None
+    assert record_partitions.partitions_def.get_partition_keys() == list(
+        RECORD_KEYS_OF_DATA_FILES
+    )
+    for data_file_name, record_keys in RECORD_KEYS_OF_DATA_FILES.items():
+        assert (
+            read_partition(record_partitions, partitioned_input_config, data_file_name)
+            == record_keys
+        )
+    assert record_partitions.data_file_paths_by_partition(
+        partitioned_input_config.parse()
+    ) == {
+        data_file_name: frozenset(
+            [partitioned_input_config.parse().data_directory_path / data_file_name]
+        )
+        for data_file_name in RECORD_KEYS_OF_DATA_FILES
+    }
+
+
+def test_key_hash_partitions(partitioned_input_config: InputConfig) -> None:
+    """Test that the KEY_HASH scheme puts every Record in exactly one shard."""
+
+    record_partitions = RecordPartitions(
+        partitioning_scheme=PartitioningScheme.KEY_HASH,
+        data_file_names=tuple(RECORD_KEYS_OF_DATA_FILES),
+        shard_count=3,
+    )
+
+    assert record_partitions.partitions_def is not None
+    partition_keys = record_partitions.partitions_def.get_partition_keys()
+    assert partition_keys == ["shard_000", "shard_001", "shard_002"]
+
+    partitioned_record_keys = [
+        record_key
+        for partition_key in partition_keys
+        for record_key in read_partition(
+            record_partitions, partitioned_input_config, partition_key
+        )
+    ]
+    assert sorted(partitioned_record_keys) == sorted(
+        record_key
+        for record_keys in RECORD_KEYS_OF_DATA_FILES.values()
+        for record_key in record_keys
+    )
+    assert record_partitions.shard_key("Mouseion") == record_partitions.shard_key(
+        "Mouseion"
+    )
+    assert set(
+        record_partitions.data_file_paths_by_partition(
+            partitioned_input_config.parse()
+        ).values()
+    ) == {partitioned_input_config.parse().data_file_paths}
+
+
+def test_unpartitioned(partitioned_input_config: InputConfig) -> None:
+    """Test that Records are read from every data file without a scheme."""
+
+    record_partitions = RecordPartitions(
+        partitioning_scheme=None,
+        data_file_names=tuple(RECORD_KEYS_OF_DATA_FILES),
+        shard_count=8,
+    )
+
+    assert record_partitions.partitions_def is None
+    assert (
+        record_partitions.data_file_paths_by_partition(partitioned_input_config.parse())
+        == {}
+    )
+    assert sorted(
+        read_partition(record_partitions, partitioned_input_config, None)
+    ) == sorted(
+        record_key
+        for record_keys in RECORD_KEYS_OF_DATA_FILES.values()
+        for record_key in record_keys
+    )
+
+
+def test_from_env_vars(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that RecordPartitions.from_env_vars reads the scheme and the shard count from environment variables."""
+
+    data_file_names: tuple[DataFileName, ...] = ("mini-wikipedia.output.txt",)
+
+    assert (
+        RecordPartitions.from_env_vars(
+            data_file_names_default=data_file_names
+        ).partitions_def
+        is None
+    )
+
+    monkeypatch.setenv("ETL_PARTITIONING_SCHEME", "key_hash")
+    monkeypatch.setenv("ETL_SHARD_COUNT", "2")
+    partitions_def = RecordPartitions.from_env_vars(
+        data_file_names_default=data_file_names
+    ).partitions_def
+
+    assert partitions_def is not None
+    assert partitions_def.get_partition_keys() == ["shard_000", "shard_001"]
+
+
+def test_merge_partitions(partitioned_input_config: InputConfig) -> None:
+    """Test that a fan-in asset merges the outputs of every partition of its upstream asset, in partition key order."""
+
+    record_partitions = RecordPartitions(
+        partitioning_scheme=PartitioningScheme.DATA_FILE,
+        data_file_names=tuple(RECORD_KEYS_OF_DATA_FILES),
+        shard_count=8,
+    )
+
+    @asset(partitions_def=record_partitions.partitions_def)
+    def records(context: AssetExecutionContext) -> RecordTuple:
+        return RecordTuple(
+            records=tuple(
+                wikipedia.Article(title=record_key, url="https://en.wikipedia.org")
+                for record_key in read_partition(
+                    record_partitions, partitioned_input_config, context.partition_key
+                )
+            )
+        )
+
+    @asset(ins={"records": AssetIn(dagster_type=Any)})
+    def merged_records(records: RecordTuple | dict[str, RecordTuple]) -> RecordTuple:
+        return merge_partitions(records, merge=RecordTuple.concatenate)
+
+    with DagsterInstance.ephemeral() as instance:
+        for partition_key in reversed(RECORD_KEYS_OF_DATA_FILES):
+            assert materialize(
+                [records], partition_key=partition_key, instance=instance
+            ).success
+
+        result = materialize(
+            [records.to_source_asset(), merged_records], instance=instance
+        )
+
+    assert tuple(
+        record.key for record in result.output_for_node("merged_records").records
+    ) == tuple(
+        record_key
+        for record_keys in RECORD_KEYS_OF_DATA_FILES.values()
+        for record_key in record_keys
+    )
+    assert merge_partitions(
+        RecordTuple(records=()), merge=RecordTuple.concatenate
+    ) == RecordTuple(records=())
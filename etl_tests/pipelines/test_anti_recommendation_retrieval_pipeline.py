@@ -1,13 +1,25 @@
+from pathlib import Path
+
+import pytest
+from langchain.docstore.document import Document
 from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
 from pytest_mock import MockFixture
 
 from etl.models.anti_recommendation import AntiRecommendation
-from etl.models.types import AntiRecommendationKey, RecordKey
+from etl.models.types import (
+    AntiRecommendationKey,
+    DistanceStrategy,
+    OpenAiEmbeddingModelName,
+    RecordKey,
+)
 from etl.pipelines import AntiRecommendationRetrievalPipeline
+from etl.resources import RetrievalAlgorithmParameters
+from etl.stores import VectorStore
 
 
 def test_retrieve_documents(
-    session_mocker: MockFixture,
+    mocker: MockFixture,
     anti_recommendation_retrieval_pipeline: AntiRecommendationRetrievalPipeline,
     anti_recommendation: AntiRecommendation,
     anti_recommendation_key: AntiRecommendationKey,
@@ -15,7 +27,7 @@ def test_retrieve_documents(
 ) -> None:
     """Test that AntiRecommendationRetrievalPipeline.retrieve_documents returns a tuple of AntiRecommendations when given a Record key."""
 
-    session_mocker.patch.object(
+    mocker.patch.object(
         FAISS,
         "similarity_search_with_score",
         return_value=(
@@ -32,3 +44,111 @@ def test_retrieve_documents(
         )[0].key
         == anti_recommendation_key
     )
+
+
+def test_retrieve_documents_batch_with_maximal_marginal_relevance(
+    fake_vector_store: VectorStore,
+    fake_retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
+    record_key: RecordKey,
+    anti_recommendation_key: AntiRecommendationKey,
+) -> None:
+    """Test that AntiRecommendationRetrievalPipeline.retrieve_documents_batch keeps the similarity order when maximal marginal relevance only weighs relevance."""
+
+    def retrieve_keys(
+        retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
+    ) -> tuple[tuple[RecordKey, ...], ...]:
+        return tuple(
+            tuple(
+                anti_recommendation.key for anti_recommendation in anti_recommendations
+            )
+            for anti_recommendations in AntiRecommendationRetrievalPipeline(
+                vector_store=fake_vector_store,
+                retrieval_algorithm_parameters=retrieval_algorithm_parameters,
+            ).retrieve_documents_batch(
+                record_keys=(record_key, anti_recommendation_key), k=2
+            )
+        )
+
+    assert retrieve_keys(
+        fake_retrieval_algorithm_parameters.model_copy(update={"mmr_lambda_mult": 1.0})
+    ) == retrieve_keys(fake_retrieval_algorithm_parameters)
+
+
+def test_retrieval_fingerprint(
+    fake_vector_store: VectorStore,
+    fake_retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
+) -> None:
+    """Test that AntiRecommendationRetrievalPipeline.retrieval_fingerprint changes with the retrieval algorithm parameters and k."""
+
+    anti_recommendation_retrieval_pipeline = AntiRecommendationRetrievalPipeline(
+        vector_store=fake_vector_store,
+        retrieval_algorithm_parameters=fake_retrieval_algorithm_parameters,
+    )
+
+    assert anti_recommendation_retrieval_pipeline.retrieval_fingerprint(
+        k=7
+    ) == anti_recommendation_retrieval_pipeline.retrieval_fingerprint(k=7)
+    assert anti_recommendation_retrieval_pipeline.retrieval_fingerprint(
+        k=7
+    ) != anti_recommendation_retrieval_pipeline.retrieval_fingerprint(k=8)
+    assert anti_recommendation_retrieval_pipeline.retrieval_fingerprint(
+        k=7
+    ) != AntiRecommendationRetrievalPipeline(
+        vector_store=fake_vector_store,
+        retrieval_algorithm_parameters=fake_retrieval_algorithm_parameters.model_copy(
+            update={"score_threshold": 0.5}
+        ),
+    ).retrieval_fingerprint(
+        k=7
+    )
+
+
+@pytest.mark.parametrize(
+    "vector_store_distance_strategy",
+    [DistanceStrategy.EUCLIDEAN_DISTANCE, DistanceStrategy.MAX_INNER_PRODUCT],
+)
+@pytest.mark.parametrize("distance_strategy", list(DistanceStrategy))
+def test_retrieve_documents_batch_with_distance_strategy(  # noqa: PLR0913
+    tmp_path: Path,
+    fake_embedding: Embeddings,
+    document_of_article_with_summary: Document,
+    document_of_anti_recommendation_article: Document,
+    record_key: RecordKey,
+    anti_recommendation_key: AntiRecommendationKey,
+    vector_store_distance_strategy: DistanceStrategy,
+    distance_strategy: DistanceStrategy,
+) -> None:
+    """
+    Test that AntiRecommendationRetrievalPipeline.retrieve_documents_batch returns the anti-recommendations of
+    retrieve_documents, which compares score thresholds under the distance strategy of the vector store, whatever
+    the distance strategy of the retrieval algorithm parameters.
+    """
+
+    anti_recommendation_retrieval_pipeline = AntiRecommendationRetrievalPipeline(
+        vector_store=VectorStore(
+            store=FAISS.from_documents(
+                documents=[
+                    document_of_article_with_summary,
+                    document_of_anti_recommendation_article,
+                ],
+                embedding=fake_embedding,
+                distance_strategy=vector_store_distance_strategy,
+            ),
+            directory_path=tmp_path,
+            cache_directory_path=tmp_path / "cache",
+            embedding_model_name=OpenAiEmbeddingModelName.TEXT_EMBEDDING_3_LARGE,
+        ),
+        retrieval_algorithm_parameters=RetrievalAlgorithmParameters(
+            distance_strategy=distance_strategy, score_threshold=0.5
+        ),
+    )
+    record_keys = (record_key, anti_recommendation_key)
+
+    assert anti_recommendation_retrieval_pipeline.retrieve_documents_batch(
+        record_keys=record_keys, k=2
+    ) == tuple(
+        anti_recommendation_retrieval_pipeline.retrieve_documents(
+            record_key=record_key, k=2
+        )
+        for record_key in record_keys
+    )
@@ -1,6 +1,19 @@
-from etl.models.types import AntiRecommendationKey, RecordKey, SparqlQuery
-from etl.namespaces import ARKG
+from pathlib import Path
+
+from pyoxigraph import parse
+
+from etl.instrumentation import Instrumentation, Tracer
+from etl.instrumentation.slowest_spans import read_spans
+from etl.models.types import (
+    AntiRecommendationKey,
+    RdfMimeType,
+    RecordKey,
+    SparqlQuery,
+)
+from etl.namespaces import ARKG, SCHEMA, WD
 from etl.pipelines import ArkgBuilderPipeline
+from etl.stores import WikidataIdentifierStore
+from etl_tests.mediawiki_api_stand_in import MediaWikiApiStandIn
 
 
 def test_construct_graph(
@@ -23,3 +36,150 @@ def test_construct_graph(
         anti_recommendation_node["anti_recommendation"].value
         == ARKG.anti_recommendation_iri(anti_recommendation_key).value
     )
+
+
+def test_construct_graph_with_batched_wikidata_identifiers(tmp_path: Path) -> None:
+    """Test that ArkgBuilderPipeline.construct_graph resolves normalized and redirected titles in batches, and skips titles without a Wikidata identifier."""
+
+    with MediaWikiApiStandIn(
+        wikidata_identifiers={"Mouseion": "Q1", "Alan Turing": "Q2"},
+        redirects={"Turing": "Alan Turing"},
+    ) as mediawiki_api_stand_in:
+        arkg_store = ArkgBuilderPipeline(
+            arkg_store_directory_path=tmp_path / "arkg_store",
+            requests_cache_directory_path=tmp_path / "requests_cache",
+            mediawiki_api_url=mediawiki_api_stand_in.url,
+            max_titles_per_request=2,
+        ).construct_graph(
+            (
+                (RecordKey("mouseion"), ()),
+                (RecordKey("Turing"), ()),
+                (RecordKey("Missing_article"), ()),
+            )
+        )
+
+        assert mediawiki_api_stand_in.request_count == 2
+
+    assert {
+        (solution["title"].value, solution["item"].value)
+        for solution in arkg_store.query(  # type: ignore[union-attr]
+            f"SELECT ?item ?title WHERE {{ ?item <{SCHEMA.TITLE.value}> ?title }}"
+        )
+    } == {
+        ("mouseion", WD.BASE_IRI.value + "Q1"),
+        ("Turing", WD.BASE_IRI.value + "Q2"),
+    }
+
+
+def test_construct_graph_with_retried_requests(tmp_path: Path) -> None:
+    """Test that ArkgBuilderPipeline retries failed MediaWiki API requests, and traces their resends."""
+
+    traces_file_path = tmp_path / "traces.jsonl"
+
+    with MediaWikiApiStandIn(
+        wikidata_identifiers={"Mouseion": "Q1"}, failing_request_count=1
+    ) as mediawiki_api_stand_in, Tracer(
+        service_name="etl", file_path=traces_file_path
+    ) as tracer, Instrumentation(
+        tracer=tracer
+    ):
+        arkg_store = ArkgBuilderPipeline(
+            arkg_store_directory_path=tmp_path / "arkg_store",
+            requests_cache_directory_path=tmp_path / "requests_cache",
+            mediawiki_api_url=mediawiki_api_stand_in.url,
+        ).construct_graph(((RecordKey("Mouseion"), ()),))
+
+        assert mediawiki_api_stand_in.request_count == 2
+
+    assert any(quad.subject.value == WD.BASE_IRI.value + "Q1" for quad in arkg_store)  # type: ignore[union-attr]
+    assert [
+        span["attributes"]["http.request.resend_count"]
+        for span in read_spans(traces_file_path)
+        if "http.request.resend_count" in span["attributes"]
+    ] == [1]
+
+
+def test_construct_graph_offline(tmp_path: Path, record_key: RecordKey) -> None:
+    """Test that ArkgBuilderPipeline.construct_graph builds an ARKG from a WikidataIdentifierStore without MediaWiki API requests."""
+
+    with WikidataIdentifierStore(
+        file_path=tmp_path / "wikidata_identifiers.sqlite"
+    ) as wikidata_identifier_store:
+        wikidata_identifier_store.put({record_key: "Q1"})
+
+        arkg_store = ArkgBuilderPipeline(
+            arkg_store_directory_path=tmp_path / "arkg_store",
+            requests_cache_directory_path=tmp_path / "requests_cache",
+            wikidata_identifier_store=wikidata_identifier_store,
+            mediawiki_api_url=None,
+        ).construct_graph(((record_key, ()),))
+
+    assert arkg_store.query(  # type: ignore[union-attr]
+        f"ASK {{ <{WD.BASE_IRI.value}Q1> <{SCHEMA.TITLE.value}> ?title }}"
+    )
+
+
+def test_write_graph(
+    tmp_path: Path,
+    record_key: RecordKey,
+    anti_recommendation_graph: tuple[
+        tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...
+    ],
+) -> None:
+    """Test that ArkgBuilderPipeline.write_graph writes the same graph as construct_graph, without constructing a RDF Store."""
+
+    with WikidataIdentifierStore(
+        file_path=tmp_path / "wikidata_identifiers.sqlite"
+    ) as wikidata_identifier_store:
+        wikidata_identifier_store.put({record_key: "Q1"})
+
+        arkg_builder_pipeline = ArkgBuilderPipeline(
+            arkg_store_directory_path=tmp_path / "arkg_store",
+            requests_cache_directory_path=tmp_path / "requests_cache",
+            wikidata_identifier_store=wikidata_identifier_store,
+            mediawiki_api_url=None,
+        )
+        arkg_builder_pipeline.write_graph(
+            anti_recommendation_graph,
+            file_path=tmp_path / "arkg.nt",
+            rdf_mime_type=RdfMimeType.N_TRIPLES,
+        )
+
+        assert not (tmp_path / "arkg_store").exists()
+        assert set(parse(str(tmp_path / "arkg.nt"), RdfMimeType.N_TRIPLES.value)) == {
+            quad.triple
+            for quad in arkg_builder_pipeline.construct_graph(anti_recommendation_graph)
+        }
+
+
+def test_write_graph_with_wikidata_identifiers(tmp_path: Path) -> None:
+    """
+    Test that ArkgBuilderPipeline.write_graph writes the graph of resolved Wikidata identifiers without resolving
+    them again, and writes every triple once, however many graphs share its nodes.
+    """
+
+    graphs = (
+        (RecordKey("Mouseion"), (AntiRecommendationKey("Pharos"),)),
+        (RecordKey("Serapeum"), (AntiRecommendationKey("Pharos"),)),
+        (RecordKey("Mouseion"), (AntiRecommendationKey("Pharos"),)),
+    )
+
+    ArkgBuilderPipeline(
+        arkg_store_directory_path=tmp_path / "arkg_store",
+        requests_cache_directory_path=tmp_path / "requests_cache",
+        mediawiki_api_url="http://localhost:1/w/api.php",
+    ).write_graph(
+        graphs,
+        file_path=tmp_path / "arkg.nt",
+        rdf_mime_type=RdfMimeType.N_TRIPLES,
+        wikidata_identifiers={RecordKey("Mouseion"): "Q1", RecordKey("Serapeum"): "Q2"},
+    )
+
+    lines = (tmp_path / "arkg.nt").read_text(encoding="utf-8").splitlines()
+
+    assert len(lines) == len(set(lines))
+    assert {
+        triple.subject.value
+        for triple in parse(str(tmp_path / "arkg.nt"), RdfMimeType.N_TRIPLES.value)
+        if triple.predicate == SCHEMA.TITLE
+    } == {WD.BASE_IRI.value + "Q1", WD.BASE_IRI.value + "Q2"}
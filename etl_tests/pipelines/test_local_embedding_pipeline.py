@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import numpy as np
+from langchain.docstore.document import Document
+from langchain_community.vectorstores.utils import DistanceStrategy
+
+from etl.models.types import LocalEmbeddingModelName
+from etl.pipelines import HashedTfidfSvdEmbeddings
+from etl.resources import (
+    LocalEmbeddingSettings,
+    OpenaiSettings,
+    OutputConfig,
+    VectorStoreSettings,
+)
+from etl.stores import VectorStore
+
+DIMENSIONS = 16
+TOPIC_WORDS = {
+    "astronomy": ("star", "planet", "galaxy", "telescope", "orbit", "comet"),
+    "cooking": ("bread", "oven", "flour", "recipe", "butter", "bake"),
+    "music": ("guitar", "song", "melody", "concert", "piano", "chord"),
+}
+
+
+def topic_texts(*, texts_per_topic: int) -> dict[str, tuple[str, ...]]:
+    """Return texts of each topic of TOPIC_WORDS, each made of a rotation of the words of its topic."""
+
+    return {
+        topic: tuple(
+            " ".join(words[index % len(words) :] + words[: index % len(words)])
+            + f" the article number {index}"
+            for index in range(texts_per_topic)
+        )
+        for topic, words in TOPIC_WORDS.items()
+    }
+
+
+def test_hashed_tfidf_svd_embeddings(tmp_path: Path) -> None:
+    """
+    Test that HashedTfidfSvdEmbeddings embeds texts of the same topic closer together than texts of other topics,
+    and embeds texts the same once saved and loaded.
+    """
+
+    texts = topic_texts(texts_per_topic=12)
+    embeddings = HashedTfidfSvdEmbeddings(
+        dimensions=DIMENSIONS, hash_features=1 << 10, batch_size=5
+    ).fit([text for topic in texts.values() for text in topic])
+
+    topic_embeddings = {
+        topic: embeddings.transform(topic_texts) for topic, topic_texts in texts.items()
+    }
+    query_embedding = np.array(embeddings.embed_query("a telescope pointed at a comet"))
+
+    assert topic_embeddings["astronomy"].shape == (12, DIMENSIONS)
+    assert np.allclose(np.linalg.norm(topic_embeddings["music"], axis=1), 1.0)
+    assert (topic_embeddings["astronomy"] @ query_embedding).min() > max(
+        (topic_embeddings[topic] @ query_embedding).max()
+        for topic in ("cooking", "music")
+    )
+
+    embeddings.save(tmp_path / "model.npz")
+    assert np.allclose(
+        HashedTfidfSvdEmbeddings.load(tmp_path / "model.npz").transform(
+            texts["cooking"]
+        ),
+        topic_embeddings["cooking"],
+    )
+
+
+def test_create_local_vector_store(tmp_path: Path) -> None:
+    """
+    Test that VectorStore.create builds a sharded vector store without an OpenAI key, and that it is searchable
+    once opened.
+    """
+
+    texts = topic_texts(texts_per_topic=8)
+    documents = tuple(
+        Document(page_content=text, metadata={"topic": topic})
+        for topic, topic_texts in texts.items()
+        for text in topic_texts
+    )
+
+    with VectorStore.create(
+        documents=documents,
+        openai_settings=OpenaiSettings(openai_api_key=""),
+        output_config=OutputConfig.default(output_directory_path_default=tmp_path),
+        vector_store_settings=VectorStoreSettings(shard_count=2),
+        local_embedding_settings=LocalEmbeddingSettings(
+            local_embedding_model_name=LocalEmbeddingModelName.HASHED_TFIDF_SVD,
+            dimensions=DIMENSIONS,
+            hash_features=1 << 10,
+        ),
+    ) as vector_store:
+        vector_store.save_local()
+        descriptor = vector_store.descriptor
+
+    assert descriptor.local_embedding_model_file_path.exists()
+
+    with VectorStore.open(descriptor) as opened_vector_store:
+        results = opened_vector_store.similarity_search_with_score(
+            query="a piano concert with a guitar",
+            k=3,
+            score_threshold=2,
+            distance_strategy=DistanceStrategy.EUCLIDEAN_DISTANCE,
+        )
+
+    assert [document.metadata["topic"] for document, _ in results] == ["music"] * 3
@@ -9,14 +9,14 @@ from etl.resources.output_config import OutputConfig
 
 
 def test_create_vector_store(
-    session_mocker: MockFixture,
+    mocker: MockFixture,
     document_of_article_with_summary: Document,
     openai_embedding_pipeline: OpenaiEmbeddingPipeline,
 ) -> None:
     """Test that OpenaiEmbeddingPipeline.create_vector_store invokes a method that is required to create a vector store."""
 
     # Mock FAISS.from_documents
-    mock_faiss__from_documents = session_mocker.patch.object(
+    mock_faiss__from_documents = mocker.patch.object(
         FAISS, "from_documents", return_value=None
     )
 
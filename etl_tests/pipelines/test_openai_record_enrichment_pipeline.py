@@ -7,7 +7,7 @@ from etl.pipelines import OpenaiRecordEnrichmentPipeline
 
 
 def test_enrich_records(
-    session_mocker: MockFixture,
+    mocker: MockFixture,
     openai_record_enrichment_pipeline: OpenaiRecordEnrichmentPipeline,
     article: wikipedia.Article,
     openai_model_response: ModelResponse,
@@ -15,9 +15,7 @@ def test_enrich_records(
     """Test that OpenaiRecordEnrichmentPipeline.enrich_records returns enriched Records."""
 
     # Mock RunnableSequence.invoke and return a ModelResponse
-    session_mocker.patch.object(
-        RunnableSequence, "invoke", return_value=openai_model_response
-    )
+    mocker.patch.object(RunnableSequence, "invoke", return_value=openai_model_response)
 
     assert (
         openai_record_enrichment_pipeline.enrich_record(record=article).model_dump(
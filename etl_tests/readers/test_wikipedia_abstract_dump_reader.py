@@ -0,0 +1,33 @@
+from pathlib import Path
+
+from etl.readers import WikipediaAbstractDumpReader, WikipediaReader
+from etl_tests.synthetic_wikipedia_corpus import (
+    write_synthetic_abstract_dump,
+    write_synthetic_corpus,
+)
+
+
+def test_read_synthetic_abstract_dump(tmp_path: Path) -> None:
+    """Test that WikipediaAbstractDumpReader.read yields the same articles from an abstract dump as WikipediaReader from JSON Lines."""
+
+    abstract_dump_file_path = tmp_path / "enwiki-synthetic-abstract.xml.gz"
+    write_synthetic_abstract_dump(
+        file_path=abstract_dump_file_path, articles_count=2_000
+    )
+    data_file_names = write_synthetic_corpus(
+        directory_path=tmp_path / "data_files", articles_count=2_000
+    )
+
+    assert WikipediaAbstractDumpReader.is_abstract_dump(abstract_dump_file_path)
+    assert list(
+        WikipediaAbstractDumpReader(
+            data_file_paths=frozenset([abstract_dump_file_path])
+        ).read()
+    ) == list(
+        WikipediaReader(
+            data_file_paths=frozenset(
+                tmp_path / "data_files" / data_file_name
+                for data_file_name in data_file_names
+            )
+        ).read()
+    )
@@ -0,0 +1,124 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from etl.models import wikipedia
+from etl.readers import WikipediaDatasetReader
+
+TITLES = tuple(f"Article {article_index:03d}" for article_index in range(100))
+
+
+@pytest.fixture()
+def dataset_paths(tmp_path: Path) -> tuple[Path, Path]:
+    """Write the articles of TITLES as a Parquet dataset and as an Arrow IPC file, and return their paths."""
+
+    pyarrow = pytest.importorskip("pyarrow")
+    pyarrow_feather = pytest.importorskip("pyarrow.feather")
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+
+    table = pyarrow.table(
+        {
+            "title": list(TITLES),
+            "url": [
+                "https://en.wikipedia.org/wiki/" + title.replace(" ", "_")
+                for title in TITLES
+            ],
+            "abstract": [f"The abstract of {title}." for title in TITLES],
+            "text": [f"The text of {title}." * 100 for title in TITLES],
+            "namespace": [article_index % 2 for article_index in range(len(TITLES))],
+            "modified": [
+                datetime(2024, 1, 1 + article_index % 28)
+                for article_index in range(len(TITLES))
+            ],
+        }
+    )
+    parquet_dataset_path = tmp_path / "snapshot.parquet"
+    parquet_dataset_path.mkdir()
+    pyarrow_parquet.write_table(
+        table, parquet_dataset_path / "part-0.parquet", row_group_size=10
+    )
+    arrow_file_path = tmp_path / "snapshot.arrow"
+    pyarrow_feather.write_feather(table, arrow_file_path)
+
+    return parquet_dataset_path, arrow_file_path
+
+
+def test_read(dataset_paths: tuple[Path, Path]) -> None:
+    """Test that WikipediaDatasetReader.read yields wikipedia.Articles of only the columns that Articles hold."""
+
+    for dataset_path in dataset_paths:
+        assert WikipediaDatasetReader.is_dataset(dataset_path)
+
+        articles = list(
+            WikipediaDatasetReader(data_file_paths=frozenset([dataset_path])).read()
+        )
+
+        assert [article.key for article in articles] == [
+            title.replace(" ", "_") for title in TITLES
+        ]
+        assert isinstance(articles[0], wikipedia.Article)
+        assert articles[0].model_dump()["abstract"] == "The abstract of Article 000."
+        assert "text" not in articles[0].model_dump()
+
+
+def test_read_batches_with_filters(dataset_paths: tuple[Path, Path]) -> None:
+    """Test that WikipediaDatasetReader.read_batches yields the batches of the Articles that pass its filters."""
+
+    batches = list(
+        WikipediaDatasetReader(
+            data_file_paths=frozenset(dataset_paths[:1]),
+            min_record_key="Article_010",
+            max_record_key="Article_060",
+            namespaces=frozenset([0]),
+            modified_since=datetime(2024, 1, 10),
+            batch_size=4,
+        ).read_batches()
+    )
+
+    assert all(len(batch) <= 4 for batch in batches)  # noqa: PLR2004
+    assert [article.key for batch in batches for article in batch] == [
+        title.replace(" ", "_")
+        for article_index, title in enumerate(TITLES)
+        if 10 <= article_index < 60  # noqa: PLR2004
+        and article_index % 2 == 0
+        and 1 + article_index % 28 >= 10  # noqa: PLR2004
+    ]
+
+
+def test_read_batches_with_key_range_in_key_order(tmp_path: Path) -> None:
+    """
+    Test that WikipediaDatasetReader filters by the order of Record keys, in which underscores sort after capital
+    letters, unlike spaces, and by the Record keys of titles that are transliterated to ASCII.
+    """
+
+    pyarrow = pytest.importorskip("pyarrow")
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+
+    titles = ("A Z", "AA", "AB", "\u00c5b", "B")
+    dataset_path = tmp_path / "snapshot.parquet"
+    pyarrow_parquet.write_table(
+        pyarrow.table(
+            {
+                "title": list(titles),
+                "url": ["https://en.wikipedia.org/wiki/" + title for title in titles],
+                "abstract": ["An abstract."] * len(titles),
+            }
+        ),
+        dataset_path,
+    )
+
+    articles = WikipediaDatasetReader(
+        data_file_paths=frozenset([dataset_path]),
+        min_record_key="AB",
+        max_record_key="A~",
+    ).read()
+
+    assert sorted(article.key for article in articles) == ["AB", "A_Z", "Ab"]
+
+    with pytest.raises(ValueError, match="namespace"):
+        list(
+            WikipediaDatasetReader(
+                data_file_paths=frozenset([dataset_path]), namespaces=frozenset([0])
+            ).read()
+        )
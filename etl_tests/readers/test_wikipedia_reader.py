@@ -1,8 +1,36 @@
+from pathlib import Path
+
 from etl.models import wikipedia
 from etl.readers import WikipediaReader
+from etl_tests.synthetic_wikipedia_corpus import (
+    SyntheticWikidataIdentifiers,
+    write_synthetic_corpus,
+)
 
 
 def test_read(wikipedia_reader: WikipediaReader) -> None:
     """Test that WikipediaReader.read yields wikipedia.Article objects."""
 
     assert isinstance(next(iter(wikipedia_reader.read())), wikipedia.Article)
+
+
+def test_read_synthetic_corpus(tmp_path: Path) -> None:
+    """Test that WikipediaReader.read yields every article of a synthetic corpus, with a unique key."""
+
+    data_file_names = write_synthetic_corpus(
+        directory_path=tmp_path, articles_count=25_000, data_files_count=3
+    )
+    record_keys = [
+        article.key
+        for article in WikipediaReader(
+            data_file_paths=frozenset(
+                tmp_path / data_file_name for data_file_name in data_file_names
+            )
+        ).read()
+    ]
+    wikidata_identifiers = SyntheticWikidataIdentifiers(articles_count=25_000)
+
+    assert len(set(record_keys)) == len(record_keys) == 25_000
+    assert (
+        len({wikidata_identifiers[record_key] for record_key in record_keys}) == 25_000
+    )
@@ -0,0 +1,67 @@
+import json
+from collections.abc import Callable
+from urllib.request import urlopen
+
+from etl.models.types import RecordKey
+from etl.pipelines import AntiRecommendationRetrievalPipeline
+from etl.resources import RetrievalAlgorithmParameters
+from etl.servers import AntiRecommendationServer
+from etl.stores import VectorStore
+
+
+def test_anti_recommendations(
+    fake_vector_store: VectorStore,
+    fake_retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
+    open_fake_vector_store: Callable[[VectorStore.Descriptor], VectorStore],
+    record_key: RecordKey,
+) -> None:
+    """Test that AntiRecommendationServer answers a lookup with the anti-recommendations of a Record key."""
+
+    with AntiRecommendationServer(
+        vector_store_descriptor=fake_vector_store.descriptor,
+        retrieval_algorithm_parameters=fake_retrieval_algorithm_parameters,
+        port=0,
+        open_vector_store=open_fake_vector_store,
+    ) as anti_recommendation_server:
+        anti_recommendation_server.start()
+        host, port = anti_recommendation_server.server_address
+
+        with urlopen(  # noqa: S310
+            f"http://{host}:{port}/anti-recommendations?record_key={record_key}&k=2"
+        ) as response:
+            response_json = json.loads(response.read())
+
+    assert [
+        anti_recommendation["key"]
+        for anti_recommendation in response_json["anti_recommendations"]
+    ] == [
+        anti_recommendation.key
+        for anti_recommendation in AntiRecommendationRetrievalPipeline(
+            vector_store=fake_vector_store,
+            retrieval_algorithm_parameters=fake_retrieval_algorithm_parameters,
+        ).retrieve_documents(record_key=record_key, k=2)
+        if anti_recommendation.key != record_key
+    ]
+
+
+def test_reload(
+    fake_vector_store: VectorStore,
+    fake_retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
+    open_fake_vector_store: Callable[[VectorStore.Descriptor], VectorStore],
+) -> None:
+    """Test that AntiRecommendationServer.reload only reopens the VectorStore when a new index version is published."""
+
+    with AntiRecommendationServer(
+        vector_store_descriptor=fake_vector_store.descriptor,
+        retrieval_algorithm_parameters=fake_retrieval_algorithm_parameters,
+        port=0,
+        open_vector_store=open_fake_vector_store,
+    ) as anti_recommendation_server:
+        assert not anti_recommendation_server.reload()
+
+        fake_vector_store.descriptor.index_version_file_path.write_text("new-version")
+
+        assert anti_recommendation_server.reload()
+        assert anti_recommendation_server.index_version == "new-version"
+
+        fake_vector_store.save_local()
@@ -0,0 +1,62 @@
+import pytest
+
+from etl.servers import MicroBatcher
+
+
+def test_submit() -> None:
+    """Test that MicroBatcher.submit groups concurrently submitted items into one batch and resolves each item's result."""
+
+    batches: list[tuple[int, ...]] = []
+
+    def process_batch(items: tuple[int, ...]) -> tuple[int, ...]:
+        batches.append(items)
+        return tuple(item * 2 for item in items)
+
+    with MicroBatcher(
+        process_batch=process_batch, max_batch_size=4, max_batch_wait_seconds=10
+    ) as micro_batcher:
+        futures = [micro_batcher.submit(item) for item in range(4)]
+
+        assert [future.result(timeout=10) for future in futures] == [0, 2, 4, 6]
+
+    assert batches == [(0, 1, 2, 3)]
+
+
+def test_submit_with_failed_batches() -> None:
+    """Test that MicroBatcher sets the exception of a batch that fails, or has too few results, on its Futures, and keeps processing later batches."""
+
+    def process_batch(items: tuple[int, ...]) -> tuple[int, ...]:
+        if items == (0,):
+            message = "failed batch"
+            raise ValueError(message)
+        if items == (1,):
+            return ()
+        return tuple(item * 2 for item in items)
+
+    with MicroBatcher(
+        process_batch=process_batch, max_batch_size=1, max_batch_wait_seconds=10
+    ) as micro_batcher:
+        failed_future, short_future, future = (
+            micro_batcher.submit(item) for item in range(3)
+        )
+
+        with pytest.raises(ValueError, match="failed batch"):
+            failed_future.result(timeout=10)
+        with pytest.raises(ValueError, match="0 results for 1 items"):
+            short_future.result(timeout=10)
+        assert future.result(timeout=10) == 4
+
+
+def test_submit_after_close() -> None:
+    """Test that MicroBatcher.submit raises once the batcher is closed, and that closing it again does not block."""
+
+    micro_batcher: MicroBatcher[int, int] = MicroBatcher(
+        process_batch=lambda items: items, max_batch_size=1, max_batch_wait_seconds=10
+    )
+    future = micro_batcher.submit(1)
+    micro_batcher.close()
+
+    assert future.result(timeout=10) == 1
+    with pytest.raises(RuntimeError, match="closed"):
+        micro_batcher.submit(2)
+    micro_batcher.close()
@@ -0,0 +1,146 @@
+import json
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+
+import pytest
+
+from etl.models import AntiRecommendationGraphTuple
+from etl.models.types import AntiRecommendationKey, RecordKey, SparqlQuery
+from etl.namespaces import ARKG
+from etl.resources import WikidataSettings
+from etl.servers import SparqlServer
+from etl.stores import ArkgStore, WikidataIdentifierStore
+
+
+@pytest.fixture()
+def arkg_store_descriptor(
+    tmp_path: Path,
+    record_key: RecordKey,
+    anti_recommendation_graph: tuple[
+        tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...
+    ],
+) -> ArkgStore.Descriptor:
+    """Return the Descriptor of an ARKG Store that was built offline and closed."""
+
+    with WikidataIdentifierStore(
+        file_path=tmp_path / "wikidata_identifiers.sqlite"
+    ) as wikidata_identifier_store:
+        wikidata_identifier_store.put({record_key: "Q1"})
+
+        with ArkgStore.create(
+            directory_path=tmp_path / "arkg_store",
+            requests_cache_directory_path=tmp_path / "requests_cache",
+            anti_recommendation_graphs=AntiRecommendationGraphTuple(
+                anti_recommendation_graphs=anti_recommendation_graph
+            ),
+            wikidata_identifier_store=wikidata_identifier_store,
+            wikidata_settings=WikidataSettings(offline=True),
+        ) as arkg_store:
+            return arkg_store.descriptor
+
+
+def test_select(
+    arkg_store_descriptor: ArkgStore.Descriptor,
+    anti_recommendation_key: AntiRecommendationKey,
+) -> None:
+    """Test that SparqlServer streams the results of a SELECT query, and answers a repeated query from its cache."""
+
+    query = SparqlQuery(
+        "SELECT ?anti_recommendation WHERE { ?anti_recommendation <http://schema.org/itemReviewed> <http://www.wikidata.org/entity/Q1> }"
+    )
+
+    with SparqlServer(
+        arkg_store_descriptor=arkg_store_descriptor, port=0, chunk_size=16
+    ) as sparql_server:
+        sparql_server.start()
+        host, port = sparql_server.server_address
+
+        response_jsons = []
+        for _ in range(2):
+            with urlopen(  # noqa: S310
+                f"http://{host}:{port}/sparql?query={quote(query)}"
+            ) as response:
+                response_jsons.append(json.loads(response.read()))
+
+        assert sparql_server.cache_hit_count == 1
+
+    assert response_jsons[0] == response_jsons[1]
+    assert response_jsons[0]["head"]["vars"] == ["anti_recommendation"]
+    assert response_jsons[0]["results"]["bindings"] == [
+        {
+            "anti_recommendation": {
+                "type": "uri",
+                "value": ARKG.anti_recommendation_iri(anti_recommendation_key).value,
+            }
+        }
+    ]
+
+
+def test_construct(
+    arkg_store_descriptor: ArkgStore.Descriptor, record_key: RecordKey
+) -> None:
+    """Test that SparqlServer answers a POSTed CONSTRUCT query with N-Triples."""
+
+    with SparqlServer(
+        arkg_store_descriptor=arkg_store_descriptor, port=0
+    ) as sparql_server:
+        sparql_server.start()
+        host, port = sparql_server.server_address
+
+        with urlopen(  # noqa: S310
+            Request(  # noqa: S310
+                f"http://{host}:{port}/sparql",
+                data=b"CONSTRUCT WHERE { ?s <http://schema.org/title> ?o }",
+                headers={"Content-Type": "application/sparql-query"},
+            )
+        ) as response:
+            content_type = response.headers["Content-Type"]
+            body = response.read().decode("utf-8")
+
+    assert content_type == "application/n-triples"
+    assert body == (
+        f'<http://www.wikidata.org/entity/Q1> <http://schema.org/title> "{record_key}" .\n'
+    )
+
+
+@pytest.mark.parametrize(
+    ("query", "query_timeout_seconds", "status"),
+    [
+        ("SELECT", 30.0, 400),
+        ("SELECT * WHERE { ?s ?p ?o }", 0.0, 504),
+    ],
+)
+def test_errors(
+    arkg_store_descriptor: ArkgStore.Descriptor,
+    query: SparqlQuery,
+    query_timeout_seconds: float,
+    status: int,
+) -> None:
+    """Test that SparqlServer rejects invalid queries and abandons queries that run past their timeout."""
+
+    with SparqlServer(
+        arkg_store_descriptor=arkg_store_descriptor,
+        port=0,
+        query_timeout_seconds=query_timeout_seconds,
+    ) as sparql_server:
+        sparql_server.start()
+        host, port = sparql_server.server_address
+
+        with pytest.raises(HTTPError) as http_error:
+            urlopen(f"http://{host}:{port}/sparql?query={quote(query)}")  # noqa: S310
+
+    assert http_error.value.code == status
+
+
+def test_close(arkg_store_descriptor: ArkgStore.Descriptor) -> None:
+    """Test that a SparqlServer can be closed by serve_forever and again as a context manager."""
+
+    with SparqlServer(
+        arkg_store_descriptor=arkg_store_descriptor, port=0
+    ) as sparql_server:
+        sparql_server.close()
+
+    with ArkgStore.open(arkg_store_descriptor) as arkg_store:
+        arkg_store.close()
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import numpy as np
+
+from etl.models import CompactAntiRecommendationGraphs
+from etl.models.types import AntiRecommendationKey, RecordKey
+from etl.stores import ArkgLookupTables
+
+
+def test_save_and_load(tmp_path: Path) -> None:
+    """Test that ArkgLookupTables answer forward and reverse lookups, before and after a save and a memory-mapped load."""
+
+    lookup_tables = ArkgLookupTables.from_anti_recommendation_graphs(
+        (
+            (RecordKey("A"), (AntiRecommendationKey("X"), AntiRecommendationKey("B"))),
+            (RecordKey("B"), (AntiRecommendationKey("X"),)),
+            (RecordKey("C"), ()),
+        )
+    )
+    lookup_tables.save(tmp_path / "lookup_tables")
+
+    for tables in (lookup_tables, ArkgLookupTables.load(tmp_path / "lookup_tables")):
+        assert tables.anti_recommendations(RecordKey("A")) == ("X", "B")
+        assert tables.anti_recommendations(RecordKey("C")) == ()
+        assert tables.anti_recommendations(RecordKey("X")) == ()
+        assert tables.anti_recommended_by(AntiRecommendationKey("X")) == ("A", "B")
+        assert tables.anti_recommended_by(AntiRecommendationKey("B")) == ("A",)
+        assert tables.anti_recommended_by(AntiRecommendationKey("Missing")) == ()
+
+
+def test_keys_are_interned_like_compact_anti_recommendation_graphs(
+    tmp_path: Path,
+) -> None:
+    """Test that ArkgLookupTables save their keys in the key_data and key_offsets format of CompactAntiRecommendationGraphs."""
+
+    anti_recommendation_graphs = (
+        (RecordKey("Café"), (AntiRecommendationKey("X"),)),
+        (RecordKey("X"), (AntiRecommendationKey("Café"),)),
+    )
+    ArkgLookupTables.from_anti_recommendation_graphs(anti_recommendation_graphs).save(
+        tmp_path / "lookup_tables"
+    )
+
+    assert CompactAntiRecommendationGraphs.decode_keys(
+        np.load(tmp_path / "lookup_tables" / "key_data.npy"),
+        np.load(tmp_path / "lookup_tables" / "key_offsets.npy"),
+    ) == (
+        CompactAntiRecommendationGraphs.from_anti_recommendation_graphs(
+            anti_recommendation_graphs
+        ).keys()
+    )
+
+
+def test_save_swaps_tables(tmp_path: Path) -> None:
+    """Test that ArkgLookupTables.save swaps in a whole new directory of tables, and removes all but the previous one."""
+
+    directory_path = tmp_path / "lookup_tables"
+    directory_path.mkdir()
+    (directory_path / "keys.json").write_text("[]")
+
+    for anti_recommendation_key in ("X", "Y", "Z"):
+        ArkgLookupTables.from_anti_recommendation_graphs(
+            ((RecordKey("A"), (AntiRecommendationKey(anti_recommendation_key),)),)
+        ).save(directory_path)
+
+    assert directory_path.is_symlink()
+    assert ArkgLookupTables.load(directory_path).anti_recommendations(
+        RecordKey("A")
+    ) == ("Z",)
+    assert (
+        len(
+            [
+                path
+                for path in tmp_path.iterdir()
+                if path.is_dir() and not path.is_symlink()
+            ]
+        )
+        == 2
+    )
@@ -0,0 +1,186 @@
+import shutil
+from collections.abc import Iterable
+from pathlib import Path
+
+import pyoxigraph as ox
+import pytest
+
+from etl.models import AntiRecommendationGraphTuple
+from etl.models.types import AntiRecommendationKey, RecordKey
+from etl.pipelines import ArkgBuilderPipeline
+from etl.resources import WikidataSettings
+from etl.stores import ArkgStore, WikidataIdentifierStore
+
+
+def test_update(tmp_path: Path) -> None:
+    """Test that ArkgStore.update applies only the changed Quads of each subject, and leaves the same ARKG and lookup tables as a fresh build."""
+
+    first_graphs = AntiRecommendationGraphTuple(
+        anti_recommendation_graphs=(
+            (RecordKey("A"), (AntiRecommendationKey("X"), AntiRecommendationKey("Y"))),
+            (RecordKey("B"), (AntiRecommendationKey("X"),)),
+        )
+    )
+    second_graphs = AntiRecommendationGraphTuple(
+        anti_recommendation_graphs=(
+            (RecordKey("A"), (AntiRecommendationKey("Y"), AntiRecommendationKey("Z"))),
+            (RecordKey("C"), ()),
+        )
+    )
+
+    with WikidataIdentifierStore(
+        file_path=tmp_path / "wikidata_identifiers.sqlite"
+    ) as wikidata_identifier_store:
+        wikidata_identifier_store.put(
+            {RecordKey("A"): "Q1", RecordKey("B"): "Q2", RecordKey("C"): "Q3"}
+        )
+
+        def update(
+            arkg_store: ArkgStore,
+            anti_recommendation_graphs: AntiRecommendationGraphTuple,
+        ) -> ArkgStore.Changes:
+            return arkg_store.update(
+                requests_cache_directory_path=tmp_path / "requests_cache",
+                anti_recommendation_graphs=anti_recommendation_graphs,
+                wikidata_identifier_store=wikidata_identifier_store,
+                wikidata_settings=WikidataSettings(offline=True),
+            )
+
+        with ArkgStore.open(
+            ArkgStore.Descriptor(tmp_path / "updated_arkg_store")
+        ) as arkg_store:
+            first_changes = update(arkg_store, first_graphs)
+            second_changes = update(arkg_store, second_graphs)
+            third_changes = update(arkg_store, second_graphs)
+            anti_recommendations = arkg_store.anti_recommendations(RecordKey("A"))
+            anti_recommended_by = arkg_store.anti_recommended_by(
+                AntiRecommendationKey("X")
+            )
+            updated_quads = set(arkg_store.query("CONSTRUCT WHERE { ?s ?p ?o }"))  # type: ignore[arg-type]
+
+        with ArkgStore.create(
+            directory_path=tmp_path / "created_arkg_store",
+            requests_cache_directory_path=tmp_path / "requests_cache",
+            anti_recommendation_graphs=second_graphs,
+            wikidata_identifier_store=wikidata_identifier_store,
+            wikidata_settings=WikidataSettings(offline=True),
+        ) as arkg_store:
+            created_quads = set(arkg_store.query("CONSTRUCT WHERE { ?s ?p ?o }"))  # type: ignore[arg-type]
+
+    assert first_changes == ArkgStore.Changes(
+        added_quad_count=11, removed_quad_count=0, changed_subject_count=4
+    )
+    assert second_changes == ArkgStore.Changes(
+        added_quad_count=5, removed_quad_count=6, changed_subject_count=4
+    )
+    assert third_changes == ArkgStore.Changes(
+        added_quad_count=0, removed_quad_count=0, changed_subject_count=0
+    )
+    assert updated_quads == created_quads
+    assert anti_recommendations == ("Y", "Z")
+    assert anti_recommended_by == ()
+
+
+def test_lookup_tables_after_failed_update_and_without_tables(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test that a failed ArkgStore.update leaves the Quads and the lookup tables of the previous ARKG, and that the
+    lookup tables of an ARKG Store without them, or with them in a previous format, are rebuilt from the Store.
+    """
+
+    with WikidataIdentifierStore(
+        file_path=tmp_path / "wikidata_identifiers.sqlite"
+    ) as wikidata_identifier_store:
+        wikidata_identifier_store.put({RecordKey("A"): "Q1", RecordKey("B"): "Q2"})
+
+        with ArkgStore.create(
+            directory_path=tmp_path / "arkg_store",
+            requests_cache_directory_path=tmp_path / "requests_cache",
+            anti_recommendation_graphs=AntiRecommendationGraphTuple(
+                anti_recommendation_graphs=(
+                    (
+                        RecordKey("A"),
+                        (AntiRecommendationKey("Y"), AntiRecommendationKey("X")),
+                    ),
+                    (RecordKey("B"), ()),
+                )
+            ),
+            wikidata_identifier_store=wikidata_identifier_store,
+            wikidata_settings=WikidataSettings(offline=True),
+        ) as arkg_store:
+            descriptor = arkg_store.descriptor
+            quads = set(arkg_store.query("CONSTRUCT WHERE { ?s ?p ?o }"))  # type: ignore[arg-type]
+
+            def fail_to_generate_quads(*_args: object, **_kwargs: object) -> None:
+                raise OSError
+
+            # The additions of the second failed update are not valid SPARQL, so it fails once its removals are
+            # part of the update.
+            to_sparql_data = ArkgStore._ArkgStore__to_sparql_data  # type: ignore[attr-defined]
+            sparql_data_blocks: list[str] = []
+
+            def to_invalid_sparql_data(quads: Iterable[ox.Quad]) -> str:
+                sparql_data_blocks.append(to_sparql_data(quads))
+                return (
+                    sparql_data_blocks[-1]
+                    if len(sparql_data_blocks) == 1
+                    else "not SPARQL"
+                )
+
+            for attribute_owner, attribute_name, failing_attribute, error in (
+                (
+                    ArkgBuilderPipeline,
+                    "generate_quads",
+                    fail_to_generate_quads,
+                    OSError,
+                ),
+                (
+                    ArkgStore,
+                    "_ArkgStore__to_sparql_data",
+                    staticmethod(to_invalid_sparql_data),
+                    SyntaxError,
+                ),
+            ):
+                with monkeypatch.context() as failing_monkeypatch:
+                    failing_monkeypatch.setattr(
+                        attribute_owner, attribute_name, failing_attribute
+                    )
+                    with pytest.raises(error):
+                        arkg_store.update(
+                            requests_cache_directory_path=tmp_path / "requests_cache",
+                            anti_recommendation_graphs=AntiRecommendationGraphTuple(
+                                anti_recommendation_graphs=(
+                                    (RecordKey("A"), (AntiRecommendationKey("Z"),)),
+                                )
+                            ),
+                            wikidata_identifier_store=wikidata_identifier_store,
+                            wikidata_settings=WikidataSettings(offline=True),
+                        )
+
+            assert sparql_data_blocks[0]
+            assert set(arkg_store.query("CONSTRUCT WHERE { ?s ?p ?o }")) == quads  # type: ignore[arg-type]
+
+    with ArkgStore.open(descriptor, read_only=True) as arkg_store:
+        assert arkg_store.anti_recommendations(RecordKey("A")) == ("Y", "X")
+
+    shutil.rmtree(descriptor.lookup_tables_directory_path.resolve())
+    descriptor.lookup_tables_directory_path.unlink()
+
+    with ArkgStore.open(descriptor, read_only=True) as arkg_store:
+        assert arkg_store.anti_recommendations(RecordKey("A")) == ("X", "Y")
+        assert arkg_store.anti_recommendations(RecordKey("B")) == ()
+        assert arkg_store.anti_recommended_by(AntiRecommendationKey("X")) == ("A",)
+
+    assert descriptor.lookup_tables_directory_path.exists()
+
+    # Lookup tables saved in a previous format, with their keys in a JSON file, are rebuilt too.
+    shutil.rmtree(descriptor.lookup_tables_directory_path.resolve())
+    descriptor.lookup_tables_directory_path.unlink()
+    descriptor.lookup_tables_directory_path.mkdir()
+    (descriptor.lookup_tables_directory_path / "keys.json").write_text("[]")
+
+    with ArkgStore.open(descriptor, read_only=True) as arkg_store:
+        assert arkg_store.anti_recommendations(RecordKey("A")) == ("X", "Y")
+
+    assert descriptor.lookup_tables_directory_path.is_symlink()
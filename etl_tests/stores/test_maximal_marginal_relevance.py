@@ -0,0 +1,27 @@
+import numpy as np
+from langchain_community.vectorstores.utils import maximal_marginal_relevance
+
+from etl.stores.maximal_marginal_relevance import maximal_marginal_relevance_batch
+
+
+def test_maximal_marginal_relevance_batch() -> None:
+    """Test that maximal_marginal_relevance_batch selects the same candidates as LangChain's per-query maximal_marginal_relevance."""
+
+    random_number_generator = np.random.default_rng(seed=0)
+    query_vectors = random_number_generator.standard_normal((8, 16))
+    candidate_vectors = random_number_generator.standard_normal((8, 12, 16))
+
+    assert maximal_marginal_relevance_batch(
+        query_vectors=query_vectors,
+        candidate_vectors=candidate_vectors,
+        is_candidate=np.ones((8, 12), dtype=bool),
+        k=5,
+        lambda_mult=0.5,
+    ).tolist() == [
+        maximal_marginal_relevance(
+            query_vector, list(query_candidate_vectors), lambda_mult=0.5, k=5
+        )
+        for query_vector, query_candidate_vectors in zip(
+            query_vectors, candidate_vectors, strict=True
+        )
+    ]
@@ -0,0 +1,111 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from etl.models.types import AntiRecommendationKey, RecordKey
+from etl.stores import RetrievalResultCache
+
+
+def test_get(
+    tmp_path: Path,
+    record_key: RecordKey,
+    anti_recommendation_key: AntiRecommendationKey,
+) -> None:
+    """Test that RetrievalResultCache.get only returns results that were stored under the same fingerprint."""
+
+    file_path = tmp_path / "retrieval_result_cache.sqlite"
+
+    with RetrievalResultCache(file_path=file_path) as retrieval_result_cache:
+        retrieval_result_cache.put(
+            fingerprint="fingerprint",
+            anti_recommendation_graphs=((record_key, (anti_recommendation_key,)),),
+        )
+
+    with RetrievalResultCache(file_path=file_path) as retrieval_result_cache:
+        assert retrieval_result_cache.get(
+            fingerprint="fingerprint", record_keys=(record_key,)
+        ) == {record_key: (anti_recommendation_key,)}
+        assert not retrieval_result_cache.get(
+            fingerprint="other fingerprint", record_keys=(record_key,)
+        )
+
+
+def test_get_in_batches(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that RetrievalResultCache.get returns the results of record_keys only, across batches of Record keys."""
+
+    monkeypatch.setattr(RetrievalResultCache, "GET_BATCH_SIZE", 2)
+    anti_recommendation_graphs = tuple(
+        (f"Record_{index}", (f"Anti-recommendation_{index}",)) for index in range(7)
+    )
+
+    with RetrievalResultCache(
+        file_path=tmp_path / "retrieval_result_cache.sqlite"
+    ) as retrieval_result_cache:
+        retrieval_result_cache.put(
+            fingerprint="fingerprint",
+            anti_recommendation_graphs=anti_recommendation_graphs,
+        )
+
+        assert retrieval_result_cache.get(
+            fingerprint="fingerprint",
+            record_keys=("Record_5", "Uncached_record", "Record_0", "Record_3"),
+        ) == {
+            "Record_5": ("Anti-recommendation_5",),
+            "Record_0": ("Anti-recommendation_0",),
+            "Record_3": ("Anti-recommendation_3",),
+        }
+
+
+def test_prune(
+    tmp_path: Path,
+    record_key: RecordKey,
+    anti_recommendation_key: AntiRecommendationKey,
+) -> None:
+    """Test that RetrievalResultCache.prune removes the results of every other fingerprint."""
+
+    with RetrievalResultCache(
+        file_path=tmp_path / "retrieval_result_cache.sqlite"
+    ) as retrieval_result_cache:
+        for fingerprint in ("old fingerprint", "fingerprint"):
+            retrieval_result_cache.put(
+                fingerprint=fingerprint,
+                anti_recommendation_graphs=((record_key, (anti_recommendation_key,)),),
+            )
+
+        assert retrieval_result_cache.prune(fingerprint="fingerprint") == 1
+        assert not retrieval_result_cache.get(
+            fingerprint="old fingerprint", record_keys=(record_key,)
+        )
+        assert retrieval_result_cache.get(
+            fingerprint="fingerprint", record_keys=(record_key,)
+        ) == {record_key: (anti_recommendation_key,)}
+
+
+def test_put_while_read(
+    tmp_path: Path,
+    record_key: RecordKey,
+    anti_recommendation_key: AntiRecommendationKey,
+) -> None:
+    """Test that a RetrievalResultCache stores results while another partition is reading the cache."""
+
+    file_path = tmp_path / "retrieval_result_cache.sqlite"
+
+    with RetrievalResultCache(
+        file_path=file_path, busy_timeout_seconds=0
+    ) as retrieval_result_cache:
+        reading_connection = sqlite3.connect(file_path)
+        try:
+            reading_connection.execute("BEGIN")
+            reading_connection.execute("SELECT * FROM retrieval_results").fetchall()
+
+            retrieval_result_cache.put(
+                fingerprint="fingerprint",
+                anti_recommendation_graphs=((record_key, (anti_recommendation_key,)),),
+            )
+        finally:
+            reading_connection.close()
+
+        assert retrieval_result_cache.get(
+            fingerprint="fingerprint", record_keys=(record_key,)
+        ) == {record_key: (anti_recommendation_key,)}
@@ -0,0 +1,284 @@
+from dataclasses import replace
+from pathlib import Path
+from typing import override
+
+import pytest
+from langchain.docstore.document import Document
+from langchain.embeddings import CacheBackedEmbeddings
+from langchain.storage import LocalFileStore
+from langchain_community.vectorstores.utils import DistanceStrategy
+from langchain_core.embeddings import Embeddings
+
+from etl.models.types import (
+    CompressedIndexType,
+    ModelQuery,
+    OpenAiEmbeddingModelName,
+)
+from etl.pipelines import EmbeddingPipeline
+from etl.resources import RetrievalAlgorithmParameters, VectorStoreSettings
+from etl.stores import VectorStore
+
+
+class ScaledEmbeddings(Embeddings):
+    """An embedding model whose embeddings are those of embeddings, scaled by 3."""
+
+    def __init__(self, embeddings: Embeddings) -> None:
+        self.__embeddings = embeddings
+
+    @override
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [
+            [3 * value for value in embedding]
+            for embedding in self.__embeddings.embed_documents(texts)
+        ]
+
+    @override
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+
+def test_save_local(fake_vector_store: VectorStore) -> None:
+    """Test that VectorStore.save_local publishes an index version alongside the index."""
+
+    assert fake_vector_store.descriptor.index_version
+
+
+def test_similarity_search_with_score_batch(
+    fake_vector_store: VectorStore,
+    fake_retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
+    document_of_article_with_summary: Document,
+    document_of_anti_recommendation_article: Document,
+) -> None:
+    """Test that VectorStore.similarity_search_with_score_batch returns the same results as per-query similarity searches."""
+
+    queries: tuple[ModelQuery, ...] = (
+        document_of_article_with_summary.page_content,
+        document_of_anti_recommendation_article.page_content,
+    )
+
+    assert fake_vector_store.similarity_search_with_score_batch(
+        queries=queries,
+        k=2,
+        score_threshold=fake_retrieval_algorithm_parameters.score_threshold,
+    ) == tuple(
+        fake_vector_store.similarity_search_with_score(
+            query=query,
+            k=2,
+            score_threshold=fake_retrieval_algorithm_parameters.score_threshold,
+            distance_strategy=fake_retrieval_algorithm_parameters.distance_strategy,
+        )
+        for query in queries
+    )
+
+
+def test_similarity_search_with_score_batch_without_embedding_cache(
+    tmp_path: Path,
+    fake_vector_store: VectorStore,
+    fake_embedding: Embeddings,
+    fake_retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
+) -> None:
+    """Test that VectorStore.similarity_search_with_score_batch does not write queries to the embedding cache."""
+
+    with VectorStore.open(
+        fake_vector_store.descriptor,
+        embeddings=CacheBackedEmbeddings.from_bytes_store(
+            fake_embedding, LocalFileStore(tmp_path / "cache"), namespace="fake"
+        ),
+    ) as vector_store:
+        assert vector_store.similarity_search_with_score_batch(
+            queries=("a query of a client",),
+            k=2,
+            score_threshold=fake_retrieval_algorithm_parameters.score_threshold,
+        )
+
+    assert not any((tmp_path / "cache").glob("*"))
+
+
+def test_create_from_embedding_pipeline_with_shards(
+    tmp_path: Path,
+    fake_embedding_pipeline: EmbeddingPipeline,
+    document_of_article_with_summary: Document,
+    document_of_anti_recommendation_article: Document,
+) -> None:
+    """
+    Test that VectorStore.create_from_embedding_pipeline merges shards that fit in the memory budget,
+    and searches shards that do not fit across shard worker processes, with the same results as a single index.
+    """
+
+    documents = (
+        document_of_article_with_summary,
+        document_of_anti_recommendation_article,
+    )
+    queries: tuple[ModelQuery, ...] = tuple(
+        document.page_content for document in documents
+    )
+
+    def search(vector_store: VectorStore) -> tuple:
+        return vector_store.similarity_search_with_score_batch(
+            queries=queries,
+            k=2,
+            score_threshold=1,
+        )
+
+    def create(
+        directory_name: str, vector_store_settings: VectorStoreSettings
+    ) -> VectorStore:
+        return VectorStore.create_from_embedding_pipeline(
+            documents=documents,
+            embedding_pipeline=fake_embedding_pipeline,
+            descriptor=VectorStore.Descriptor(
+                directory_path=tmp_path / directory_name,
+                cache_directory_path=tmp_path / directory_name / "cache",
+                embedding_model_name=OpenAiEmbeddingModelName.TEXT_EMBEDDING_3_LARGE,
+            ),
+            vector_store_settings=vector_store_settings,
+        )
+
+    with create("single", VectorStoreSettings()) as single_vector_store:
+        expected_results = search(single_vector_store)
+        single_vector_store.save_local()
+        single_descriptor = single_vector_store.descriptor
+
+    assert expected_results[0]
+
+    with create("merged", VectorStoreSettings(shard_count=2)) as merged_vector_store:
+        assert merged_vector_store.descriptor.shard_count == 1
+        assert search(merged_vector_store) == expected_results
+        merged_vector_store.save_local()
+        merged_descriptor = merged_vector_store.descriptor
+
+    with create(
+        "scattered", VectorStoreSettings(shard_count=2, memory_budget_bytes=0)
+    ) as scattered_vector_store:
+        assert scattered_vector_store.descriptor.shard_count == 2
+        assert search(scattered_vector_store) == expected_results
+        scattered_vector_store.save_local()
+        scattered_descriptor = scattered_vector_store.descriptor
+
+    assert not merged_descriptor.shards_directory_path.exists()
+    assert merged_descriptor.with_saved_shard_count().shard_count == 1
+    assert (
+        replace(scattered_descriptor, shard_count=1)
+        .with_saved_shard_count()
+        .shard_count
+        == 2
+    )
+
+    # Query vectors that are not of unit length are normalized the same by sharded and unsharded vector stores.
+    scaled_embeddings = ScaledEmbeddings(fake_embedding_pipeline.embedding_model)
+    with (
+        VectorStore.open(
+            single_descriptor, embeddings=scaled_embeddings, normalize_L2=True
+        ) as single_vector_store,
+        VectorStore.open(
+            scattered_descriptor, embeddings=scaled_embeddings, normalize_L2=True
+        ) as scattered_vector_store,
+    ):
+        assert search(scattered_vector_store) == search(single_vector_store)
+
+
+@pytest.mark.parametrize("compressed_index_type", list(CompressedIndexType))
+@pytest.mark.parametrize(
+    "vector_store_settings",
+    [VectorStoreSettings(), VectorStoreSettings(shard_count=2, memory_budget_bytes=0)],
+)
+def test_similarity_search_with_score_batch_reranked(
+    tmp_path: Path,
+    compressed_index_type: CompressedIndexType,
+    vector_store_settings: VectorStoreSettings,
+    fake_embedding_pipeline: EmbeddingPipeline,
+    document_of_article_with_summary: Document,
+    document_of_anti_recommendation_article: Document,
+) -> None:
+    """
+    Test that re-ranking candidates of a compressed index, of a vector store or of each of its shards, returns the
+    Documents and distances of an exact search.
+    """
+
+    documents = (
+        document_of_article_with_summary,
+        document_of_anti_recommendation_article,
+    )
+
+    with VectorStore.create_from_embedding_pipeline(
+        documents=documents,
+        embedding_pipeline=fake_embedding_pipeline,
+        descriptor=VectorStore.Descriptor(
+            directory_path=tmp_path,
+            cache_directory_path=tmp_path / "cache",
+            embedding_model_name=OpenAiEmbeddingModelName.TEXT_EMBEDDING_3_LARGE,
+        ),
+        vector_store_settings=vector_store_settings,
+    ) as vector_store:
+        vector_store.save_local(compressed_index_type=compressed_index_type)
+
+        exact_results, reranked_results = (
+            vector_store.similarity_search_with_score_batch(
+                queries=tuple(document.page_content for document in documents),
+                k=2,
+                score_threshold=1,
+                rerank_oversampling_factor=rerank_oversampling_factor,
+            )
+            for rerank_oversampling_factor in (None, 2)
+        )
+
+    assert [
+        document for query_results in reranked_results for document, _ in query_results
+    ] == [document for query_results in exact_results for document, _ in query_results]
+    assert [
+        distance for query_results in reranked_results for _, distance in query_results
+    ] == pytest.approx(
+        [distance for query_results in exact_results for _, distance in query_results]
+    )
+
+
+def test_similarity_search_with_score_batch_without_compressed_index(
+    tmp_path: Path,
+    fake_embedding_pipeline: EmbeddingPipeline,
+    document_of_article_with_summary: Document,
+    document_of_anti_recommendation_article: Document,
+) -> None:
+    """
+    Test that a search with a rerank_oversampling_factor falls back to an exact search without a compressed index,
+    and that saving a vector store without a compressed index removes that of a previous save.
+    """
+
+    documents = (
+        document_of_article_with_summary,
+        document_of_anti_recommendation_article,
+    )
+
+    with VectorStore.create_from_embedding_pipeline(
+        documents=documents,
+        embedding_pipeline=fake_embedding_pipeline,
+        descriptor=VectorStore.Descriptor(
+            directory_path=tmp_path,
+            cache_directory_path=tmp_path / "cache",
+            embedding_model_name=OpenAiEmbeddingModelName.TEXT_EMBEDDING_3_LARGE,
+        ),
+        vector_store_settings=VectorStoreSettings(),
+    ) as vector_store:
+        vector_store.save_local(compressed_index_type=CompressedIndexType.INT8)
+        assert vector_store.descriptor.has_compressed_index
+
+        vector_store.save_local()
+        assert not vector_store.descriptor.has_compressed_index
+        assert not any(
+            file_path.exists()
+            for file_path in (
+                *vector_store.descriptor.compressed_index_file_paths,
+                *vector_store.descriptor.vectors_file_paths,
+            )
+        )
+
+        exact_results, fallback_results = (
+            vector_store.similarity_search_with_score_batch(
+                queries=tuple(document.page_content for document in documents),
+                k=2,
+                score_threshold=1,
+                rerank_oversampling_factor=rerank_oversampling_factor,
+            )
+            for rerank_oversampling_factor in (None, 2)
+        )
+
+    assert fallback_results == exact_results
@@ -0,0 +1,111 @@
+import gzip
+from pathlib import Path
+
+from etl.models.types import RecordKey
+from etl.stores import WikidataIdentifierStore
+
+
+def test_import_sql_dumps(tmp_path: Path) -> None:
+    """Test that WikidataIdentifierStore.import_sql_dumps maps the titles of articles to their wikibase_item page props."""
+
+    page_sql_dump_file_path = tmp_path / "enwiki-page.sql.gz"
+    with gzip.open(page_sql_dump_file_path, mode="wt", encoding="utf-8") as dump_file:
+        dump_file.write(
+            "CREATE TABLE `page` (\n  `page_id` int(8) unsigned NOT NULL\n);\n"
+            "INSERT INTO `page` VALUES (1,0,'Mouseion',0,0,0.5,'20240101000000',NULL,1,10,'wikitext',NULL),"
+            "(2,0,'Alan_Turing',0,0,0.5,'20240101000000',NULL,2,10,'wikitext',NULL),"
+            "(3,1,'Alan_Turing',0,0,0.5,'20240101000000',NULL,3,10,'wikitext',NULL),"
+            "(4,0,'Rock_\\'n\\'_roll_(music)',0,0,0.5,'20240101000000',NULL,4,10,'wikitext',NULL);\n"
+        )
+
+    page_props_sql_dump_file_path = tmp_path / "enwiki-page_props.sql"
+    page_props_sql_dump_file_path.write_text(
+        "INSERT INTO `page_props` VALUES (1,'wikibase_item','Q1',NULL),"
+        "(2,'page_image_free','Turing.jpg',NULL),(2,'wikibase_item','Q7251',NULL),"
+        "(3,'wikibase_item','Q99',NULL),(4,'wikibase_item','Q11399',NULL);\n",
+        encoding="utf-8",
+    )
+
+    with WikidataIdentifierStore(
+        file_path=tmp_path / "wikidata_identifiers.sqlite"
+    ) as wikidata_identifier_store:
+        assert (
+            wikidata_identifier_store.import_sql_dumps(
+                page_sql_dump_file_path=page_sql_dump_file_path,
+                page_props_sql_dump_file_path=page_props_sql_dump_file_path,
+            )
+            == 3
+        )
+        assert wikidata_identifier_store.get(
+            (
+                RecordKey("Mouseion"),
+                RecordKey("Alan Turing"),
+                RecordKey("Rock_'n'_roll_(music)"),
+                RecordKey("Missing"),
+            )
+        ) == {
+            "Mouseion": "Q1",
+            "Alan Turing": "Q7251",
+            "Rock_'n'_roll_(music)": "Q11399",
+        }
+
+
+def test_import_sql_dumps_with_redirects(tmp_path: Path) -> None:
+    """Test that WikidataIdentifierStore.import_sql_dumps maps the titles of redirects to the wikibase_item page props of their targets."""
+
+    page_sql_dump_file_path = tmp_path / "enwiki-page.sql"
+    page_sql_dump_file_path.write_text(
+        "INSERT INTO `page` VALUES (2,0,'Alan_Turing',0,0,0.5,'20240101000000',NULL,2,10,'wikitext',NULL),"
+        "(5,0,'Turing',1,0,0.5,'20240101000000',NULL,5,10,'wikitext',NULL),"
+        "(6,0,'Turing_test_(redirect)',1,0,0.5,'20240101000000',NULL,6,10,'wikitext',NULL),"
+        "(7,0,'Turing_(wiktionary)',1,0,0.5,'20240101000000',NULL,7,10,'wikitext',NULL),"
+        "(8,0,'A._M._Turing',1,0,0.5,'20240101000000',NULL,8,10,'wikitext',NULL);\n",
+        encoding="utf-8",
+    )
+    page_props_sql_dump_file_path = tmp_path / "enwiki-page_props.sql"
+    page_props_sql_dump_file_path.write_text(
+        "INSERT INTO `page_props` VALUES (2,'wikibase_item','Q7251',NULL),(8,'wikibase_item','Q8',NULL);\n",
+        encoding="utf-8",
+    )
+    redirect_sql_dump_file_path = tmp_path / "enwiki-redirect.sql"
+    redirect_sql_dump_file_path.write_text(
+        "INSERT INTO `redirect` VALUES (5,0,'Alan_Turing','',''),(6,0,'Turing_test','',''),"
+        "(7,0,'Turing','wikt',''),(8,0,'Alan_Turing','','');\n",
+        encoding="utf-8",
+    )
+
+    with WikidataIdentifierStore(
+        file_path=tmp_path / "wikidata_identifiers.sqlite"
+    ) as wikidata_identifier_store:
+        assert (
+            wikidata_identifier_store.import_sql_dumps(
+                page_sql_dump_file_path=page_sql_dump_file_path,
+                page_props_sql_dump_file_path=page_props_sql_dump_file_path,
+                redirect_sql_dump_file_path=redirect_sql_dump_file_path,
+            )
+            == 3
+        )
+        assert wikidata_identifier_store.get(
+            (
+                RecordKey("Turing"),
+                RecordKey("Turing_test_(redirect)"),
+                RecordKey("Turing_(wiktionary)"),
+                RecordKey("A._M._Turing"),
+            )
+        ) == {"Turing": "Q7251", "A._M._Turing": "Q8"}
+
+
+def test_invalidate(tmp_path: Path, record_key: RecordKey) -> None:
+    """Test that WikidataIdentifierStore.invalidate removes mappings that would otherwise never expire."""
+
+    file_path = tmp_path / "wikidata_identifiers.sqlite"
+
+    with WikidataIdentifierStore(file_path=file_path) as wikidata_identifier_store:
+        wikidata_identifier_store.put({record_key: "Q1"})
+
+    with WikidataIdentifierStore(file_path=file_path) as wikidata_identifier_store:
+        assert wikidata_identifier_store.get((record_key,)) == {record_key: "Q1"}
+
+        wikidata_identifier_store.invalidate((record_key,))
+
+        assert not wikidata_identifier_store.get((record_key,))
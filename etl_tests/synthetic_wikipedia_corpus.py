@@ -0,0 +1,277 @@
+"""
+Write a synthetic Wikipedia corpus in the RECORD-typed JSON Lines format that WikipediaReader reads, or in the
+format of the abstract dumps of Wikipedia that WikipediaAbstractDumpReader reads.
+
+Run with `python -m etl_tests.synthetic_wikipedia_corpus --help`.
+"""
+
+import argparse
+import gzip
+import json
+import math
+from collections.abc import Iterator, Mapping
+from itertools import product
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+import numpy as np
+from unidecode import unidecode
+
+from etl.models import WIKIPEDIA_BASE_URL
+from etl.models.types import DataFileName
+
+# Syllables of the synthetic vocabulary. Accented syllables transliterate to ASCII syllables that are not in
+# ASCII_SYLLABLES, so that titles stay unique after WikipediaReader transliterates them.
+ASCII_SYLLABLES = tuple(
+    consonant + vowel for consonant, vowel in product("bdgkmprstv", "aeiou")
+)
+ACCENTED_SYLLABLES = tuple("ñ" + vowel for vowel in "aeiou")
+VOCABULARY = tuple(
+    first_syllable + second_syllable
+    for first_syllable, second_syllable in product(
+        ASCII_SYLLABLES + ACCENTED_SYLLABLES, repeat=2
+    )
+)
+VOCABULARY_INDICES = {
+    **{unidecode(word): word_index for word_index, word in enumerate(VOCABULARY)},
+    **{word: word_index for word_index, word in enumerate(VOCABULARY)},
+}
+STATE_INTERVAL = 10_000
+
+
+def synthetic_title(title_index: int) -> str:
+    """Return the unique title of title_index, of words of VOCABULARY that spell title_index in base len(VOCABULARY)."""
+
+    words = [VOCABULARY[title_index % len(VOCABULARY)].capitalize()]
+    title_index //= len(VOCABULARY)
+
+    while title_index:
+        title_index -= 1
+        words.append(VOCABULARY[title_index % len(VOCABULARY)])
+        title_index //= len(VOCABULARY)
+
+    return " ".join(words)
+
+
+def synthetic_title_index(title: str) -> int | None:
+    """
+    Return the title index that synthetic_title spells as title, or None if title is not a synthetic title.
+
+    Titles that WikipediaReader transliterated to ASCII, and Record keys with underscores for spaces, are recognized too.
+    """
+
+    word_indices = [
+        VOCABULARY_INDICES.get(word.lower()) for word in title.replace("_", " ").split()
+    ]
+    if not word_indices or None in word_indices:
+        return None
+
+    title_index = 0
+    for word_index in reversed(word_indices[1:]):
+        title_index = title_index * len(VOCABULARY) + word_index + 1
+
+    return title_index * len(VOCABULARY) + word_indices[0]
+
+
+class SyntheticWikidataIdentifiers(Mapping[str, str]):
+    """A Mapping from the titles of a synthetic corpus of articles_count articles to Wikidata identifiers."""
+
+    def __init__(self, *, articles_count: int) -> None:
+        self.__articles_count = articles_count
+
+    def __getitem__(self, title: str) -> str:
+        title_index = synthetic_title_index(title)
+        if title_index is None or title_index >= self.__articles_count:
+            raise KeyError(title)
+
+        return f"Q{title_index + 1}"
+
+    def __iter__(self) -> Iterator[str]:
+        return map(synthetic_title, range(self.__articles_count))
+
+    def __len__(self) -> int:
+        return self.__articles_count
+
+
+def synthetic_titles(*, articles_count: int, seed: int) -> Iterator[str]:
+    """
+    Yield articles_count unique titles, in a seeded order.
+
+    Title indices are permuted by an affine bijection modulo articles_count, so that neighboring articles
+    do not have neighboring titles.
+    """
+
+    rng = np.random.default_rng(seed)
+    multiplier = int(rng.integers(1, max(articles_count, 2)))
+    while math.gcd(multiplier, articles_count) != 1:
+        multiplier += 1
+    offset = int(rng.integers(max(articles_count, 1)))
+
+    for article_index in range(articles_count):
+        yield synthetic_title((multiplier * article_index + offset) % articles_count)
+
+
+def synthetic_abstract(*, title: str, rng: np.random.Generator) -> str:
+    """
+    Return an abstract of 2 to 6 sentences about title.
+
+    Words are drawn from a Zipf distribution over VOCABULARY, and every sentence mentions a word of the title,
+    so that articles that share title words have similar abstracts.
+    """
+
+    title_words = title.lower().split()
+    sentences = []
+
+    for sentence_length in rng.integers(6, 24, size=int(rng.integers(2, 7))).tolist():
+        word_indices = (rng.zipf(1.3, size=sentence_length) - 1) % len(VOCABULARY)
+        words = [VOCABULARY[word_index] for word_index in word_indices.tolist()]
+        words[int(rng.integers(sentence_length))] = title_words[
+            int(rng.integers(len(title_words)))
+        ]
+        sentences.append(" ".join(words).capitalize() + ".")
+
+    return " ".join(sentences)
+
+
+def synthetic_articles(*, articles_count: int, seed: int) -> Iterator[dict[str, str]]:
+    """Yield the title, URL and abstract of articles_count synthetic articles. The same arguments yield the same articles."""
+
+    rng = np.random.default_rng(seed)
+
+    for title in synthetic_titles(articles_count=articles_count, seed=seed):
+        yield {
+            "title": title,
+            "url": WIKIPEDIA_BASE_URL + title.replace(" ", "_"),
+            "abstract": synthetic_abstract(title=title, rng=rng),
+        }
+
+
+def write_synthetic_abstract_dump(
+    *, file_path: Path, articles_count: int, seed: int = 0
+) -> None:
+    """
+    Write articles_count synthetic articles to a gzip-compressed abstract dump at file_path.
+
+    The dump holds the same articles as write_synthetic_corpus writes with the same seed.
+    """
+
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with gzip.open(file_path, mode="wt", encoding="utf-8") as abstract_dump_file:
+        abstract_dump_file.write("<feed>\n")
+
+        for article in synthetic_articles(articles_count=articles_count, seed=seed):
+            abstract_dump_file.write(
+                f"<doc>\n<title>Wikipedia: {escape(article['title'])}</title>\n"
+                f"<url>{escape(article['url'])}</url>\n"
+                f"<abstract>{escape(article['abstract'])}</abstract>\n"
+                "<links>\n"
+                f'<sublink linktype="nav"><anchor>See also</anchor><link>{escape(article["url"])}#See_also</link></sublink>\n'
+                "</links>\n</doc>\n"
+            )
+
+        abstract_dump_file.write("</feed>\n")
+
+
+def write_synthetic_corpus(
+    *,
+    directory_path: Path,
+    articles_count: int,
+    data_files_count: int = 1,
+    seed: int = 0,
+) -> tuple[DataFileName, ...]:
+    """
+    Write articles_count synthetic articles to data_files_count data files in directory_path, and return their names.
+
+    Every data file is a Singer stream: a SCHEMA message, then RECORD messages of articles, with a STATE message
+    every STATE_INTERVAL records. The same arguments always write the same corpus.
+    """
+
+    directory_path.mkdir(parents=True, exist_ok=True)
+
+    data_file_names = tuple(
+        f"synthetic-wikipedia-{data_file_index:03d}.output.txt"
+        for data_file_index in range(data_files_count)
+    )
+    articles_per_data_file = math.ceil(articles_count / data_files_count)
+    articles = synthetic_articles(articles_count=articles_count, seed=seed)
+
+    for data_file_index, data_file_name in enumerate(data_file_names):
+        with (directory_path / data_file_name).open(
+            mode="w", encoding="utf-8"
+        ) as data_file:
+            data_file.write(
+                json.dumps(
+                    {
+                        "type": "SCHEMA",
+                        "stream": "wikipedia",
+                        "schema": {
+                            "type": "object",
+                            "properties": {"abstract_info": {"type": "object"}},
+                        },
+                        "key_properties": ["title"],
+                    }
+                )
+                + "\n"
+            )
+
+            for record_index in range(
+                data_file_index * articles_per_data_file,
+                min((data_file_index + 1) * articles_per_data_file, articles_count),
+            ):
+                data_file.write(
+                    json.dumps(
+                        {
+                            "type": "RECORD",
+                            "stream": "wikipedia",
+                            "record": {"abstract_info": next(articles)},
+                        },
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+
+                if (record_index + 1) % STATE_INTERVAL == 0:
+                    data_file.write(
+                        json.dumps(
+                            {"type": "STATE", "value": {"offset": record_index + 1}}
+                        )
+                        + "\n"
+                    )
+
+    return data_file_names
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__)
+    argument_parser.add_argument("directory_path", type=Path)
+    argument_parser.add_argument("--articles", type=int, default=10_000)
+    argument_parser.add_argument("--data-files", type=int, default=1)
+    argument_parser.add_argument("--seed", type=int, default=0)
+    argument_parser.add_argument(
+        "--abstract-dump",
+        action="store_true",
+        help="write a single enwiki-synthetic-abstract.xml.gz abstract dump instead of data files",
+    )
+    arguments = argument_parser.parse_args()
+
+    if arguments.abstract_dump:
+        write_synthetic_abstract_dump(
+            file_path=arguments.directory_path / "enwiki-synthetic-abstract.xml.gz",
+            articles_count=arguments.articles,
+            seed=arguments.seed,
+        )
+        return
+
+    data_file_names = write_synthetic_corpus(
+        directory_path=arguments.directory_path,
+        articles_count=arguments.articles,
+        data_files_count=arguments.data_files,
+        seed=arguments.seed,
+    )
+
+    print(json.dumps({"data_file_names": data_file_names}, indent=2))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
+import gzip
 import json
+import os
+from collections.abc import Callable
+from pathlib import Path
 from typing import cast
 
+import pytest
+from dagster import Output, build_asset_context
 from langchain.docstore.document import Document
 from langchain.schema.runnable import RunnableSequence
 from langchain_community.vectorstores import FAISS
@@ -10,20 +16,25 @@ from etl.assets import (
     documents_of_wikipedia_articles_with_summaries,
     wikipedia_anti_recommendations,
     wikipedia_anti_recommendations_json_file,
+    wikipedia_arkg,
     wikipedia_arkg_asset_factory,
+    wikipedia_arkg_stream_asset_factory,
     wikipedia_articles_from_storage,
     wikipedia_articles_vector_store,
     wikipedia_articles_with_summaries,
     wikipedia_articles_with_summaries_json_file,
 )
+from etl.memory import MemoryBudgetExceededError, SpilledSequence, resident_set_size
 from etl.models import (
     AntiRecommendationGraphTuple,
     DocumentTuple,
     RecordTuple,
+    rdf_serializations,
     wikipedia,
 )
 from etl.models.types import (
     AntiRecommendationKey,
+    CompressionFormat,
     ModelResponse,
     RdfFileExtension,
     RdfMimeType,
@@ -33,25 +44,33 @@ from etl.models.types import (
 )
 from etl.namespaces import ARKG
 from etl.resources import (
+    CompressionSettings,
     InputConfig,
+    LocalEmbeddingSettings,
+    MemorySettings,
     OpenaiSettings,
     OutputConfig,
     RetrievalAlgorithmParameters,
+    VectorStoreSettings,
+    WikidataSettings,
 )
-from etl.stores import ArkgStore, VectorStore
+from etl.stores import ArkgStore, VectorStore, WikidataIdentifierStore
 
 
-def test_wikipedia_articles_from_storage(input_config: InputConfig) -> None:
+def test_wikipedia_articles_from_storage(
+    input_config: InputConfig, memory_settings: MemorySettings
+) -> None:
     """Test that wikipedia_articles_from_storage successfully materializes a tuple of Wikipedia articles."""
 
     assert isinstance(
-        wikipedia_articles_from_storage(input_config).records[0], wikipedia.Article  # type: ignore[attr-defined]
+        wikipedia_articles_from_storage(build_asset_context(), input_config, memory_settings).value.records[0], wikipedia.Article  # type: ignore[attr-defined]
     )
 
 
 def test_wikipedia_articles_with_summaries(
-    session_mocker: MockFixture,
+    mocker: MockFixture,
     openai_settings: OpenaiSettings,
+    memory_settings: MemorySettings,
     tuple_of_articles_with_summaries: tuple[wikipedia.Article, ...],
     article_with_summary: wikipedia.Article,
     openai_model_response: ModelResponse,
@@ -59,16 +78,15 @@ def test_wikipedia_articles_with_summaries(
     """Test that wikipedia_articles_with_summaries succesfully materializes a tuple of Wikipedia articles with summaries."""
 
     # Mock RunnableSequence.invoke and return a ModelResponse
-    session_mocker.patch.object(
-        RunnableSequence, "invoke", return_value=openai_model_response
-    )
+    mocker.patch.object(RunnableSequence, "invoke", return_value=openai_model_response)
 
     assert (
         wikipedia_articles_with_summaries(  # type: ignore[attr-defined]
             RecordTuple(records=tuple_of_articles_with_summaries),
             openai_settings,
+            memory_settings,
         )
-        .records[0]
+        .value.records[0]
         .model_dump(by_alias=True)["summary"]
         == article_with_summary.summary
     )
@@ -99,19 +117,21 @@ def test_wikipedia_articles_with_summaries_json_file(
 def test_documents_of_wikipedia_articles_with_summaries(
     tuple_of_articles_with_summaries: tuple[wikipedia.Article, ...],
     document_of_article_with_summary: Document,
+    memory_settings: MemorySettings,
 ) -> None:
     """Test that documents_of_wikipedia_articles_with_summaries successfully materializes a tuple of Documents."""
 
     assert (
         documents_of_wikipedia_articles_with_summaries(  # type: ignore[attr-defined]
             RecordTuple(records=tuple_of_articles_with_summaries),
+            memory_settings,
         ).documents[0]
         == document_of_article_with_summary
     )
 
 
 def test_wikipedia_articles_vector_store(
-    session_mocker: MockFixture,
+    mocker: MockFixture,
     openai_settings: OpenaiSettings,
     output_config: OutputConfig,
     faiss: FAISS,
@@ -119,7 +139,7 @@ def test_wikipedia_articles_vector_store(
 ) -> None:
     """Test that wikipedia_articles_vector_store calls a method that is required to create an embedding store."""
 
-    mock_faiss__from_documents = session_mocker.patch.object(
+    mock_faiss__from_documents = mocker.patch.object(
         FAISS, "from_documents", return_value=faiss
     )
 
@@ -127,31 +147,120 @@ def test_wikipedia_articles_vector_store(
         output_config,
         openai_settings,
         DocumentTuple(documents=(document_of_article_with_summary,)),
+        VectorStoreSettings(),
+        LocalEmbeddingSettings(),
     )
 
     mock_faiss__from_documents.assert_called_once()
 
 
+# The stand-in embeddings of the OpenAI embedding model hash words, so they do not retrieve the same Documents.
+@pytest.mark.skipif(
+    "OPENAI_API_KEY" not in os.environ,
+    reason="the expected anti-recommendations are those of OpenAI's embeddings.",
+)
 def test_wikipedia_anti_recommendations(
+    output_config: OutputConfig,
     vector_store: VectorStore,
     article: wikipedia.Article,
     anti_recommendation_graph: tuple[
         tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...
     ],
     retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
+    memory_settings: MemorySettings,
 ) -> None:
     """Test that wikipedia_anti_recommendations successfully returns anti_recommendation_graphs."""
 
     assert (
         wikipedia_anti_recommendations(  # type: ignore[attr-defined]
+            output_config,
             RecordTuple(records=(article,)),
             retrieval_algorithm_parameters,
             vector_store.descriptor,
-        ).anti_recommendation_graphs[0]
+            memory_settings,
+        ).value.anti_recommendation_graphs[0]
         == anti_recommendation_graph[0]
     )
 
 
+def test_wikipedia_anti_recommendations_with_retrieval_result_cache(
+    mocker: MockFixture,
+    tmp_path: Path,
+    fake_vector_store: VectorStore,
+    open_fake_vector_store: Callable[[VectorStore.Descriptor], VectorStore],
+    fake_retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
+    article: wikipedia.Article,
+) -> None:
+    """Test that wikipedia_anti_recommendations reuses the anti-recommendations cached by a previous run."""
+
+    mocker.patch.object(VectorStore, "open", side_effect=open_fake_vector_store)
+
+    def materialize() -> Output[AntiRecommendationGraphTuple]:
+        return wikipedia_anti_recommendations(  # type: ignore[no-any-return]
+            OutputConfig(output_directory_path=str(tmp_path)),
+            RecordTuple(records=(article,)),
+            fake_retrieval_algorithm_parameters,
+            fake_vector_store.descriptor,
+            MemorySettings(),
+        )
+
+    first_output = materialize()
+    second_output = materialize()
+
+    assert first_output.metadata["retrieval_cache_misses"].value == 1
+    assert second_output.metadata["retrieval_cache_hits"].value == 1
+    assert second_output.value == first_output.value
+
+
+def test_wikipedia_anti_recommendations_under_memory_budget(
+    mocker: MockFixture,
+    tmp_path: Path,
+    fake_vector_store: VectorStore,
+    open_fake_vector_store: Callable[[VectorStore.Descriptor], VectorStore],
+    fake_retrieval_algorithm_parameters: RetrievalAlgorithmParameters,
+    article: wikipedia.Article,
+    anti_recommendation_article: wikipedia.Article,
+) -> None:
+    """
+    Test that wikipedia_anti_recommendations spills its anti-recommendation graphs under a memory budget, and
+    fails before it loads a vector store that does not fit in the budget.
+    """
+
+    mocker.patch.object(VectorStore, "open", side_effect=open_fake_vector_store)
+    records = RecordTuple(records=(article, anti_recommendation_article, article))
+
+    def materialize(
+        memory_budget_bytes: int | None,
+    ) -> Output[AntiRecommendationGraphTuple]:
+        return wikipedia_anti_recommendations(  # type: ignore[no-any-return]
+            OutputConfig(output_directory_path=str(tmp_path)),
+            records,
+            fake_retrieval_algorithm_parameters,
+            fake_vector_store.descriptor,
+            MemorySettings(
+                memory_budget_bytes=memory_budget_bytes,
+                spill_directory_path=str(tmp_path / "spill"),
+            ),
+        )
+
+    anti_recommendation_graphs = materialize(
+        resident_set_size() + (128 << 20)
+    ).value.anti_recommendation_graphs
+
+    assert isinstance(anti_recommendation_graphs, SpilledSequence)
+    assert list(anti_recommendation_graphs) == list(
+        materialize(None).value.anti_recommendation_graphs
+    )
+    assert [record_key for record_key, _ in anti_recommendation_graphs] == [
+        record.key for record in records.records
+    ]
+
+    open_vector_store = mocker.patch.object(VectorStore, "open")
+    with pytest.raises(MemoryBudgetExceededError):
+        materialize(resident_set_size() + fake_vector_store.descriptor.index_bytes // 2)
+    open_vector_store.assert_not_called()
+
+
 def test_wikipedia_anti_recommendations_json_file(
     output_config: OutputConfig,
     anti_recommendation_graph: tuple[
@@ -177,25 +286,25 @@ def test_wikipedia_anti_recommendations_json_file(
             )
 
 
-def test_wikipedia_arkg_asset_factory(
+def test_wikipedia_arkg(
     output_config: OutputConfig,
     anti_recommendation_key: AntiRecommendationKey,
     anti_recommendation_graph: tuple[
         tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...
     ],
     anti_recommendation_node_query: SparqlQuery,
-    rdf_serialization_tuple: tuple[RdfSerializationName, RdfMimeType, RdfFileExtension],
 ) -> None:
-    """Test that wikipedia_arkg_factory successfully materializes a Wikipedia ARKG and writes it to file."""
+    """Test that wikipedia_arkg successfully materializes a Wikipedia ARKG."""
 
     wikipedia_arkg_store_descriptor = cast(
         ArkgStore.Descriptor,
-        wikipedia_arkg_asset_factory(*rdf_serialization_tuple)(
+        wikipedia_arkg(  # type: ignore[attr-defined]
             output_config,
             AntiRecommendationGraphTuple(
                 anti_recommendation_graphs=anti_recommendation_graph
             ),
-        ),
+            WikidataSettings(),
+        ).value,
     )
 
     with ArkgStore.open(wikipedia_arkg_store_descriptor) as wikipedia_arkg_store:
@@ -207,3 +316,116 @@ def test_wikipedia_arkg_asset_factory(
         anti_recommendation_node["anti_recommendation"].value
         == ARKG.anti_recommendation_iri(anti_recommendation_key).value
     )
+
+
+def test_wikipedia_arkg_asset_factory(
+    tmp_path: Path,
+    record_key: RecordKey,
+    anti_recommendation_graph: tuple[
+        tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...
+    ],
+    rdf_serialization_tuple: tuple[RdfSerializationName, RdfMimeType, RdfFileExtension],
+) -> None:
+    """Test that the assets of wikipedia_arkg_asset_factory write the ARKG of one offline wikipedia_arkg build to file."""
+
+    output_config = OutputConfig(output_directory_path=str(tmp_path))
+    parsed_output_config = output_config.parse()
+
+    with WikidataIdentifierStore(
+        file_path=parsed_output_config.wikidata_identifiers_file_path
+    ) as wikidata_identifier_store:
+        wikidata_identifier_store.put({record_key: "Q1"})
+
+    wikipedia_arkg_store_descriptor = cast(
+        ArkgStore.Descriptor,
+        wikipedia_arkg(  # type: ignore[attr-defined]
+            output_config,
+            AntiRecommendationGraphTuple(
+                anti_recommendation_graphs=anti_recommendation_graph
+            ),
+            WikidataSettings(offline=True),
+        ).value,
+    )
+
+    for rdf_serialization in rdf_serializations:
+        wikipedia_arkg_asset_factory(*rdf_serialization)(
+            output_config, wikipedia_arkg_store_descriptor, CompressionSettings()
+        )
+
+    assert (
+        parsed_output_config.wikipedia_arkg_file_path.with_suffix(
+            rdf_serialization_tuple[2]
+        )
+        .read_text(encoding="utf-8")
+        .strip()
+    )
+
+
+def test_wikipedia_arkg_asset_factory_with_compression(
+    tmp_path: Path,
+    record_key: RecordKey,
+    anti_recommendation_graph: tuple[
+        tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...
+    ],
+) -> None:
+    """Test that the assets of wikipedia_arkg_asset_factory write gzip-compressed serializations, and report their compressed file extension."""
+
+    output_config = OutputConfig(output_directory_path=str(tmp_path))
+    parsed_output_config = output_config.parse()
+
+    with WikidataIdentifierStore(
+        file_path=parsed_output_config.wikidata_identifiers_file_path
+    ) as wikidata_identifier_store:
+        wikidata_identifier_store.put({record_key: "Q1"})
+
+    wikipedia_arkg_store_descriptor = cast(
+        ArkgStore.Descriptor,
+        wikipedia_arkg(  # type: ignore[attr-defined]
+            output_config,
+            AntiRecommendationGraphTuple(
+                anti_recommendation_graphs=anti_recommendation_graph
+            ),
+            WikidataSettings(offline=True),
+        ).value,
+    )
+
+    output = wikipedia_arkg_asset_factory("n_triples", RdfMimeType.N_TRIPLES, ".nt")(  # type: ignore[attr-defined]
+        output_config,
+        wikipedia_arkg_store_descriptor,
+        CompressionSettings(compression_format=CompressionFormat.GZIP),
+    )
+
+    assert output.metadata["file_extension"].value == ".nt.gz"
+    with gzip.open(
+        parsed_output_config.wikipedia_arkg_file_path.with_suffix(".nt.gz"),
+        mode="rt",
+        encoding="utf-8",
+    ) as file:
+        assert record_key in file.read()
+
+
+def test_wikipedia_arkg_stream_asset_factory(
+    tmp_path: Path,
+    record_key: RecordKey,
+    anti_recommendation_graph: tuple[
+        tuple[RecordKey, tuple[AntiRecommendationKey, ...]], ...
+    ],
+) -> None:
+    """Test that the assets of wikipedia_arkg_stream_asset_factory write their serializations to other files than those of wikipedia_arkg_asset_factory."""
+
+    output_config = OutputConfig(output_directory_path=str(tmp_path))
+    parsed_output_config = output_config.parse()
+
+    output = wikipedia_arkg_stream_asset_factory("n_triples", RdfMimeType.N_TRIPLES, ".nt")(  # type: ignore[attr-defined]
+        output_config,
+        AntiRecommendationGraphTuple(
+            anti_recommendation_graphs=anti_recommendation_graph
+        ),
+        {record_key: "Q1"},
+        CompressionSettings(),
+    )
+
+    file_path = parsed_output_config.wikipedia_arkg_stream_file_path.with_suffix(".nt")
+    assert output.metadata["file_path"].value == str(file_path)
+    assert record_key in file_path.read_text(encoding="utf-8")
+    assert not parsed_output_config.wikipedia_arkg_file_path.with_suffix(".nt").exists()
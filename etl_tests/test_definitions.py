@@ -0,0 +1,18 @@
+from etl_benchmarks.import_time_benchmark import DEFERRED_MODULES, time_import
+
+
+def test_definitions_defer_imports() -> None:
+    """Test that loading the etl code location does not import the dependencies of the pipelines and stores."""
+
+    imported_modules = time_import("etl.definitions")["modules"]
+
+    assert not set(DEFERRED_MODULES) & set(imported_modules)  # type: ignore[arg-type]
+
+
+def test_arkg_store_defers_imports() -> None:
+    """Test that the ARKG assets do not import the LangChain and FAISS dependencies of the vector store assets."""
+
+    imported_modules = time_import("etl.stores.arkg_store")["modules"]
+
+    assert "faiss" not in imported_modules  # type: ignore[operator]
+    assert "langchain_core" not in imported_modules  # type: ignore[operator]
@@ -0,0 +1,106 @@
+from pathlib import Path
+
+from dagster import (
+    AssetKey,
+    AssetSelection,
+    DagsterInstance,
+    Definitions,
+    define_asset_job,
+    materialize,
+)
+from dagster._core.definitions.data_version import (
+    CachingStaleStatusResolver,
+    StaleStatus,
+)
+
+from etl.assets import wikipedia_articles_from_storage, wikipedia_data_files
+from etl.resources import InputConfig, MemorySettings, OpenaiSettings
+from etl.versioning import content_hash, file_content_hash, settings_content_hash
+from etl_tests.synthetic_wikipedia_corpus import write_synthetic_corpus
+
+
+def test_content_hashes(tmp_path: Path) -> None:
+    """Test that content hashes change with contents, and only with contents."""
+
+    assert content_hash(("ab", "c")) == content_hash((b"ab", b"c"))
+    assert content_hash(("ab", "c")) != content_hash(("a", "bc"))
+
+    first_file_path, second_file_path = tmp_path / "first", tmp_path / "second"
+    first_file_path.write_text("first")
+    second_file_path.write_text("second")
+    file_hash = file_content_hash((first_file_path, second_file_path))
+
+    assert file_content_hash((second_file_path, first_file_path)) == file_hash
+    second_file_path.write_text("changed")
+    assert file_content_hash((first_file_path, second_file_path)) != file_hash
+
+    dataset_directory_path = tmp_path / "dataset"
+    dataset_directory_path.mkdir()
+    (dataset_directory_path / "part-0").write_text("first")
+    directory_hash = file_content_hash((dataset_directory_path,))
+    (dataset_directory_path / "part-1").write_text("second")
+    assert file_content_hash((dataset_directory_path,)) != directory_hash
+
+    openai_settings = OpenaiSettings(openai_api_key="first")
+
+    assert settings_content_hash(
+        openai_settings, field_names=("generative_model_name",)
+    ) == settings_content_hash(
+        OpenaiSettings(openai_api_key="second"),
+        field_names=("generative_model_name",),
+    )
+    assert settings_content_hash(openai_settings) != settings_content_hash(
+        OpenaiSettings(openai_api_key="second")
+    )
+
+
+def test_stale_assets(tmp_path: Path) -> None:
+    """Test that an asset is unsynced only once the content of its input data files changed."""
+
+    data_file_names = write_synthetic_corpus(
+        directory_path=tmp_path / "input", articles_count=20
+    )
+    resources = {
+        "input_config": InputConfig.default(
+            data_directory_path_default=tmp_path / "input",
+            data_file_names_default=data_file_names,
+        ),
+        "memory_settings": MemorySettings(),
+    }
+    definitions = Definitions(
+        assets=[wikipedia_data_files, wikipedia_articles_from_storage],
+        jobs=[
+            define_asset_job(
+                "observation_job",
+                selection=AssetSelection.assets(wikipedia_data_files.key),
+            )
+        ],
+        resources=resources,
+    )
+    instance = DagsterInstance.ephemeral()
+
+    def observe_and_get_stale_status() -> StaleStatus:
+        assert (
+            definitions.get_job_def("observation_job")
+            .execute_in_process(instance=instance)
+            .success
+        )
+        return CachingStaleStatusResolver(
+            instance, definitions.get_asset_graph()
+        ).get_status(AssetKey("wikipedia_articles_from_storage"))
+
+    observe_and_get_stale_status()
+    assert materialize(
+        [wikipedia_data_files, wikipedia_articles_from_storage],
+        selection=[wikipedia_articles_from_storage],
+        instance=instance,
+        resources=resources,
+    ).success
+
+    assert observe_and_get_stale_status() == StaleStatus.FRESH
+
+    (tmp_path / "input" / data_file_names[0]).touch()
+    assert observe_and_get_stale_status() == StaleStatus.FRESH
+
+    write_synthetic_corpus(directory_path=tmp_path / "input", articles_count=20, seed=1)
+    assert observe_and_get_stale_status() == StaleStatus.STALE
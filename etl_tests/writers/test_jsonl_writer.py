@@ -0,0 +1,19 @@
+import json
+from pathlib import Path
+
+from etl.writers import JsonlWriter
+
+
+def test_write(tmp_path: Path) -> None:
+    """Test that JsonlWriter.write writes one line of JSON per value, across chunks."""
+
+    values = [["Mouseion", ["Café", "B"]], ["B", []], {"key": "value"}]
+    file_path = tmp_path / "values.jsonl"
+
+    with JsonlWriter(file_path=file_path, chunk_size=8) as jsonl_writer:
+        jsonl_writer.write(values[:1])
+        jsonl_writer.write(values[1:])
+
+    assert [
+        json.loads(line) for line in file_path.read_text(encoding="utf-8").splitlines()
+    ] == values
@@ -0,0 +1,49 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from etl.models.types import CompressionFormat
+from etl.resources import CompressionSettings
+from etl.writers import open_compressed_file
+
+
+def test_open_compressed_file_with_gzip(tmp_path: Path) -> None:
+    """Test that open_compressed_file writes a gzip file that decompresses into the written bytes."""
+
+    file_path = tmp_path / "arkg.nt.gz"
+
+    with open_compressed_file(
+        file_path,
+        compression_settings=CompressionSettings(
+            compression_format=CompressionFormat.GZIP, compression_level=1
+        ),
+    ) as file:
+        file.write(
+            b"<http://example.org/s> <http://example.org/p> <http://example.org/o> .\n"
+            * 1000
+        )
+
+    assert gzip.decompress(file_path.read_bytes()).count(b"\n") == 1000
+    assert file_path.stat().st_size < 1000
+
+
+def test_open_compressed_file_with_zstd(tmp_path: Path) -> None:
+    """Test that open_compressed_file writes a zstd file with compression threads that decompresses into the written bytes."""
+
+    zstandard = pytest.importorskip("zstandard")
+    file_path = tmp_path / "arkg.nt.zst"
+
+    with open_compressed_file(
+        file_path,
+        compression_settings=CompressionSettings(
+            compression_format=CompressionFormat.ZSTD, compression_threads=2
+        ),
+    ) as file:
+        file.write(
+            b"<http://example.org/s> <http://example.org/p> <http://example.org/o> .\n"
+            * 1000
+        )
+
+    with zstandard.open(file_path, mode="rb") as file:
+        assert file.read().count(b"\n") == 1000
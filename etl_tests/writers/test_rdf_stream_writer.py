@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pyoxigraph as ox
+import pytest
+
+from etl.models.types import RdfMimeType
+from etl.namespaces import RDF, SCHEMA
+from etl.writers import RdfStreamWriter
+
+
+@pytest.mark.parametrize(
+    "rdf_mime_type", sorted(RdfStreamWriter.SUPPORTED_RDF_MIME_TYPES)
+)
+def test_write(tmp_path: Path, rdf_mime_type: RdfMimeType) -> None:
+    """Test that RdfStreamWriter.write writes Quads that parse back into the same Quads, or the same triples."""
+
+    subject = ox.NamedNode("http://www.wikidata.org/entity/Q1")
+    graph_name = ox.NamedNode("http://example.org/graph")
+    quads = (
+        ox.Quad(subject, RDF.TYPE, SCHEMA.WEB_PAGE),
+        ox.Quad(subject, SCHEMA.TITLE, ox.Literal('The "Mouseion"\n')),
+        ox.Quad(subject, SCHEMA.URL, ox.Literal(subject.value), graph_name),
+        ox.Quad(
+            ox.NamedNode("http://example.org/anti-recommendation"),
+            SCHEMA.ITEM_REVIEWED,
+            subject,
+        ),
+    )
+    file_path = tmp_path / "arkg"
+
+    with RdfStreamWriter(
+        file_path=file_path, rdf_mime_type=rdf_mime_type, chunk_size=16
+    ) as rdf_stream_writer:
+        rdf_stream_writer.write(quads[:2])
+        rdf_stream_writer.write(quads[2:])
+
+    if rdf_mime_type in (RdfMimeType.N_QUADS, RdfMimeType.TRIG):
+        assert set(ox.parse(str(file_path), rdf_mime_type.value)) == set(quads)
+    else:
+        assert set(ox.parse(str(file_path), rdf_mime_type.value)) == {
+            quad.triple for quad in quads
+        }